@@ -2,7 +2,7 @@
 Celery configuration for background task processing.
 """
 from celery import Celery
-from celery.signals import setup_logging
+from celery.signals import setup_logging, worker_init, worker_process_init, worker_process_shutdown
 from .config import get_settings
 import logging
 
@@ -180,5 +180,21 @@ def config_loggers(*args, **kwargs):
     })
 
 
+@worker_init.connect
+@worker_process_init.connect
+def init_worker_metrics(*args, **kwargs):
+    """Record metrics in worker processes when ENABLE_METRICS is set."""
+    from .config.metrics import init_metrics
+    init_metrics()
+
+
+@worker_process_shutdown.connect
+def release_worker_metrics(pid=None, **kwargs):
+    """Drop the live gauges of an exiting worker process."""
+    import os
+    from core.utils import metrics
+    metrics.mark_process_dead(pid or os.getpid())
+
+
 # Export celery app
 __all__ = ['celery_app']
@@ -11,6 +11,8 @@ from typing import Any, Dict, Optional, Sequence
 from celery import Task
 from celery.signals import task_prerun, task_postrun, task_failure
 
+from core.translation.models.rate_limiter import rate_limit_scope
+
 from ..config.database import SessionLocal
 from ..domains.tasks.models import TaskExecution, TaskStatus, TaskKind
 from sqlalchemy.exc import IntegrityError
@@ -128,6 +130,19 @@ class TrackedTask(DatabaseTask):
     """Task that tracks execution in the database."""
     
     task_kind = TaskKind.OTHER
+
+    def __call__(self, *args, **kwargs):
+        """Run the task with its model requests accounted to its queue and job (rate limits)."""
+        with rate_limit_scope(self._rate_limit_queue(), _extract_job_id(None, args, kwargs)):
+            return super().__call__(*args, **kwargs)
+
+    def _rate_limit_queue(self) -> str:
+        delivery_info = getattr(self.request, "delivery_info", None) or {}
+        queue = delivery_info.get("routing_key")
+        if queue:
+            return queue
+        # Eager or direct calls: derive the queue from the task kind
+        return {TaskKind.ILLUSTRATION: "illustrations"}.get(self.task_kind, self.task_kind.value)
     
     def apply_async(self, args=None, kwargs=None, task_id=None, **options):
         """Override to generate task_id if not provided."""
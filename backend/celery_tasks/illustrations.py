@@ -5,16 +5,18 @@ This module provides Celery tasks for generating illustrations for translation j
 including character base images and scene illustrations.
 """
 
-from typing import Optional, List, Dict, Any
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Optional, List, Dict, Any, Tuple
 from pathlib import Path
 import os
-import json
 import traceback
 import time
 import logging
 
 from ..celery_app import celery_app
 from .base import TrackedTask
+from .progress import ProgressReporter
+from backend.domains.shared.events.live import publish_job_event_after_commit
 from ..config.database import SessionLocal
 from ..config.settings import get_settings
 from backend.domains.translation.models import TranslationJob, TranslationUsageLog
@@ -33,6 +35,8 @@ from core.config.builder import DynamicConfigBuilder
 from backend.domains.shared.model_factory import ModelAPIFactory
 from core.schemas.illustration import IllustrationConfig
 from core.translation.usage_tracker import TokenUsageCollector
+from core.utils.tracing import in_current_context
+from shared.utils.segment_log import SegmentLogReader
 
 
 def _resolve_prompt_model_name(
@@ -52,15 +56,6 @@ def _resolve_prompt_model_name(
     return 'gemini-flash-latest'
 
 
-def _segment_sort_key(segment_key: Any) -> int:
-    """Sort helper that safely handles non-numeric keys."""
-
-    try:
-        return int(segment_key)
-    except (TypeError, ValueError):
-        return 0
-
-
 def _load_segment_from_data(seg_data: Dict[str, Any], seg_id: Optional[int] = None) -> Dict[str, Any]:
     """Construct a normalized segment dictionary from log data."""
 
@@ -87,6 +82,64 @@ def _load_segment_from_data(seg_data: Dict[str, Any], seg_id: Optional[int] = No
 
 
 
+def _generate_segment_illustration(generator, segment: Dict[str, Any], **kwargs) -> Tuple[Any, Optional[str]]:
+    """Generate one scene illustration; failures yield (None, None) so other segments continue."""
+    print(f"[ILLUSTRATIONS TASK] Calling generator.generate_illustration for segment {segment['index']}")
+    try:
+        illustration_result, prompt = generator.generate_illustration(
+            segment_text=segment['text'],
+            segment_index=segment['index'],
+            **kwargs,
+        )
+        print(f"[ILLUSTRATIONS TASK] Completed generation for segment {segment['index']}")
+        if kwargs.get('return_base64'):
+            print(f"[ILLUSTRATIONS TASK] Generated base64 data for client-side storage")
+        else:
+            print(f"[ILLUSTRATIONS TASK] Result path: {illustration_result}")
+        return illustration_result, prompt
+    except Exception as e:
+        print(f"[ILLUSTRATIONS TASK] Error generating illustration for segment {segment['index']}: {e}")
+
+        # Just log the error and continue without retry since we're already not using reference
+        print(f"[ILLUSTRATIONS TASK] Generation failed, continuing without image")
+        return None, None
+
+
+def _submit_segment_illustration(executor, generator, segment: Dict[str, Any], **kwargs) -> Future:
+    """Queue _generate_segment_illustration on the executor in the task's context (rate-limit scope, spans)."""
+    return executor.submit(in_current_context(_generate_segment_illustration), generator, segment, **kwargs)
+
+
+def _build_illustration_result(
+    segment_index: int,
+    illustration_result: Any,
+    prompt: Optional[str],
+    *,
+    reference_used: bool,
+    world_atmosphere_used: bool,
+    return_base64: bool,
+) -> Dict[str, Any]:
+    """Build the illustrations_data entry for one segment."""
+    # Determine if it's an image or prompt, and handle base64 data
+    result = {
+        'segment_index': segment_index,
+        'prompt': prompt,
+        'success': illustration_result is not None,
+        'reference_used': reference_used,
+        'world_atmosphere_used': world_atmosphere_used  # Track if analysis was used
+    }
+
+    if return_base64 and illustration_result and isinstance(illustration_result, dict):
+        # Base64 mode - store data directly
+        result['type'] = 'base64_image' if illustration_result.get('type') == 'image' else 'prompt'
+        result['illustration_data'] = illustration_result
+    else:
+        # Traditional file-based mode
+        result['type'] = 'image' if illustration_result and str(illustration_result).endswith('.png') else 'prompt'
+        result['illustration_path'] = str(illustration_result) if illustration_result else None
+    return result
+
+
 def _persist_usage_events(
     db,
     job: TranslationJob,
@@ -222,6 +275,7 @@ def generate_illustrations_task(
                 client=client,
                 output_dir=settings.job_storage_base,
                 usage_callback=usage_collector.record_event,
+                requests_per_minute=settings.illustration_requests_per_minute,
             )
             print(f"[ILLUSTRATIONS TASK] Generator initialized successfully with model: {settings.illustration_model}")
         except Exception as e:
@@ -278,41 +332,19 @@ def generate_illustrations_task(
         if not segments:
             # Load segments from log files as a fallback for legacy jobs
             log_dir = Path(settings.job_storage_base) / str(job_id) / "segments" / "translation"
-            if log_dir.exists():
-                summary_file = log_dir / "summary.json"
-                segments = []
-                if summary_file.exists():
-                    print(f"[ILLUSTRATIONS TASK] Loading segments from {summary_file}")
-                    try:
-                        with open(summary_file, 'r', encoding='utf-8') as f:
-                            summary_data = json.load(f)
-
-                        segments_dict = summary_data.get('segments', {})
-                        for seg_id_key in sorted(segments_dict.keys(), key=_segment_sort_key):
-                            seg_data = segments_dict[seg_id_key]
-                            try:
-                                seg_id_int = int(seg_id_key)
-                            except (TypeError, ValueError):
-                                seg_id_int = None
-
-                            segments.append(_load_segment_from_data(seg_data, seg_id_int))
-
-                        print(f"[ILLUSTRATIONS TASK] Loaded {len(segments)} segments from log summary")
-                    except Exception as e:
-                        print(f"[ILLUSTRATIONS TASK] Error loading from summary.json: {e}")
-                        import traceback
-                        traceback.print_exc()
-
-                if not segments:
-                    print(f"[ILLUSTRATIONS TASK] Attempting to load individual segment files from {log_dir}")
+            segment_log = SegmentLogReader(str(log_dir))
+            if segment_log.exists():
+                print(f"[ILLUSTRATIONS TASK] Loading segments from segment log in {log_dir}")
+                try:
+                    segments = [
+                        _load_segment_from_data(seg_data, seg_id)
+                        for seg_id, seg_data in segment_log.iter_segments()
+                    ]
+                    print(f"[ILLUSTRATIONS TASK] Loaded {len(segments)} segments from segment log")
+                except Exception as e:
+                    print(f"[ILLUSTRATIONS TASK] Error loading segment log: {e}")
+                    traceback.print_exc()
                     segments = []
-                    for seg_file in sorted(log_dir.glob("segment_*.json")):
-                        try:
-                            with open(seg_file, 'r', encoding='utf-8') as f:
-                                seg_data = json.load(f)
-                                segments.append(_load_segment_from_data(seg_data))
-                        except Exception as e:
-                            print(f"[ILLUSTRATIONS TASK] Error loading {seg_file}: {e}")
 
             if not segments:
                 print(f"[ILLUSTRATIONS TASK] No log files found; using database segments if available")
@@ -322,6 +354,7 @@ def generate_illustrations_task(
         if not segments:
             job.illustrations_status = "FAILED"
             job.illustrations_data = {"error": "No segments found in logs or database"}
+            publish_job_event_after_commit(db, job_id, "status", phase="illustrations", status="FAILED")
             db.commit()
             raise ValueError("No segments found in translation job")
 
@@ -369,194 +402,208 @@ def generate_illustrations_task(
 
         world_data_dirty = False
         job_base_filename = job.filename or f"job_{job_id}"
+        # Check if we should return base64 data instead of saving to disk
+        return_base64 = settings.illustrations_to_user_side
 
-        for idx, segment in enumerate(segments_to_illustrate):
-            print(f"[ILLUSTRATIONS TASK] Processing segment {idx + 1}/{total_segments} (index: {segment['index']})")
-            
-            # Update progress
-            progress = int(idx / total_segments * 100)
-            self.update_state(
-                state='PROGRESS',
-                meta={
-                    'current': progress,
-                    'total': 100,
-                    'status': f'Generating illustration {idx + 1}/{total_segments}...'
-                }
+        # Segments are prepared (prompt, reference, world atmosphere) on this thread while
+        # up to `concurrency` image requests run in the background; each finished image is
+        # recorded and committed here as soon as it completes.
+        concurrency = max(1, int(settings.illustration_concurrency or 1))
+        print(f"[ILLUSTRATIONS TASK] Image generation concurrency: {concurrency}")
+        executor = ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix=f"illustrations-{job_id}")
+        try:
+            in_flight: Dict[Future, Tuple[Dict[str, Any], bool, bool]] = {}
+            progress_reporter = ProgressReporter(
+                db,
+                job_id,
+                'illustrations_progress',
+                task=self,
+                task_state='PROGRESS',
+                status_message=lambda p: f'Generated illustrations... {p}%',
             )
+
+            def record_completed(done_futures) -> None:
+                nonlocal world_data_dirty
+                for future in done_futures:
+                    done_segment, reference_used, world_atmosphere_used = in_flight.pop(future)
+                    illustration_result, prompt = future.result()
+                    result = _build_illustration_result(
+                        done_segment['index'],
+                        illustration_result,
+                        prompt,
+                        reference_used=reference_used,
+                        world_atmosphere_used=world_atmosphere_used,
+                        return_base64=return_base64,
+                    )
+                    if use_profile_lock:
+                        result['used_base_index'] = selected_base_index
+                        result['consistency_mode'] = 'profile_locked'
+                    results.append(result)
+
+                    if segments_from_db and world_data_dirty:
+                        # Flushed with the next progress commit
+                        job.translation_segments = segments
+                        world_data_dirty = False
+
+                    # Update task state, job progress and partial results (coalesced)
+                    progress = int(len(results) / total_segments * 100)
+                    progress_reporter.report(
+                        progress,
+                        values={'illustrations_data': sorted(results, key=lambda r: r['segment_index'])},
+                    )
+
+            for idx, segment in enumerate(segments_to_illustrate):
+                print(f"[ILLUSTRATIONS TASK] Processing segment {idx + 1}/{total_segments} (index: {segment['index']})")
+            
+                # Wait for a free slot, recording whatever finished meanwhile
+                if len(in_flight) >= concurrency:
+                    done, _ = wait(list(in_flight), return_when=FIRST_COMPLETED)
+                    record_completed(done)
             
-            # Prepare prompt and reference image
-            custom_prompt = None
-            ref_tuple = None
+                # Prepare prompt and reference image
+                custom_prompt = None
+                ref_tuple = None
 
-            # Attempt to load selected base image as reference regardless of profile lock
-            # (reference usage will still be gated by config below)
-            try:
-                bases = job.character_base_images or []
-                if selected_base_index is not None:
-                    print(f"[ILLUSTRATIONS TASK] Number of base images available: {len(bases)}")
-                    if 0 <= selected_base_index < len(bases):
-                        base_path = bases[selected_base_index].get('illustration_path')
-                        print(f"[ILLUSTRATIONS TASK] Base path from DB: {base_path}")
-                        if base_path and not os.path.isabs(base_path) and job.character_base_directory:
-                            base_path = str(Path(job.character_base_directory) / Path(base_path).name)
-                            print(f"[ILLUSTRATIONS TASK] Resolved base path: {base_path}")
-                        if base_path and base_path.endswith('.png') and os.path.exists(base_path):
-                            with open(base_path, 'rb') as bf:
-                                ref_bytes = bf.read()
-                            ref_tuple = (ref_bytes, 'image/png')
-                            print(f"[ILLUSTRATIONS TASK] Reference image loaded, size: {len(ref_bytes)} bytes")
-                        else:
-                            print(f"[ILLUSTRATIONS TASK] No PNG base found for reference at: {base_path}")
-            except Exception as e:
-                print(f"[ILLUSTRATIONS TASK] Error loading base reference image: {e}")
-                traceback.print_exc()
-
-            if use_profile_lock:
-                print(f"[ILLUSTRATIONS TASK] Using profile lock for segment {segment['index']}")
-                print(f"[ILLUSTRATIONS TASK] Selected base index: {selected_base_index}")
-                print(f"[ILLUSTRATIONS TASK] Character profile exists: {bool(character_profile)}")
-                
-                context_text = None
-                if segment['index'] > 0 and segment['index'] < len(segments):
-                    prev = segments[segment['index'] - 1]
-                    context_text = prev.get('source_text') or prev.get('text') or None
-                
+                # Attempt to load selected base image as reference regardless of profile lock
+                # (reference usage will still be gated by config below)
                 try:
-                    custom_prompt = generator.create_scene_prompt_with_profile(
-                        segment_text=segment['text'],
-                        context=context_text,
-                        profile=character_profile,
-                        style_hints=config.style_hints,
-                        style=config.style
-                    )
-                    print(f"[ILLUSTRATIONS TASK] Created custom prompt: {custom_prompt[:100]}...")
+                    bases = job.character_base_images or []
+                    if selected_base_index is not None:
+                        print(f"[ILLUSTRATIONS TASK] Number of base images available: {len(bases)}")
+                        if 0 <= selected_base_index < len(bases):
+                            base_path = bases[selected_base_index].get('illustration_path')
+                            print(f"[ILLUSTRATIONS TASK] Base path from DB: {base_path}")
+                            if base_path and not os.path.isabs(base_path) and job.character_base_directory:
+                                base_path = str(Path(job.character_base_directory) / Path(base_path).name)
+                                print(f"[ILLUSTRATIONS TASK] Resolved base path: {base_path}")
+                            if base_path and base_path.endswith('.png') and os.path.exists(base_path):
+                                with open(base_path, 'rb') as bf:
+                                    ref_bytes = bf.read()
+                                ref_tuple = (ref_bytes, 'image/png')
+                                print(f"[ILLUSTRATIONS TASK] Reference image loaded, size: {len(ref_bytes)} bytes")
+                            else:
+                                print(f"[ILLUSTRATIONS TASK] No PNG base found for reference at: {base_path}")
                 except Exception as e:
-                    print(f"[ILLUSTRATIONS TASK] Error creating custom prompt: {e}")
-                    custom_prompt = None
-            else:
-                print(f"[ILLUSTRATIONS TASK] Not using profile lock for segment {segment['index']}")
+                    print(f"[ILLUSTRATIONS TASK] Error loading base reference image: {e}")
+                    traceback.print_exc()
+
+                if use_profile_lock:
+                    print(f"[ILLUSTRATIONS TASK] Using profile lock for segment {segment['index']}")
+                    print(f"[ILLUSTRATIONS TASK] Selected base index: {selected_base_index}")
+                    print(f"[ILLUSTRATIONS TASK] Character profile exists: {bool(character_profile)}")
+                
+                    context_text = None
+                    if segment['index'] > 0 and segment['index'] < len(segments):
+                        prev = segments[segment['index'] - 1]
+                        context_text = prev.get('source_text') or prev.get('text') or None
+                
+                    try:
+                        custom_prompt = generator.create_scene_prompt_with_profile(
+                            segment_text=segment['text'],
+                            context=context_text,
+                            profile=character_profile,
+                            style_hints=config.style_hints,
+                            style=config.style
+                        )
+                        print(f"[ILLUSTRATIONS TASK] Created custom prompt: {custom_prompt[:100]}...")
+                    except Exception as e:
+                        print(f"[ILLUSTRATIONS TASK] Error creating custom prompt: {e}")
+                        custom_prompt = None
+                else:
+                    print(f"[ILLUSTRATIONS TASK] Not using profile lock for segment {segment['index']}")
             
-            # Generate illustration for this segment
-            print(f"[ILLUSTRATIONS TASK] Calling generator.generate_illustration for segment {segment['index']}")
-            print(f"[ILLUSTRATIONS TASK] Text length: {len(segment['text'])} chars")
-            print(f"[ILLUSTRATIONS TASK] Has custom prompt: {custom_prompt is not None}")
-            print(f"[ILLUSTRATIONS TASK] Has reference image: {ref_tuple is not None}")
+                # Queue illustration generation for this segment
+                print(f"[ILLUSTRATIONS TASK] Queueing illustration for segment {segment['index']}")
+                print(f"[ILLUSTRATIONS TASK] Text length: {len(segment['text'])} chars")
+                print(f"[ILLUSTRATIONS TASK] Has custom prompt: {custom_prompt is not None}")
+                print(f"[ILLUSTRATIONS TASK] Has reference image: {ref_tuple is not None}")
             
-            # Decide whether to use the selected base image as a reference
-            use_reference = False
-            if ref_tuple is not None and getattr(config, 'allow_reference_images', True):
-                if getattr(config, 'reference_image_source', 'base_selection') == 'base_selection':
-                    use_reference = True
-
-            # If we plan to use reference, add a short instruction to the prompt
-            effective_prompt = custom_prompt
-            if use_reference and effective_prompt:
-                effective_prompt = (
-                    effective_prompt
-                    + ". Use the attached reference image to preserve identity; do not copy any reference background."
-                )
+                # Decide whether to use the selected base image as a reference
+                use_reference = False
+                if ref_tuple is not None and getattr(config, 'allow_reference_images', True):
+                    if getattr(config, 'reference_image_source', 'base_selection') == 'base_selection':
+                        use_reference = True
+
+                # If we plan to use reference, add a short instruction to the prompt
+                effective_prompt = custom_prompt
+                if use_reference and effective_prompt:
+                    effective_prompt = (
+                        effective_prompt
+                        + ". Use the attached reference image to preserve identity; do not copy any reference background."
+                    )
 
-            # Extract or compute world_atmosphere data for the segment
-            world_atmosphere_data: Optional[Dict[str, Any]] = None
-            segment_summary = None
-
-            if segment['index'] < len(segments):
-                full_segment = segments[segment['index']]
-                world_atmosphere_data, created_now = ensure_world_atmosphere_data(
-                    world_provider,
-                    segments,
-                    segment['index'],
-                    job.final_glossary or {},
-                    job_base_filename,
-                )
+                # Extract or compute world_atmosphere data for the segment
+                world_atmosphere_data: Optional[Dict[str, Any]] = None
+                segment_summary = None
+
+                if segment['index'] < len(segments):
+                    full_segment = segments[segment['index']]
+                    world_atmosphere_data, created_now = ensure_world_atmosphere_data(
+                        world_provider,
+                        segments,
+                        segment['index'],
+                        job.final_glossary or {},
+                        job_base_filename,
+                    )
 
-                if world_atmosphere_data is None:
-                    world_atmosphere_data = extract_world_atmosphere_dict(full_segment)
-                    created_now = False
+                    if world_atmosphere_data is None:
+                        world_atmosphere_data = extract_world_atmosphere_dict(full_segment)
+                        created_now = False
 
-                if world_atmosphere_data:
-                    segment_summary = world_atmosphere_data.get('segment_summary', '')
-                    if isinstance(full_segment, dict):
-                        full_segment['world_atmosphere'] = world_atmosphere_data
-                        if segment_summary:
-                            full_segment['segment_summary'] = segment_summary
-                    if created_now:
-                        world_data_dirty = True
-
-            if world_atmosphere_data:
-                print(f"[ILLUSTRATIONS TASK] ✓ World atmosphere analysis available for segment {segment['index']}")
-                keys = list(world_atmosphere_data.keys()) if isinstance(world_atmosphere_data, dict) else []
-                print(f"[ILLUSTRATIONS TASK] World atmosphere keys: {keys}")
-                if segment_summary:
-                    print(f"[ILLUSTRATIONS TASK] Segment summary: {segment_summary[:100]}...")
-            else:
-                print(f"[ILLUSTRATIONS TASK] ✗ World atmosphere analysis NOT available for segment {segment['index']}")
-                print(f"[ILLUSTRATIONS TASK] Will use basic prompt without detailed scene analysis")
+                    if world_atmosphere_data:
+                        segment_summary = world_atmosphere_data.get('segment_summary', '')
+                        if isinstance(full_segment, dict):
+                            full_segment['world_atmosphere'] = world_atmosphere_data
+                            if segment_summary:
+                                full_segment['segment_summary'] = segment_summary
+                        if created_now:
+                            world_data_dirty = True
 
-            try:
-                # Check if we should return base64 data instead of saving to disk
-                return_base64 = settings.illustrations_to_user_side
+                if world_atmosphere_data:
+                    print(f"[ILLUSTRATIONS TASK] ✓ World atmosphere analysis available for segment {segment['index']}")
+                    keys = list(world_atmosphere_data.keys()) if isinstance(world_atmosphere_data, dict) else []
+                    print(f"[ILLUSTRATIONS TASK] World atmosphere keys: {keys}")
+                    if segment_summary:
+                        print(f"[ILLUSTRATIONS TASK] Segment summary: {segment_summary[:100]}...")
+                else:
+                    print(f"[ILLUSTRATIONS TASK] ✗ World atmosphere analysis NOT available for segment {segment['index']}")
+                    print(f"[ILLUSTRATIONS TASK] Will use basic prompt without detailed scene analysis")
 
-                illustration_result, prompt = generator.generate_illustration(
-                    segment_text=segment['text'],
-                    segment_index=segment['index'],
+                future = _submit_segment_illustration(
+                    executor,
+                    generator,
+                    segment,
                     style_hints=config.style_hints,
                     glossary=job.final_glossary,
                     world_atmosphere=world_atmosphere_data,
                     custom_prompt=effective_prompt,
                     reference_image=(ref_tuple if use_reference else None),
                     return_base64=return_base64,
-                    style=config.style
+                    style=config.style,
                 )
+                in_flight[future] = (segment, bool(use_reference), world_atmosphere_data is not None)
 
-                print(f"[ILLUSTRATIONS TASK] Completed generation for segment {segment['index']}")
-                if return_base64:
-                    print(f"[ILLUSTRATIONS TASK] Generated base64 data for client-side storage")
-                else:
-                    print(f"[ILLUSTRATIONS TASK] Result path: {illustration_result}")
-            except Exception as e:
-                print(f"[ILLUSTRATIONS TASK] Error generating illustration for segment {segment['index']}: {e}")
-
-                # Just log the error and continue without retry since we're already not using reference
-                print(f"[ILLUSTRATIONS TASK] Generation failed, continuing without image")
-                illustration_result = None
-                prompt = None
-
-            # Determine if it's an image or prompt, and handle base64 data
-            result = {
-                'segment_index': segment['index'],
-                'prompt': prompt,
-                'success': illustration_result is not None,
-                'reference_used': bool(use_reference),
-                'world_atmosphere_used': world_atmosphere_data is not None  # Track if analysis was used
-            }
+            while in_flight:
+                done, _ = wait(list(in_flight), return_when=FIRST_COMPLETED)
+                record_completed(done)
+        finally:
+            # Stop queued image requests when the task fails; running ones finish first
+            executor.shutdown(wait=True, cancel_futures=True)
+
+        results.sort(key=lambda r: r['segment_index'])
 
-            if return_base64 and illustration_result and isinstance(illustration_result, dict):
-                # Base64 mode - store data directly
-                result['type'] = 'base64_image' if illustration_result.get('type') == 'image' else 'prompt'
-                result['illustration_data'] = illustration_result
-            else:
-                # Traditional file-based mode
-                result['type'] = 'image' if illustration_result and str(illustration_result).endswith('.png') else 'prompt'
-                result['illustration_path'] = str(illustration_result) if illustration_result else None
-            if use_profile_lock:
-                result['used_base_index'] = selected_base_index
-                result['consistency_mode'] = 'profile_locked'
-            results.append(result)
-
-            # Update job progress in database
-            job.illustrations_progress = progress
-            if segments_from_db and world_data_dirty:
-                job.translation_segments = segments
-                world_data_dirty = False
-            db.commit()
-        
         # Update job with final results
         job.illustrations_data = results
         job.illustrations_count = sum(1 for r in results if r['success'])
         job.illustrations_directory = str(generator.job_output_dir)
         job.illustrations_status = "COMPLETED"
         job.illustrations_progress = 100
+        if segments_from_db and world_data_dirty:
+            job.translation_segments = segments
+        publish_job_event_after_commit(
+            db, job_id, "status", phase="illustrations", status="COMPLETED",
+            progress=100, count=job.illustrations_count,
+        )
         
         db.commit()
         
@@ -594,6 +641,9 @@ def generate_illustrations_task(
                     job.illustrations_status = "FAILED"
                     job.illustrations_data = {"error": error_msg}
                     job.illustrations_progress = 0
+                    publish_job_event_after_commit(
+                        db, job_id, "status", phase="illustrations", status="FAILED", error=error_msg
+                    )
                     db.commit()
             except:
                 pass
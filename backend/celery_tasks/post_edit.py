@@ -10,6 +10,7 @@ import logging
 
 from ..celery_app import celery_app
 from .base import TrackedTask
+from .progress import ProgressReporter
 from ..config.database import SessionLocal
 from ..domains.post_edit.service import PostEditDomainService
 from ..domains.tasks.models import TaskKind
@@ -117,15 +118,15 @@ def process_post_edit_task(
                 validation_report_path = None
         
         # Run the post-editing
-        def update_progress(p: int):
-            """Update both Celery task state and database progress."""
-            current_task.update_state(
-                state='PROCESSING',
-                meta={'current': p, 'total': 100, 'status': f'Post-editing... {p}%'}
-            )
-            # Also update database progress
-            repo.update_post_edit_status(job_id, "IN_PROGRESS", progress=p)
-            db.commit()
+        # Coalesced Celery task state + database progress (one UPDATE per interval/step)
+        update_progress = ProgressReporter(
+            db,
+            job_id,
+            "post_edit_progress",
+            task=current_task,
+            status_message=lambda p: f'Post-editing... {p}%',
+            extra_values={"post_edit_status": "IN_PROGRESS"},
+        )
         
         edited_segments = post_edit_service.run_post_edit(
             post_editor=post_editor,
@@ -140,6 +141,7 @@ def process_post_edit_task(
             job_filename=job.filename,
             segment_logger=segment_logger
         )
+        update_progress.flush()
         
         # Create result paths
         post_edit_result = {
@@ -0,0 +1,148 @@
+"""
+Coalesced job progress reporting for Celery tasks.
+
+Per-item progress callbacks used to SELECT the job and COMMIT (plus a Celery
+update_state write to the result backend) for every segment. ProgressReporter
+keeps the latest value in memory and writes it with a single
+UPDATE ... WHERE id = :job_id at most once per interval, unless progress moved
+by at least `min_delta` percent. flush() writes whatever is still pending.
+Each write is also pushed to the job's live event channel once it commits.
+"""
+
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+
+from sqlalchemy.orm import Session
+
+from backend.domains.shared.events.live import publish_job_event_after_commit
+from backend.domains.translation.models import TranslationJob
+
+
+class ProgressReporter:
+    """Throttles progress writes for one job column (and optionally the Celery task state)."""
+
+    def __init__(
+        self,
+        db: Session,
+        job_id: int,
+        column: str = "progress",
+        *,
+        task: Any = None,
+        task_state: str = "PROCESSING",
+        status_message: Optional[Callable[[int], str]] = None,
+        extra_values: Optional[Dict[str, Any]] = None,
+        min_interval: Optional[float] = None,
+        min_delta: Optional[int] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Args:
+            db: Session used for the UPDATE statements
+            job_id: Job whose progress is reported
+            column: TranslationJob column holding the percentage
+            task: Optional Celery task whose state mirrors the progress
+            task_state: Celery state reported with each write
+            status_message: Builds the Celery 'status' text from a percentage
+            extra_values: Other columns written together with the progress (e.g. a status)
+            min_interval: Seconds between writes (default: settings.progress_update_interval)
+            min_delta: Percentage change that forces a write (default: settings.progress_update_min_delta)
+            clock: Monotonic time source (overridable in tests)
+        """
+        if min_interval is None or min_delta is None:
+            from backend.config.settings import get_settings
+            settings = get_settings()
+            if min_interval is None:
+                min_interval = settings.progress_update_interval
+            if min_delta is None:
+                min_delta = settings.progress_update_min_delta
+
+        self.db = db
+        self.job_id = job_id
+        self.column = column
+        # "validation_progress" -> "validation"; the plain column is the translation itself
+        self.phase = column[:-len("_progress")] if column.endswith("_progress") else "translation"
+        self.task = task
+        self.task_state = task_state
+        self.status_message = status_message
+        self.extra_values = dict(extra_values or {})
+        self.min_interval = max(0.0, float(min_interval))
+        self.min_delta = max(1, int(min_delta))
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._pending: Optional[int] = None
+        self._pending_values: Dict[str, Any] = {}
+        self._written: Optional[int] = None
+        self._last_write = float("-inf")
+        self.writes = 0
+
+    def report(self, progress: int, values: Optional[Dict[str, Any]] = None) -> bool:
+        """
+        Record a progress value, writing it only when the throttle allows.
+
+        Args:
+            progress: Percentage (clamped to 0-100)
+            values: Other columns to write with the next UPDATE (latest value wins),
+                e.g. partial results
+
+        Returns:
+            True if the value was written
+        """
+        progress = min(100, max(0, int(progress)))
+        with self._lock:
+            if values:
+                self._pending_values.update(values)
+            if progress == self._written and not self._pending_values:
+                self._pending = None
+                return False
+            self._pending = progress
+            due = (
+                self._written is None
+                or progress >= 100
+                or abs(progress - self._written) >= self.min_delta
+                or self._clock() - self._last_write >= self.min_interval
+            )
+            if not due:
+                return False
+            return self._write_locked()
+
+    __call__ = report
+
+    def flush(self) -> bool:
+        """Write the last reported value if it has not been written yet."""
+        with self._lock:
+            if self._pending is None:
+                return False
+            return self._write_locked()
+
+    def _write_locked(self) -> bool:
+        progress = self._pending
+        values = {self.column: progress, **self.extra_values, **self._pending_values}
+        try:
+            self.db.query(TranslationJob).filter(TranslationJob.id == self.job_id).update(
+                values, synchronize_session=False
+            )
+            publish_job_event_after_commit(
+                self.db, self.job_id, "progress", phase=self.phase, progress=progress
+            )
+            self.db.commit()
+        except Exception as exc:
+            self.db.rollback()
+            print(f"[ProgressReporter] Failed to update progress for job {self.job_id}: {exc}")
+            return False
+
+        if self.task is not None:
+            meta = {'current': progress, 'total': 100}
+            if self.status_message is not None:
+                meta['status'] = self.status_message(progress)
+            try:
+                self.task.update_state(state=self.task_state, meta=meta)
+            except Exception as exc:
+                print(f"[ProgressReporter] Failed to update task state for job {self.job_id}: {exc}")
+
+        self._written = progress
+        self._pending = None
+        self._pending_values = {}
+        self._last_write = self._clock()
+        self.writes += 1
+        return True
@@ -11,6 +11,7 @@ from datetime import datetime
 
 from ..celery_app import celery_app
 from .base import TrackedTask
+from .progress import ProgressReporter
 from ..config.database import SessionLocal
 from ..domains.validation.service import ValidationDomainService
 from ..domains.tasks.models import TaskKind
@@ -161,15 +162,15 @@ def process_validation_task(
         quick_mode = validation_mode == 'quick'
         task_logger.info(f"[VALIDATION TASK] Running validation with quick_mode={quick_mode}, sample_rate={sample_rate}")
         
-        def update_progress(p: int):
-            """Update both Celery task state and database progress."""
-            current_task.update_state(
-                state='PROCESSING',
-                meta={'current': p, 'total': 100, 'status': f'Validating... {p}%'}
-            )
-            # Also update database progress
-            repo.update_validation_status(job_id, "IN_PROGRESS", progress=p)
-            db.commit()
+        # Coalesced Celery task state + database progress (one UPDATE per interval/step)
+        update_progress = ProgressReporter(
+            db,
+            job_id,
+            "validation_progress",
+            task=current_task,
+            status_message=lambda p: f'Validating... {p}%',
+            extra_values={"validation_status": "IN_PROGRESS"},
+        )
         
         try:
             validation_result = validation_service.run_validation(
@@ -180,6 +181,7 @@ def process_validation_task(
                 progress_callback=update_progress,
                 segment_logger=segment_logger
             )
+            update_progress.flush()
             task_logger.info(f"[VALIDATION TASK] Validation run completed, result: {validation_result is not None}")
         except Exception as e:
             task_logger.error(f"[VALIDATION TASK] Error during validation run: {str(e)}")
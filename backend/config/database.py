@@ -1,7 +1,23 @@
+import time
+
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import QueuePool
+from core.utils import metrics
 from .settings import get_settings
 
+
+class TimedQueuePool(QueuePool):
+    """QueuePool that reports how long each checkout waited for a connection."""
+
+    def connect(self):
+        start = time.perf_counter()
+        try:
+            return super().connect()
+        finally:
+            metrics.observe_db_checkout(time.perf_counter() - start)
+
+
 # Get database URL from centralized settings
 settings = get_settings()
 SQLALCHEMY_DATABASE_URL = settings.database_url
@@ -18,6 +34,7 @@ else:
     # PostgreSQL with connection pooling for production
     engine = create_engine(
         SQLALCHEMY_DATABASE_URL,
+        poolclass=TimedQueuePool,
         pool_size=settings.pool_size,
         max_overflow=settings.max_overflow,
         pool_pre_ping=settings.pool_pre_ping,
@@ -0,0 +1,113 @@
+"""
+Metrics endpoint and scrape-time collectors.
+
+Turns on core.utils.metrics when ENABLE_METRICS is set and serves the merged
+samples of the API and Celery worker processes at settings.metrics_endpoint.
+Celery queue depth and the outbox backlog are read from Redis and the database
+when the endpoint is scraped, so they are reported once instead of per process.
+"""
+
+import time
+from typing import Iterator, Optional
+
+from fastapi import APIRouter, Response
+
+from core.utils import metrics
+from .settings import get_settings
+
+# Queues consumed by the workers (see celery_app.task_queues)
+CELERY_QUEUES = ("translation", "validation", "post_edit", "illustrations", "events", "maintenance", "default")
+
+
+def init_metrics() -> bool:
+    """Enable metrics for this process when configured; returns whether they are on."""
+    settings = get_settings()
+    if not settings.enable_metrics:
+        return False
+    return metrics.enable(settings.metrics_multiproc_dir)
+
+
+class CeleryQueueCollector:
+    """Messages waiting in each Celery queue (Redis broker list lengths)."""
+
+    def __init__(self, redis_url: str, queues=CELERY_QUEUES, cache_seconds: float = 5.0):
+        self.redis_url = redis_url
+        self.queues = tuple(queues)
+        self.cache_seconds = cache_seconds
+        self._client = None
+        self._cached_at = 0.0
+        self._cached: dict = {}
+
+    def _depths(self) -> dict:
+        now = time.monotonic()
+        if now - self._cached_at < self.cache_seconds:
+            return self._cached
+        try:
+            if self._client is None:
+                import redis  # type: ignore
+
+                self._client = redis.Redis.from_url(self.redis_url, socket_timeout=2)
+            pipe = self._client.pipeline()
+            for queue in self.queues:
+                pipe.llen(queue)
+            self._cached = dict(zip(self.queues, pipe.execute()))
+        except Exception as e:
+            print(f"Warning: Failed to read Celery queue depth: {e}")
+            self._client = None
+            self._cached = {}
+        self._cached_at = now
+        return self._cached
+
+    def collect(self) -> Iterator:
+        from prometheus_client.core import GaugeMetricFamily
+
+        family = GaugeMetricFamily("cat_celery_queue_depth", "Tasks waiting in a Celery queue", labels=["queue"])
+        for queue, depth in self._depths().items():
+            family.add_metric([queue], depth)
+        yield family
+
+
+class OutboxBacklogCollector:
+    """Outbox events not yet processed, by status."""
+
+    def collect(self) -> Iterator:
+        from prometheus_client.core import GaugeMetricFamily
+        from sqlalchemy import func
+
+        from .database import SessionLocal
+        from ..domains.shared.events.outbox_model import OutboxEvent
+
+        family = GaugeMetricFamily("cat_outbox_backlog", "Outbox events waiting to be processed", labels=["status"])
+        db = SessionLocal()
+        try:
+            rows = (
+                db.query(OutboxEvent.status, func.count(OutboxEvent.id))
+                .filter(OutboxEvent.processed.is_(False))
+                .group_by(OutboxEvent.status)
+                .all()
+            )
+            for status, count in rows:
+                family.add_metric([status or "pending"], count)
+        except Exception as e:
+            print(f"Warning: Failed to read outbox backlog: {e}")
+        finally:
+            db.close()
+        yield family
+
+
+def create_metrics_router() -> Optional[APIRouter]:
+    """Router serving the metrics endpoint, or None when metrics are disabled."""
+    if not init_metrics():
+        return None
+    settings = get_settings()
+    metrics.register_collector(CeleryQueueCollector(settings.redis_url))
+    metrics.register_collector(OutboxBacklogCollector())
+
+    router = APIRouter()
+
+    @router.get(settings.metrics_endpoint, include_in_schema=False)
+    def read_metrics() -> Response:
+        payload, content_type = metrics.render()
+        return Response(content=payload, media_type=content_type)
+
+    return router
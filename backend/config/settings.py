@@ -3,7 +3,7 @@ Centralized configuration management using Pydantic Settings.
 """
 from pydantic_settings import BaseSettings, SettingsConfigDict
 from pydantic import Field, field_validator
-from typing import Optional, List, Union
+from typing import Optional, List, Literal, Union
 from pathlib import Path
 import os
 
@@ -62,6 +62,9 @@ class Settings(BaseSettings):
     # Redis (for Celery and Caching)
     redis_url: str = Field(default="redis://localhost:6379", env="REDIS_URL")
     redis_max_connections: int = 50
+    # Push job progress / announcement events to SSE clients over Redis pub/sub
+    live_events_enabled: bool = Field(default=True, env="LIVE_EVENTS_ENABLED")
+    live_events_keepalive_seconds: int = Field(default=15, env="LIVE_EVENTS_KEEPALIVE_SECONDS")
     cache_ttl: int = 3600  # 1 hour default cache TTL
     
     # Security
@@ -86,10 +89,40 @@ class Settings(BaseSettings):
     max_retries: int = 3
     retry_delay: int = 1  # seconds
     request_timeout: int = 300  # 5 minutes
+    # Segments whose glossary/style analysis runs ahead of the translation call (0 = serial)
+    translation_guide_lookahead: int = Field(default=0, env="TRANSLATION_GUIDE_LOOKAHEAD")
+    # Analyze glossary, dialogue styles and style deviation in one structured call per segment
+    translation_combined_guide_analysis: bool = Field(default=False, env="TRANSLATION_COMBINED_GUIDE_ANALYSIS")
+    # Parallel sharded translation: "chapter" or "segments" (unset = single serial chain)
+    translation_shard_strategy: Optional[Literal["chapter", "segments"]] = Field(
+        default=None, env="TRANSLATION_SHARD_STRATEGY"
+    )
+    translation_shard_size: int = Field(default=20, env="TRANSLATION_SHARD_SIZE")
+    translation_shard_workers: int = Field(default=4, env="TRANSLATION_SHARD_WORKERS")
+    # Default per-key model limits shared by all workers through Redis (0 = off); a job's
+    # requests_per_minute overrides the request limit. Queues take from these budgets by
+    # priority (translation > post_edit > validation > illustrations) and jobs split them evenly.
+    model_requests_per_minute: int = Field(default=0, env="MODEL_REQUESTS_PER_MINUTE")
+    model_tokens_per_minute: int = Field(default=0, env="MODEL_TOKENS_PER_MINUTE")
+    # Segments validated at once (requests are still paced by the key pool / rate limiter)
+    validation_concurrency: int = Field(default=4, env="VALIDATION_CONCURRENCY")
+    # Segments post-edited at once
+    post_edit_concurrency: int = Field(default=4, env="POST_EDIT_CONCURRENCY")
+    # Job progress is written at most once per interval unless it moved by the given percentage
+    progress_update_interval: float = Field(default=2.0, env="PROGRESS_UPDATE_INTERVAL")
+    progress_update_min_delta: int = Field(default=5, env="PROGRESS_UPDATE_MIN_DELTA")
+    # Segment size unit: "characters" (job segment_size) or "tokens" (budget derived from the model)
+    segmentation_mode: str = Field(default="characters", env="SEGMENTATION_MODE")
+    segment_max_tokens: int = Field(default=8000, env="SEGMENT_MAX_TOKENS")
+    # Output tokens kept free for model thinking when sizing token-budget segments
+    segment_output_reserve_tokens: int = Field(default=4000, env="SEGMENT_OUTPUT_RESERVE_TOKENS")
 
     # Illustration Storage Settings
     illustrations_to_user_side: bool = Field(default=False, env="ILLUSTRATIONS_TO_USER_SIDE")
     illustration_temp_ttl: int = Field(default=86400, env="ILLUSTRATION_TEMP_TTL")  # 24 hours in seconds
+    # Scene illustrations generated at once, and optional per-key pacing of image requests (0 = off)
+    illustration_concurrency: int = Field(default=4, env="ILLUSTRATION_CONCURRENCY")
+    illustration_requests_per_minute: int = Field(default=0, env="ILLUSTRATION_REQUESTS_PER_MINUTE")
     
     # Logging
     log_level: str = Field(default="INFO", env="LOG_LEVEL")
@@ -100,6 +133,8 @@ class Settings(BaseSettings):
     sentry_dsn: Optional[str] = Field(default=None, env="SENTRY_DSN")
     enable_metrics: bool = Field(default=False, env="ENABLE_METRICS")
     metrics_endpoint: str = "/metrics"
+    # Directory shared by the API and Celery worker processes for Prometheus samples
+    metrics_multiproc_dir: Optional[str] = Field(default=None, env="PROMETHEUS_MULTIPROC_DIR")
     
     # S3 Storage (optional)
     s3_bucket: Optional[str] = Field(default=None, env="S3_BUCKET")
@@ -125,6 +160,14 @@ class Settings(BaseSettings):
             return ["http://localhost:3000"]
         return v
     
+    @field_validator("translation_shard_strategy", mode='before')
+    @classmethod
+    def normalize_shard_strategy(cls, v):
+        if isinstance(v, str):
+            v = v.strip().lower()
+            return v or None
+        return v
+
     @field_validator("upload_directory")
     @classmethod
     def ensure_upload_dir(cls, v):
@@ -14,10 +14,10 @@ def update_job_progress(db: Session, job_id: int, progress: int) -> None:
         job_id: Job ID
         progress: Progress percentage (0-100)
     """
-    job = db.query(TranslationJob).filter(TranslationJob.id == job_id).first()
-    if job:
-        job.progress = progress
-        db.commit()
+    db.query(TranslationJob).filter(TranslationJob.id == job_id).update(
+        {"progress": progress}, synchronize_session=False
+    )
+    db.commit()
 
 
 def update_job_final_glossary(db: Session, job_id: int, glossary: Dict[str, str]) -> None:
@@ -10,7 +10,6 @@ Refactored from backend/services/glossary_analysis_service.py
 """
 
 import json
-import re
 from typing import Optional, Dict, List, Any
 from pathlib import Path
 
@@ -18,6 +17,7 @@ from core.config.glossary import GlossaryManager
 from core.translation.models.gemini import GeminiModel
 from core.config.loader import load_config
 from core.utils.text_segmentation import create_segments_for_text
+from core.utils.glossary_matcher import GlossaryMatcher
 
 
 class GlossaryAnalysis:
@@ -33,6 +33,7 @@ class GlossaryAnalysis:
         self.config = load_config()
         self._model_api = model_api
         self._glossary_manager = None
+        self._glossary_matcher = GlossaryMatcher()
     
     def set_model_api(self, model_api):
         """Set or update the model API instance."""
@@ -276,13 +277,8 @@ class GlossaryAnalysis:
         Returns:
             Filtered glossary relevant to the segment
         """
-        filtered = {}
-        for term, translation in full_glossary.items():
-            # Check if term appears in segment (case-insensitive)
-            if re.search(r'\b' + re.escape(term) + r'\b', segment_text, re.IGNORECASE):
-                filtered[term] = translation
-        
-        return filtered
+        # Case-insensitive whole-word match, compiled once and extended with new terms
+        return self._glossary_matcher.filter(full_glossary, segment_text)
     
     def validate_glossary(self, glossary: Dict[str, str]) -> List[str]:
         """
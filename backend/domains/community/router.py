@@ -5,6 +5,7 @@ from typing import List, Optional
 import traceback
 
 from backend.config import SessionLocal, dependencies
+from backend.config.settings import get_settings
 from backend.config.db import get_db
 from backend.domains.user.models import User
 from backend.domains.community.schemas import (
@@ -20,6 +21,7 @@ from backend.domains.community.schemas import (
     CategoryOverview
 )
 from backend.domains.user.schemas import Announcement as AnnouncementSchema, AnnouncementCreate
+from backend.domains.shared.events.live import ANNOUNCEMENTS_CHANNEL, SSE_HEADERS, get_broker, get_publisher
 from backend.domains.community.services import (
     PostService,
     CommentService,
@@ -323,17 +325,24 @@ async def list_announcements(
 
 @router.get("/announcements/stream")
 async def stream_announcements():
-    """Stream announcements via Server-Sent Events (SSE)."""
+    """Stream announcements via Server-Sent Events (SSE).
+
+    Changes are pushed through the live event channel, so connected clients do not
+    query the database; without Redis the stream falls back to polling every 30 seconds.
+    """
     import asyncio
     import json
 
-    async def event_generator():
+    def load_active_announcements() -> list:
+        with SessionLocal() as session:
+            service = AnnouncementService(session)
+            announcements = service.get_announcements(active_only=True)
+            return [service.format_announcement_for_json(a) for a in announcements]
+
+    async def poll_announcements():
         while True:
             try:
-                with SessionLocal() as session:
-                    service = AnnouncementService(session)
-                    announcements = service.get_announcements(active_only=True)
-                    announcements_data = [service.format_announcement_for_json(a) for a in announcements]
+                announcements_data = load_active_announcements()
 
                 # Send the announcement data
                 yield f"data: {json.dumps(announcements_data)}\n\n"
@@ -344,7 +353,45 @@ async def stream_announcements():
                 print(f"Error in announcement stream: {e}")
                 break
 
-    return StreamingResponse(event_generator(), media_type="text/event-stream")
+    async def event_generator():
+        broker = get_broker()
+        if not broker.available:
+            async for frame in poll_announcements():
+                yield frame
+            return
+        try:
+            initial = await broker.last_event(ANNOUNCEMENTS_CHANNEL)
+            if initial is None:
+                # First subscriber since the retained event expired: load once and share it
+                announcements_data = await asyncio.to_thread(load_active_announcements)
+                await asyncio.to_thread(_publish_announcements_data, announcements_data)
+                initial = {"type": "announcements", "data": announcements_data}
+            async for frame in broker.stream(
+                ANNOUNCEMENTS_CHANNEL,
+                initial=initial,
+                keepalive=get_settings().live_events_keepalive_seconds,
+                named_events=False,
+            ):
+                yield frame
+        except Exception as e:
+            print(f"Live announcement stream unavailable, polling instead: {e}")
+            async for frame in poll_announcements():
+                yield frame
+
+    return StreamingResponse(event_generator(), media_type="text/event-stream", headers=SSE_HEADERS)
+
+
+def _publish_announcements_data(announcements_data: list) -> None:
+    get_publisher().publish(ANNOUNCEMENTS_CHANNEL, "announcements", announcements_data)
+
+
+async def _publish_active_announcements(announcement_service: AnnouncementService) -> None:
+    """Push the current active announcements to every connected stream."""
+    import asyncio
+
+    announcements = announcement_service.get_announcements(active_only=True)
+    announcements_data = [announcement_service.format_announcement_for_json(a) for a in announcements]
+    await asyncio.to_thread(_publish_announcements_data, announcements_data)
 
 @router.post("/announcements", response_model=AnnouncementSchema, status_code=status.HTTP_201_CREATED)
 async def create_announcement(
@@ -359,6 +406,7 @@ async def create_announcement(
 
         # Create the new announcement
         db_announcement = await announcement_service.create_announcement(announcement)
+        await _publish_active_announcements(announcement_service)
         return AnnouncementSchema.from_orm(db_announcement)
     except PermissionDeniedException as e:
         raise HTTPException(status_code=403, detail=e.detail)
@@ -377,6 +425,7 @@ async def update_announcement(
             message=announcement.message,
             is_active=announcement.is_active
         )
+        await _publish_active_announcements(announcement_service)
         return AnnouncementSchema.from_orm(db_announcement)
     except PermissionDeniedException as e:
         raise HTTPException(status_code=403, detail=e.detail)
@@ -392,6 +441,7 @@ async def delete_announcement(
     """Delete an announcement (admin only)."""
     try:
         await announcement_service.delete_announcement(announcement_id)
+        await _publish_active_announcements(announcement_service)
         return Response(status_code=status.HTTP_204_NO_CONTENT)
     except PermissionDeniedException as e:
         raise HTTPException(status_code=403, detail=e.detail)
@@ -364,8 +364,8 @@ class ExportDomainService(DomainServiceBase):
         if include_source and db_job.filepath and os.path.exists(db_job.filepath):
             try:
                 # Parse the original file to get the text content
-                from core.utils.file_parser import parse_document
-                source_content = parse_document(db_job.filepath)
+                from core.utils.document_cache import parse_document_cached
+                source_content = parse_document_cached(db_job.filepath)
             except Exception as e:
                 # Log error but don't fail the whole request
                 self.logger.warning(f"Error reading source file: {e}")
@@ -156,7 +156,8 @@ class PostEditDomainService(DomainServiceBase):
             job.filepath,
             original_filename=job.filename,
             target_segment_size=job.segment_size,
-            job_id=job.id
+            job_id=job.id,
+            segment_token_budget=job.segment_token_budget
         )
         
         # Use stored translation segments from DB for exact alignment
@@ -253,14 +254,20 @@ class PostEditDomainService(DomainServiceBase):
             default_select_all
         )
 
-        edited_segments = post_editor.post_edit_document(
-            translation_document,
-            validation_report_path,
-            effective_selected,
-            normalized_modified,
-            progress_callback=progress_callback,
-            job_id=job_id
-        )
+        try:
+            edited_segments = post_editor.post_edit_document(
+                translation_document,
+                validation_report_path,
+                effective_selected,
+                normalized_modified,
+                progress_callback=progress_callback,
+                job_id=job_id,
+                concurrency=get_settings().post_edit_concurrency,
+            )
+        finally:
+            # Write out buffered segment logs even when post-editing failed
+            if segment_logger:
+                segment_logger.close()
         
         # Persist the edited content with legacy TXT compatibility
         edited_content = '\n\n'.join(edited_segments)
@@ -306,7 +313,8 @@ class PostEditDomainService(DomainServiceBase):
                         data_model.filepath,
                         edited_segments,
                         epub_path,
-                        data_model.style_map
+                        data_model.style_map,
+                        segment_infos=data_model.segments,
                     )
                     print(f"--- [POST-EDIT] EPUB artifact refreshed: {epub_path} ---")
                 except Exception as exc:
@@ -524,7 +532,8 @@ class PostEditDomainService(DomainServiceBase):
                 default_select_all,
                 progress_callback,
                 job_id,
-                job.filename
+                job.filename,
+                segment_logger=segment_logger,
             )
             
             # Get the log path
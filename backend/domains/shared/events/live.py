@@ -0,0 +1,333 @@
+"""
+Live push events over Redis pub/sub.
+
+Workers publish small JSON events (progress, segments stored, status changes) to a
+per-job channel once the transaction that produced them commits. Each API process
+holds one Redis subscription and fans events out to its SSE clients through
+in-memory queues, so open browser tabs do not poll Postgres. The last event of a
+channel is also kept under `<channel>:last`, which new subscribers receive first.
+
+Publishing is best-effort: when Redis is unreachable, events are dropped and the
+publisher backs off instead of slowing down the caller.
+"""
+
+import asyncio
+import json
+import threading
+import time
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, List, Optional, Set
+
+from sqlalchemy import event as sa_event
+from sqlalchemy.orm import Session
+
+try:
+    import redis  # type: ignore
+    import redis.asyncio as redis_asyncio  # type: ignore
+    REDIS_AVAILABLE = True
+except ImportError:  # pragma: no cover - depends on installed extras
+    redis = None
+    redis_asyncio = None
+    REDIS_AVAILABLE = False
+
+
+JOB_CHANNEL_PATTERN = "jobs:*:events"
+ANNOUNCEMENTS_CHANNEL = "announcements"
+LAST_EVENT_TTL_SECONDS = 24 * 3600
+
+# Session.info key holding events to publish after commit
+_PENDING_KEY = "live_events"
+
+
+def job_channel(job_id: int) -> str:
+    """Redis channel carrying the events of one job."""
+    return f"jobs:{job_id}:events"
+
+
+def _last_event_key(channel: str) -> str:
+    return f"{channel}:last"
+
+
+def _live_events_settings():
+    from backend.config.settings import get_settings
+    settings = get_settings()
+    return settings.redis_url, settings.live_events_enabled
+
+
+def format_sse(event_type: Optional[str], data: Any) -> str:
+    """Encode one Server-Sent Event frame (no event type = default 'message' event)."""
+    payload = f"data: {json.dumps(data, ensure_ascii=False, default=str)}\n\n"
+    if event_type:
+        return f"event: {event_type}\n{payload}"
+    return payload
+
+
+class LiveEventPublisher:
+    """Synchronous publisher used by Celery workers and request handlers."""
+
+    def __init__(self, redis_url: Optional[str] = None, *, enabled: bool = True, retry_after: float = 30.0):
+        self.redis_url = redis_url
+        self.enabled = enabled and REDIS_AVAILABLE and bool(redis_url)
+        self.retry_after = retry_after
+        self._client = None
+        self._disabled_until = 0.0
+        self._lock = threading.Lock()
+
+    def _get_client(self):
+        with self._lock:
+            if self._client is not None:
+                return self._client
+            if time.monotonic() < self._disabled_until:
+                return None
+            try:
+                client = redis.Redis.from_url(
+                    self.redis_url,
+                    decode_responses=True,
+                    socket_connect_timeout=1.0,
+                    socket_timeout=2.0,
+                )
+                client.ping()
+                self._client = client
+            except Exception as exc:
+                self._disabled_until = time.monotonic() + self.retry_after
+                print(f"[LiveEvents] Redis unavailable, dropping live events for {self.retry_after:.0f}s: {exc}")
+            return self._client
+
+    def publish(self, channel: str, event_type: str, data: Dict[str, Any], *, retain: bool = True) -> bool:
+        """
+        Publish an event to a channel.
+
+        Args:
+            channel: Redis channel (see job_channel / ANNOUNCEMENTS_CHANNEL)
+            event_type: SSE event name, e.g. "progress", "segments", "status"
+            data: JSON-serializable payload
+            retain: Also store it as the channel's last event for new subscribers
+
+        Returns:
+            True if the event was handed to Redis
+        """
+        if not self.enabled:
+            return False
+        client = self._get_client()
+        if client is None:
+            return False
+
+        message = json.dumps(
+            {"type": event_type, "data": data, "ts": time.time()}, ensure_ascii=False, default=str
+        )
+        try:
+            pipe = client.pipeline(transaction=False)
+            pipe.publish(channel, message)
+            if retain:
+                pipe.set(_last_event_key(channel), message, ex=LAST_EVENT_TTL_SECONDS)
+            pipe.execute()
+            return True
+        except Exception as exc:
+            with self._lock:
+                self._client = None
+                self._disabled_until = time.monotonic() + self.retry_after
+            print(f"[LiveEvents] Failed to publish {event_type} on {channel}: {exc}")
+            return False
+
+
+_publisher: Optional[LiveEventPublisher] = None
+_publisher_lock = threading.Lock()
+
+
+def get_publisher() -> LiveEventPublisher:
+    """Process-wide publisher configured from settings."""
+    global _publisher
+    with _publisher_lock:
+        if _publisher is None:
+            try:
+                redis_url, enabled = _live_events_settings()
+            except Exception:
+                redis_url, enabled = None, False
+            _publisher = LiveEventPublisher(redis_url, enabled=enabled)
+        return _publisher
+
+
+def publish_job_event(job_id: int, event_type: str, **data: Any) -> bool:
+    """Publish an event for one job right away."""
+    return get_publisher().publish(job_channel(job_id), event_type, {"job_id": job_id, **data})
+
+
+def publish_after_commit(session: Session, channel: str, event_type: str, data: Dict[str, Any]) -> None:
+    """Queue an event that is published only if the session's transaction commits."""
+    pending: List[tuple] = session.info.setdefault(_PENDING_KEY, [])
+    pending.append((channel, event_type, data))
+
+
+def publish_job_event_after_commit(session: Session, job_id: int, event_type: str, **data: Any) -> None:
+    """Queue a job event that is published only if the session's transaction commits."""
+    publish_after_commit(session, job_channel(job_id), event_type, {"job_id": job_id, **data})
+
+
+@sa_event.listens_for(Session, "after_commit")
+def _publish_pending_events(session: Session) -> None:
+    pending = session.info.pop(_PENDING_KEY, None)
+    if not pending:
+        return
+    publisher = get_publisher()
+    for channel, event_type, data in pending:
+        publisher.publish(channel, event_type, data)
+
+
+@sa_event.listens_for(Session, "after_soft_rollback")
+def _discard_pending_events(session: Session, previous_transaction) -> None:
+    session.info.pop(_PENDING_KEY, None)
+
+
+class LiveEventBroker:
+    """
+    Fans Redis pub/sub messages out to in-process subscribers (one per SSE client).
+
+    A single pattern subscription per process covers every job channel and the
+    announcements channel; it is opened with the first subscriber.
+    """
+
+    def __init__(self, redis_url: Optional[str] = None, *, enabled: bool = True, queue_size: int = 100):
+        self.redis_url = redis_url
+        self.enabled = enabled and REDIS_AVAILABLE and bool(redis_url)
+        self.queue_size = queue_size
+        self._subscribers: Dict[str, Set[asyncio.Queue]] = {}
+        self._client = None
+        self._reader: Optional[asyncio.Task] = None
+        self._start_lock: Optional[asyncio.Lock] = None
+
+    @property
+    def available(self) -> bool:
+        return self.enabled
+
+    async def _ensure_reader(self) -> None:
+        if self._start_lock is None:
+            self._start_lock = asyncio.Lock()
+        async with self._start_lock:
+            if self._reader is not None and not self._reader.done():
+                return
+            if self._client is not None:
+                try:
+                    await self._client.aclose()
+                except Exception:
+                    pass
+            self._client = redis_asyncio.Redis.from_url(self.redis_url, decode_responses=True)
+            pubsub = self._client.pubsub(ignore_subscribe_messages=True)
+            await pubsub.psubscribe(JOB_CHANNEL_PATTERN)
+            await pubsub.subscribe(ANNOUNCEMENTS_CHANNEL)
+            self._reader = asyncio.create_task(self._read(pubsub))
+
+    async def _read(self, pubsub) -> None:
+        try:
+            async for message in pubsub.listen():
+                if message.get("type") not in ("message", "pmessage"):
+                    continue
+                self.dispatch(message["channel"], message["data"])
+        except asyncio.CancelledError:
+            raise
+        except Exception as exc:
+            print(f"[LiveEvents] Subscription lost: {exc}")
+            for queues in self._subscribers.values():
+                for queue in queues:
+                    self._offer(queue, None)
+        finally:
+            try:
+                await pubsub.aclose()
+            except Exception:
+                pass
+
+    def dispatch(self, channel: str, raw_message: str) -> None:
+        """Deliver a raw pub/sub message to every subscriber of its channel."""
+        queues = self._subscribers.get(channel)
+        if not queues:
+            return
+        try:
+            message = json.loads(raw_message)
+        except (TypeError, ValueError):
+            return
+        for queue in list(queues):
+            self._offer(queue, message)
+
+    @staticmethod
+    def _offer(queue: asyncio.Queue, message: Optional[Dict[str, Any]]) -> None:
+        # Slow clients lose their oldest events rather than blocking the fan-out
+        if queue.full():
+            try:
+                queue.get_nowait()
+            except asyncio.QueueEmpty:
+                pass
+        queue.put_nowait(message)
+
+    @asynccontextmanager
+    async def subscribe(self, channel: str) -> AsyncIterator[asyncio.Queue]:
+        """Register a queue receiving the channel's events (None means the subscription was lost)."""
+        await self._ensure_reader()
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+        self._subscribers.setdefault(channel, set()).add(queue)
+        try:
+            yield queue
+        finally:
+            queues = self._subscribers.get(channel)
+            if queues is not None:
+                queues.discard(queue)
+                if not queues:
+                    self._subscribers.pop(channel, None)
+
+    async def last_event(self, channel: str) -> Optional[Dict[str, Any]]:
+        """The retained last event of a channel, if any."""
+        await self._ensure_reader()
+        raw = await self._client.get(_last_event_key(channel))
+        if not raw:
+            return None
+        try:
+            return json.loads(raw)
+        except ValueError:
+            return None
+
+    async def stream(self, channel: str, *, initial: Optional[Dict[str, Any]] = None,
+                     keepalive: float = 15.0, named_events: bool = True) -> AsyncIterator[str]:
+        """
+        SSE frames for a channel: the retained (or given) initial event, then live events.
+
+        Comment frames are sent every `keepalive` seconds so proxies keep the
+        connection open and disconnected clients are noticed. With
+        `named_events=False` only the data is sent (clients use `onmessage`).
+        """
+        def frame(message: Dict[str, Any]) -> str:
+            return format_sse(message["type"] if named_events else None, message["data"])
+
+        async with self.subscribe(channel) as queue:
+            first = initial or await self.last_event(channel)
+            if first:
+                yield frame(first)
+            while True:
+                try:
+                    message = await asyncio.wait_for(queue.get(), timeout=keepalive)
+                except asyncio.TimeoutError:
+                    yield ": keep-alive\n\n"
+                    continue
+                if message is None:
+                    yield format_sse("error", {"error": "Live event subscription lost"})
+                    return
+                yield frame(message)
+
+
+_broker: Optional[LiveEventBroker] = None
+
+
+def get_broker() -> LiveEventBroker:
+    """Process-wide broker used by the API's SSE endpoints."""
+    global _broker
+    if _broker is None:
+        try:
+            redis_url, enabled = _live_events_settings()
+        except Exception:
+            redis_url, enabled = None, False
+        _broker = LiveEventBroker(redis_url, enabled=enabled)
+    return _broker
+
+
+SSE_HEADERS = {
+    "Cache-Control": "no-cache",
+    "Connection": "keep-alive",
+    "X-Accel-Buffering": "no",  # Disable proxy buffering
+}
@@ -118,7 +118,9 @@ def _is_permission_denied_error(exc: Exception) -> bool:
 from core.config.loader import load_config
 from core.translation.models.gemini import GeminiModel
 from core.translation.models.openrouter import OpenRouterModel
+from core.translation.models.response_cache import get_response_cache
 from core.translation.usage_tracker import UsageEvent
+from backend.config.settings import get_settings
 from backend.domains.shared.provider_context import (
     ProviderContext,
     build_vertex_client,
@@ -157,6 +159,10 @@ class ModelAPIFactory:
         """
         if config is None:
             config = load_config()
+        response_cache = get_response_cache(config.get('response_cache'))
+        settings = get_settings()
+        requests_per_minute = requests_per_minute or settings.model_requests_per_minute
+        tokens_per_minute = settings.model_tokens_per_minute
 
         if provider_context and provider_context.name == "vertex":
             client, resolved_model = ModelAPIFactory._create_vertex_client_and_model(provider_context, model_name)
@@ -174,6 +180,7 @@ class ModelAPIFactory:
                 generation_config=generation_config,
                 enable_soft_retry=config.get('enable_soft_retry', True),
                 usage_callback=usage_callback,
+                response_cache=response_cache,
             )
 
         provider_name = provider_context.name if provider_context else None
@@ -192,6 +199,9 @@ class ModelAPIFactory:
                 enable_soft_retry=config.get('enable_soft_retry', True),
                 usage_callback=usage_callback,
                 native_gemini_api_key=config.get('gemini_api_key'),
+                response_cache=response_cache,
+                requests_per_minute=requests_per_minute,
+                tokens_per_minute=tokens_per_minute,
             )
         elif (provider_name == "gemini") or (api_key and (api_key.startswith("AIza") or len(api_key) == 39)):
             print(f"--- [API] Using Gemini model: {model_name} ---")
@@ -209,6 +219,8 @@ class ModelAPIFactory:
                 usage_callback=usage_callback,
                 backup_api_keys=backup_api_keys,
                 requests_per_minute=requests_per_minute,
+                tokens_per_minute=tokens_per_minute,
+                response_cache=response_cache,
             )
         else:
             prefix = (api_key or "")[:10]
@@ -1,11 +1,13 @@
 from .repository import (
     TranslationJobRepository,
     SqlAlchemyTranslationJobRepository,
+    SqlAlchemyTranslationSegmentRepository,
     TranslationUsageLogRepository
 )
 
 __all__ = [
     "TranslationJobRepository",
     "SqlAlchemyTranslationJobRepository",
+    "SqlAlchemyTranslationSegmentRepository",
     "TranslationUsageLogRepository",
 ]
\ No newline at end of file
@@ -1,4 +1,6 @@
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Boolean, JSON
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Boolean, JSON, UniqueConstraint
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from backend.domains.shared.db_base import Base
@@ -21,8 +23,20 @@ class TranslationJob(Base):
     final_glossary = Column(JSON, nullable=True)
     # -----------------------
     segment_size = Column(Integer, default=15000)
-    # Segment data for displaying in segment view
-    translation_segments = Column(JSON, nullable=True)  # Stores both source and translated segments
+    # How the job was first segmented ("characters" or "tokens") and, for tokens, the
+    # budget per segment; resumes and later phases re-segment the same way
+    segmentation_mode = Column(String, nullable=True)
+    segment_token_budget = Column(Integer, nullable=True)
+    # Segment data for displaying in segment view lives in translation_segments rows.
+    # The old JSON blob column is only read for jobs that were never backfilled.
+    legacy_translation_segments = Column("translation_segments", JSON, nullable=True)
+    segment_rows = relationship(
+        "TranslationSegment",
+        back_populates="job",
+        order_by="TranslationSegment.segment_index",
+        cascade="all, delete-orphan",
+        passive_deletes=True,
+    )
     
     # Validation and Post-Edit fields
     validation_enabled = Column(Boolean, default=False)
@@ -54,6 +68,117 @@ class TranslationJob(Base):
     character_base_selected_index = Column(Integer, nullable=True)  # Which base image the user selected
     character_base_directory = Column(String, nullable=True)  # Directory for base images
 
+    @property
+    def translation_segments(self) -> Optional[Any]:
+        """All segments as a list of dicts (source, translation, world_atmosphere, illustration data).
+
+        Loads every row; paginated readers should use SqlAlchemyTranslationSegmentRepository.
+        """
+        if self.segment_rows:
+            return [row.to_dict() for row in self.segment_rows]
+        return self.legacy_translation_segments
+
+    @translation_segments.setter
+    def translation_segments(self, segments: Optional[Any]) -> None:
+        if segments is not None and not isinstance(segments, list):
+            # Unknown legacy shapes are kept as-is in the blob column
+            self.legacy_translation_segments = segments
+            return
+
+        # One row per segment_index; the last entry for a repeated index wins
+        by_index: Dict[int, Dict[str, Any]] = {}
+        for position, data in enumerate(segments or []):
+            if not isinstance(data, dict):
+                data = {"translated_text": str(data)}
+            index = data.get("segment_index", position)
+            try:
+                index = int(index)
+            except (TypeError, ValueError):
+                index = position
+            by_index[index] = data
+
+        # Update rows in place by index so a rewrite never re-inserts an existing
+        # (job_id, segment_index) pair before the old row is deleted.
+        existing = {row.segment_index: row for row in self.segment_rows}
+        rows: List[TranslationSegment] = []
+        for index, data in by_index.items():
+            row = existing.pop(index, None) or TranslationSegment(segment_index=index)
+            row.apply_dict(data)
+            rows.append(row)
+        self.segment_rows = rows
+        self.legacy_translation_segments = None
+
+
+class TranslationSegment(Base):
+    """One translated segment of a job (what the segment view pages through)."""
+    __tablename__ = "translation_segments"
+    __table_args__ = (
+        UniqueConstraint("job_id", "segment_index", name="uq_translation_segments_job_segment"),
+    )
+
+    # Keys stored in dedicated columns; anything else in a segment dict goes to `extra`
+    COLUMN_KEYS = (
+        "source_text",
+        "translated_text",
+        "chapter_title",
+        "chapter_filename",
+        "world_atmosphere",
+        "segment_summary",
+        "illustration_path",
+        "illustration_prompt",
+        "illustration_status",
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    job_id = Column(Integer, ForeignKey("translation_jobs.id", ondelete="CASCADE"), nullable=False, index=True)
+    segment_index = Column(Integer, nullable=False)
+    source_text = Column(Text, nullable=True)
+    translated_text = Column(Text, nullable=True)
+    chapter_title = Column(String, nullable=True)
+    chapter_filename = Column(String, nullable=True)
+    world_atmosphere = Column(JSON, nullable=True)
+    segment_summary = Column(Text, nullable=True)
+    illustration_path = Column(String, nullable=True)
+    illustration_prompt = Column(Text, nullable=True)
+    illustration_status = Column(String, nullable=True)
+    extra = Column(JSON, nullable=True)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+    job = relationship("TranslationJob", back_populates="segment_rows")
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Segment dict in the shape the segment view and downstream tasks expect."""
+        data: Dict[str, Any] = {
+            "segment_index": self.segment_index,
+            "source_text": self.source_text,
+            "translated_text": self.translated_text,
+            "chapter_title": self.chapter_title,
+            "chapter_filename": self.chapter_filename,
+        }
+        for key in self.COLUMN_KEYS[4:]:
+            value = getattr(self, key)
+            if value is not None:
+                data[key] = value
+        if self.extra:
+            data.update(self.extra)
+        return data
+
+    def apply_dict(self, data: Dict[str, Any]) -> None:
+        """Copy a segment dict onto this row."""
+        for key in self.COLUMN_KEYS:
+            setattr(self, key, data.get(key))
+        extra = {
+            key: value for key, value in data.items()
+            if key not in self.COLUMN_KEYS and key != "segment_index"
+        }
+        self.extra = extra or None
+
+    @classmethod
+    def from_dict(cls, job_id: int, segment_index: int, data: Dict[str, Any]) -> "TranslationSegment":
+        row = cls(job_id=job_id, segment_index=segment_index)
+        row.apply_dict(data)
+        return row
+
 class TranslationUsageLog(Base):
     __tablename__ = "translation_usage_logs"
 
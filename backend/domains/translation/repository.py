@@ -3,8 +3,9 @@ from datetime import datetime
 from sqlalchemy.orm import Session, joinedload
 from sqlalchemy import and_, desc
 
-from backend.domains.translation.models import TranslationJob, TranslationUsageLog
+from backend.domains.translation.models import TranslationJob, TranslationSegment, TranslationUsageLog
 from backend.domains.shared.repository import SqlAlchemyRepository
+from backend.domains.shared.events.live import publish_job_event_after_commit
 
 
 class TranslationJobRepository(Protocol):
@@ -111,6 +112,9 @@ class SqlAlchemyTranslationJobRepository(SqlAlchemyRepository[TranslationJob]):
             if status == "COMPLETED":
                 job.completed_at = datetime.utcnow()
             self.session.flush()
+            publish_job_event_after_commit(
+                self.session, id, "status", phase="translation", status=status, error=error, progress=progress
+            )
     
     def list_by_user(
         self,
@@ -179,6 +183,12 @@ class SqlAlchemyTranslationJobRepository(SqlAlchemyRepository[TranslationJob]):
             job.progress = min(100, max(0, progress))  # Ensure 0-100 range
             self.session.flush()
     
+    def set_segmentation(self, id: int, mode: str, budget: Optional[int]) -> None:
+        """Record how the job's segments were built (mode and token budget)."""
+        self.session.query(TranslationJob).filter(TranslationJob.id == id).update(
+            {"segmentation_mode": mode, "segment_token_budget": budget}, synchronize_session=False
+        )
+
     def update_validation_status(
         self,
         id: int,
@@ -198,6 +208,9 @@ class SqlAlchemyTranslationJobRepository(SqlAlchemyRepository[TranslationJob]):
             if status == "COMPLETED":
                 job.validation_completed_at = datetime.utcnow()
             self.session.flush()
+            publish_job_event_after_commit(
+                self.session, id, "status", phase="validation", status=status, progress=progress
+            )
     
     def update_post_edit_status(
         self,
@@ -218,6 +231,9 @@ class SqlAlchemyTranslationJobRepository(SqlAlchemyRepository[TranslationJob]):
             if status == "COMPLETED":
                 job.post_edit_completed_at = datetime.utcnow()
             self.session.flush()
+            publish_job_event_after_commit(
+                self.session, id, "status", phase="post_edit", status=status, progress=progress
+            )
     
     def get_with_usage_logs(self, id: int) -> Optional[TranslationJob]:
         """Get a job with its usage logs eagerly loaded."""
@@ -246,6 +262,89 @@ class SqlAlchemyTranslationJobRepository(SqlAlchemyRepository[TranslationJob]):
             if directory is not None:
                 job.illustrations_directory = directory
             self.session.flush()
+            publish_job_event_after_commit(
+                self.session, id, "status", phase="illustrations", status=status, progress=progress
+            )
+
+
+class SqlAlchemyTranslationSegmentRepository(SqlAlchemyRepository[TranslationSegment]):
+    """Repository for per-segment translation rows (paginated segment view, incremental writes)."""
+
+    def __init__(self, session: Session):
+        """Initialize with a SQLAlchemy session."""
+        super().__init__(session, TranslationSegment)
+
+    def count(self, job_id: int) -> int:
+        """Number of stored segments for a job."""
+        return self.session.query(TranslationSegment).filter(
+            TranslationSegment.job_id == job_id
+        ).count()
+
+    def list_by_job(self, job_id: int, offset: int = 0, limit: Optional[int] = None) -> List[TranslationSegment]:
+        """Segments of a job ordered by segment_index, paginated in SQL."""
+        query = self.session.query(TranslationSegment).filter(
+            TranslationSegment.job_id == job_id
+        ).order_by(TranslationSegment.segment_index).offset(offset)
+        if limit is not None:
+            query = query.limit(limit)
+        return query.all()
+
+    def get_by_index(self, job_id: int, segment_index: int) -> Optional[TranslationSegment]:
+        """Get a single segment by its position in the job."""
+        return self.session.query(TranslationSegment).filter(
+            and_(
+                TranslationSegment.job_id == job_id,
+                TranslationSegment.segment_index == segment_index,
+            )
+        ).first()
+
+    def upsert(self, job_id: int, segment_index: int, data: Dict[str, Any]) -> TranslationSegment:
+        """Insert or update one segment without touching the rest of the job."""
+        row = self.get_by_index(job_id, segment_index)
+        if row is None:
+            row = TranslationSegment.from_dict(job_id, segment_index, data)
+            self.session.add(row)
+        else:
+            row.apply_dict(data)
+        self.session.flush()
+        return row
+
+    def upsert_many(self, job_id: int, segments: Dict[int, Dict[str, Any]]) -> None:
+        """Insert or update a batch of segments (keyed by segment_index) with one lookup query."""
+        if not segments:
+            return
+        existing = {
+            row.segment_index: row
+            for row in self.session.query(TranslationSegment).filter(
+                and_(
+                    TranslationSegment.job_id == job_id,
+                    TranslationSegment.segment_index.in_(list(segments)),
+                )
+            )
+        }
+        for segment_index, data in segments.items():
+            row = existing.get(segment_index)
+            if row is None:
+                self.session.add(TranslationSegment.from_dict(job_id, segment_index, data))
+            else:
+                row.apply_dict(data)
+        self.session.flush()
+
+    def delete_from(self, job_id: int, segment_index: int) -> int:
+        """Delete a job's segments at or after segment_index (e.g. left over from a longer run)."""
+        return self.session.query(TranslationSegment).filter(
+            and_(
+                TranslationSegment.job_id == job_id,
+                TranslationSegment.segment_index >= segment_index,
+            )
+        ).delete(synchronize_session=False)
+
+    def replace_all(self, job_id: int, segments: List[Dict[str, Any]]) -> None:
+        """Replace every segment of a job (e.g. after post-editing the whole document)."""
+        job = self.session.query(TranslationJob).filter(TranslationJob.id == job_id).first()
+        if job:
+            job.translation_segments = segments
+            self.session.flush()
 
 
 class TranslationUsageLogRepository(SqlAlchemyRepository[TranslationUsageLog]):
@@ -7,7 +7,7 @@ delegating all business logic to the TranslationDomainService.
 
 from typing import List, Optional
 from fastapi import Depends, HTTPException, UploadFile, File, Form, Query, Response
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, StreamingResponse
 from sqlalchemy.orm import Session
 
 from backend.config.dependencies import get_db, get_required_user, is_admin
@@ -16,6 +16,8 @@ from backend.domains.translation.models import TranslationJob as TranslationJobM
 from backend.domains.translation.schemas import TranslationJob, TranslationJobListItem, ResumeRequest
 from backend.domains.translation.service import TranslationDomainService
 from backend.domains.shared.provider_context import provider_context_to_payload
+from backend.domains.shared.events.live import SSE_HEADERS, format_sse, get_broker, job_channel
+from backend.config.settings import get_settings
 
 
 def get_translation_service(db: Session = Depends(get_db)) -> TranslationDomainService:
@@ -234,6 +236,36 @@ async def get_job_segments(
     return service.get_job_segments(job_id, offset=offset, limit=limit)
 
 
+async def stream_job_events(job_id: int) -> StreamingResponse:
+    """
+    Stream live events of a job via Server-Sent Events (SSE).
+
+    Event types: "progress" (per phase), "segments" (segments stored during
+    translation) and "status" (phase changes). Events come from Redis pub/sub and
+    never query the database; the latest event is replayed on connect.
+    
+    Args:
+        job_id: Job ID
+        
+    Returns:
+        text/event-stream response
+    """
+    broker = get_broker()
+    if not broker.available:
+        raise HTTPException(status_code=503, detail="Live job events are not available; poll the job instead.")
+
+    async def event_generator():
+        try:
+            async for frame in broker.stream(
+                job_channel(job_id), keepalive=get_settings().live_events_keepalive_seconds
+            ):
+                yield frame
+        except Exception as e:
+            yield format_sse("error", {"error": str(e)})
+
+    return StreamingResponse(event_generator(), media_type="text/event-stream", headers=SSE_HEADERS)
+
+
 async def resume_job(
     job_id: int,
     request: ResumeRequest,
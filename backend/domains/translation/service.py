@@ -23,6 +23,8 @@ from fastapi.responses import FileResponse
 from core.translation.document import TranslationDocument
 from core.translation.translation_pipeline import TranslationPipeline
 from core.translation.usage_tracker import TokenUsageCollector
+from core.prompts.manager import PromptManager
+from core.utils.token_budget import PromptOverhead, budget_for_document
 from .storage_adapter import create_storage_handler
 from core.config.builder import DynamicConfigBuilder
 from backend.domains.shared.provider_context import (
@@ -40,7 +42,10 @@ from backend.domains.shared import (
     TranslationCompletedEvent,
     TranslationFailedEvent,
 )
-from backend.domains.translation import SqlAlchemyTranslationJobRepository
+from backend.domains.translation import (
+    SqlAlchemyTranslationJobRepository,
+    SqlAlchemyTranslationSegmentRepository,
+)
 from backend.domains.translation.models import TranslationJob
 from backend.domains.translation.schemas import (
     TranslationJob as TranslationJobSchema,
@@ -397,6 +402,59 @@ class TranslationDomainService(DomainServiceBase):
             logger.info(f"Completed validation for job {job_id}")
             return True
     
+    def _resolve_segment_token_budget(
+        self,
+        job_id: int,
+        job: TranslationJob,
+        model_name: str,
+        model_api,
+        turbo_mode: bool,
+        resume: bool = False,
+    ) -> Optional[int]:
+        """
+        Token budget per segment for this job, or None for character-sized segments.
+
+        The segmentation mode and budget are decided the first time the job is
+        segmented and stored on the job, so resumed translations, validation and
+        post-editing rebuild exactly the same segments even if SEGMENTATION_MODE
+        changes in between.
+        """
+        if job.segmentation_mode:
+            return job.segment_token_budget if job.segmentation_mode == "tokens" else None
+        if job.segment_token_budget:
+            return job.segment_token_budget
+        if resume:
+            # Started before the mode was stored, without a budget: character segments
+            return None
+
+        settings = get_settings()
+        budget_tokens = None
+        if settings.segmentation_mode == "tokens":
+            try:
+                generation_config = getattr(model_api, "generation_config", None) or {}
+                budget = budget_for_document(
+                    job.filepath,
+                    model_name,
+                    overhead=PromptOverhead(
+                        template=PromptManager.TURBO_TRANSLATION if turbo_mode else PromptManager.MAIN_TRANSLATION
+                    ),
+                    max_output_tokens=generation_config.get("max_output_tokens"),
+                    reserved_output_tokens=settings.segment_output_reserve_tokens,
+                    max_segment_tokens=settings.segment_max_tokens,
+                )
+                budget_tokens = budget.max_tokens
+            except Exception as e:
+                print(f"--- WARNING: Token budget estimation failed for Job ID: {job_id}; "
+                      f"using character segments. Error: {e} ---")
+
+        mode = "tokens" if budget_tokens else "characters"
+        with self.unit_of_work() as uow:
+            SqlAlchemyTranslationJobRepository(uow.session).set_segmentation(job_id, mode, budget_tokens)
+            uow.commit()
+        job.segmentation_mode = mode
+        job.segment_token_budget = budget_tokens
+        return budget_tokens
+
     def prepare_translation_job(
         self,
         job_id: int,
@@ -465,12 +523,16 @@ class TranslationDomainService(DomainServiceBase):
         # Create storage handler for core integration
         storage_handler = create_storage_handler()
         
+        segment_token_budget = self._resolve_segment_token_budget(
+            job_id, job, translation_model_name, model_api, turbo_mode, resume=resume
+        )
         translation_document = TranslationDocument(
             job.filepath,
             original_filename=job.filename,
             target_segment_size=job.segment_size,
             job_id=job_id,
-            storage_handler=storage_handler
+            storage_handler=storage_handler,
+            segment_token_budget=segment_token_budget
         )
 
         # If resuming, prefill translated segments from existing partial file
@@ -601,12 +663,14 @@ class TranslationDomainService(DomainServiceBase):
         if dyn_model_for_guides is model_api and glossary_model_api is not None and glossary_model_api is not model_api:
             print("Warning: Selected glossary/analysis model does not support structured output. Falling back to main model for dynamic guides.")
 
+        settings = get_settings()
         dyn_config_builder = DynamicConfigBuilder(
             dyn_model_for_guides,
             protagonist_name,
             initial_glossary=initial_glossary,
             character_style_model=style_model_api,
             turbo_mode=turbo_mode,
+            combined_analysis=settings.translation_combined_guide_analysis,
         )
         
         pipeline = TranslationPipeline(
@@ -618,6 +682,10 @@ class TranslationDomainService(DomainServiceBase):
             style_model_api=style_model_api,
             usage_collector=usage_collector,
             turbo_mode=turbo_mode,
+            guide_lookahead=settings.translation_guide_lookahead,
+            shard_strategy=settings.translation_shard_strategy,
+            shard_size=settings.translation_shard_size,
+            max_shard_workers=settings.translation_shard_workers,
         )
 
         pipeline.translate_document(translation_document)
@@ -1096,9 +1164,10 @@ class TranslationDomainService(DomainServiceBase):
             if job is None:
                 raise HTTPException(status_code=404, detail="Job not found")
 
-            # Allow access if translation is completed OR if validation/post-edit is completed
+            # Allow access if translation is completed OR if validation/post-edit is completed.
+            # In-flight jobs expose the segments stored so far
             can_access = (
-                job.status in ["COMPLETED", "FAILED"] or
+                job.status in ["COMPLETED", "FAILED", "PROCESSING"] or
                 (job.status == "VALIDATING" and job.validation_status == "COMPLETED") or
                 (job.status == "POST_EDITING" and job.post_edit_status == "COMPLETED")
             )
@@ -1109,7 +1178,22 @@ class TranslationDomainService(DomainServiceBase):
                     detail=f"Job not accessible. Status: {job.status}, Validation: {job.validation_status}, Post-edit: {job.post_edit_status}"
                 )
 
-            segments = job.translation_segments or []
+            segment_repo = SqlAlchemyTranslationSegmentRepository(uow.session)
+            total = segment_repo.count(job_id)
+            if total:
+                # Paginate in SQL so large jobs never load every segment
+                rows = segment_repo.list_by_job(job_id, offset=offset, limit=limit)
+                return {
+                    "job_id": job.id,
+                    "status": job.status,
+                    "segments": [row.to_dict() for row in rows],
+                    "total": total,
+                    "offset": offset,
+                    "limit": limit
+                }
+
+            # Jobs stored before the translation_segments table existed
+            segments = job.legacy_translation_segments or []
 
             # If no segments in DB, try to read from file (fallback - not optimal)
             if not segments:
@@ -157,8 +157,20 @@ class TranslationStorageManager:
     def read_partial_segments(self, job_id: int) -> Optional[List[str]]:
         """Read partial translated segments stored for resume support."""
         import json
+        from core.translation.segment_journal import JOURNAL_FILENAME, SegmentJournal
 
         base_dir = Path(get_settings().job_storage_base)
+
+        # Prefer the append-only segment journal written while translating
+        journal_path = base_dir / str(job_id) / "output" / JOURNAL_FILENAME
+        try:
+            journaled = SegmentJournal(str(journal_path)).read()
+            if journaled:
+                return journaled
+        except Exception as exc:
+            logger.error(f"Failed to read segment journal for job {job_id}: {exc}")
+
+        # Fall back to the snapshot written at finalization (and by older versions)
         cache_path = base_dir / str(job_id) / "output" / "partial_segments.json"
         if not cache_path.exists():
             return None
@@ -141,7 +141,8 @@ class ValidationDomainService(DomainServiceBase):
             validation_document = TranslationDocument(
                 job.filepath,
                 original_filename=job.filename,
-                target_segment_size=job.segment_size
+                target_segment_size=job.segment_size,
+                segment_token_budget=job.segment_token_budget
             )
             logger.info(f"[VALIDATION PREP] Validation document created with {len(validation_document.segments)} segments")
             # Log the first segment for debugging
@@ -232,7 +233,8 @@ class ValidationDomainService(DomainServiceBase):
         sample_rate: float = 1.0,
         quick_mode: bool = False,
         progress_callback: Optional[Callable[[int], None]] = None,
-        segment_logger=None
+        segment_logger=None,
+        concurrency: Optional[int] = None,
     ) -> Dict[str, Any]:
         """
         Run the validation process and return the report.
@@ -243,24 +245,31 @@ class ValidationDomainService(DomainServiceBase):
             sample_rate: Percentage of segments to validate (0.0-1.0)
             quick_mode: Whether to use quick validation mode
             progress_callback: Optional callback for progress updates
+            concurrency: Segments validated at once (defaults to settings.validation_concurrency)
             
         Returns:
             Validation report dictionary
         """
         print(f"[DEBUG] run_validation called - segments: {len(validation_document.segments)}, translated: {len(validation_document.translated_segments)}")
-        results, summary = validator.validate_document(
-            validation_document,
-            sample_rate=sample_rate,
-            quick_mode=quick_mode,
-            progress_callback=progress_callback
-        )
-
-        # Log completion if logger is available
-        if segment_logger:
-            segment_logger.log_completion(
-                total_segments=summary.get('validated_segments', 0),
-                total_time=None
+        try:
+            results, summary = validator.validate_document(
+                validation_document,
+                sample_rate=sample_rate,
+                quick_mode=quick_mode,
+                progress_callback=progress_callback,
+                concurrency=concurrency if concurrency is not None else get_settings().validation_concurrency,
             )
+
+            # Log completion if logger is available
+            if segment_logger:
+                segment_logger.log_completion(
+                    total_segments=summary.get('validated_segments', 0),
+                    total_time=None
+                )
+        finally:
+            # Write out buffered segment logs even when validation failed
+            if segment_logger:
+                segment_logger.close()
         
         # Create the validation report
         report = {
@@ -431,7 +440,8 @@ class ValidationDomainService(DomainServiceBase):
                 validation_document,
                 sample_rate,
                 quick_mode,
-                progress_callback
+                progress_callback,
+                segment_logger=segment_logger,
             )
             
             # Save report
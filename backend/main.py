@@ -94,6 +94,12 @@ if upload_path.exists():
 app.include_router(api_router)  # All API routes from consolidated router
 app.include_router(schemas_export.router)  # Schema endpoint (for OpenAPI schema export)
 
+# Prometheus metrics (ENABLE_METRICS)
+from .config.metrics import create_metrics_router
+metrics_router = create_metrics_router()
+if metrics_router is not None:
+    app.include_router(metrics_router)
+
 # Root endpoint
 @app.get("/")
 def read_root():
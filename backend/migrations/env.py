@@ -24,7 +24,7 @@ from backend.domains.shared.db_base import Base
 from backend.domains.tasks.models import TaskExecution
 from backend.domains.shared.events.outbox_model import OutboxEvent
 from backend.domains.user.models import User
-from backend.domains.translation.models import TranslationJob, TranslationUsageLog
+from backend.domains.translation.models import TranslationJob, TranslationSegment, TranslationUsageLog
 from backend.domains.community.models import Announcement, PostCategory, Post, Comment
 
 # Get database URL from centralized settings
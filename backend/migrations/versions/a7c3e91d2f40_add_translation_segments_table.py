@@ -0,0 +1,149 @@
+"""add_translation_segments_table
+
+Revision ID: a7c3e91d2f40
+Revises: 292087d8217d
+Create Date: 2026-10-16 10:12:31.204518
+
+"""
+import json
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a7c3e91d2f40'
+down_revision: Union[str, Sequence[str], None] = '292087d8217d'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+COLUMN_KEYS = (
+    'source_text',
+    'translated_text',
+    'chapter_title',
+    'chapter_filename',
+    'world_atmosphere',
+    'segment_summary',
+    'illustration_path',
+    'illustration_prompt',
+    'illustration_status',
+)
+BACKFILL_PAGE_SIZE = 50
+
+
+def upgrade() -> None:
+    """Move per-job segment JSON blobs into one row per segment."""
+    segments_table = op.create_table(
+        'translation_segments',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('job_id', sa.Integer(), nullable=False),
+        sa.Column('segment_index', sa.Integer(), nullable=False),
+        sa.Column('source_text', sa.Text(), nullable=True),
+        sa.Column('translated_text', sa.Text(), nullable=True),
+        sa.Column('chapter_title', sa.String(), nullable=True),
+        sa.Column('chapter_filename', sa.String(), nullable=True),
+        sa.Column('world_atmosphere', sa.JSON(), nullable=True),
+        sa.Column('segment_summary', sa.Text(), nullable=True),
+        sa.Column('illustration_path', sa.String(), nullable=True),
+        sa.Column('illustration_prompt', sa.Text(), nullable=True),
+        sa.Column('illustration_status', sa.String(), nullable=True),
+        sa.Column('extra', sa.JSON(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=True),
+        sa.ForeignKeyConstraint(['job_id'], ['translation_jobs.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('job_id', 'segment_index', name='uq_translation_segments_job_segment'),
+    )
+    op.create_index('ix_translation_segments_id', 'translation_segments', ['id'], unique=False)
+    op.create_index('ix_translation_segments_job_id', 'translation_segments', ['job_id'], unique=False)
+
+    # Backfill from the JSON column, a page of jobs at a time so the blobs are never
+    # all in memory. The column stays in place; downgrade() writes the rows back.
+    connection = op.get_bind()
+    last_id = 0
+    while True:
+        jobs = connection.execute(
+            sa.text(
+                'SELECT id, translation_segments FROM translation_jobs '
+                'WHERE translation_segments IS NOT NULL AND id > :last_id ORDER BY id LIMIT :limit'
+            ),
+            {'last_id': last_id, 'limit': BACKFILL_PAGE_SIZE},
+        ).fetchall()
+        if not jobs:
+            break
+        last_id = jobs[-1][0]
+        for job_id, raw_segments in jobs:
+            _backfill_job(connection, segments_table, job_id, raw_segments)
+
+
+def _backfill_job(connection, segments_table, job_id, raw_segments) -> None:
+    segments = raw_segments
+    if isinstance(segments, str):
+        try:
+            segments = json.loads(segments)
+        except ValueError:
+            return
+    if not isinstance(segments, list) or not segments:
+        return
+
+    # One row per segment_index; the last entry for a repeated index wins
+    rows = {}
+    for position, data in enumerate(segments):
+        if not isinstance(data, dict):
+            continue
+        try:
+            index = int(data.get('segment_index', position))
+        except (TypeError, ValueError):
+            index = position
+        row = {key: data.get(key) for key in COLUMN_KEYS}
+        extra = {
+            key: value for key, value in data.items()
+            if key not in COLUMN_KEYS and key != 'segment_index'
+        }
+        row.update(job_id=job_id, segment_index=index, extra=extra or None)
+        rows[index] = row
+    if rows:
+        op.bulk_insert(segments_table, list(rows.values()))
+        connection.execute(
+            sa.text('UPDATE translation_jobs SET translation_segments = NULL WHERE id = :id'),
+            {'id': job_id},
+        )
+
+
+def downgrade() -> None:
+    """Copy segment rows back into the JSON column and drop the table."""
+    connection = op.get_bind()
+    job_ids = [
+        row[0] for row in connection.execute(sa.text('SELECT DISTINCT job_id FROM translation_segments'))
+    ]
+    for job_id in job_ids:
+        result = connection.execute(
+            sa.text(
+                'SELECT segment_index, ' + ', '.join(COLUMN_KEYS) + ', extra '
+                'FROM translation_segments WHERE job_id = :id ORDER BY segment_index'
+            ),
+            {'id': job_id},
+        )
+        segments = []
+        for row in result.mappings():
+            data = {'segment_index': row['segment_index']}
+            for key in COLUMN_KEYS:
+                value = row[key]
+                if key == 'world_atmosphere' and isinstance(value, str):
+                    value = json.loads(value)
+                if value is not None or key in COLUMN_KEYS[:4]:
+                    data[key] = value
+            extra = row['extra']
+            if isinstance(extra, str):
+                extra = json.loads(extra)
+            if extra:
+                data.update(extra)
+            segments.append(data)
+        connection.execute(
+            sa.text('UPDATE translation_jobs SET translation_segments = :segments WHERE id = :id'),
+            {'segments': json.dumps(segments, ensure_ascii=False), 'id': job_id},
+        )
+
+    op.drop_index('ix_translation_segments_job_id', table_name='translation_segments')
+    op.drop_index('ix_translation_segments_id', table_name='translation_segments')
+    op.drop_table('translation_segments')
@@ -0,0 +1,28 @@
+"""Add segmentation_mode to translation_jobs
+
+Revision ID: c41d7a9e2b58
+Revises: e5b1f0c7a913
+Create Date: 2026-10-17 09:15:42.503981
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c41d7a9e2b58'
+down_revision: Union[str, Sequence[str], None] = 'e5b1f0c7a913'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('translation_jobs', sa.Column('segmentation_mode', sa.String(), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('translation_jobs', 'segmentation_mode')
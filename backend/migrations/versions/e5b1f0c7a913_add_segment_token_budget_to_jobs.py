@@ -0,0 +1,28 @@
+"""Add segment_token_budget to translation_jobs
+
+Revision ID: e5b1f0c7a913
+Revises: a7c3e91d2f40
+Create Date: 2026-10-16 21:40:12.118734
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e5b1f0c7a913'
+down_revision: Union[str, Sequence[str], None] = 'a7c3e91d2f40'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('translation_jobs', sa.Column('segment_token_budget', sa.Integer(), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('translation_jobs', 'segment_token_budget')
@@ -68,6 +68,12 @@ router.add_api_route(
     methods=["GET"],
     tags=["jobs"]
 )
+router.add_api_route(
+    "/jobs/{job_id}/events",
+    translation.stream_job_events,
+    methods=["GET"],
+    tags=["jobs"]
+)
 
 # Resume job endpoint
 router.add_api_route(
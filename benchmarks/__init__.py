@@ -0,0 +1 @@
+"""Offline benchmarks of the translation workflow (see run_benchmarks.py)."""
@@ -0,0 +1,199 @@
+"""
+Deterministic fake LLM backend for benchmarks.
+
+FakeModel implements the model interface the engine uses (generate_text,
+generate_structured, model_name, usage_callback) without network access:
+
+- Latency: log-normal around a median, plus a per-output-token cost, scaled by
+  time_scale (0 disables sleeping and measures orchestration overhead only).
+- Errors: transient (503) and rate-limit (429) failures are retried inside the
+  model with backoff, like GeminiModel; prohibited-content failures are raised as
+  ProhibitedException so the callers' soft-retry paths run.
+- Usage: every answered call reports a UsageEvent with token counts estimated from
+  the prompt and the output, scaled by log-normal noise.
+
+Every random draw comes from a generator seeded with (seed, call kind, prompt,
+attempt), so a run produces the same outputs and failures regardless of thread
+scheduling. Structured responses are generated from the JSON schema of the call.
+"""
+
+import hashlib
+import math
+import random
+import re
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Callable, Dict, Optional
+
+from core.translation.usage_tracker import UsageEvent
+from core.utils.token_budget import estimate_tokens
+from core.utils.tracing import span
+from shared.errors import ProhibitedException
+
+_WORD_PATTERN = re.compile(r"\b[A-Z][a-z]{2,}\b")
+_HANGUL_START, _HANGUL_COUNT = 0xAC00, 11172
+
+
+class FakeServerError(Exception):
+    """Injected API failure; code mirrors the HTTP status the model classifiers read."""
+
+    def __init__(self, code: int, message: str):
+        super().__init__(message)
+        self.code = code
+        self.message = message
+
+
+@dataclass
+class FakeModelProfile:
+    """Latency, failure and token-usage distributions of a FakeModel."""
+
+    latency_ms: float = 20.0            # median latency of one call
+    latency_sigma: float = 0.35         # log-normal shape; 0 = constant latency
+    ms_per_output_token: float = 0.0    # generation cost on top of latency_ms
+    time_scale: float = 1.0             # multiplies every sleep (0 = never sleep)
+    transient_error_rate: float = 0.0   # per attempt: 503, retried with backoff
+    rate_limit_rate: float = 0.0        # per attempt: 429, retried with backoff
+    prohibited_rate: float = 0.0        # per call: ProhibitedException, not retried
+    backoff_ms: float = 200.0           # first retry delay, doubled per attempt
+    output_ratio: float = 1.1           # translated length relative to the source text
+    token_noise: float = 0.1            # log-normal noise on reported token counts
+    array_fill_rate: float = 0.3        # chance a structured array gets items
+    max_array_items: int = 3
+
+
+class FakeModel:
+    """Model stand-in driven by a FakeModelProfile; thread-safe."""
+
+    def __init__(
+        self,
+        profile: Optional[FakeModelProfile] = None,
+        *,
+        model_name: str = "fake-model",
+        seed: int = 0,
+        usage_callback: Callable[[UsageEvent], None] | None = None,
+    ):
+        self.profile = profile or FakeModelProfile()
+        self.model_name = model_name
+        self.seed = seed
+        self.usage_callback = usage_callback
+        self.last_usage: UsageEvent | None = None
+        self.enable_soft_retry = True
+
+    def generate_text(self, prompt: str, max_retries: int = 3) -> str:
+        return self._call("text", prompt, max_retries, lambda rng: self._text(prompt, rng))
+
+    def generate_structured(self, prompt: str, response_schema, max_retries: int = 3):
+        if not isinstance(response_schema, dict):
+            raise NotImplementedError("FakeModel only answers JSON-schema (dict) structured calls.")
+        return self._call(
+            "structured", prompt, max_retries,
+            lambda rng: _fill_schema(response_schema, rng, _WORD_PATTERN.findall(prompt), self.profile),
+        )
+
+    def _rng(self, kind: str, prompt: str, attempt: int) -> random.Random:
+        digest = hashlib.sha256(f"{self.seed}\x00{kind}\x00{attempt}\x00{prompt}".encode("utf-8")).digest()
+        return random.Random(int.from_bytes(digest[:8], "big"))
+
+    def _call(self, kind: str, prompt: str, max_retries: int, answer: Callable[[random.Random], Any]):
+        profile = self.profile
+        if profile.prohibited_rate and self._rng("prohibited", prompt, 0).random() < profile.prohibited_rate:
+            raise ProhibitedException(message="Injected safety block", prompt=prompt, api_call_type=kind)
+
+        attempts = max(1, max_retries)
+        for attempt in range(attempts):
+            rng = self._rng(kind, prompt, attempt)
+            error = self._injected_error(rng)
+            try:
+                with span("llm_call", provider="fake", model=self.model_name, kind=kind, attempt=attempt + 1):
+                    if error is not None:
+                        self._sleep(self._latency_ms(rng, 0) * 0.2)
+                        raise error
+                    result = answer(rng)
+                    output_tokens = self._output_tokens(result)
+                    self._sleep(self._latency_ms(rng, output_tokens))
+                    self._record_usage(prompt, output_tokens, rng)
+                    return result
+            except FakeServerError:
+                if attempt == attempts - 1:
+                    raise Exception(f"All {attempts} API call attempts failed. Last error: {error}") from error
+            with span("retry_backoff", model=self.model_name, attempt=attempt + 1, reason=type(error).__name__):
+                self._sleep(profile.backoff_ms * (2 ** attempt))
+
+    def _injected_error(self, rng: random.Random) -> Optional[Exception]:
+        draw = rng.random()
+        if draw < self.profile.rate_limit_rate:
+            return FakeServerError(429, "RESOURCE_EXHAUSTED: injected rate limit")
+        if draw < self.profile.rate_limit_rate + self.profile.transient_error_rate:
+            return FakeServerError(503, "UNAVAILABLE: injected server error")
+        return None
+
+    def _latency_ms(self, rng: random.Random, output_tokens: int) -> float:
+        profile = self.profile
+        latency = profile.latency_ms
+        if profile.latency_sigma > 0:
+            latency *= math.exp(rng.gauss(0.0, profile.latency_sigma))
+        return latency + profile.ms_per_output_token * output_tokens
+
+    def _sleep(self, ms: float) -> None:
+        seconds = ms * self.profile.time_scale / 1000.0
+        if seconds > 0:
+            time.sleep(seconds)
+
+    def _text(self, prompt: str, rng: random.Random) -> str:
+        """Hangul filler; prompts carry the source text plus about as much context, so half their length."""
+        length = max(1, int(len(prompt) * 0.5 * self.profile.output_ratio))
+        words = []
+        total = 0
+        while total < length:
+            word = "".join(chr(_HANGUL_START + rng.randrange(_HANGUL_COUNT)) for _ in range(rng.randint(1, 4)))
+            words.append(word)
+            total += len(word) + 1
+            if rng.random() < 0.08:
+                words[-1] += "."
+        return " ".join(words)
+
+    def _output_tokens(self, result: Any) -> int:
+        return estimate_tokens(result if isinstance(result, str) else repr(result))
+
+    def _record_usage(self, prompt: str, output_tokens: int, rng: random.Random) -> None:
+        noise = math.exp(rng.gauss(0.0, self.profile.token_noise)) if self.profile.token_noise > 0 else 1.0
+        prompt_tokens = int(estimate_tokens(prompt) * noise)
+        completion_tokens = int(output_tokens * noise)
+        event = UsageEvent(
+            model_name=self.model_name,
+            prompt_tokens=prompt_tokens,
+            completion_tokens=completion_tokens,
+            total_tokens=prompt_tokens + completion_tokens,
+            timestamp=datetime.utcnow(),
+        )
+        self.last_usage = event
+        if self.usage_callback:
+            self.usage_callback(event)
+
+
+def _fill_schema(schema: Dict[str, Any], rng: random.Random, words: list, profile: FakeModelProfile) -> Any:
+    """A value valid for a (Gemini-subset) JSON schema."""
+    if "enum" in schema and schema["enum"]:
+        return rng.choice(list(schema["enum"]))
+    kind = schema.get("type", "object")
+    if isinstance(kind, list):
+        kind = next((k for k in kind if k != "null"), "string")
+    if kind == "object":
+        properties = schema.get("properties", {})
+        return {name: _fill_schema(sub, rng, words, profile) for name, sub in properties.items()}
+    if kind == "array":
+        count = 0
+        if rng.random() < profile.array_fill_rate:
+            count = rng.randint(1, max(1, profile.max_array_items))
+        return [_fill_schema(schema.get("items", {"type": "string"}), rng, words, profile) for _ in range(count)]
+    if kind == "boolean":
+        return rng.random() < profile.array_fill_rate
+    if kind == "integer":
+        return rng.randint(0, 3)
+    if kind == "number":
+        return round(rng.random(), 3)
+    # Strings: a name from the prompt when there is one, so glossary terms look real
+    if words:
+        return rng.choice(words)
+    return "".join(chr(_HANGUL_START + rng.randrange(_HANGUL_COUNT)) for _ in range(3))
@@ -0,0 +1,386 @@
+#!/usr/bin/env python3
+"""
+End-to-end benchmark of the translation workflow against a fake model.
+
+Runs TranslationPipeline, TranslationValidator, PostEditEngine and PDFGenerator on
+sample novels built from source_novel/ (small, medium, large) with FakeModel, so no
+network access or API key is needed. Each size runs in its own process and working
+directory. Reported per stage: wall time, throughput, model calls, tokens and peak
+RSS; --phases adds per-span timings (segment, guide_analysis, llm_call, ...).
+
+Save a run with --json and compare a later one with --baseline to catch
+regressions: the exit status is 1 when a stage got slower (or used more memory)
+than the baseline by more than --tolerance.
+
+Usage:
+    python -m benchmarks.run_benchmarks
+    python -m benchmarks.run_benchmarks --sizes large --latency-ms 200 --time-scale 0.1 --phases
+    python -m benchmarks.run_benchmarks --time-scale 0 --json bench.json
+    python -m benchmarks.run_benchmarks --baseline bench.json --tolerance 0.2
+"""
+
+import argparse
+import contextlib
+import glob
+import io
+import json
+import multiprocessing
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict
+from datetime import datetime
+from types import SimpleNamespace
+from typing import Any, Dict, List, Optional
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from benchmarks.fake_model import FakeModelProfile
+
+SOURCE_DIR = os.path.join(ROOT, "source_novel")
+# Source characters per sample novel
+SIZES = {"small": 40_000, "medium": 400_000, "large": 2_000_000}
+STAGES = ("translation", "validation", "post_edit", "pdf")
+# Job id of the benchmark run; all job files live in a temporary directory
+JOB_ID = 1
+MB = 1024 * 1024
+
+
+def build_sample(chars: int) -> str:
+    """Repeat the novels in source_novel/ up to `chars` characters, cut at a paragraph."""
+    texts = []
+    for path in sorted(glob.glob(os.path.join(SOURCE_DIR, "*.txt"))):
+        with open(path, "r", encoding="utf-8", errors="ignore") as f:
+            texts.append(f.read().strip())
+    if not texts:
+        raise SystemExit(f"No sample novels found in {SOURCE_DIR}")
+    corpus = "\n\n".join(texts)
+    text = (corpus + "\n\n") * (chars // len(corpus) + 1)
+    cut = text.rfind("\n\n", 0, chars)
+    return text[: cut if cut > chars // 2 else chars]
+
+
+def _current_rss_mb() -> float:
+    try:
+        with open("/proc/self/statm", "r") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / MB
+    except (OSError, ValueError, IndexError, AttributeError):
+        return _max_rss_mb()
+
+
+def _max_rss_mb() -> float:
+    try:
+        import resource
+    except ImportError:  # pragma: no cover - Windows
+        return 0.0
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Kilobytes on Linux, bytes on macOS
+    return peak / MB if sys.platform == "darwin" else peak / 1024
+
+
+class PeakRSS:
+    """Samples the resident set size on a background thread while the block runs."""
+
+    def __init__(self, interval: float = 0.01):
+        self.interval = interval
+        self.peak_mb = 0.0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def _sample(self) -> None:
+        while True:
+            self.peak_mb = max(self.peak_mb, _current_rss_mb())
+            if self._stop.wait(self.interval):
+                return
+
+    def __enter__(self) -> "PeakRSS":
+        self.peak_mb = _current_rss_mb()
+        self._thread = threading.Thread(target=self._sample, name="peak-rss", daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self._stop.set()
+        self._thread.join()
+        self.peak_mb = max(self.peak_mb, _current_rss_mb())
+
+
+class SpanRecorder:
+    """Collects every finished span of the process (all threads) as span records."""
+
+    def __init__(self):
+        self.records: List[Dict[str, Any]] = []
+        self._lock = threading.Lock()
+
+    def __call__(self, finished) -> None:
+        with self._lock:
+            self.records.append({"name": finished.name, "ms": finished.duration * 1000.0, "error": finished.error})
+
+    def count(self, name: str) -> int:
+        return sum(1 for r in self.records if r["name"] == name)
+
+
+def _run_stages(sample_path: str, source_chars: int, options: Dict[str, Any]) -> Dict[str, Any]:
+    """Run the selected stages in the current directory; returns the per-stage report."""
+    from backend.domains.export.pdf_generator import PDFGenerator
+    from benchmarks.fake_model import FakeModel
+    from core.config.builder import DynamicConfigBuilder
+    from core.translation.document import TranslationDocument
+    from core.translation.post_editor import PostEditEngine
+    from core.translation.translation_pipeline import TranslationPipeline
+    from core.translation.usage_tracker import TokenUsageCollector
+    from core.translation.validator import TranslationValidator
+    from core.utils.tracing import add_span_listener, remove_span_listener, summarize_spans
+    from shared.utils.logging import TranslationLogger
+
+    # Loggers read the backend settings on first use; import them here so the
+    # one-off import cost is not timed as part of the first stage
+    try:
+        import backend.config  # noqa: F401
+    except Exception:
+        pass
+
+    collector = TokenUsageCollector()
+    model = FakeModel(FakeModelProfile(**options["profile"]), seed=options["seed"], usage_callback=collector.record_event)
+    stages: Dict[str, Any] = {}
+    state: Dict[str, Any] = {}
+
+    def translation():
+        document = TranslationDocument(sample_path, target_segment_size=options["segment_size"], job_id=JOB_ID)
+        builder = DynamicConfigBuilder(
+            model, options["protagonist"],
+            turbo_mode=options["turbo"], combined_analysis=options["combined_analysis"],
+        )
+        pipeline = TranslationPipeline(
+            model, builder, db=None, job_id=JOB_ID,
+            usage_collector=collector,
+            turbo_mode=options["turbo"],
+            guide_lookahead=options["guide_lookahead"],
+            shard_strategy=options["shard_strategy"],
+            max_shard_workers=options["concurrency"],
+        )
+        pipeline.translate_document(document)
+        state["document"] = document
+        return len(document.segments)
+
+    def validation():
+        document = state["document"]
+        logger = TranslationLogger(JOB_ID, document.user_base_filename, task_type="validation")
+        logger.initialize_session()
+        validator = TranslationValidator(model, logger=logger)
+        results, summary = validator.validate_document(document, concurrency=options["concurrency"])
+        logger.close()
+        report_path = os.path.abspath("validation_report.json")
+        with open(report_path, "w", encoding="utf-8") as f:
+            json.dump({"summary": summary, "detailed_results": [r.to_dict() for r in results]}, f, ensure_ascii=False)
+        state["report_path"] = report_path
+        state["selected_cases"] = {r.segment_index: [True] * len(r.structured_cases) for r in results if r.structured_cases}
+        return len(results)
+
+    def post_edit():
+        document = state["document"]
+        engine = PostEditEngine(model, job_id=JOB_ID)
+        edited = engine.post_edit_document(
+            document, state["report_path"], state["selected_cases"], concurrency=options["concurrency"]
+        )
+        state["post_edit_log_path"] = os.path.abspath(os.path.join("logs", "jobs", str(JOB_ID), "postedit", "postedit_log.json"))
+        return len(edited)
+
+    def pdf():
+        document = state["document"]
+        job = SimpleNamespace(
+            id=JOB_ID,
+            filename=os.path.basename(sample_path),
+            completed_at=datetime.now(),
+            post_edit_status="COMPLETED" if state.get("post_edit_log_path") else None,
+            post_edit_log_path=state.get("post_edit_log_path"),
+            illustrations_data=None,
+            translation_segments=[
+                {"source_text": segment.text, "translated_text": translated}
+                for segment, translated in zip(document.segments, document.translated_segments)
+            ],
+        )
+        pdf_bytes = PDFGenerator(job, db=None).generate(include_source=True, include_illustrations=False)
+        with open("output.pdf", "wb") as f:
+            f.write(pdf_bytes)
+        return len(job.translation_segments)
+
+    runners = {"translation": translation, "validation": validation, "post_edit": post_edit, "pdf": pdf}
+    for name in STAGES:
+        if name not in options["stages"]:
+            continue
+        if name != "translation" and "document" not in state:
+            break
+        if name == "post_edit" and "report_path" not in state:
+            continue
+        recorder = SpanRecorder()
+        tokens_before = sum(e.total_tokens for e in collector.events())
+        add_span_listener(recorder)
+        try:
+            with PeakRSS() as rss:
+                start = time.perf_counter()
+                segments = runners[name]()
+                seconds = time.perf_counter() - start
+        except Exception as e:
+            # Later stages need this one's output; report the failure and stop
+            stages[name] = {"error": f"{type(e).__name__}: {e}", "llm_calls": recorder.count("llm_call")}
+            break
+        finally:
+            remove_span_listener(recorder)
+        stages[name] = {
+            "seconds": round(seconds, 3),
+            "segments": segments,
+            "segments_per_s": round(segments / seconds, 2) if seconds else None,
+            "source_kb_per_s": round(source_chars / 1024 / seconds, 1) if seconds else None,
+            "llm_calls": recorder.count("llm_call"),
+            "tokens": sum(e.total_tokens for e in collector.events()) - tokens_before,
+            "peak_rss_mb": round(rss.peak_mb, 1),
+            "phases": summarize_spans(recorder.records),
+        }
+    return stages
+
+
+def run_size(size: str, options: Dict[str, Any]) -> Dict[str, Any]:
+    """Benchmark one sample size in a temporary working directory (run in a fresh process)."""
+    workdir = tempfile.mkdtemp(prefix=f"cat-bench-{size}-")
+    # Job logs, outputs and caches all go below the working directory
+    os.environ["JOB_STORAGE_BASE"] = os.path.join(workdir, "logs", "jobs")
+    os.environ["TQDM_DISABLE"] = "1"
+    os.chdir(workdir)
+    text = build_sample(SIZES[size])
+    sample_path = os.path.join(workdir, f"sample_{size}.txt")
+    with open(sample_path, "w", encoding="utf-8") as f:
+        f.write(text)
+
+    quiet = contextlib.ExitStack()
+    if not options["verbose"]:
+        quiet.enter_context(contextlib.redirect_stdout(io.StringIO()))
+        quiet.enter_context(contextlib.redirect_stderr(io.StringIO()))
+    try:
+        with quiet:
+            stages = _run_stages(sample_path, len(text), options)
+    finally:
+        os.chdir(ROOT)
+        if not options["keep_workdir"]:
+            shutil.rmtree(workdir, ignore_errors=True)
+    return {
+        "size": size,
+        "source_chars": len(text),
+        "process_peak_rss_mb": round(_max_rss_mb(), 1),
+        "workdir": workdir if options["keep_workdir"] else None,
+        "stages": stages,
+    }
+
+
+def compare(results: Dict[str, Any], baseline: Dict[str, Any], tolerance: float) -> List[str]:
+    """Stages slower or larger than the baseline by more than the tolerance."""
+    regressions = []
+    for size, report in results["sizes"].items():
+        for stage, current in report["stages"].items():
+            if "error" in current:
+                regressions.append(f"{size}/{stage}: failed ({current['error']})")
+                continue
+            previous = baseline.get("sizes", {}).get(size, {}).get("stages", {}).get(stage)
+            if not previous:
+                continue
+            for key in ("seconds", "peak_rss_mb"):
+                if previous.get(key) and current[key] > previous[key] * (1.0 + tolerance):
+                    change = current[key] / previous[key] - 1.0
+                    regressions.append(f"{size}/{stage}: {key} {previous[key]} -> {current[key]} (+{change:.0%})")
+    return regressions
+
+
+def format_results(results: Dict[str, Any], phases: bool = False) -> str:
+    from core.utils.tracing import format_summary
+
+    lines = [
+        f"{'size':<8}{'stage':<13}{'seconds':>9}{'segments':>10}{'seg/s':>9}{'KB/s':>9}"
+        f"{'calls':>8}{'tokens':>11}{'peak MB':>9}"
+    ]
+    for size, report in results["sizes"].items():
+        for stage, s in report["stages"].items():
+            if "error" in s:
+                lines.append(f"{size:<8}{stage:<13}  failed after {s['llm_calls']} calls: {s['error'][:120]}")
+                continue
+            lines.append(
+                f"{size:<8}{stage:<13}{s['seconds']:>9.2f}{s['segments']:>10}{s['segments_per_s'] or 0:>9.2f}"
+                f"{s['source_kb_per_s'] or 0:>9.1f}{s['llm_calls']:>8}{s['tokens']:>11}{s['peak_rss_mb']:>9.1f}"
+            )
+    if phases:
+        for size, report in results["sizes"].items():
+            for stage, s in report["stages"].items():
+                if s.get("phases"):
+                    lines.append(f"\n[{size} / {stage}]")
+                    lines.append(format_summary(s["phases"]))
+    return "\n".join(lines)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", nargs="+", choices=list(SIZES), default=["small", "medium"])
+    parser.add_argument("--stages", nargs="+", choices=list(STAGES), default=list(STAGES))
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--segment-size", type=int, default=15000, help="Target segment size in characters")
+    parser.add_argument("--protagonist", default="Holden")
+    parser.add_argument("--concurrency", type=int, default=4, help="Validation/post-edit concurrency and shard workers")
+    parser.add_argument("--guide-lookahead", type=int, default=0)
+    parser.add_argument("--shard-strategy", choices=["chapter", "segments"], default=None)
+    parser.add_argument("--turbo", action="store_true", help="Translate without dynamic guide analysis")
+    parser.add_argument("--combined-analysis", action="store_true", help="One structured call per segment for guides")
+    profile = parser.add_argument_group("fake model")
+    defaults = FakeModelProfile()
+    for field, value in asdict(defaults).items():
+        profile.add_argument(f"--{field.replace('_', '-')}", type=type(value), default=value)
+    parser.add_argument("--phases", action="store_true", help="Print per-span timings of every stage")
+    parser.add_argument("--json", help="Write the results to this file")
+    parser.add_argument("--baseline", help="Results file of an earlier run to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed slowdown versus the baseline")
+    parser.add_argument("--keep-workdir", action="store_true", help="Keep outputs and logs of each run")
+    parser.add_argument("--verbose", action="store_true", help="Show the engine's console output")
+    args = parser.parse_args(argv)
+
+    options = {
+        "profile": {field: getattr(args, field) for field in asdict(defaults)},
+        "seed": args.seed,
+        "segment_size": args.segment_size,
+        "protagonist": args.protagonist,
+        "concurrency": args.concurrency,
+        "guide_lookahead": args.guide_lookahead,
+        "shard_strategy": args.shard_strategy,
+        "turbo": args.turbo,
+        "combined_analysis": args.combined_analysis,
+        "stages": args.stages,
+        "keep_workdir": args.keep_workdir,
+        "verbose": args.verbose,
+    }
+    results = {"created_at": datetime.now().isoformat(), "options": options, "sizes": {}}
+    context = multiprocessing.get_context("spawn")
+    for size in args.sizes:
+        # A fresh process per size keeps peak RSS and in-process caches separate
+        with ProcessPoolExecutor(max_workers=1, mp_context=context) as executor:
+            results["sizes"][size] = executor.submit(run_size, size, options).result()
+
+    print(format_results(results, phases=args.phases))
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+        if regressions:
+            print("\nRegressions against " + args.baseline + ":")
+            print("\n".join(f"  {line}" for line in regressions))
+            return 1
+        print(f"\nNo regressions against {args.baseline} (tolerance {args.tolerance:.0%}).")
+    failed = any("error" in s for report in results["sizes"].values() for s in report["stages"].values())
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
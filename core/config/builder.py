@@ -1,12 +1,20 @@
 from ..translation.models.gemini import GeminiModel
 from ..translation.models.openrouter import OpenRouterModel
+from ..translation.sharding import model_for_shard
 from ..prompts.manager import PromptManager
+from ..utils.tracing import span
 from .glossary import GlossaryManager
 from .character_style import CharacterStyleManager
 from shared.errors import ProhibitedException
 from shared.errors import prohibited_content_logger
+from dataclasses import dataclass, field
 from typing import List, Dict, Optional, Union
 from pydantic import ValidationError
+from ..schemas.character_style import DialogueAnalysisResult
+from ..schemas.segment_analysis import (
+    make_segment_analysis_schema,
+    parse_segment_analysis_response,
+)
 from ..schemas.narrative_style import (
     StyleDeviation,
     WorldAtmosphereAnalysis,
@@ -16,6 +24,15 @@ from ..schemas.narrative_style import (
     parse_world_atmosphere_response,
 )
 
+@dataclass
+class SegmentGuideAnalysis:
+    """Model output for one segment's dynamic guides, before it is merged into job state."""
+
+    new_terms: Dict[str, str] = field(default_factory=dict)
+    dialogue: Optional[DialogueAnalysisResult] = None
+    style_deviation: str = "N/A"
+
+
 class DynamicConfigBuilder:
     """
     Orchestrates the dynamic generation of configuration for each translation segment.
@@ -29,6 +46,7 @@ class DynamicConfigBuilder:
         initial_glossary: Optional[Union[List[Dict[str, str]], Dict[str, str]]] = None,
         character_style_model: Optional[GeminiModel | OpenRouterModel] = None,
         turbo_mode: bool = False,
+        combined_analysis: bool = False,
     ):
         """
         Initializes the builder with the shared Gemini model and managers.
@@ -37,8 +55,11 @@ class DynamicConfigBuilder:
             model: The shared GeminiModel instance.
             protagonist_name: The name of the protagonist.
             initial_glossary: An optional dictionary or list of dictionaries to pre-populate the glossary.
+            combined_analysis: Analyze glossary, dialogue styles and style deviation in a single
+                structured call per segment instead of one call per aspect.
         """
         self.model = model
+        self.combined_analysis = combined_analysis
 
         # Prefer a dedicated model for character style analysis if it supports structured output
         character_style_backend = character_style_model if (
@@ -66,9 +87,27 @@ class DynamicConfigBuilder:
         if self.initial_glossary_dict:
             print(f"Pre-populating glossary with {len(self.initial_glossary_dict)} user-defined terms.")
         print(f"DynamicConfigBuilder using structured output mode.")
+        if self.combined_analysis and not self.turbo_mode:
+            print("DynamicConfigBuilder using combined segment analysis (one call per segment).")
 
     
 
+    def spawn_for_shard(self, shard_index: int) -> "DynamicConfigBuilder":
+        """
+        Create an independent builder for a translation shard.
+
+        The new builder shares the protagonist, user glossary and turbo setting, and
+        uses a per-shard view of each model when the model offers one.
+        """
+        return DynamicConfigBuilder(
+            model_for_shard(self.model, shard_index),
+            self.character_style_manager.protagonist_name,
+            initial_glossary=dict(self.initial_glossary_dict),
+            character_style_model=model_for_shard(self.character_style_manager.model, shard_index),
+            turbo_mode=self.turbo_mode,
+            combined_analysis=self.combined_analysis,
+        )
+
     def build_dynamic_guides(self, segment_text: str, core_narrative_style: str, current_glossary: dict, current_character_styles: dict, job_base_filename: str, segment_index: int, previous_context: Optional[str] = None) -> tuple[dict, dict, str]:
         """
         Analyzes a text segment to build dynamic guidelines for translation.
@@ -91,38 +130,67 @@ class DynamicConfigBuilder:
             A tuple containing the updated glossary, updated character styles,
             and style deviation information.
         """
-        # 1. Initialize GlossaryManager with the user-defined glossary
-        # The current_glossary from the job state is merged with the initial one.
+        analysis = self.analyze_segment(
+            segment_text,
+            core_narrative_style,
+            current_glossary,
+            job_base_filename,
+            segment_index,
+        )
+        return self.apply_segment_analysis(analysis, current_glossary, current_character_styles)
+
+    def analyze_segment(self, segment_text: str, core_narrative_style: str, current_glossary: dict, job_base_filename: str, segment_index: int) -> SegmentGuideAnalysis:
+        """
+        Runs the model calls for a segment's dynamic guides without touching any job state.
+
+        The result only depends on the segment text and the glossary snapshot passed in,
+        so it is safe to run ahead of the translation loop on a worker thread. Use
+        apply_segment_analysis to merge the result into the job state, in segment order.
+        """
+        # Skip all analysis in turbo mode
+        if self.turbo_mode:
+            return SegmentGuideAnalysis()
+
+        with span("guide_analysis", segment=segment_index):
+            return self._analyze_segment(
+                segment_text, core_narrative_style, current_glossary, job_base_filename, segment_index
+            )
+
+    def _analyze_segment(self, segment_text: str, core_narrative_style: str, current_glossary: dict, job_base_filename: str, segment_index: int) -> SegmentGuideAnalysis:
+        """Model calls behind analyze_segment, timed as one guide_analysis span."""
+        if self.combined_analysis:
+            with span("combined_analysis"):
+                combined = self._analyze_segment_combined(
+                    segment_text,
+                    core_narrative_style,
+                    current_glossary,
+                    job_base_filename,
+                    segment_index
+                )
+            if combined is not None:
+                return combined
+            print(f"Warning: Combined analysis failed for segment {segment_index}. Falling back to separate analysis calls.")
+
+        # 1. Propose new glossary terms against the user-defined + current glossary
         combined_glossary = {**self.initial_glossary_dict, **current_glossary}
         glossary_manager = GlossaryManager(
             self.model, 
             job_base_filename, 
             initial_glossary=combined_glossary
         )
-        
-        # Update glossary based on the current segment (skip in turbo mode)
-        if self.turbo_mode:
-            updated_glossary = {**self.initial_glossary_dict, **current_glossary}
-        else:
-            updated_glossary = glossary_manager.update_glossary(segment_text)
+        with span("glossary_terms"):
+            new_terms = glossary_manager.propose_terms(segment_text)
 
-        # 2. Update character styles
-        # Update character styles (skip in turbo mode)
-        if self.turbo_mode:
-            updated_character_styles = current_character_styles
-        else:
-            updated_character_styles = self.character_style_manager.update_styles(
+        # 2. Analyze the protagonist's dialogue
+        with span("dialogue_analysis"):
+            dialogue = self.character_style_manager.analyze_dialogue(
                 segment_text,
-                current_character_styles,
                 job_base_filename,
                 segment_index
             )
 
         # 3. Analyze for style deviations
-        # Analyze for style deviations (skip in turbo mode)
-        if self.turbo_mode:
-            style_deviation_info = "N/A"
-        else:
+        with span("style_deviation"):
             style_deviation_info = self._analyze_style_deviation(
                 segment_text,
                 core_narrative_style,
@@ -130,7 +198,84 @@ class DynamicConfigBuilder:
                 segment_index
             )
 
-        return updated_glossary, updated_character_styles, style_deviation_info
+        return SegmentGuideAnalysis(
+            new_terms=new_terms,
+            dialogue=dialogue,
+            style_deviation=style_deviation_info,
+        )
+
+    def apply_segment_analysis(self, analysis: SegmentGuideAnalysis, current_glossary: dict, current_character_styles: dict) -> tuple[dict, dict, str]:
+        """
+        Merges a segment analysis into the current glossary and character styles.
+
+        Terms that are already in the glossary keep their existing translation, so
+        analyses computed against an older glossary snapshot merge the same way a
+        serial run would.
+        """
+        updated_glossary = {**self.initial_glossary_dict, **current_glossary}
+        for term, translation in analysis.new_terms.items():
+            updated_glossary.setdefault(term, translation)
+
+        if analysis.dialogue is not None:
+            updated_character_styles = analysis.dialogue.merge_with_existing(current_character_styles)
+        else:
+            updated_character_styles = current_character_styles
+
+        return updated_glossary, updated_character_styles, analysis.style_deviation
+
+    def _analyze_segment_combined(self, segment_text: str, core_narrative_style: str, current_glossary: dict, job_base_filename: str = "unknown", segment_index: Optional[int] = None) -> Optional[SegmentGuideAnalysis]:
+        """
+        Analyzes new terms, dialogue styles and style deviation with one structured call.
+
+        Returns None when the call fails so the caller can fall back to the separate calls.
+        Dialogue is analyzed by the dynamic guide model here, not the character style model.
+        """
+        if not hasattr(self.model, 'generate_structured'):
+            return None
+
+        protagonist_name = self.character_style_manager.protagonist_name
+        combined_glossary = {**self.initial_glossary_dict, **current_glossary}
+        existing_glossary_str = '\n'.join([f"{k}: {v}" for k, v in combined_glossary.items()]) or "N/A"
+        prompt = PromptManager.ANALYZE_SEGMENT_GUIDES.format(
+            protagonist_name=protagonist_name,
+            core_narrative_style=core_narrative_style,
+            existing_glossary=existing_glossary_str,
+            segment_text=segment_text
+        )
+        try:
+            schema = make_segment_analysis_schema()
+            response = self.model.generate_structured(prompt, schema)
+            result = parse_segment_analysis_response(response)
+        except ProhibitedException as e:
+            log_path = prohibited_content_logger.log_simple_prohibited_content(
+                api_call_type="combined_segment_analysis_structured",
+                prompt=prompt,
+                source_text=segment_text,
+                error_message=str(e),
+                job_filename=job_base_filename,
+                segment_index=segment_index,
+                context={"core_narrative_style": core_narrative_style}
+            )
+            print(f"Warning: Combined segment analysis blocked by safety settings. Log saved to: {log_path}")
+            # The separate calls would see the same text, so keep the guides unchanged.
+            return SegmentGuideAnalysis()
+        except Exception as e:
+            print(f"Warning: Could not run combined segment analysis (structured). {e}")
+            return None
+
+        new_terms = {
+            term: translation for term, translation in result.terms_to_dict().items()
+            if term not in combined_glossary
+        }
+        dialogue = None
+        if result.has_dialogue and result.interactions:
+            dialogue = result.to_dialogue_result(protagonist_name)
+
+        return SegmentGuideAnalysis(
+            new_terms=new_terms,
+            dialogue=dialogue,
+            style_deviation=result.style_deviation.to_prompt_format(),
+        )
 
     def analyze_world_atmosphere(
         self,
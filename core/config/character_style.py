@@ -1,5 +1,5 @@
 import os
-from typing import Dict
+from typing import Dict, Optional
 from ..translation.models.gemini import GeminiModel
 from ..translation.models.openrouter import OpenRouterModel
 from ..prompts.manager import PromptManager
@@ -37,8 +37,24 @@ class CharacterStyleManager:
             return current_styles
         return self._update_styles_structured(segment_text, current_styles, job_base_filename, segment_index)
     
+    def analyze_dialogue(self, segment_text: str, job_base_filename: str, segment_index: int) -> Optional[DialogueAnalysisResult]:
+        """
+        Analyzes the protagonist's dialogue in the segment without merging it
+        into any existing styles. Returns None when nothing should be merged.
+        """
+        if not self._supports_structured_output:
+            return None
+        return self._analyze_dialogue_structured(segment_text, job_base_filename, segment_index)
+
     def _update_styles_structured(self, segment_text: str, current_styles: Dict[str, str], job_base_filename: str, segment_index: int) -> Dict[str, str]:
         """Update styles using structured output."""
+        result = self._analyze_dialogue_structured(segment_text, job_base_filename, segment_index)
+        if result is None:
+            return current_styles
+        return result.merge_with_existing(current_styles)
+
+    def _analyze_dialogue_structured(self, segment_text: str, job_base_filename: str, segment_index: int) -> Optional[DialogueAnalysisResult]:
+        """Run the structured dialogue analysis for a single segment."""
         prompt = PromptManager.CHARACTER_ANALYZE_DIALOGUE.format(
             protagonist_name=self.protagonist_name,
             segment_text=segment_text
@@ -51,9 +67,9 @@ class CharacterStyleManager:
             result = parse_dialogue_analysis_response(response)
             
             if not result.has_dialogue or not result.interactions:
-                return current_styles
+                return None
             
-            return result.merge_with_existing(current_styles)
+            return result
 
         except ProhibitedException as e:
             log_path = prohibited_content_logger.log_simple_prohibited_content(
@@ -66,8 +82,8 @@ class CharacterStyleManager:
                 context={"protagonist_name": self.protagonist_name}
             )
             print(f"Warning: Structured character style analysis blocked by safety settings. Log saved to: {log_path}")
-            return current_styles
+            return None
             
         except Exception as e:
             print(f"Warning: Could not analyze character styles (structured). {e}")
-            return current_styles
+            return None
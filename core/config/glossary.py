@@ -33,18 +33,25 @@ class GlossaryManager:
         Extracts proper nouns from the segment, translates new ones,
         and returns the updated glossary.
         """
+        translated_terms = self.propose_terms(segment_text)
+        if translated_terms:
+            self.glossary.update(translated_terms)
+        return self.glossary
+
+    def propose_terms(self, segment_text: str) -> Dict[str, str]:
+        """
+        Extracts and translates proper nouns that are not yet in the glossary,
+        without modifying the glossary itself.
+        """
         extracted_terms = self._extract_proper_nouns(segment_text)
         if not extracted_terms:
-            return self.glossary
+            return {}
 
         new_terms = [term for term in extracted_terms if term not in self.glossary]
         if not new_terms:
-            return self.glossary
-            
-        translated_terms = self._translate_terms(new_terms, segment_text)
+            return {}
 
-        self.glossary.update(translated_terms)
-        return self.glossary
+        return self._translate_terms(new_terms, segment_text)
 
     def _extract_proper_nouns(self, segment_text: str) -> List[str]:
         """Extracts proper nouns from the text using the LLM with structured output."""
@@ -30,12 +30,21 @@ def load_config():
         "max_output_tokens": 25000,
     }
 
+    # Optional persistent cache for model responses (see core/translation/models/response_cache.py)
+    response_cache = {
+        "enabled": os.getenv("LLM_RESPONSE_CACHE_ENABLED", "false").lower() in ("1", "true", "yes"),
+        "path": os.getenv("LLM_RESPONSE_CACHE_PATH", os.path.join("cache", "llm_responses.sqlite3")),
+        "ttl_seconds": int(os.getenv("LLM_RESPONSE_CACHE_TTL_SECONDS", str(7 * 24 * 3600))),
+        "max_size_mb": int(os.getenv("LLM_RESPONSE_CACHE_MAX_SIZE_MB", "512")),
+    }
+
     return {
         # "gemini_api_key": gemini_api_key, # 서버 제공 키 사용 시 주석 해제
         "gemini_model_name": 'gemini-flash-lite-latest',
         "safety_settings": safety_settings,
         "generation_config": generation_config,
         "enable_soft_retry": True,  # Enable retry with softer prompts for ProhibitedException
+        "response_cache": response_cache,
     }
 
 if __name__ == '__main__':
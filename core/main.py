@@ -10,11 +10,13 @@ from dotenv import load_dotenv
 
 from core.config.loader import load_config
 from core.translation.models.gemini import GeminiModel
+from core.translation.models.response_cache import get_response_cache
 from core.config.builder import DynamicConfigBuilder
 from core.translation.document import TranslationDocument
 from core.translation.translation_pipeline import TranslationPipeline
 from shared.errors.base import TranslationError
 from core.utils.file_parser import parse_document
+from core.utils.token_budget import budget_for_document
 from core.translation.style_analyzer import StyleAnalyzer
 from core.translation.validator import TranslationValidator
 from core.translation.post_editor import PostEditEngine
@@ -22,7 +24,10 @@ from core.translation.post_editor import PostEditEngine
 
 def translate(source_file: str, target_file: Optional[str] = None, api_key: Optional[str] = None, 
               segment_size: int = 10000, verbose: bool = False, with_validation: bool = False,
-              validation_sample_rate: float = 1.0, quick_validation: bool = False, post_edit: bool = False) -> None:
+              validation_sample_rate: float = 1.0, quick_validation: bool = False, post_edit: bool = False,
+              guide_lookahead: int = 0, shard_by: Optional[str] = None, shard_size: int = 20,
+              shard_workers: int = 4, combined_analysis: bool = False,
+              token_segments: bool = False) -> None:
     """
     Translate a novel from a source language to Korean using the Context-Aware Translation system.
     
@@ -36,6 +41,12 @@ def translate(source_file: str, target_file: Optional[str] = None, api_key: Opti
         validation_sample_rate: Percentage of segments to validate (0.0 to 1.0)
         quick_validation: Use quick validation mode instead of comprehensive
         post_edit: Apply post-editing to fix validation issues
+        guide_lookahead: Segments to analyze ahead of the current translation (0 = serial)
+        shard_by: Optional sharding mode ("chapter" or "segments") for parallel translation
+        shard_size: Segments per shard
+        shard_workers: Maximum number of shards translated at the same time
+        combined_analysis: Analyze glossary, dialogue styles and style deviation in one call per segment
+        token_segments: Size segments by a token budget derived from the model instead of segment_size
     """
     try:
         # Load environment variables from .env file
@@ -73,7 +84,8 @@ def translate(source_file: str, target_file: Optional[str] = None, api_key: Opti
             model_name=config['gemini_model_name'],
             safety_settings=config['safety_settings'],
             generation_config=config['generation_config'],
-            enable_soft_retry=config.get('enable_soft_retry', True)
+            enable_soft_retry=config.get('enable_soft_retry', True),
+            response_cache=get_response_cache(config.get('response_cache'))
         )
         
         # Create translation job
@@ -81,7 +93,19 @@ def translate(source_file: str, target_file: Optional[str] = None, api_key: Opti
             print(f"Creating translation job for: {source_file}")
             print(f"Segment size: {segment_size}")
         
-        document = TranslationDocument(source_file, target_segment_size=segment_size)
+        segment_token_budget = None
+        if token_segments:
+            segment_token_budget = budget_for_document(
+                source_file,
+                config['gemini_model_name'],
+                max_output_tokens=config['generation_config'].get('max_output_tokens'),
+            ).max_tokens
+
+        document = TranslationDocument(
+            source_file,
+            target_segment_size=segment_size,
+            segment_token_budget=segment_token_budget
+        )
         
         if verbose:
             print(f"Created {len(document.segments)} segments from source file")
@@ -121,11 +145,16 @@ def translate(source_file: str, target_file: Optional[str] = None, api_key: Opti
         
         dyn_config_builder = DynamicConfigBuilder(
             gemini_model, 
-            protagonist_name
+            protagonist_name,
+            combined_analysis=combined_analysis
         )
         
         # Create translation pipeline with local job ID
-        pipeline = TranslationPipeline(gemini_model, dyn_config_builder, db=None, job_id=job_id)
+        pipeline = TranslationPipeline(
+            gemini_model, dyn_config_builder, db=None, job_id=job_id,
+            guide_lookahead=guide_lookahead,
+            shard_strategy=shard_by, shard_size=shard_size, max_shard_workers=shard_workers
+        )
         
         # Run translation
         if verbose:
@@ -314,12 +343,26 @@ Examples:
                         help='Use quick validation mode (faster but less thorough)')
     parser.add_argument('--post-edit', action='store_true',
                         help='Apply AI-powered post-editing to fix validation issues (requires --with-validation)')
+    parser.add_argument('--guide-lookahead', type=int, default=0,
+                        help='Analyze glossary/styles for this many upcoming segments while translating (default: 0, serial)')
+    parser.add_argument('--shard-by', choices=['chapter', 'segments'],
+                        help='Translate shards in parallel, split by chapter or every --shard-size segments')
+    parser.add_argument('--shard-size', type=int, default=20,
+                        help='Segments per shard for --shard-by (default: 20)')
+    parser.add_argument('--shard-workers', type=int, default=4,
+                        help='Maximum shards translated in parallel (default: 4)')
+    parser.add_argument('--combined-analysis', action='store_true',
+                        help='Analyze glossary, dialogue styles and style deviation in a single call per segment')
+    parser.add_argument('--token-segments', action='store_true',
+                        help="Size segments by a token budget derived from the model's limits instead of --segment-size")
     
     args = parser.parse_args()
     
     # Validate sample rate
     if args.validation_sample_rate < 0.0 or args.validation_sample_rate > 1.0:
         parser.error("--validation-sample-rate must be between 0.0 and 1.0")
+    if args.guide_lookahead < 0:
+        parser.error("--guide-lookahead must be 0 or greater")
     
     # Run translation
     translate(
@@ -331,7 +374,13 @@ Examples:
         with_validation=args.with_validation,
         validation_sample_rate=args.validation_sample_rate,
         quick_validation=args.quick_validation,
-        post_edit=args.post_edit
+        post_edit=args.post_edit,
+        guide_lookahead=args.guide_lookahead,
+        shard_by=args.shard_by,
+        shard_size=args.shard_size,
+        shard_workers=args.shard_workers,
+        combined_analysis=args.combined_analysis,
+        token_segments=args.token_segments
     )
 
 
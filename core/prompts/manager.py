@@ -24,6 +24,9 @@ class PromptManager:
     ANALYZE_NARRATIVE_DEVIATION = _prompts["style_analysis"]["narrative_deviation"]
     DEFINE_NARRATIVE_STYLE = _prompts["style_analysis"]["define_narrative_style"]
     
+    # --- Combined Segment Analysis Prompts ---
+    ANALYZE_SEGMENT_GUIDES = _prompts["combined_analysis"]["segment_guides"]
+    
     # --- Translation Engine Prompts ---
     MAIN_TRANSLATION = _prompts["translation"]["main"]
     TURBO_TRANSLATION = _prompts["translation"].get("turbo", _prompts["translation"]["main"])  # fallback to main if missing
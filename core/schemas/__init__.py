@@ -28,6 +28,11 @@ from .narrative_style import (
     make_style_deviation_schema,
 )
 
+from .segment_analysis import (
+    SegmentAnalysisResponse,
+    make_segment_analysis_schema,
+)
+
 from .validation import (
     ValidationCase,
     ValidationResponse,
@@ -67,6 +72,9 @@ __all__ = [
     "StyleDeviation",
     "make_narrative_style_schema",
     "make_style_deviation_schema",
+    # Combined Segment Analysis
+    "SegmentAnalysisResponse",
+    "make_segment_analysis_schema",
     # Validation
     "ValidationCase",
     "ValidationResponse",
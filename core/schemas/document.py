@@ -40,6 +40,14 @@ class TranslationDocumentData(BaseModel):
         default=15000, 
         description="Target character count for each segment"
     )
+    segment_token_budget: Optional[int] = Field(
+        default=None,
+        description="Token budget per segment; replaces target_segment_size when set"
+    )
+    source_language: Optional[str] = Field(
+        default=None,
+        description="Source language code used to estimate tokens (detected when unset)"
+    )
     
     # Content data
     segments: List[SegmentInfo] = Field(
@@ -0,0 +1,140 @@
+"""
+Combined segment analysis schema for structured output.
+
+This module defines a single schema that covers everything the dynamic guides
+need for one segment, so the segment text is sent to the model only once:
+- New proper nouns with their Korean translations
+- The protagonist's dialogue styles
+- Narrative style deviation
+"""
+
+from typing import Dict, List, Any
+from pydantic import BaseModel, Field
+
+from .glossary import TranslatedTerm
+from .character_style import CharacterInteraction, DialogueAnalysisResult
+from .narrative_style import StyleDeviation
+
+
+# --------------------
+# Pydantic Models
+# --------------------
+
+class SegmentAnalysisResponse(BaseModel):
+    """Response model for the combined per-segment guide analysis."""
+
+    new_terms: List[TranslatedTerm] = Field(
+        default_factory=list,
+        description="Proper nouns not yet in the glossary, with their Korean translations"
+    )
+    has_dialogue: bool = Field(
+        default=False,
+        description="Whether the protagonist has any dialogue in this segment"
+    )
+    interactions: List[CharacterInteraction] = Field(
+        default_factory=list,
+        description="Characters the protagonist speaks to and the speech style used"
+    )
+    style_deviation: StyleDeviation = Field(
+        default_factory=lambda: StyleDeviation(has_deviation=False),
+        description="Narrative style deviation in this segment"
+    )
+
+    def terms_to_dict(self) -> Dict[str, str]:
+        """Convert new terms to a { source: korean } dictionary."""
+        return {t.source: t.korean for t in self.new_terms if t.source and t.korean}
+
+    def to_dialogue_result(self, protagonist_name: str) -> DialogueAnalysisResult:
+        """Convert the dialogue part to a DialogueAnalysisResult."""
+        return DialogueAnalysisResult(
+            protagonist_name=protagonist_name,
+            has_dialogue=self.has_dialogue,
+            interactions=self.interactions,
+        )
+
+
+# --------------------
+# JSON Schema Builders (for Gemini API)
+# --------------------
+
+def make_segment_analysis_schema() -> Dict[str, Any]:
+    """
+    Create JSON schema for the combined segment analysis.
+
+    Returns:
+        JSON schema returning new terms, dialogue styles and style deviation
+    """
+    return {
+        "type": "object",
+        "properties": {
+            "new_terms": {
+                "type": "array",
+                "description": "Proper nouns in the segment that are not in the existing glossary. Empty array if none.",
+                "items": {
+                    "type": "object",
+                    "properties": {
+                        "source": {
+                            "type": "string",
+                            "description": "Proper noun exactly as it appears in the source text"
+                        },
+                        "korean": {
+                            "type": "string",
+                            "description": "Korean translation of the term"
+                        }
+                    },
+                    "required": ["source", "korean"]
+                }
+            },
+            "has_dialogue": {
+                "type": "boolean",
+                "description": "Whether the protagonist has any dialogue in this segment"
+            },
+            "interactions": {
+                "type": "array",
+                "description": "Characters the protagonist speaks to in this segment",
+                "items": {
+                    "type": "object",
+                    "properties": {
+                        "character_name": {
+                            "type": "string",
+                            "description": "Name of the character the protagonist is speaking to"
+                        },
+                        "speech_style": {
+                            "type": "string",
+                            "enum": ["반말", "해요체", "하십시오체"],
+                            "description": "Korean speech style used"
+                        }
+                    },
+                    "required": ["character_name", "speech_style"]
+                }
+            },
+            "style_deviation": {
+                "type": "object",
+                "properties": {
+                    "has_deviation": {
+                        "type": "boolean",
+                        "description": "Whether a style deviation was detected"
+                    },
+                    "starts_with": {
+                        "type": "string",
+                        "description": "The first few words of the deviating part (null if no deviation)"
+                    },
+                    "instruction": {
+                        "type": "string",
+                        "description": "Direct command for the translator (null if no deviation)"
+                    }
+                },
+                "required": ["has_deviation"]
+            }
+        },
+        "required": ["new_terms", "has_dialogue", "interactions", "style_deviation"]
+    }
+
+
+# --------------------
+# Helper Functions
+# --------------------
+
+def parse_segment_analysis_response(response: Dict[str, Any]) -> SegmentAnalysisResponse:
+    """Parse JSON response into SegmentAnalysisResponse model."""
+    return SegmentAnalysisResponse(**response)
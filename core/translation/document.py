@@ -14,6 +14,8 @@ from typing import List, Optional
 from ..schemas import SegmentInfo, TranslationDocumentData
 from ..utils import create_segments_for_text, create_segments_for_epub
 from ..utils.document_io import DocumentOutputManager
+from ..utils.token_budget import SegmentBudget, detect_document_language
+from .segment_journal import JOURNAL_FILENAME, SegmentJournal
 
 
 class TranslationDocument:
@@ -26,7 +28,8 @@ class TranslationDocument:
     
     def __init__(self, filepath: str, original_filename: Optional[str] = None, 
                  target_segment_size: int = 15000, job_id: Optional[int] = None,
-                 storage_handler=None):
+                 storage_handler=None, segment_token_budget: Optional[int] = None,
+                 source_language: Optional[str] = None):
         """
         Initialize a translation document.
         
@@ -36,10 +39,17 @@ class TranslationDocument:
             target_segment_size: Target size for each segment in characters
             job_id: Optional job ID for saving to job-specific directory
             storage_handler: Optional storage handler for backend integration
+            segment_token_budget: Target size for each segment in estimated tokens
+                (see core.utils.token_budget); overrides target_segment_size
+            source_language: Language used for token estimates (detected when omitted)
         """
         # Store job_id and storage handler for storage operations
         self._job_id = job_id
         self._storage_handler = storage_handler
+        # Append-only journal of translated segments; rewritten once after translated_segments is replaced
+        self._journal: Optional[SegmentJournal] = None
+        self._journal_synced = False
+        self._journaled_count = 0
         
         # Setup filenames
         user_base_filename, unique_base_filename, input_format = self._setup_filenames(
@@ -67,7 +77,9 @@ class TranslationDocument:
             input_format=input_format,
             output_filename=output_filename,
             job_output_filename=job_output_filename,
-            target_segment_size=target_segment_size
+            target_segment_size=target_segment_size,
+            segment_token_budget=segment_token_budget,
+            source_language=source_language
         )
         
         # Create segments using centralized utilities
@@ -95,15 +107,26 @@ class TranslationDocument:
     
     def _create_segments(self):
         """Create segments using centralized segmentation utilities."""
+        budget = None
+        if self._data.segment_token_budget:
+            if not self._data.source_language:
+                self._data.source_language = detect_document_language(self._data.filepath)
+            budget = SegmentBudget(
+                max_tokens=self._data.segment_token_budget,
+                language=self._data.source_language
+            )
+
         if self._data.input_format == '.epub':
             segments = create_segments_for_epub(
                 self._data.filepath, 
-                self._data.target_segment_size
+                self._data.target_segment_size,
+                budget=budget
             )
         else:
             segments = create_segments_for_text(
                 self._data.filepath, 
-                self._data.target_segment_size
+                self._data.target_segment_size,
+                budget=budget
             )
         
         # Store segments in data model
@@ -142,6 +165,7 @@ class TranslationDocument:
     @translated_segments.setter
     def translated_segments(self, value: List[str]):
         self._data.translated_segments = value
+        self._journal_synced = False
     
     @property
     def glossary(self) -> dict:
@@ -177,6 +201,18 @@ class TranslationDocument:
             original_segment: The original segment info (for compatibility)
         """
         self._data.add_translation(translated_text)
+
+    def replace_translated_segment(self, position: int, translated_text: str):
+        """
+        Replace an already translated segment and journal the new translation.
+
+        Args:
+            position: 0-based segment position
+            translated_text: The new translation
+        """
+        self._data.translated_segments[position] = translated_text
+        if self._journal_synced and position < self._journaled_count:
+            self._get_journal().append(position, translated_text)
     
     def get_previous_segment(self, current_index: int) -> str:
         """
@@ -205,7 +241,36 @@ class TranslationDocument:
     
     # Output operations using centralized utilities
     def save_partial_output(self):
-        """Save the currently translated segments to the output file."""
+        """
+        Journal the segments translated since the last call.
+
+        Only new segments are appended (and fsync'd), so saving progress stays O(1)
+        per segment. The full TXT/EPUB output is written by materialize_output.
+        """
+        segments = self._data.translated_segments
+        try:
+            journal = self._get_journal()
+            if not self._journal_synced:
+                # First save, or translated_segments was replaced (e.g. resume prefill)
+                journal.rewrite(segments)
+                self._journal_synced = True
+            else:
+                journal.append_many(
+                    (position, segments[position])
+                    for position in range(self._journaled_count, len(segments))
+                )
+            self._journaled_count = len(segments)
+        except Exception as exc:  # pragma: no cover - best effort journal
+            print(f"Warning: Failed to journal translated segments: {exc}")
+
+    def materialize_output(self) -> bool:
+        """
+        Write the currently translated segments to the output file(s).
+
+        Returns:
+            True if the output was saved through the storage handler (TXT only),
+            False if it was written directly in the input format.
+        """
         saved_with_storage = False
 
         # Try to save using storage abstraction if job_id available
@@ -222,7 +287,7 @@ class TranslationDocument:
                 saved_with_storage = True
 
         if saved_with_storage:
-            return
+            return True
 
         # Fallback to traditional file saving
         if self._data.input_format == '.epub':
@@ -231,7 +296,8 @@ class TranslationDocument:
                 self._data.filepath,
                 self._data.translated_segments,
                 self._data.output_filename,
-                self._data.style_map
+                self._data.style_map,
+                segment_infos=self._data.segments,
             )
             # Also save to job-specific location if available
             if self._data.job_output_filename:
@@ -239,7 +305,8 @@ class TranslationDocument:
                     self._data.filepath,
                     self._data.translated_segments,
                     self._data.job_output_filename,
-                    self._data.style_map
+                    self._data.style_map,
+                    segment_infos=self._data.segments,
                 )
         else:
             # Save to main output location
@@ -256,18 +323,20 @@ class TranslationDocument:
 
         if hasattr(self, '_job_id') and self._job_id:
             self._persist_partial_segment_cache()
+        return False
     
     def save_final_output(self):
         """Save the final output based on the input file format."""
         print(f"\nSaving final output to {self._data.output_filename}...")
         if self._data.job_output_filename:
             print(f"Also saving to job directory: {self._data.job_output_filename}")
-        # Always persist the text output via existing mechanism (may use storage handler)
         self.save_partial_output()
+        # Always persist the text output via existing mechanism (may use storage handler)
+        saved_with_storage = self.materialize_output()
 
         # If the original input is EPUB, also emit a proper EPUB artifact locally
-        # even when a storage handler is present (which short-circuits file writes).
-        if self._data.input_format == '.epub':
+        # when a storage handler is present (which short-circuits file writes).
+        if self._data.input_format == '.epub' and saved_with_storage:
             try:
                 # Main output location
                 DocumentOutputManager.save_epub_output(
@@ -275,6 +344,7 @@ class TranslationDocument:
                     self._data.translated_segments,
                     self._data.output_filename,
                     self._data.style_map,
+                    segment_infos=self._data.segments,
                 )
 
                 # Job-scoped output location (if configured)
@@ -284,6 +354,7 @@ class TranslationDocument:
                         self._data.translated_segments,
                         self._data.job_output_filename,
                         self._data.style_map,
+                        segment_infos=self._data.segments,
                     )
             except Exception as exc:
                 # Surface but do not block TXT availability; EPUB is best-effort
@@ -304,7 +375,8 @@ class TranslationDocument:
                     self._data.filepath,
                     self._data.translated_segments,
                     output_path,
-                    self._data.style_map
+                    self._data.style_map,
+                    segment_infos=self._data.segments,
                 )
             else:
                 # Default to text format for post-edited versions
@@ -315,6 +387,25 @@ class TranslationDocument:
         else:
             self.save_final_output()
 
+    def _job_output_dir(self) -> Path:
+        """Return the job's output directory under JOB_STORAGE_BASE."""
+        # Align partial cache location with JOB_STORAGE_BASE to avoid path mismatches in prod
+        job_base = os.environ.get("JOB_STORAGE_BASE", "logs/jobs")
+        base_path = Path(job_base)
+        if not base_path.is_absolute():
+            base_path = Path(os.getcwd()) / base_path
+        return base_path / str(self._job_id) / "output"
+
+    def _get_journal(self) -> SegmentJournal:
+        """Return the segment journal (job output dir, or next to the output file in CLI mode)."""
+        if self._journal is None:
+            if self._job_id:
+                path = self._job_output_dir() / JOURNAL_FILENAME
+            else:
+                path = Path(f"{self._data.output_filename}.journal.jsonl")
+            self._journal = SegmentJournal(str(path))
+        return self._journal
+
     def _persist_partial_segment_cache(self):
         """Persist partial translation segments for accurate resume support."""
         job_id = getattr(self, '_job_id', None)
@@ -322,12 +413,7 @@ class TranslationDocument:
             return
 
         try:
-            # Align partial cache location with JOB_STORAGE_BASE to avoid path mismatches in prod
-            job_base = os.environ.get("JOB_STORAGE_BASE", "logs/jobs")
-            base_path = Path(job_base)
-            if not base_path.is_absolute():
-                base_path = Path(os.getcwd()) / base_path
-            cache_dir = base_path / str(job_id) / "output"
+            cache_dir = self._job_output_dir()
             cache_dir.mkdir(parents=True, exist_ok=True)
             cache_path = cache_dir / "partial_segments.json"
             with open(cache_path, 'w', encoding='utf-8') as cache_file:
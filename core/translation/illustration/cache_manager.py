@@ -6,6 +6,7 @@ Handles caching of generated illustrations to avoid redundant API calls.
 import json
 import hashlib
 import logging
+import threading
 from pathlib import Path
 from typing import Optional, Dict, Any
 
@@ -24,6 +25,7 @@ class IllustrationCacheManager:
         self.output_dir = output_dir
         self.enable_caching = enable_caching
         self.cache: Dict[str, Any] = {} if enable_caching else None
+        self._lock = threading.RLock()  # illustrations may be generated concurrently
         self._load_cache_metadata()
 
     def _load_cache_metadata(self):
@@ -48,7 +50,7 @@ class IllustrationCacheManager:
 
         cache_file = self.output_dir / "cache_metadata.json"
         try:
-            with open(cache_file, 'w', encoding='utf-8') as f:
+            with self._lock, open(cache_file, 'w', encoding='utf-8') as f:
                 json.dump(self.cache, f, ensure_ascii=False, indent=2)
             logging.debug(f"Saved cache metadata with {len(self.cache)} entries")
         except Exception as e:
@@ -79,20 +81,23 @@ class IllustrationCacheManager:
         Returns:
             Tuple of (image_path, prompt) if cached and file exists, None otherwise
         """
-        if not self.enable_caching or cache_key not in self.cache:
+        if not self.enable_caching:
             return None
 
-        cached_data = self.cache[cache_key]
-        cached_path = cached_data['path']
-        cached_prompt = cached_data['prompt']
-
-        if Path(cached_path).exists():
-            logging.info(f"Found cached illustration: {cached_path}")
-            return cached_path, cached_prompt
-        else:
-            # Remove invalid cache entry
-            del self.cache[cache_key]
-            return None
+        with self._lock:
+            cached_data = self.cache.get(cache_key)
+            if cached_data is None:
+                return None
+            cached_path = cached_data['path']
+            cached_prompt = cached_data['prompt']
+
+            if Path(cached_path).exists():
+                logging.info(f"Found cached illustration: {cached_path}")
+                return cached_path, cached_prompt
+            else:
+                # Remove invalid cache entry
+                del self.cache[cache_key]
+                return None
 
     def add_to_cache(self, cache_key: str, image_path: str, prompt: str, segment_index: int):
         """
@@ -107,12 +112,13 @@ class IllustrationCacheManager:
         if not self.enable_caching or not cache_key:
             return
 
-        self.cache[cache_key] = {
-            'path': str(image_path),
-            'prompt': prompt,
-            'segment_index': segment_index
-        }
-        self.save_cache_metadata()
+        with self._lock:
+            self.cache[cache_key] = {
+                'path': str(image_path),
+                'prompt': prompt,
+                'segment_index': segment_index
+            }
+            self.save_cache_metadata()
 
     def clear_cache(self):
         """Clear all cache entries."""
@@ -7,6 +7,7 @@ cache management, prompt building, visual extraction, and image generation.
 import os
 import json
 import logging
+import threading
 from datetime import datetime
 from pathlib import Path
 from typing import Optional, Dict, Any, Tuple, List, Callable
@@ -54,6 +55,7 @@ class IllustrationGenerator:
         model_name: str = "gemini-2.5-flash-image-preview",
         client: Optional[genai.Client] = None,
         usage_callback: Optional[Callable[[UsageEvent], None]] = None,
+        requests_per_minute: Optional[int] = None,
     ):
         """
         Initialize the illustration generator.
@@ -64,6 +66,8 @@ class IllustrationGenerator:
             output_dir: Directory to store generated illustrations
             enable_caching: Whether to cache generated illustrations
             model_name: Name of the Gemini model to use for image generation
+            requests_per_minute: Optional per-key pacing for image requests (shared across
+                workers through Redis when REDIS_URL is set)
         """
         if not GENAI_AVAILABLE:
             raise ImportError("google-genai package is required for illustration generation. "
@@ -89,6 +93,13 @@ class IllustrationGenerator:
         self.enable_caching = enable_caching
         self.model_name = model_name
         self.usage_callback = usage_callback
+        self._log_lock = threading.Lock()  # illustrations may be generated concurrently
+
+        rate_limiter = None
+        if requests_per_minute is not None and int(requests_per_minute) > 0:
+            from core.translation.models.rate_limiter import RateLimiter
+            # Image models have their own quota, separate from the text model's
+            rate_limiter = RateLimiter(int(requests_per_minute), namespace="gemini-image")
 
         # Setup output directory
         self.job_output_dir = self._setup_output_directory()
@@ -111,6 +122,8 @@ class IllustrationGenerator:
             self.logger,
             self.model_name,
             usage_callback=self.usage_callback,
+            rate_limiter=rate_limiter,
+            rate_limit_key=api_key,
         )
         self.character_generator = CharacterIllustrationGenerator(
             self.client,
@@ -294,7 +307,8 @@ class IllustrationGenerator:
             else:
                 context_data['world_atmosphere'] = None
 
-            self.logger.log_segment_context(segment_index, context_data)
+            with self._log_lock:
+                self.logger.log_segment_context(segment_index, context_data)
 
         # Generate or use custom prompt
         if custom_prompt:
@@ -324,7 +338,8 @@ class IllustrationGenerator:
                                    style_hints: str = "",
                                    glossary: Optional[Dict[str, str]] = None,
                                    world_atmosphere=None,
-                                   parallel: bool = False) -> List[Dict[str, Any]]:
+                                   parallel: bool = False,
+                                   max_workers: int = 4) -> List[Dict[str, Any]]:
         """
         Generate illustrations for multiple segments.
 
@@ -333,7 +348,8 @@ class IllustrationGenerator:
             style_hints: Style preferences for all illustrations
             glossary: Optional glossary for names
             world_atmosphere: World atmosphere analysis data
-            parallel: Whether to generate in parallel (not implemented yet)
+            parallel: Whether to generate up to max_workers illustrations at once
+            max_workers: Concurrency limit when parallel is True
 
         Returns:
             List of dictionaries with illustration data
@@ -344,7 +360,8 @@ class IllustrationGenerator:
             style_hints=style_hints,
             glossary=glossary,
             world_atmosphere=world_atmosphere,
-            parallel=parallel
+            parallel=parallel,
+            max_workers=max_workers
         )
 
     def generate_character_bases(self,
@@ -433,21 +450,22 @@ class IllustrationGenerator:
         # Append to prompt generation log file
         log_file = prompt_gen_log_dir / "prompt_generation_log.json"
 
-        # Read existing log if it exists
-        existing_logs = []
-        if log_file.exists():
-            try:
-                with open(log_file, 'r', encoding='utf-8') as f:
-                    existing_logs = json.load(f)
-            except:
-                existing_logs = []
-
-        # Append new entry
-        existing_logs.append(log_entry)
-
-        # Write back to file
-        with open(log_file, 'w', encoding='utf-8') as f:
-            json.dump(existing_logs, f, ensure_ascii=False, indent=2)
+        with self._log_lock:
+            # Read existing log if it exists
+            existing_logs = []
+            if log_file.exists():
+                try:
+                    with open(log_file, 'r', encoding='utf-8') as f:
+                        existing_logs = json.load(f)
+                except:
+                    existing_logs = []
+
+            # Append new entry
+            existing_logs.append(log_entry)
+
+            # Write back to file
+            with open(log_file, 'w', encoding='utf-8') as f:
+                json.dump(existing_logs, f, ensure_ascii=False, indent=2)
 
     def cleanup_old_illustrations(self, keep_days: int = 30):
         """
@@ -9,6 +9,7 @@ import logging
 import hashlib
 import base64
 import concurrent.futures
+import threading
 from pathlib import Path
 from typing import Optional, Dict, Any, Tuple, List, Callable, Union
 from PIL import Image
@@ -16,6 +17,35 @@ from io import BytesIO
 from datetime import datetime
 
 from core.translation.usage_tracker import UsageEvent
+from core.utils.tracing import in_current_context, span
+
+# Image API calls run on one long-lived pool shared by every service in the process,
+# so a timed-out call no longer blocks on a throwaway executor's shutdown. Batch
+# generation runs on a second shared pool: its jobs wait on API calls, so they must
+# not occupy the API pool's threads.
+_API_EXECUTOR_MAX_WORKERS = 32
+_BATCH_EXECUTOR_MAX_WORKERS = 16
+_executors: Dict[str, concurrent.futures.ThreadPoolExecutor] = {}
+_executors_lock = threading.Lock()
+
+
+def _shared_executor(name: str, max_workers: int) -> concurrent.futures.ThreadPoolExecutor:
+    with _executors_lock:
+        executor = _executors.get(name)
+        if executor is None:
+            executor = concurrent.futures.ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=name)
+            _executors[name] = executor
+        return executor
+
+
+def get_api_executor() -> concurrent.futures.ThreadPoolExecutor:
+    """Return the shared executor used for image API calls."""
+    return _shared_executor("illustration-api", _API_EXECUTOR_MAX_WORKERS)
+
+
+def get_batch_executor() -> concurrent.futures.ThreadPoolExecutor:
+    """Return the shared executor running the segments of batch generations."""
+    return _shared_executor("illustration-batch", _BATCH_EXECUTOR_MAX_WORKERS)
 
 
 class ImageGenerationService:
@@ -29,6 +59,8 @@ class ImageGenerationService:
         logger=None,
         model_name: str = "gemini-2.5-flash-image-preview",
         usage_callback: Optional[Callable[[UsageEvent], None]] = None,
+        rate_limiter=None,
+        rate_limit_key: Optional[str] = None,
     ):
         """
         Initialize the image generation service.
@@ -39,6 +71,8 @@ class ImageGenerationService:
             cache_manager: IllustrationCacheManager instance
             logger: Optional TranslationLogger instance
             model_name: Name of the Gemini model to use for image generation
+            rate_limiter: Optional per-key requests-per-minute limiter (wait(key) before each call)
+            rate_limit_key: Key the limiter paces on (the API key; defaults to the model name)
         """
         self.client = client
         self.output_dir = output_dir
@@ -46,6 +80,9 @@ class ImageGenerationService:
         self.logger = logger
         self.model_name = model_name
         self.usage_callback = usage_callback
+        self.rate_limiter = rate_limiter
+        self.rate_limit_key = rate_limit_key or model_name
+        self._log_lock = threading.Lock()  # illustrations may be generated concurrently
 
     def generate_illustration(self,
                             segment_text: str,
@@ -106,14 +143,16 @@ class ImageGenerationService:
 
         # Log the prompt (context logging is now handled in generator.py)
         if self.logger:
-            self.logger.log_translation_prompt(segment_index, f"[ILLUSTRATION PROMPT]\n{final_prompt}")
+            with self._log_lock:
+                self.logger.log_translation_prompt(segment_index, f"[ILLUSTRATION PROMPT]\n{final_prompt}")
 
         # Generate the actual image using Gemini
         for attempt in range(max_retries):
             try:
-                result = self._generate_single_illustration(
-                    final_prompt, segment_index, reference_image, attempt, max_retries, return_base64
-                )
+                with span("image_generation", segment=segment_index, attempt=attempt + 1):
+                    result = self._generate_single_illustration(
+                        final_prompt, segment_index, reference_image, attempt, max_retries, return_base64
+                    )
 
                 if result:
                     if return_base64:
@@ -132,7 +171,8 @@ class ImageGenerationService:
                 logging.error(f"Attempt {attempt + 1} failed to generate illustration for segment {segment_index}: {e}")
                 if attempt == max_retries - 1:
                     if self.logger:
-                        self.logger.log_error(e, segment_index, "image_generation")
+                        with self._log_lock:
+                            self.logger.log_error(e, segment_index, "image_generation")
                     return None, None
 
         return None, None
@@ -225,7 +265,8 @@ class ImageGenerationService:
                 }
                 return prompt_data, prompt
         else:
-            image_generated = self._extract_image_from_response(response, image_filepath, segment_index)
+            with span("image_save"):
+                image_generated = self._extract_image_from_response(response, image_filepath, segment_index)
             if image_generated:
                 logging.info(f"Successfully generated image for segment {segment_index}")
                 return image_filepath, prompt
@@ -251,15 +292,18 @@ class ImageGenerationService:
                 contents=contents
             )
 
-        # Use ThreadPoolExecutor with timeout
-        with concurrent.futures.ThreadPoolExecutor(max_workers=1) as executor:
-            future = executor.submit(generate_with_timeout)
+        if self.rate_limiter is not None:
+            self.rate_limiter.wait(self.rate_limit_key)
+
+        future = get_api_executor().submit(generate_with_timeout)
+        with span("image_api_call", model=self.model_name) as api_span:
             try:
                 response = future.result(timeout=timeout)
                 logging.info("[ILLUSTRATION] Received response from Gemini API")
                 return response
             except concurrent.futures.TimeoutError:
                 logging.error("[ILLUSTRATION] Timeout waiting for Gemini API response")
+                api_span.set(timed_out=True)
                 future.cancel()
                 return None
 
@@ -435,7 +479,8 @@ class ImageGenerationService:
                                     style_hints: str = "",
                                     glossary: Optional[Dict[str, str]] = None,
                                     world_atmosphere=None,
-                                    parallel: bool = False) -> List[Dict[str, Any]]:
+                                    parallel: bool = False,
+                                    max_workers: int = 4) -> List[Dict[str, Any]]:
         """
         Generate illustrations for multiple segments.
 
@@ -445,13 +490,13 @@ class ImageGenerationService:
             style_hints: Style preferences for all illustrations
             glossary: Optional glossary for names
             world_atmosphere: World atmosphere analysis data
-            parallel: Whether to generate in parallel (not implemented yet)
+            parallel: Whether to generate up to max_workers illustrations at once
+            max_workers: Concurrency limit when parallel is True
 
         Returns:
-            List of dictionaries with illustration data
+            List of dictionaries with illustration data, in segment order
         """
-        results = []
-
+        jobs = []
         for i, segment in enumerate(segments):
             segment_text = segment.get('text', '')
             segment_index = segment.get('index', i)
@@ -467,21 +512,40 @@ class ImageGenerationService:
                 glossary=glossary,
                 world_atmosphere=world_atmosphere
             )
+            jobs.append((segment_text, segment_index, prompt))
 
-            # Generate illustration
+        def generate(job) -> Dict[str, Any]:
+            segment_text, segment_index, prompt = job
             illustration_path, prompt_used = self.generate_illustration(
                 segment_text=segment_text,
                 segment_index=segment_index,
                 prompt=prompt,
                 style_hints=style_hints
             )
-
-            results.append({
+            return {
                 'segment_index': segment_index,
                 'illustration_path': illustration_path,
                 'prompt': prompt_used,
                 'success': illustration_path is not None
-            })
+            }
+
+        workers = max(1, min(int(max_workers or 1), len(jobs), _BATCH_EXECUTOR_MAX_WORKERS)) if parallel else 1
+        if workers > 1:
+            # At most `workers` segments of this batch in flight on the shared pool
+            executor = get_batch_executor()
+            futures: List[concurrent.futures.Future] = []
+            try:
+                for job in jobs:
+                    running = [future for future in futures if not future.done()]
+                    if len(running) >= workers:
+                        concurrent.futures.wait(running, return_when=concurrent.futures.FIRST_COMPLETED)
+                    futures.append(executor.submit(in_current_context(generate), job))
+                results = [future.result() for future in futures]
+            finally:
+                for future in futures:
+                    future.cancel()
+        else:
+            results = [generate(job) for job in jobs]
 
         # Log completion
         if self.logger:
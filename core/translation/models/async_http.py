@@ -0,0 +1,92 @@
+"""
+Shared asyncio plumbing for model clients.
+
+- get_async_client(): a pooled httpx.AsyncClient per event loop (keep-alive, HTTP/2 when
+  the optional 'h2' package is installed), reused by every model in the process.
+- run_sync(): runs a coroutine on a long-lived background event loop, so the existing
+  synchronous call sites (generate_text, ...) share one connection pool instead of
+  opening a new connection per request. The coroutine runs in the caller's context
+  (context variables such as the current tracer carry over).
+"""
+
+import asyncio
+import contextvars
+import threading
+import weakref
+from typing import Any, Awaitable, Optional
+
+import httpx
+
+try:  # HTTP/2 support is optional in httpx
+    import h2  # noqa: F401
+    HTTP2_AVAILABLE = True
+except ImportError:  # pragma: no cover - depends on installed extras
+    HTTP2_AVAILABLE = False
+
+DEFAULT_TIMEOUT = httpx.Timeout(300.0, connect=10.0)
+DEFAULT_LIMITS = httpx.Limits(max_connections=64, max_keepalive_connections=32, keepalive_expiry=60.0)
+
+_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]" = weakref.WeakKeyDictionary()
+_clients_lock = threading.Lock()
+
+_background_loop: Optional[asyncio.AbstractEventLoop] = None
+_background_lock = threading.Lock()
+
+
+def get_async_client() -> httpx.AsyncClient:
+    """Return the pooled AsyncClient bound to the running event loop."""
+    loop = asyncio.get_running_loop()
+    with _clients_lock:
+        client = _clients.get(loop)
+        if client is None or client.is_closed:
+            client = httpx.AsyncClient(
+                timeout=DEFAULT_TIMEOUT,
+                limits=DEFAULT_LIMITS,
+                http2=HTTP2_AVAILABLE,
+            )
+            _clients[loop] = client
+    return client
+
+
+async def aclose_async_client() -> None:
+    """Close the pooled client of the running event loop (e.g. on application shutdown)."""
+    loop = asyncio.get_running_loop()
+    with _clients_lock:
+        client = _clients.pop(loop, None)
+    if client is not None:
+        await client.aclose()
+
+
+def _get_background_loop() -> asyncio.AbstractEventLoop:
+    global _background_loop
+    with _background_lock:
+        if _background_loop is None or _background_loop.is_closed():
+            loop = asyncio.new_event_loop()
+            thread = threading.Thread(target=loop.run_forever, name="model-io-loop", daemon=True)
+            thread.start()
+            _background_loop = loop
+        return _background_loop
+
+
+def run_sync(awaitable: Awaitable[Any]) -> Any:
+    """
+    Run a coroutine to completion from synchronous code.
+
+    Works from plain threads (Celery workers, pipeline threads) and from code that
+    is itself called inside another event loop, because the coroutine always runs
+    on the shared background loop.
+    """
+    loop = _get_background_loop()
+    try:
+        running = asyncio.get_running_loop()
+    except RuntimeError:
+        running = None
+    if running is loop:
+        raise RuntimeError("run_sync() called from the model I/O loop; await the coroutine instead.")
+    # Run in the caller's context so its tracer and rate-limit scope apply on the loop
+    context = contextvars.copy_context()
+    return asyncio.run_coroutine_threadsafe(_run_in_context(awaitable, context), loop).result()
+
+
+async def _run_in_context(awaitable: Awaitable[Any], context: contextvars.Context) -> Any:
+    return await asyncio.get_running_loop().create_task(awaitable, context=context)
@@ -1,6 +1,5 @@
+import asyncio
 import json
-import hashlib
-import os
 import random
 import threading
 import time
@@ -10,8 +9,13 @@ from typing import Callable, Optional, Tuple
 from google import genai
 from google.genai import errors as genai_errors
 from shared.errors import ProhibitedException
-from ...utils.retry import retry_with_softer_prompt
+from ...utils import metrics
+from ...utils.retry import async_retry_with_softer_prompt, retry_with_softer_prompt
+from ...utils.token_budget import estimate_tokens
+from ...utils.tracing import span
 from ..usage_tracker import UsageEvent
+from .rate_limiter import RateLimiter
+from .response_cache import ResponseCache
 
 try:
     # Prefer typed helpers from the new google-genai package
@@ -49,11 +53,6 @@ def _error_message(exc: Exception) -> str:
     message = getattr(exc, "message", None)
     return message if isinstance(message, str) and message else str(exc)
 
-def _key_id(api_key: str) -> str:
-    """Generate a stable, non-reversible identifier for an API key (for logs/Redis keys)."""
-    digest = hashlib.sha256(api_key.encode("utf-8")).hexdigest()
-    return digest[:12]
-
 
 def _is_permission_denied_error(exc: Exception) -> bool:
     if google_api_exceptions and isinstance(exc, google_api_exceptions.PermissionDenied):
@@ -117,6 +116,30 @@ def _is_transient_error(exc: Exception) -> bool:
     return any(token in status for token in ("INTERNAL", "UNAVAILABLE", "DEADLINE_EXCEEDED", "ABORTED"))
 
 
+def classify_error(exc: BaseException) -> str:
+    """Outcome label of a failed model call, using the same classifiers as the retry loop.
+
+    HTTP errors carrying a response (httpx, requests) are classified by its status code.
+    """
+    if isinstance(exc, ProhibitedException) or _looks_like_safety_block(exc):
+        return "safety_blocked"
+    response = getattr(exc, "response", None)
+    if _error_code(exc) is None and getattr(response, "status_code", None) is not None:
+        code = response.status_code
+        if code == 429:
+            return "rate_limited"
+        if code in (500, 502, 503, 504):
+            return "transient"
+        return "rejected" if 400 <= code < 500 else "error"
+    if _is_rate_limited_error(exc):
+        return "rate_limited"
+    if _is_transient_error(exc):
+        return "transient"
+    if _is_permission_denied_error(exc) or _is_invalid_argument_error(exc) or _is_not_found_error(exc):
+        return "rejected"
+    return "error"
+
+
 def _retry_delay_seconds(exc: Exception) -> Optional[float]:
     """Best-effort retry delay extraction (when SDK provides it)."""
     for attr in ("retry_delay", "retry_after", "retry_after_seconds"):
@@ -186,13 +209,32 @@ class _ApiKeyPool:
                 return key
             return None
 
-    def rotate(self, now: float) -> Optional[str]:
+    def rotate(self, now: float, away_from: Optional[str] = None) -> Optional[str]:
+        """Move to the next usable key.
+
+        With away_from, the pool only advances while that key is still the current one,
+        so a failure reported late does not rotate away from a key another request chose.
+        """
         with self._lock:
             if not self._api_keys:
                 return None
-            self._current_index = (self._current_index + 1) % len(self._api_keys)
+            if away_from is None or self._api_keys[self._current_index] == away_from:
+                self._current_index = (self._current_index + 1) % len(self._api_keys)
         return self.next_available(now)
 
+    def state_counts(self, now: float) -> dict[str, int]:
+        """Number of keys per state: available, cooldown, disabled."""
+        with self._lock:
+            counts = {"available": 0, "cooldown": 0, "disabled": 0}
+            for key in self._api_keys:
+                if key in self._disabled:
+                    counts["disabled"] += 1
+                elif self._cooldown_until.get(key, 0.0) > now:
+                    counts["cooldown"] += 1
+                else:
+                    counts["available"] += 1
+            return counts
+
     def next_ready_in_seconds(self, now: float) -> Optional[float]:
         with self._lock:
             candidates = []
@@ -208,82 +250,6 @@ class _ApiKeyPool:
             return max(0.0, min(candidates) - now)
 
 
-class _RequestsPerMinuteLimiter:
-    """Per-API-key request pacing; uses Redis when available for cross-worker coordination."""
-
-    def __init__(self, requests_per_minute: int, *, redis_url: str | None = None):
-        self._rpm = int(requests_per_minute)
-        self._interval_ms = int((60.0 / max(1, self._rpm)) * 1000.0)
-        self._redis_url = redis_url or os.getenv("REDIS_URL")
-        self._redis = None
-        self._redis_lock = threading.Lock()
-        self._local_next_allowed_ms: dict[str, int] = {}
-        self._lua = None
-
-    def _get_redis(self):
-        if not self._redis_url:
-            return None
-        with self._redis_lock:
-            if self._redis is not None:
-                return self._redis
-            try:
-                import redis  # type: ignore
-
-                self._redis = redis.Redis.from_url(self._redis_url, decode_responses=True)
-                self._redis.ping()
-            except Exception:
-                self._redis = None
-            return self._redis
-
-    def _redis_next_allowed_ms(self, key_id: str, now_ms: int) -> Optional[int]:
-        r = self._get_redis()
-        if r is None:
-            return None
-        if self._lua is None:
-            self._lua = r.register_script(
-                """
-                local current = redis.call('GET', KEYS[1])
-                local now = tonumber(ARGV[1])
-                local interval = tonumber(ARGV[2])
-                local allowed = now
-                if current then
-                  local next_allowed = tonumber(current)
-                  if next_allowed and next_allowed > now then
-                    allowed = next_allowed
-                  end
-                end
-                local new_next = allowed + interval
-                redis.call('SET', KEYS[1], new_next)
-                local ttl = math.max(interval * 2, 120000)
-                redis.call('PEXPIRE', KEYS[1], ttl)
-                return allowed
-                """
-            )
-        try:
-            redis_key = f"gemini:rpm:{key_id}"
-            allowed = self._lua(keys=[redis_key], args=[now_ms, self._interval_ms])
-            return int(allowed) if allowed is not None else None
-        except Exception:
-            return None
-
-    def wait(self, api_key: str) -> None:
-        if self._rpm <= 0:
-            return
-        key_id = _key_id(api_key)
-        now_ms = int(time.time() * 1000)
-
-        allowed_ms = self._redis_next_allowed_ms(key_id, now_ms)
-        if allowed_ms is None:
-            # Local fallback (per-process only)
-            next_allowed = self._local_next_allowed_ms.get(key_id, 0)
-            allowed_ms = max(now_ms, next_allowed)
-            self._local_next_allowed_ms[key_id] = allowed_ms + self._interval_ms
-
-        delay_ms = allowed_ms - now_ms
-        if delay_ms > 0:
-            time.sleep(delay_ms / 1000.0)
-
-
 class GeminiModel:
     """
     A wrapper class for the Google Gemini API to handle text generation,
@@ -301,7 +267,9 @@ class GeminiModel:
         *,
         backup_api_keys: list[str] | None = None,
         requests_per_minute: int | None = None,
+        tokens_per_minute: int | None = None,
         client_factory: Callable[[str], genai.Client] | None = None,
+        response_cache: ResponseCache | None = None,
     ):
         """
         Initializes the Gemini model client.
@@ -312,6 +280,9 @@ class GeminiModel:
             safety_settings: Safety settings for the model
             generation_config: Generation configuration
             enable_soft_retry: Whether to enable retry with softer prompts for ProhibitedException
+            requests_per_minute: Optional per-key request limit, shared across workers via Redis
+            tokens_per_minute: Optional per-key token limit, shared across workers via Redis
+            response_cache: Optional persistent cache; identical requests are answered from it
         """
         if client is not None:
             self.client = client
@@ -319,7 +290,7 @@ class GeminiModel:
             self._api_key_pool = None
             self._clients_by_key: dict[str, genai.Client] = {}
             self._client_factory = None
-            self._rpm_limiter = None
+            self._rate_limiter = None
         else:
             api_keys: list[str] = []
             if isinstance(api_key, str) and api_key.strip():
@@ -348,11 +319,8 @@ class GeminiModel:
             self.client = self._client_factory(first_key)
             self._clients_by_key[first_key] = self.client
             self.api_key = first_key
-            self._rpm_limiter = (
-                _RequestsPerMinuteLimiter(int(requests_per_minute))
-                if requests_per_minute is not None and int(requests_per_minute) > 0
-                else None
-            )
+            rate_limiter = RateLimiter(requests_per_minute or 0, tokens_per_minute or 0, namespace="gemini")
+            self._rate_limiter = rate_limiter if rate_limiter.enabled else None
         self._client_lock = threading.Lock()
         self.model_name = model_name
         self.safety_settings = safety_settings
@@ -360,10 +328,65 @@ class GeminiModel:
         self.enable_soft_retry = enable_soft_retry
         self.usage_callback = usage_callback
         self.last_usage: UsageEvent | None = None
+        self.response_cache = response_cache
         print(f"GeminiModel initialized with model: {model_name}, soft_retry: {enable_soft_retry}")
 
-    def _active_api_key(self) -> Optional[str]:
-        return self.api_key if isinstance(self.api_key, str) and self.api_key else None
+    def for_shard(self, shard_index: int) -> "GeminiModel":
+        """Return a model for a parallel shard that starts on a different API key.
+
+        Shards rotate the key list by their index so concurrent shards spread over
+        all keys instead of piling onto the primary one. The rate limiter is shared so
+        its limits still hold per key across shards. Vertex/injected clients and
+        single-key models return self.
+        """
+        if self._api_key_pool is None:
+            return self
+        keys = list(self._api_key_pool.api_keys)
+        if len(keys) < 2:
+            return self
+        offset = shard_index % len(keys)
+        rotated = keys[offset:] + keys[:offset]
+        model = GeminiModel(
+            api_key=rotated[0],
+            model_name=self.model_name,
+            safety_settings=self.safety_settings,
+            generation_config=self.generation_config,
+            enable_soft_retry=self.enable_soft_retry,
+            usage_callback=self.usage_callback,
+            backup_api_keys=rotated[1:],
+            client_factory=self._client_factory,
+            response_cache=self.response_cache,
+        )
+        model._rate_limiter = self._rate_limiter
+        return model
+
+    def _try_select_client(self) -> tuple[float, Optional[str], Optional[genai.Client]]:
+        """Make one attempt at selecting a usable client.
+
+        Returns (wait_seconds, key, client). client is None when every key is cooling
+        down; the caller should wait wait_seconds and try again.
+        """
+        now = time.time()
+        key = self._api_key_pool.current(now) or self._api_key_pool.next_available(now)
+        if key is None:
+            metrics.set_key_pool_state(self.model_name, self._api_key_pool.state_counts(now))
+            ready_in = self._api_key_pool.next_ready_in_seconds(now)
+            if ready_in is None:
+                raise ValueError("No usable API keys available.")
+            # ready_in == 0.0 but key selection still failed; loop again
+            return min(ready_in, 10.0), None, None
+
+        with self._client_lock:
+            client = self._clients_by_key.get(key)
+            if client is None:
+                if not self._client_factory:
+                    raise ValueError("Client factory missing for Gemini API key mode.")
+                client = self._client_factory(key)
+                self._clients_by_key[key] = client
+            # Keep backward-compatible attributes updated for logs/debugging
+            self.client = client
+            self.api_key = key
+            return 0.0, key, client
 
     def _select_client_for_request(self) -> tuple[Optional[str], genai.Client]:
         """Select a usable client (and its key) for the next request.
@@ -374,37 +397,67 @@ class GeminiModel:
             return None, self.client
 
         while True:
-            now = time.time()
-            key = self._api_key_pool.current(now) or self._api_key_pool.next_available(now)
-            if key is None:
-                ready_in = self._api_key_pool.next_ready_in_seconds(now)
-                if ready_in is None:
-                    raise ValueError("No usable API keys available.")
-                if ready_in > 0:
-                    time.sleep(min(ready_in, 10.0))
-                    continue
-                # ready_in == 0.0 but key selection still failed; loop again
-                continue
-
-            with self._client_lock:
-                client = self._clients_by_key.get(key)
-                if client is None:
-                    if not self._client_factory:
-                        raise ValueError("Client factory missing for Gemini API key mode.")
-                    client = self._client_factory(key)
-                    self._clients_by_key[key] = client
-                # Keep backward-compatible attributes updated for logs/debugging
-                self.client = client
-                self.api_key = key
+            wait_seconds, key, client = self._try_select_client()
+            if client is not None:
                 return key, client
+            if wait_seconds > 0:
+                with span("key_cooldown_wait"):
+                    time.sleep(wait_seconds)
+
+    async def _aselect_client_for_request(self) -> tuple[Optional[str], genai.Client]:
+        """Async version of _select_client_for_request; awaits while keys cool down."""
+        if self._api_key_pool is None:
+            return None, self.client
 
-    def _pace_requests_if_needed(self, api_key: Optional[str]) -> None:
-        if not api_key or not self._rpm_limiter:
+        while True:
+            wait_seconds, key, client = self._try_select_client()
+            if client is not None:
+                return key, client
+            with span("key_cooldown_wait"):
+                await asyncio.sleep(wait_seconds)
+
+    def _reserved_tokens(self, prompt: str) -> int:
+        """Tokens to reserve for a call before its usage is known (prompt plus a like-sized answer)."""
+        if not self._rate_limiter or not self._rate_limiter.tokens_per_minute:
+            return 0
+        return 2 * estimate_tokens(prompt)
+
+    def _pace_requests_if_needed(self, api_key: Optional[str], prompt: str = "") -> int:
+        """Wait for the key's rate limits; returns the tokens reserved for the call."""
+        if not api_key or not self._rate_limiter:
+            return 0
+        reserved = self._reserved_tokens(prompt)
+        self._rate_limiter.wait(api_key, reserved)
+        return reserved
+
+    async def _apace_requests_if_needed(self, api_key: Optional[str], prompt: str = "") -> int:
+        if not api_key or not self._rate_limiter:
+            return 0
+        reserved = self._reserved_tokens(prompt)
+        await self._rate_limiter.async_wait(api_key, reserved)
+        return reserved
+
+    def _settle_reserved_tokens(self, api_key: Optional[str], reserved: int, response) -> None:
+        """Replace the token reservation of a call with the usage its response reported."""
+        if not reserved or not api_key or not self._rate_limiter:
             return
-        self._rpm_limiter.wait(api_key)
+        event = self._extract_usage_event(response)
+        if event is not None:
+            self._rate_limiter.settle(api_key, reserved, event.normalized().total_tokens)
+
+    @staticmethod
+    async def _agenerate_content(client: genai.Client, **kwargs):
+        """Call generate_content on the SDK's async surface (client.aio).
+
+        Injected clients without an async surface are called in a worker thread.
+        """
+        aio = getattr(client, "aio", None)
+        if aio is not None:
+            return await aio.models.generate_content(**kwargs)
+        return await asyncio.to_thread(client.models.generate_content, **kwargs)
 
     def _rotate_or_disable_key(self, api_key: Optional[str], *, cooldown_seconds: float | None = None) -> bool:
-        """Rotate away from the current key when possible.
+        """Cool down or disable `api_key` (the key the failed request used) and rotate away from it.
 
         Returns True if rotation selected another usable key, False otherwise.
         """
@@ -413,10 +466,13 @@ class GeminiModel:
         now = time.time()
         if cooldown_seconds is not None and cooldown_seconds > 0:
             self._api_key_pool.mark_cooldown(api_key, seconds=cooldown_seconds, now=now)
+            metrics.record_key_event(self.model_name, "cooldown")
         else:
             self._api_key_pool.mark_disabled(api_key)
+            metrics.record_key_event(self.model_name, "disabled")
+        metrics.set_key_pool_state(self.model_name, self._api_key_pool.state_counts(now))
 
-        next_key = self._api_key_pool.rotate(now)
+        next_key = self._api_key_pool.rotate(now, away_from=api_key)
         return bool(next_key and next_key != api_key)
 
     def _compute_backoff_seconds(self, attempt: int, *, base: float, cap: float, jitter_ratio: float = 0.25) -> float:
@@ -429,13 +485,37 @@ class GeminiModel:
         event = self._extract_usage_event(response)
         if not event:
             return
+        self._record_usage_event(event)
+
+    def _record_usage_event(self, event: UsageEvent) -> None:
         self.last_usage = event
+        metrics.record_usage(event)
         if self.usage_callback:
             try:
                 self.usage_callback(event)
             except Exception as exc:  # pragma: no cover - best effort logging
                 print(f"[GeminiModel] Failed to emit usage event: {exc}")
 
+    def _cache_key(self, kind: str, prompt: str, response_schema=None) -> Optional[str]:
+        if self.response_cache is None:
+            return None
+        config = {"generation_config": self.generation_config, "safety_settings": self.safety_settings}
+        return self.response_cache.build_key(kind, self.model_name, config, prompt, response_schema)
+
+    def _cached_response(self, cache_key: Optional[str], response_schema=None):
+        """Return a cached response and report it as a zero-token, cached usage event."""
+        if cache_key is None:
+            return None
+        cached = self.response_cache.get(cache_key, response_schema)
+        if cached is not None:
+            self._record_usage_event(UsageEvent(model_name=self.model_name, timestamp=datetime.utcnow(), cached=True))
+        return cached
+
+    def _store_response(self, cache_key: Optional[str], value, response_schema=None) -> None:
+        if cache_key is None:
+            return
+        self.response_cache.put(cache_key, value, model_name=self.model_name, response_schema=response_schema)
+
     def _extract_usage_event(self, response) -> UsageEvent | None:
         metadata = getattr(response, "usage_metadata", None)
         if metadata is None:
@@ -595,6 +675,59 @@ class GeminiModel:
         
         return repair
 
+    def _handle_api_error(self, e: Exception, prompt: str, attempt: int, max_retries: int,
+                          *, api_key: Optional[str], api_call_type: str, label: str) -> float:
+        """Classify an API error: raise when it is final, else return seconds to wait before retrying.
+
+        Safety blocks become ProhibitedException (no key rotation); permission and
+        rate-limit errors disable or cool down `api_key`, the key the failed request
+        used, and rotate to another key when one is available.
+        """
+        # Safety signals should route to the sanitizer (do not rotate keys)
+        if _looks_like_safety_block(e):
+            raise ProhibitedException(
+                message=_error_message(e),
+                prompt=prompt,
+                api_call_type=api_call_type,
+            )
+
+        if _is_invalid_argument_error(e) or _is_not_found_error(e):
+            print(f"\nNon-retriable {label} error: {e}")
+            raise e
+
+        if _is_permission_denied_error(e):
+            rotated = self._rotate_or_disable_key(api_key)
+            if rotated and attempt < max_retries - 1:
+                return 0.0
+            print(f"\nPermission denied {label} error: {e}")
+            raise e
+
+        if _is_rate_limited_error(e):
+            retry_after = _retry_delay_seconds(e)
+            delay = retry_after if retry_after is not None else self._compute_backoff_seconds(attempt, base=2.0, cap=30.0)
+            rotated = self._rotate_or_disable_key(api_key, cooldown_seconds=delay)
+            if rotated and attempt < max_retries - 1:
+                return 0.0
+            if attempt < max_retries - 1:
+                return delay
+            raise Exception(f"All {max_retries} {label} call attempts failed. Last error: {e}") from e
+
+        # Transient/unknown API errors: retry with backoff
+        delay = _retry_delay_seconds(e)
+        if delay is None:
+            delay = self._compute_backoff_seconds(attempt, base=1.0, cap=15.0)
+        if attempt < max_retries - 1:
+            return delay
+        raise Exception(f"All {max_retries} {label} call attempts failed. Last error: {e}") from e
+
+    def _handle_unexpected_error(self, e: Exception, attempt: int, max_retries: int, *, label: str) -> float:
+        """Retry non-API errors (empty/invalid responses, network hiccups) with backoff."""
+        if isinstance(e, ValueError) and "No usable API keys" in str(e):
+            raise e
+        if attempt < max_retries - 1:
+            return self._compute_backoff_seconds(attempt, base=1.0, cap=10.0)
+        raise Exception(f"All {max_retries} {label} call attempts failed. Last error: {e}") from e
+
     def _retry_or_raise(self, error: Exception, attempt: int, max_retries: int, label: str) -> None:
         """Legacy helper (kept for backward compatibility); uses exponential backoff."""
         print(f"\nRetriable {label} failed on attempt {attempt + 1}/{max_retries}. Error: {error}")
@@ -660,113 +793,147 @@ class GeminiModel:
         
         If enable_soft_retry is True, will also retry ProhibitedException with softer prompts.
         """
+        cache_key = self._cache_key("text", prompt)
+        cached = self._cached_response(cache_key)
+        if cached is not None:
+            return cached
+
         if self.enable_soft_retry:
-            return self._generate_text_with_soft_retry(prompt, max_retries)
+            text = self._generate_text_with_soft_retry(prompt, max_retries)
         else:
-            return self._generate_text_base(prompt, max_retries)
+            text = self._generate_text_base(prompt, max_retries)
+        self._store_response(cache_key, text)
+        return text
     
+    async def agenerate_text(self, prompt: str, max_retries: int = 3) -> str:
+        """
+        Async version of generate_text built on the google-genai async client.
+
+        Key rotation, RPM pacing and error classification match generate_text;
+        waits are awaited instead of blocking the thread.
+        """
+        cache_key = self._cache_key("text", prompt)
+        cached = self._cached_response(cache_key)
+        if cached is not None:
+            return cached
+
+        if self.enable_soft_retry:
+            text = await self._agenerate_text_with_soft_retry(prompt, max_retries)
+        else:
+            text = await self._agenerate_text_base(prompt, max_retries)
+        self._store_response(cache_key, text)
+        return text
+
+    def _text_from_response(self, response, prompt: str) -> str:
+        """Extract the generated text, raising ProhibitedException on safety blocks."""
+        # Prefer direct text if present (property or callable)
+        response_text = None
+        if response and hasattr(response, 'text'):
+            try:
+                response_text = response.text() if callable(response.text) else response.text
+            except Exception:
+                response_text = None
+
+        # Fallback: assemble from candidates/parts
+        if not response_text:
+            try:
+                parts = response.candidates[0].content.parts
+                response_text = ''.join(getattr(p, 'text', '') for p in parts)
+            except Exception:
+                response_text = None
+
+        if response_text:
+            self._emit_usage_event(response)
+            return str(response_text).strip()
+
+        # Safety block detection
+        if response and hasattr(response, 'prompt_feedback') and getattr(response.prompt_feedback, 'block_reason', None):
+            block_reason = response.prompt_feedback.block_reason
+            # This is a non-retriable error - raise ProhibitedException
+            raise ProhibitedException(
+                message=f"Prompt blocked by safety settings. Reason: {block_reason}",
+                prompt=prompt,
+                api_response=str(response.prompt_feedback) if hasattr(response, 'prompt_feedback') else None,
+                api_call_type="text_generation"
+            )
+
+        # Otherwise, treat as invalid/empty response
+        raise ValueError("API returned an empty or invalid response.")
+
     def _generate_text_base(self, prompt: str, max_retries: int = 3) -> str:
         """
         Base text generation method without soft retry logic.
         """
         last_error: Exception | None = None
         for attempt in range(max_retries):
+            api_key: Optional[str] = None
             try:
                 api_key, client = self._select_client_for_request()
-                self._pace_requests_if_needed(api_key)
+                reserved = self._pace_requests_if_needed(api_key, prompt)
 
-                response = client.models.generate_content(
-                    model=self.model_name,
-                    contents=prompt,
-                    config=self._build_generation_config(None),
-                )
-                # Prefer direct text if present (property or callable)
-                response_text = None
-                if response and hasattr(response, 'text'):
-                    try:
-                        response_text = response.text() if callable(response.text) else response.text
-                    except Exception:
-                        response_text = None
-
-                # Fallback: assemble from candidates/parts
-                if not response_text:
-                    try:
-                        parts = response.candidates[0].content.parts
-                        response_text = ''.join(getattr(p, 'text', '') for p in parts)
-                    except Exception:
-                        response_text = None
-
-                if response_text:
-                    self._emit_usage_event(response)
-                    return str(response_text).strip()
-
-                # Safety block detection
-                if response and hasattr(response, 'prompt_feedback') and getattr(response.prompt_feedback, 'block_reason', None):
-                    block_reason = response.prompt_feedback.block_reason
-                    # This is a non-retriable error - raise ProhibitedException
-                    raise ProhibitedException(
-                        message=f"Prompt blocked by safety settings. Reason: {block_reason}",
-                        prompt=prompt,
-                        api_response=str(response.prompt_feedback) if hasattr(response, 'prompt_feedback') else None,
-                        api_call_type="text_generation"
+                with span("llm_call", provider="gemini", model=self.model_name, kind="text", attempt=attempt + 1):
+                    response = client.models.generate_content(
+                        model=self.model_name,
+                        contents=prompt,
+                        config=self._build_generation_config(None),
                     )
-
-                # Otherwise, treat as invalid/empty response
-                raise ValueError("API returned an empty or invalid response.")
+                    self._settle_reserved_tokens(api_key, reserved, response)
+                    return self._text_from_response(response, prompt)
 
             except ProhibitedException:
                 raise
 
             except API_ERROR_TYPES as e:
                 last_error = e
-                # Safety signals should route to the sanitizer (do not rotate keys)
-                if _looks_like_safety_block(e):
-                    raise ProhibitedException(
-                        message=_error_message(e),
-                        prompt=prompt,
-                        api_call_type="text_generation",
-                    )
+                delay = self._handle_api_error(
+                    e, prompt, attempt, max_retries, api_key=api_key, api_call_type="text_generation", label="API"
+                )
 
-                if _is_invalid_argument_error(e) or _is_not_found_error(e):
-                    print(f"\nNon-retriable API error: {e}")
-                    raise e
-
-                if _is_permission_denied_error(e):
-                    rotated = self._rotate_or_disable_key(self._active_api_key())
-                    if rotated and attempt < max_retries - 1:
-                        continue
-                    print(f"\nPermission denied API error: {e}")
-                    raise e
-
-                if _is_rate_limited_error(e):
-                    retry_after = _retry_delay_seconds(e)
-                    delay = retry_after if retry_after is not None else self._compute_backoff_seconds(attempt, base=2.0, cap=30.0)
-                    rotated = self._rotate_or_disable_key(self._active_api_key(), cooldown_seconds=delay)
-                    if rotated and attempt < max_retries - 1:
-                        continue
-                    if attempt < max_retries - 1:
-                        time.sleep(delay)
-                        continue
-                    raise Exception(f"All {max_retries} API call attempts failed. Last error: {e}") from e
-
-                # Transient/unknown API errors: retry with backoff
-                delay = _retry_delay_seconds(e)
-                if delay is None:
-                    delay = self._compute_backoff_seconds(attempt, base=1.0, cap=15.0)
-                if attempt < max_retries - 1:
+            except Exception as e:
+                last_error = e
+                delay = self._handle_unexpected_error(e, attempt, max_retries, label="API")
+
+            if delay > 0:
+                with span("retry_backoff", model=self.model_name, attempt=attempt + 1, reason=type(last_error).__name__):
                     time.sleep(delay)
-                    continue
-                raise Exception(f"All {max_retries} API call attempts failed. Last error: {e}") from e
+
+        raise Exception(f"All {max_retries} API call attempts failed. Last error: {last_error}") from last_error
+
+    async def _agenerate_text_base(self, prompt: str, max_retries: int = 3) -> str:
+        """Async version of _generate_text_base."""
+        last_error: Exception | None = None
+        for attempt in range(max_retries):
+            api_key: Optional[str] = None
+            try:
+                api_key, client = await self._aselect_client_for_request()
+                reserved = await self._apace_requests_if_needed(api_key, prompt)
+
+                with span("llm_call", provider="gemini", model=self.model_name, kind="text", attempt=attempt + 1):
+                    response = await self._agenerate_content(
+                        client,
+                        model=self.model_name,
+                        contents=prompt,
+                        config=self._build_generation_config(None),
+                    )
+                    self._settle_reserved_tokens(api_key, reserved, response)
+                    return self._text_from_response(response, prompt)
+
+            except ProhibitedException:
+                raise
+
+            except API_ERROR_TYPES as e:
+                last_error = e
+                delay = self._handle_api_error(
+                    e, prompt, attempt, max_retries, api_key=api_key, api_call_type="text_generation", label="API"
+                )
 
             except Exception as e:
                 last_error = e
-                if isinstance(e, ValueError) and "No usable API keys" in str(e):
-                    raise
-                if attempt < max_retries - 1:
-                    delay = self._compute_backoff_seconds(attempt, base=1.0, cap=10.0)
-                    time.sleep(delay)
-                    continue
-                raise Exception(f"All {max_retries} API call attempts failed. Last error: {e}") from e
+                delay = self._handle_unexpected_error(e, attempt, max_retries, label="API")
+
+            if delay > 0:
+                with span("retry_backoff", model=self.model_name, attempt=attempt + 1, reason=type(last_error).__name__):
+                    await asyncio.sleep(delay)
 
         raise Exception(f"All {max_retries} API call attempts failed. Last error: {last_error}") from last_error
 
@@ -778,6 +945,11 @@ class GeminiModel:
         """
         return self._generate_text_base(prompt, max_retries)
 
+    @async_retry_with_softer_prompt(max_retries=3, delay=2.0)
+    async def _agenerate_text_with_soft_retry(self, prompt: str, max_retries: int = 3) -> str:
+        """Async version of _generate_text_with_soft_retry."""
+        return await self._agenerate_text_base(prompt, max_retries)
+
     # --------------------
     # Structured Output
     # --------------------
@@ -794,147 +966,190 @@ class GeminiModel:
             If response_schema is a dict: Returns a Python dict
             If response_schema is a Pydantic model: Returns an instance of that model
         """
-        # Check if response_schema is a Pydantic model
+        cache_key = self._cache_key("structured", prompt, response_schema)
+        cached = self._cached_response(cache_key, response_schema)
+        if cached is not None:
+            return cached
+
+        result = self._generate_structured_base(prompt, response_schema, max_retries)
+        self._store_response(cache_key, result, response_schema)
+        return result
+
+    async def agenerate_structured(self, prompt: str, response_schema, max_retries: int = 3):
+        """Async version of generate_structured built on the google-genai async client."""
+        cache_key = self._cache_key("structured", prompt, response_schema)
+        cached = self._cached_response(cache_key, response_schema)
+        if cached is not None:
+            return cached
+
+        result = await self._agenerate_structured_base(prompt, response_schema, max_retries)
+        self._store_response(cache_key, result, response_schema)
+        return result
+
+    @staticmethod
+    def _is_pydantic_schema(response_schema) -> bool:
+        """True for Pydantic model classes and type annotations such as list[Model]."""
         from pydantic import BaseModel
-        is_pydantic = False
-        if not isinstance(response_schema, dict):
-            # Check if it's a Pydantic model class or a type annotation
+        if isinstance(response_schema, dict):
+            return False
+        # Check if it's a Pydantic model class or a type annotation
+        try:
+            return issubclass(response_schema, BaseModel)
+        except TypeError:
+            # Could be a list[Model] or other type annotation
+            return True
+
+    def _structured_config(self, response_schema):
+        # Note: For structured output, passing schema either via generation_config
+        # or constructor works; we pass here to avoid global state on the model.
+        return self._build_generation_config({
+            "response_mime_type": "application/json",
+            "response_schema": response_schema,
+        })
+
+    def _structured_from_response(self, response, prompt: str, is_pydantic: bool):
+        """Parse a structured response, raising ProhibitedException on safety blocks."""
+        # Safety block detection (route to sanitizer; do not rotate keys)
+        if response and hasattr(response, "prompt_feedback") and getattr(response.prompt_feedback, "block_reason", None):
+            block_reason = response.prompt_feedback.block_reason
+            raise ProhibitedException(
+                message=f"Prompt blocked by safety settings. Reason: {block_reason}",
+                prompt=prompt,
+                api_response=str(response.prompt_feedback),
+                api_call_type="structured_output",
+            )
+
+        # If using Pydantic models, use the parsed response
+        if is_pydantic:
+            if hasattr(response, 'parsed') and response.parsed is not None:
+                self._emit_usage_event(response)
+                return response.parsed
+            else:
+                # For Pydantic models, parsed response is required
+                raise ValueError("Structured output failed: No parsed response available. This may indicate the response was truncated or malformed.")
+
+        # Only for dict schemas (backward compatibility)
+        response_text = None
+
+        if response and hasattr(response, 'text'):
+            if callable(response.text):
+                response_text = response.text()
+            else:
+                response_text = response.text
+
+        # If no text directly available, try to extract from candidates
+        if not response_text:
             try:
-                if issubclass(response_schema, BaseModel):
-                    is_pydantic = True
-            except TypeError:
-                # Could be a list[Model] or other type annotation
-                is_pydantic = True
-        
+                parts = response.candidates[0].content.parts
+                response_text = ''.join(getattr(p, 'text', '') for p in parts)
+            except Exception:
+                pass
+
+        parsed_response = None
+        parse_error = None
+        cleaned_text = None
+
+        if response_text:
+            cleaned_text = self._clean_json_text(response_text)
+            try:
+                parsed_response = json.loads(cleaned_text)
+            except json.JSONDecodeError as e:
+                self._log_json_parse_error(cleaned_text, e)
+                parse_error = e
+
+        if parsed_response is None:
+            parsed_response = self._extract_structured_payload(response, cleaned_text)
+
+        if parsed_response is None and parse_error is None:
+            parsed_response = {}
+
+        if parsed_response is not None:
+            self._emit_usage_event(response)
+            return parsed_response
+
+        if parse_error is not None:
+            raise ValueError(f"Failed to parse JSON response: {parse_error}")
+
+        raise ValueError("Structured API returned an empty response.")
+
+    def _generate_structured_base(self, prompt: str, response_schema, max_retries: int = 3):
+        """Structured generation without the response cache."""
+        is_pydantic = self._is_pydantic_schema(response_schema)
+
         # We do not use soft retry here by default, because schema prompts are minimal.
         # If desired, we could add a similar decorator later.
         last_error: Exception | None = None
         for attempt in range(max_retries):
+            api_key: Optional[str] = None
             try:
-                # Note: For structured output, passing schema either via generation_config
-                # or constructor works; we pass here to avoid global state on the model.
                 api_key, client = self._select_client_for_request()
-                self._pace_requests_if_needed(api_key)
-
-                response = client.models.generate_content(
-                    model=self.model_name,
-                    contents=prompt,
-                    config=self._build_generation_config({
-                        "response_mime_type": "application/json",
-                        "response_schema": response_schema,
-                    }),
-                )
+                reserved = self._pace_requests_if_needed(api_key, prompt)
 
-                # Safety block detection (route to sanitizer; do not rotate keys)
-                if response and hasattr(response, "prompt_feedback") and getattr(response.prompt_feedback, "block_reason", None):
-                    block_reason = response.prompt_feedback.block_reason
-                    raise ProhibitedException(
-                        message=f"Prompt blocked by safety settings. Reason: {block_reason}",
-                        prompt=prompt,
-                        api_response=str(response.prompt_feedback),
-                        api_call_type="structured_output",
+                with span("llm_call", provider="gemini", model=self.model_name, kind="structured", attempt=attempt + 1):
+                    response = client.models.generate_content(
+                        model=self.model_name,
+                        contents=prompt,
+                        config=self._structured_config(response_schema),
                     )
-                
-                # If using Pydantic models, use the parsed response
-                if is_pydantic:
-                    if hasattr(response, 'parsed') and response.parsed is not None:
-                        self._emit_usage_event(response)
-                        return response.parsed
-                    else:
-                        # For Pydantic models, parsed response is required
-                        raise ValueError("Structured output failed: No parsed response available. This may indicate the response was truncated or malformed.")
-
-                # Only for dict schemas (backward compatibility)
-                import json as _json
-                response_text = None
+                    self._settle_reserved_tokens(api_key, reserved, response)
+                    return self._structured_from_response(response, prompt, is_pydantic)
 
-                if response and hasattr(response, 'text'):
-                    if callable(response.text):
-                        response_text = response.text()
-                    else:
-                        response_text = response.text
-
-                # If no text directly available, try to extract from candidates
-                if not response_text:
-                    try:
-                        parts = response.candidates[0].content.parts
-                        response_text = ''.join(getattr(p, 'text', '') for p in parts)
-                    except Exception:
-                        pass
+            except ProhibitedException:
+                raise
 
-                parsed_response = None
-                parse_error = None
-                cleaned_text = None
+            except API_ERROR_TYPES as e:
+                last_error = e
+                delay = self._handle_api_error(
+                    e, prompt, attempt, max_retries, api_key=api_key, api_call_type="structured_output", label="structured API"
+                )
 
-                if response_text:
-                    cleaned_text = self._clean_json_text(response_text)
-                    try:
-                        parsed_response = _json.loads(cleaned_text)
-                    except _json.JSONDecodeError as e:
-                        self._log_json_parse_error(cleaned_text, e)
-                        parse_error = e
+            except Exception as e:
+                last_error = e
+                delay = self._handle_unexpected_error(e, attempt, max_retries, label="structured API")
 
-                if parsed_response is None:
-                    parsed_response = self._extract_structured_payload(response, cleaned_text)
+            if delay > 0:
+                with span("retry_backoff", model=self.model_name, attempt=attempt + 1, reason=type(last_error).__name__):
+                    time.sleep(delay)
 
-                if parsed_response is None and parse_error is None:
-                    parsed_response = {}
+        raise Exception(f"All {max_retries} structured API call attempts failed. Last error: {last_error}") from last_error
 
-                if parsed_response is not None:
-                    self._emit_usage_event(response)
-                    return parsed_response
+    async def _agenerate_structured_base(self, prompt: str, response_schema, max_retries: int = 3):
+        """Async version of _generate_structured_base."""
+        is_pydantic = self._is_pydantic_schema(response_schema)
 
-                if parse_error is not None:
-                    raise ValueError(f"Failed to parse JSON response: {parse_error}")
+        last_error: Exception | None = None
+        for attempt in range(max_retries):
+            api_key: Optional[str] = None
+            try:
+                api_key, client = await self._aselect_client_for_request()
+                reserved = await self._apace_requests_if_needed(api_key, prompt)
+
+                with span("llm_call", provider="gemini", model=self.model_name, kind="structured", attempt=attempt + 1):
+                    response = await self._agenerate_content(
+                        client,
+                        model=self.model_name,
+                        contents=prompt,
+                        config=self._structured_config(response_schema),
+                    )
+                    self._settle_reserved_tokens(api_key, reserved, response)
+                    return self._structured_from_response(response, prompt, is_pydantic)
 
-                raise ValueError("Structured API returned an empty response.")
+            except ProhibitedException:
+                raise
 
             except API_ERROR_TYPES as e:
                 last_error = e
-                if _looks_like_safety_block(e):
-                    raise ProhibitedException(
-                        message=_error_message(e),
-                        prompt=prompt,
-                        api_call_type="structured_output",
-                    )
-                if _is_invalid_argument_error(e) or _is_not_found_error(e):
-                    print(f"\nNon-retriable structured API error: {e}")
-                    raise e
-                if _is_permission_denied_error(e):
-                    rotated = self._rotate_or_disable_key(self._active_api_key())
-                    if rotated and attempt < max_retries - 1:
-                        continue
-                    print(f"\nPermission denied structured API error: {e}")
-                    raise e
-                if _is_rate_limited_error(e):
-                    retry_after = _retry_delay_seconds(e)
-                    delay = retry_after if retry_after is not None else self._compute_backoff_seconds(attempt, base=2.0, cap=30.0)
-                    rotated = self._rotate_or_disable_key(self._active_api_key(), cooldown_seconds=delay)
-                    if rotated and attempt < max_retries - 1:
-                        continue
-                    if attempt < max_retries - 1:
-                        time.sleep(delay)
-                        continue
-                    raise Exception(f"All {max_retries} structured API call attempts failed. Last error: {e}") from e
-
-                delay = _retry_delay_seconds(e)
-                if delay is None:
-                    delay = self._compute_backoff_seconds(attempt, base=1.0, cap=15.0)
-                if attempt < max_retries - 1:
-                    time.sleep(delay)
-                    continue
-                raise Exception(f"All {max_retries} structured API call attempts failed. Last error: {e}") from e
+                delay = self._handle_api_error(
+                    e, prompt, attempt, max_retries, api_key=api_key, api_call_type="structured_output", label="structured API"
+                )
+
             except Exception as e:
                 last_error = e
-                if isinstance(e, ProhibitedException):
-                    raise
-                if isinstance(e, ValueError) and "No usable API keys" in str(e):
-                    raise
-                if attempt < max_retries - 1:
-                    delay = self._compute_backoff_seconds(attempt, base=1.0, cap=10.0)
-                    time.sleep(delay)
-                    continue
-                raise Exception(f"All {max_retries} structured API call attempts failed. Last error: {e}") from e
+                delay = self._handle_unexpected_error(e, attempt, max_retries, label="structured API")
+
+            if delay > 0:
+                with span("retry_backoff", model=self.model_name, attempt=attempt + 1, reason=type(last_error).__name__):
+                    await asyncio.sleep(delay)
 
         raise Exception(f"All {max_retries} structured API call attempts failed. Last error: {last_error}") from last_error
 
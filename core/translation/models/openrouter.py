@@ -1,11 +1,17 @@
+import asyncio
+import httpx
 import requests
-import json
-import time
 from datetime import datetime
-from typing import Any, Callable, Dict, List, Optional
-from ...utils.retry import retry_with_softer_prompt
+from typing import Any, Callable, Dict, Optional
+from ...utils import metrics
+from ...utils.retry import async_retry_with_softer_prompt
+from ...utils.token_budget import estimate_tokens
+from ...utils.tracing import span
 from shared.errors import ProhibitedException
 from ..usage_tracker import UsageEvent
+from .rate_limiter import RateLimiter
+from .response_cache import ResponseCache
+from .async_http import get_async_client, run_sync
 
 class OpenRouterModel:
     """
@@ -22,6 +28,9 @@ class OpenRouterModel:
         generation_config: Dict[str, Any] | None = None,
         usage_callback: Callable[[UsageEvent], None] | None = None,
         native_gemini_api_key: Optional[str] = None,
+        response_cache: ResponseCache | None = None,
+        requests_per_minute: int | None = None,
+        tokens_per_minute: int | None = None,
         **kwargs,
     ):
         """
@@ -30,6 +39,9 @@ class OpenRouterModel:
         Args:
             api_key (str): The OpenRouter API key.
             model_name (str): The model to use via OpenRouter (e.g., "openai/gpt-4o").
+            response_cache (ResponseCache, optional): Persistent cache; identical requests are answered from it.
+            requests_per_minute (int, optional): Request limit for the key, shared across workers via Redis.
+            tokens_per_minute (int, optional): Token limit for the key, shared across workers via Redis.
             **kwargs: Additional keyword arguments (for compatibility, not all are used).
         """
         if not api_key.startswith("sk-or-"):
@@ -47,11 +59,14 @@ class OpenRouterModel:
         self.usage_callback = usage_callback
         self.last_usage: UsageEvent | None = None
         self.native_gemini_api_key = native_gemini_api_key
+        self.response_cache = response_cache
+        rate_limiter = RateLimiter(requests_per_minute or 0, tokens_per_minute or 0, namespace="openrouter")
+        self.rate_limiter = rate_limiter if rate_limiter.enabled else None
 
-    def _emit_usage_event(self, result: Dict[str, Any]) -> None:
+    def _emit_usage_event(self, result: Dict[str, Any]) -> Optional[UsageEvent]:
         usage = result.get('usage') if isinstance(result, dict) else None
         if not isinstance(usage, dict):
-            return
+            return None
 
         prompt = usage.get('prompt_tokens', usage.get('input_tokens', 0))
         completion = usage.get('completion_tokens', usage.get('output_tokens', 0))
@@ -77,17 +92,44 @@ class OpenRouterModel:
             total_tokens=total_tokens,
             timestamp=datetime.utcnow(),
         )
+        self._record_usage_event(event)
+        return event
+
+    def _record_usage_event(self, event: UsageEvent) -> None:
         self.last_usage = event
+        metrics.record_usage(event)
         if self.usage_callback:
             try:
                 self.usage_callback(event)
             except Exception as exc:  # pragma: no cover
                 print(f"[OpenRouterModel] Failed to emit usage event: {exc}")
 
+    def _cache_key(self, kind: str, prompt: str, response_schema=None) -> Optional[str]:
+        if self.response_cache is None:
+            return None
+        return self.response_cache.build_key(kind, self.model_name, self.generation_config, prompt, response_schema)
+
+    def _cached_response(self, cache_key: Optional[str], response_schema=None):
+        """Return a cached response and report it as a zero-token, cached usage event."""
+        if cache_key is None:
+            return None
+        cached = self.response_cache.get(cache_key, response_schema)
+        if cached is not None:
+            self._record_usage_event(UsageEvent(model_name=self.model_name, timestamp=datetime.utcnow(), cached=True))
+        return cached
+
+    def _store_response(self, cache_key: Optional[str], value, response_schema=None) -> None:
+        if cache_key is None:
+            return
+        self.response_cache.put(cache_key, value, model_name=self.model_name, response_schema=response_schema)
+
     def generate_text(self, prompt: str, max_retries: int = 3) -> str:
         """
         Generates text using the specified OpenRouter model.
 
+        Synchronous wrapper around agenerate_text; requests run on the shared
+        model I/O loop so all callers reuse one connection pool.
+
         Args:
             prompt (str): The prompt to send to the model.
             max_retries (int): Maximum number of retries for transient errors.
@@ -98,15 +140,24 @@ class OpenRouterModel:
         Raises:
             Exception: If the API call fails.
         """
+        return run_sync(self.agenerate_text(prompt, max_retries))
+
+    async def agenerate_text(self, prompt: str, max_retries: int = 3) -> str:
+        """Async version of generate_text."""
+        cache_key = self._cache_key("text", prompt)
+        cached = self._cached_response(cache_key)
+        if cached is not None:
+            return cached
+
         if self.enable_soft_retry:
-            return self._generate_text_with_soft_retry(prompt, max_retries)
+            text = await self._agenerate_text_with_soft_retry(prompt, max_retries)
         else:
-            return self._generate_text_base(prompt, max_retries)
-    
-    def _generate_text_base(self, prompt: str, max_retries: int = 3) -> str:
-        """
-        Base text generation method with retry logic for transient errors.
-        """
+            text = await self._agenerate_text_base(prompt, max_retries)
+        self._store_response(cache_key, text)
+        return text
+
+    def _build_request_body(self, prompt: str) -> Dict[str, Any]:
+        """Build the chat completion request body, mapping the shared generation_config."""
         # Map shared generation_config to OpenAI-compatible fields
         max_output_tokens = self.generation_config.get("max_output_tokens")
         temperature = self.generation_config.get("temperature")
@@ -126,62 +177,82 @@ class OpenRouterModel:
             body["temperature"] = float(temperature)
         if isinstance(top_p, (int, float)):
             body["top_p"] = float(top_p)
-        
+        return body
+    
+    async def _agenerate_text_base(self, prompt: str, max_retries: int = 3) -> str:
+        """
+        Base text generation method with retry logic for transient errors.
+        """
+        body = self._build_request_body(prompt)
+        client = get_async_client()
+        reserved = 2 * estimate_tokens(prompt) if self.rate_limiter and self.rate_limiter.tokens_per_minute else 0
+
         for attempt in range(max_retries):
             try:
-                response = requests.post(
-                    f"{self.BASE_URL}/chat/completions",
-                    headers=self.headers,
-                    json=body,
-                    timeout=300  # 5 minutes timeout
-                )
-                
-                # Check for content policy violations
-                if response.status_code == 400:
-                    error_data = response.json()
-                    error_msg = error_data.get('error', {}).get('message', '')
-                    if 'content policy' in error_msg.lower() or 'prohibited' in error_msg.lower():
-                        raise ProhibitedException(
-                            message=f"Content blocked by OpenRouter: {error_msg}",
-                            prompt=prompt,
-                            api_response=str(error_data),
-                            api_call_type="text_generation"
-                        )
-                
-                response.raise_for_status()  # Raise an exception for bad status codes
-                
-                result = response.json()
-                self._emit_usage_event(result)
-                content = result['choices'][0]['message']['content']
-                return content
+                if self.rate_limiter:
+                    await self.rate_limiter.async_wait(self.api_key, reserved)
+                with span("llm_call", provider="openrouter", model=self.model_name, kind="text", attempt=attempt + 1):
+                    response = await client.post(
+                        f"{self.BASE_URL}/chat/completions",
+                        headers=self.headers,
+                        json=body,
+                    )
+
+                    # Check for content policy violations
+                    if response.status_code == 400:
+                        error_data = response.json()
+                        error_msg = error_data.get('error', {}).get('message', '')
+                        if 'content policy' in error_msg.lower() or 'prohibited' in error_msg.lower():
+                            raise ProhibitedException(
+                                message=f"Content blocked by OpenRouter: {error_msg}",
+                                prompt=prompt,
+                                api_response=str(error_data),
+                                api_call_type="text_generation"
+                            )
+
+                    response.raise_for_status()  # Raise an exception for bad status codes
+
+                    result = response.json()
+                    event = self._emit_usage_event(result)
+                    if reserved and event is not None:
+                        self.rate_limiter.settle(self.api_key, reserved, event.total_tokens)
+                    content = result['choices'][0]['message']['content']
+                    return content
 
             except ProhibitedException:
                 # Re-raise ProhibitedException without retrying
                 raise
             
-            except requests.exceptions.Timeout as e:
+            except httpx.TimeoutException as e:
                 # Timeout is retriable
                 print(f"\nTimeout on attempt {attempt + 1}/{max_retries}. Error: {e}")
                 if attempt < max_retries - 1:
                     print("Retrying in 5 seconds...")
-                    time.sleep(5)
+                    await asyncio.sleep(5)
                 else:
                     raise Exception(f"All {max_retries} API call attempts timed out. Last error: {e}")
             
-            except requests.exceptions.RequestException as e:
+            except httpx.HTTPStatusError as e:
                 # Check if it's a rate limit or server error (retriable)
-                if hasattr(e, 'response') and e.response:
-                    if e.response.status_code in [429, 500, 502, 503, 504]:
-                        print(f"\nRetriable error on attempt {attempt + 1}/{max_retries}. Status: {e.response.status_code}")
-                        if attempt < max_retries - 1:
-                            wait_time = min(5 * (2 ** attempt), 30)  # Exponential backoff, max 30s
-                            print(f"Retrying in {wait_time} seconds...")
-                            time.sleep(wait_time)
-                            continue
+                if e.response.status_code in [429, 500, 502, 503, 504]:
+                    print(f"\nRetriable error on attempt {attempt + 1}/{max_retries}. Status: {e.response.status_code}")
+                    if attempt < max_retries - 1:
+                        wait_time = min(5 * (2 ** attempt), 30)  # Exponential backoff, max 30s
+                        print(f"Retrying in {wait_time} seconds...")
+                        await asyncio.sleep(wait_time)
+                        continue
                 
                 # Non-retriable error
                 print(f"\nNon-retriable OpenRouter API error: {e}")
                 raise Exception(f"OpenRouter API request failed: {e}")
+
+            except httpx.TransportError as e:
+                # Dropped/refused connections are retriable
+                print(f"\nConnection error on attempt {attempt + 1}/{max_retries}. Error: {e}")
+                if attempt < max_retries - 1:
+                    await asyncio.sleep(min(5 * (2 ** attempt), 30))
+                    continue
+                raise Exception(f"OpenRouter API request failed: {e}")
             
             except (KeyError, IndexError) as e:
                 print(f"Error parsing OpenRouter response: {e}")
@@ -190,70 +261,95 @@ class OpenRouterModel:
         # Should not be reached
         raise Exception(f"All {max_retries} API call attempts failed")
     
-    @retry_with_softer_prompt(max_retries=3, delay=2.0)
-    def _generate_text_with_soft_retry(self, prompt: str, max_retries: int = 3) -> str:
+    @async_retry_with_softer_prompt(max_retries=3, delay=2.0)
+    async def _agenerate_text_with_soft_retry(self, prompt: str, max_retries: int = 3) -> str:
         """
         Text generation with soft retry logic for ProhibitedException.
         The decorator will automatically retry with softer prompts.
         """
-        return self._generate_text_base(prompt, max_retries)
+        return await self._agenerate_text_base(prompt, max_retries)
 
     # --------------------
     # Structured Output
     # --------------------
-    def generate_structured(self, prompt: str, response_schema, max_retries: int = 3):
+    def _native_gemini_model(self):
         """
-        Structured output using OpenRouter (OpenAI-compatible chat API).
+        Return a native GeminiModel for Gemini engines routed via OpenRouter, or None.
 
-        Behavior mirrors GeminiModel.generate_structured:
-        - If response_schema is a Pydantic model: returns an instance, requires valid JSON
-        - If response_schema is a dict (JSON schema): returns parsed Python dict
-        - Adds JSON-only instructions and attempts to enforce JSON mode when supported
+        Structured output uses the native Gemini API for best compatibility.
         """
-        # Defer import to keep optional dependency light
-        from pydantic import BaseModel  # type: ignore
-
-        is_pydantic = False
-        if not isinstance(response_schema, dict):
-            try:
-                if issubclass(response_schema, BaseModel):
-                    is_pydantic = True
-            except TypeError:
-                is_pydantic = True
-
-        # If the selected model is a Gemini engine routed via OpenRouter and a native Gemini key is available,
-        # use native Gemini structured output for best compatibility.
         model_lower = (self.model_name or "").lower()
         is_gemini_via_openrouter = (
             model_lower.startswith("google/") or model_lower.startswith("gemini-") or "gemini" in model_lower
         )
+        if not is_gemini_via_openrouter:
+            return None
         try:
             from core.translation.models.gemini import GeminiModel as _GeminiModel  # type: ignore
             from core.config.loader import load_config as _load_config  # type: ignore
         except Exception:
-            _GeminiModel = None
-            _load_config = None
+            return None
+
+        try:
+            cfg = _load_config()
+            gemini_api_key = self.native_gemini_api_key or cfg.get("gemini_api_key")
+            if not gemini_api_key:
+                return None
+            return _GeminiModel(
+                api_key=gemini_api_key,
+                model_name=model_lower.replace("google/", ""),
+                safety_settings=cfg.get("safety_settings", []),
+                generation_config=cfg.get("generation_config", {}),
+                enable_soft_retry=cfg.get("enable_soft_retry", True),
+            )
+        except Exception:
+            return None
 
-        if is_gemini_via_openrouter and _GeminiModel and _load_config:
+    def generate_structured(self, prompt: str, response_schema, max_retries: int = 3):
+        """
+        Structured output for Gemini engines routed via OpenRouter.
+
+        Behavior mirrors GeminiModel.generate_structured:
+        - If response_schema is a Pydantic model: returns an instance, requires valid JSON
+        - If response_schema is a dict (JSON schema): returns parsed Python dict
+        - Requests go to the native Gemini API when a Gemini key is available
+        """
+        native = self._native_gemini_model()
+        if native is not None:
+            cache_key = self._cache_key("structured", prompt, response_schema)
+            cached = self._cached_response(cache_key, response_schema)
+            if cached is not None:
+                return cached
             try:
-                cfg = _load_config()
-                gemini_api_key = self.native_gemini_api_key or cfg.get("gemini_api_key")
-                if gemini_api_key:
-                    native = _GeminiModel(
-                        api_key=gemini_api_key,
-                        model_name=model_lower.replace("google/", ""),
-                        safety_settings=cfg.get("safety_settings", []),
-                        generation_config=cfg.get("generation_config", {}),
-                        enable_soft_retry=cfg.get("enable_soft_retry", True),
-                    )
-                    return native.generate_structured(prompt, response_schema, max_retries=max_retries)
+                result = native.generate_structured(prompt, response_schema, max_retries=max_retries)
             except Exception:
-                # Fall back to OpenRouter path below on any failure
-                pass
+                # Surface the same error as the unsupported path below
+                result = None
+            if result is not None:
+                self._store_response(cache_key, result, response_schema)
+                return result
 
         # Non-Gemini engines via OpenRouter: explicitly not supported for structured output
         raise NotImplementedError("Structured output is only supported for Gemini models.")
 
+    async def agenerate_structured(self, prompt: str, response_schema, max_retries: int = 3):
+        """Async version of generate_structured."""
+        native = self._native_gemini_model()
+        if native is not None:
+            cache_key = self._cache_key("structured", prompt, response_schema)
+            cached = self._cached_response(cache_key, response_schema)
+            if cached is not None:
+                return cached
+            try:
+                result = await native.agenerate_structured(prompt, response_schema, max_retries=max_retries)
+            except Exception:
+                result = None
+            if result is not None:
+                self._store_response(cache_key, result, response_schema)
+                return result
+
+        raise NotImplementedError("Structured output is only supported for Gemini models.")
+
     @classmethod
     def validate_api_key(cls, api_key: str, model_name: str = None) -> bool:
         """
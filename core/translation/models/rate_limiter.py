@@ -0,0 +1,376 @@
+"""
+Distributed rate limiting for model API keys.
+
+RateLimiter keeps two token buckets per API key: one for requests per minute and
+one for tokens per minute. Bucket state lives in Redis when REDIS_URL is reachable,
+so every Celery worker and the API process draw from the same budget. Without
+Redis, each process keeps its own buckets.
+
+- Bursts: a bucket holds `burst` of a minute's budget (at least one request or one
+  call's tokens) and refills continuously.
+- Priorities: a request may only take from a bucket while the level stays above
+  its queue's reserve (QUEUE_RESERVES). Translation can drain the key;
+  illustrations leave 30% of it for the other queues. A key's bucket keeps filling
+  past its capacity by the largest reserve, which is never spent: when the capacity
+  is a single request (low rates), lower-priority queues still wait for the key to
+  stay idle a little longer.
+- Fair share: jobs that used a key in the last `active_seconds` split its rate
+  evenly. Each job (queue and job id) has its own buckets sized to that share.
+- Tokens: callers reserve an estimate before the call and settle() the difference
+  once the response reports its usage.
+
+The queue and job of a request come from rate_limit_scope(), which the Celery
+tasks enter; code running outside a scope is accounted as the "default" queue.
+"""
+
+import asyncio
+import contextvars
+import hashlib
+import math
+import os
+import random
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from ...utils.tracing import span
+
+# Share of each bucket a queue leaves for higher-priority queues
+QUEUE_RESERVES: Dict[str, float] = {
+    "translation": 0.0,
+    "post_edit": 0.1,
+    "validation": 0.2,
+    "illustrations": 0.3,
+}
+DEFAULT_RESERVE = 0.2
+MAX_RESERVE = max(DEFAULT_RESERVE, *QUEUE_RESERVES.values())
+
+_scope: contextvars.ContextVar[Tuple[str, str]] = contextvars.ContextVar("rate_limit_scope", default=("default", "-"))
+
+# Buckets of the key and of the calling job; see _LocalBuckets.acquire for the same
+# logic in Python. Levels may go negative when settle() charges more tokens than
+# were reserved; the debt is paid back by the refill.
+_ACQUIRE_SCRIPT = """
+local now = tonumber(ARGV[1])
+local rpm = tonumber(ARGV[2])
+local tpm = tonumber(ARGV[3])
+local cost = tonumber(ARGV[4])
+local reserve = tonumber(ARGV[5])
+local burst = tonumber(ARGV[6])
+local job = ARGV[7]
+local window = tonumber(ARGV[8])
+local max_reserve = tonumber(ARGV[9])
+
+redis.call('ZADD', KEYS[3], now, job)
+redis.call('ZREMRANGEBYSCORE', KEYS[3], '-inf', now - window)
+local jobs = math.max(1, redis.call('ZCARD', KEYS[3]))
+
+local function load(key, fill_r, fill_t, rate_r, rate_t)
+  local state = redis.call('HMGET', key, 'r', 't', 'ts')
+  local r, t, ts = tonumber(state[1]), tonumber(state[2]), tonumber(state[3])
+  if not ts then
+    return fill_r, fill_t
+  end
+  local elapsed = math.max(0, now - ts)
+  return math.min(fill_r, r + elapsed * rate_r), math.min(fill_t, t + elapsed * rate_t)
+end
+
+local function shortfall(level, need, rate)
+  if rate <= 0 or level >= need then
+    return 0
+  end
+  return (need - level) / rate
+end
+
+local rate_r, rate_t = rpm / 60000.0, tpm / 60000.0
+local cap_r = math.max(1, rpm * burst)
+local cap_t = math.max(cost, tpm * burst)
+local fill_r = math.max(cap_r, 1 + max_reserve * cap_r)
+local fill_t = math.max(cap_t, cost + max_reserve * cap_t)
+local job_cap_r = math.max(1, cap_r / jobs)
+local job_cap_t = math.max(cost, cap_t / jobs)
+
+local key_r, key_t = load(KEYS[1], fill_r, fill_t, rate_r, rate_t)
+local job_r, job_t = load(KEYS[2], job_cap_r, job_cap_t, rate_r / jobs, rate_t / jobs)
+
+local wait = math.max(
+  shortfall(key_r, 1 + reserve * cap_r, rate_r),
+  shortfall(key_t, cost + reserve * cap_t, rate_t),
+  shortfall(job_r, 1, rate_r / jobs),
+  shortfall(job_t, cost, rate_t / jobs)
+)
+if wait <= 0 then
+  -- Only the capacity can be spent; the level above it just records idle time
+  key_r, key_t = math.min(key_r, cap_r) - 1, math.min(key_t, cap_t) - cost
+  job_r, job_t = job_r - 1, job_t - cost
+end
+
+local ttl = math.ceil(math.max(window, 120000))
+redis.call('HSET', KEYS[1], 'r', key_r, 't', key_t, 'ts', now)
+redis.call('HSET', KEYS[2], 'r', job_r, 't', job_t, 'ts', now)
+redis.call('PEXPIRE', KEYS[1], ttl)
+redis.call('PEXPIRE', KEYS[2], ttl)
+redis.call('PEXPIRE', KEYS[3], ttl)
+return math.ceil(wait)
+"""
+
+# Token corrections only apply to buckets that still exist: a bucket that expired is
+# full again, and a hash without 'ts' would be read back as empty.
+_SETTLE_SCRIPT = """
+for _, key in ipairs(KEYS) do
+  if redis.call('HEXISTS', key, 'ts') == 1 then
+    redis.call('HINCRBYFLOAT', key, 't', ARGV[1])
+  end
+end
+return 0
+"""
+
+
+@contextmanager
+def rate_limit_scope(queue: Optional[str] = None, job_id=None) -> Iterator[None]:
+    """Account the model requests of the enclosed block to a queue and a job."""
+    token = _scope.set((queue or "default", str(job_id) if job_id is not None else "-"))
+    try:
+        yield
+    finally:
+        _scope.reset(token)
+
+
+def current_scope() -> Tuple[str, str]:
+    """(queue, job id) the model requests of this context are accounted to."""
+    return _scope.get()
+
+
+def _key_id(api_key: str) -> str:
+    """Stable, non-reversible identifier for an API key (for logs/Redis keys)."""
+    return hashlib.sha256(api_key.encode("utf-8")).hexdigest()[:12]
+
+
+class _LocalBuckets:
+    """In-process buckets with the same rules as _ACQUIRE_SCRIPT (used without Redis)."""
+
+    MAX_BUCKETS = 1000
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._levels: Dict[str, List[float]] = {}
+        self._active: Dict[str, Dict[str, float]] = {}
+
+    def _load(self, key: str, now: float, fill_r: float, fill_t: float, rate_r: float, rate_t: float) -> List[float]:
+        state = self._levels.get(key)
+        if state is None:
+            return [fill_r, fill_t, now]
+        elapsed = max(0.0, now - state[2])
+        return [min(fill_r, state[0] + elapsed * rate_r), min(fill_t, state[1] + elapsed * rate_t), now]
+
+    def acquire(
+        self, key: str, job_key: str, job: str, now: float, rpm: int, tpm: int, cost: float,
+        reserve: float, burst: float, window: float,
+    ) -> float:
+        """Take one request and `cost` tokens, or return the ms to wait before trying again."""
+        with self._lock:
+            active = self._active.setdefault(key, {})
+            active[job] = now
+            for other, seen in list(active.items()):
+                if seen < now - window:
+                    del active[other]
+            jobs = max(1, len(active))
+
+            rate_r, rate_t = rpm / 60000.0, tpm / 60000.0
+            cap_r = max(1.0, rpm * burst)
+            cap_t = max(cost, tpm * burst)
+            key_state = self._load(
+                key, now, max(cap_r, 1 + MAX_RESERVE * cap_r), max(cap_t, cost + MAX_RESERVE * cap_t),
+                rate_r, rate_t,
+            )
+            job_state = self._load(
+                job_key, now, max(1.0, cap_r / jobs), max(cost, cap_t / jobs), rate_r / jobs, rate_t / jobs
+            )
+            wait = max(
+                _shortfall(key_state[0], 1 + reserve * cap_r, rate_r),
+                _shortfall(key_state[1], cost + reserve * cap_t, rate_t),
+                _shortfall(job_state[0], 1, rate_r / jobs),
+                _shortfall(job_state[1], cost, rate_t / jobs),
+            )
+            if wait <= 0:
+                # Only the capacity can be spent; the level above it just records idle time
+                key_state[0] = min(key_state[0], cap_r) - 1
+                key_state[1] = min(key_state[1], cap_t) - cost
+                job_state[0] -= 1
+                job_state[1] -= cost
+            self._levels[key] = key_state
+            self._levels[job_key] = job_state
+            if len(self._levels) > self.MAX_BUCKETS:
+                # Buckets idle for two minutes are full again; forget them
+                for name, state in list(self._levels.items()):
+                    if state[2] < now - 120000:
+                        del self._levels[name]
+            return float(math.ceil(wait))
+
+    def adjust_tokens(self, keys: Tuple[str, ...], delta: float) -> None:
+        with self._lock:
+            for key in keys:
+                if key in self._levels:
+                    self._levels[key][1] += delta
+
+
+def _shortfall(level: float, need: float, rate: float) -> float:
+    if rate <= 0 or level >= need:
+        return 0.0
+    return (need - level) / rate
+
+
+class RateLimiter:
+    """
+    Requests-per-minute and tokens-per-minute limits per API key, shared across
+    processes through Redis.
+
+    Args:
+        requests_per_minute: Requests per key and minute (0 = unlimited)
+        tokens_per_minute: Prompt plus output tokens per key and minute (0 = unlimited)
+        namespace: Redis key prefix; models with separate quotas use separate namespaces
+        redis_url: Defaults to REDIS_URL; without it, limits hold per process
+        burst: Share of a minute's budget that may be spent at once
+        active_seconds: How long a job counts towards the fair share after its last request
+    """
+
+    # Longest single sleep; waiters re-check so that priorities and shares take effect
+    MAX_SLEEP_SECONDS = 5.0
+    # Seconds before reconnecting after Redis failed
+    REDIS_RETRY_SECONDS = 30.0
+
+    def __init__(
+        self,
+        requests_per_minute: int = 0,
+        tokens_per_minute: int = 0,
+        *,
+        namespace: str = "llm",
+        redis_url: str | None = None,
+        burst: float = 0.1,
+        active_seconds: float = 30.0,
+    ):
+        self.requests_per_minute = max(0, int(requests_per_minute or 0))
+        self.tokens_per_minute = max(0, int(tokens_per_minute or 0))
+        self.namespace = namespace
+        self.burst = burst
+        self.active_seconds = active_seconds
+        self._redis_url = redis_url if redis_url is not None else os.getenv("REDIS_URL")
+        self._redis = None
+        self._script = None
+        self._settle_script = None
+        self._redis_retry_at = 0.0
+        self._redis_lock = threading.Lock()
+        self._local = _LocalBuckets()
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.requests_per_minute or self.tokens_per_minute)
+
+    def _get_redis(self):
+        if not self._redis_url:
+            return None
+        with self._redis_lock:
+            if self._redis is not None or time.monotonic() < self._redis_retry_at:
+                return self._redis
+            try:
+                import redis  # type: ignore
+
+                client = redis.Redis.from_url(self._redis_url, decode_responses=True, socket_timeout=2)
+                client.ping()
+                self._script = client.register_script(_ACQUIRE_SCRIPT)
+                self._settle_script = client.register_script(_SETTLE_SCRIPT)
+                self._redis = client
+            except Exception as e:
+                print(f"Warning: Rate limiter could not reach Redis ({e}); limiting per process.")
+                self._redis_retry_at = time.monotonic() + self.REDIS_RETRY_SECONDS
+            return self._redis
+
+    def _drop_redis(self, error: Exception) -> None:
+        print(f"Warning: Rate limiter Redis call failed ({error}); limiting per process.")
+        with self._redis_lock:
+            self._redis = None
+            self._redis_retry_at = time.monotonic() + self.REDIS_RETRY_SECONDS
+
+    def _keys(self, api_key: str, job: str) -> Tuple[str, str, str]:
+        base = f"ratelimit:{self.namespace}:{_key_id(api_key)}"
+        return base, f"{base}:job:{job}", f"{base}:jobs"
+
+    def try_acquire(self, api_key: str, tokens: int = 0) -> float:
+        """
+        Take a request slot (and `tokens`) for the key if the limits allow it now.
+
+        Returns:
+            0.0 when the request may be sent, otherwise the seconds to wait before
+            trying again (nothing is taken in that case)
+        """
+        if not self.enabled:
+            return 0.0
+        queue, job_id = current_scope()
+        job = f"{queue}:{job_id}"
+        reserve = QUEUE_RESERVES.get(queue, DEFAULT_RESERVE)
+        cost = float(max(0, tokens)) if self.tokens_per_minute else 0.0
+        now_ms = time.time() * 1000.0
+        window_ms = self.active_seconds * 1000.0
+        key, job_key, jobs_key = self._keys(api_key, job)
+
+        client = self._get_redis()
+        if client is not None:
+            try:
+                wait_ms = self._script(
+                    keys=[key, job_key, jobs_key],
+                    args=[int(now_ms), self.requests_per_minute, self.tokens_per_minute, cost,
+                          reserve, self.burst, job, int(window_ms), MAX_RESERVE],
+                )
+                return max(0.0, float(wait_ms)) / 1000.0
+            except Exception as e:
+                self._drop_redis(e)
+
+        wait_ms = self._local.acquire(
+            key, job_key, job, now_ms, self.requests_per_minute, self.tokens_per_minute, cost,
+            reserve, self.burst, window_ms,
+        )
+        return wait_ms / 1000.0
+
+    def _sleep_seconds(self, wait: float) -> float:
+        # Jitter keeps waiters of several workers from retrying in lockstep
+        return min(wait, self.MAX_SLEEP_SECONDS) * (1.0 + 0.1 * random.random())
+
+    def wait(self, api_key: str, tokens: int = 0) -> None:
+        """Block until the key has room for one request of about `tokens` tokens."""
+        wait = self.try_acquire(api_key, tokens)
+        if wait <= 0:
+            return
+        with span("rate_limit_wait", key=_key_id(api_key), queue=current_scope()[0]):
+            while wait > 0:
+                time.sleep(self._sleep_seconds(wait))
+                wait = self.try_acquire(api_key, tokens)
+
+    async def async_wait(self, api_key: str, tokens: int = 0) -> None:
+        """Async version of wait(); yields to the event loop while waiting."""
+        wait = self.try_acquire(api_key, tokens)
+        if wait <= 0:
+            return
+        with span("rate_limit_wait", key=_key_id(api_key), queue=current_scope()[0]):
+            while wait > 0:
+                await asyncio.sleep(self._sleep_seconds(wait))
+                wait = self.try_acquire(api_key, tokens)
+
+    def settle(self, api_key: str, reserved_tokens: int, used_tokens: Optional[int]) -> None:
+        """Correct a token reservation once the response reported its actual usage."""
+        if not self.tokens_per_minute or used_tokens is None:
+            return
+        delta = float(reserved_tokens) - float(used_tokens)
+        if delta == 0:
+            return
+        queue, job_id = current_scope()
+        key, job_key, _ = self._keys(api_key, f"{queue}:{job_id}")
+
+        client = self._get_redis()
+        if client is not None:
+            try:
+                self._settle_script(keys=[key, job_key], args=[delta])
+                return
+            except Exception as e:
+                self._drop_redis(e)
+        self._local.adjust_tokens((key, job_key), delta)
@@ -0,0 +1,216 @@
+"""
+Persistent LLM response cache.
+
+Stores model responses in a local SQLite file, keyed on a hash of the model name,
+generation config, response schema and prompt. Re-running a job (resume, Celery
+autoretry, re-validation) then replays identical requests from disk instead of
+paying for them again.
+
+Entries expire after a TTL, and the least recently used entries are evicted once
+the cache grows past its size limit.
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Optional
+
+# Prune expired/oversized entries after this many writes
+_PRUNE_EVERY_WRITES = 100
+
+
+def _schema_fingerprint(response_schema: Any) -> Any:
+    """Return a JSON-serializable description of a response schema for the cache key."""
+    if response_schema is None or isinstance(response_schema, dict):
+        return response_schema
+    try:
+        from pydantic import TypeAdapter
+
+        return TypeAdapter(response_schema).json_schema()
+    except Exception:
+        return repr(response_schema)
+
+
+def _encode_value(value: Any, response_schema: Any) -> str:
+    """Serialize a model response (text, dict or Pydantic object) to JSON."""
+    if response_schema is not None and not isinstance(response_schema, dict):
+        from pydantic import TypeAdapter
+
+        value = TypeAdapter(response_schema).dump_python(value, mode="json")
+    return json.dumps(value, ensure_ascii=False)
+
+
+def _decode_value(payload: str, response_schema: Any) -> Any:
+    """Inverse of _encode_value; rebuilds Pydantic objects when a model schema was used."""
+    value = json.loads(payload)
+    if response_schema is not None and not isinstance(response_schema, dict):
+        from pydantic import TypeAdapter
+
+        value = TypeAdapter(response_schema).validate_python(value)
+    return value
+
+
+class ResponseCache:
+    """Content-addressed SQLite cache for model responses (thread-safe, shared across processes)."""
+
+    def __init__(self, path: str, ttl_seconds: int = 7 * 24 * 3600, max_size_mb: int = 512):
+        self.path = path
+        self.ttl_seconds = max(0, int(ttl_seconds))
+        self.max_size_bytes = max(0, int(max_size_mb)) * 1024 * 1024
+        self._lock = threading.Lock()
+        self._writes_since_prune = 0
+
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        with self._lock:
+            # WAL lets several Celery workers read while one writes
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                " key TEXT PRIMARY KEY,"
+                " model_name TEXT,"
+                " payload TEXT NOT NULL,"
+                " size INTEGER NOT NULL,"
+                " created_at REAL NOT NULL,"
+                " accessed_at REAL NOT NULL)"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_responses_accessed ON responses (accessed_at)")
+            self._conn.commit()
+        self.prune()
+
+    @staticmethod
+    def build_key(kind: str, model_name: str, config: Optional[Dict[str, Any]], prompt: str,
+                  response_schema: Any = None) -> str:
+        """
+        Build the cache key for a request.
+
+        Args:
+            kind: Request type ("text" or "structured")
+            model_name: Model the request is sent to
+            config: Generation settings that affect the output (temperature, safety, ...)
+            prompt: The prompt text
+            response_schema: JSON schema dict or Pydantic type for structured output
+
+        Returns:
+            Hex digest identifying the request
+        """
+        material = json.dumps(
+            {
+                "kind": kind,
+                "model": model_name,
+                "config": config or {},
+                "schema": _schema_fingerprint(response_schema),
+                "prompt_sha256": hashlib.sha256(prompt.encode("utf-8")).hexdigest(),
+            },
+            sort_keys=True,
+            ensure_ascii=False,
+            default=str,
+        )
+        return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+    def get(self, key: str, response_schema: Any = None) -> Any:
+        """Return the cached response for key, or None when missing or expired."""
+        now = time.time()
+        try:
+            with self._lock:
+                row = self._conn.execute(
+                    "SELECT payload, created_at FROM responses WHERE key = ?", (key,)
+                ).fetchone()
+                if row is None:
+                    return None
+                payload, created_at = row
+                if self.ttl_seconds and created_at + self.ttl_seconds < now:
+                    self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                    self._conn.commit()
+                    return None
+                self._conn.execute("UPDATE responses SET accessed_at = ? WHERE key = ?", (now, key))
+                self._conn.commit()
+            return _decode_value(payload, response_schema)
+        except Exception as exc:
+            print(f"[ResponseCache] Failed to read cache entry: {exc}")
+            return None
+
+    def put(self, key: str, value: Any, model_name: str = "", response_schema: Any = None) -> None:
+        """Store a response. Empty responses are not cached."""
+        if value is None or value == "" or value == {}:
+            return
+        try:
+            payload = _encode_value(value, response_schema)
+            now = time.time()
+            with self._lock:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO responses (key, model_name, payload, size, created_at, accessed_at)"
+                    " VALUES (?, ?, ?, ?, ?, ?)",
+                    (key, model_name, payload, len(payload.encode("utf-8")), now, now),
+                )
+                self._conn.commit()
+                self._writes_since_prune += 1
+                should_prune = self._writes_since_prune >= _PRUNE_EVERY_WRITES
+            if should_prune:
+                self.prune()
+        except Exception as exc:
+            print(f"[ResponseCache] Failed to write cache entry: {exc}")
+
+    def prune(self) -> None:
+        """Delete expired entries, then the least recently used ones until under the size limit."""
+        try:
+            with self._lock:
+                self._writes_since_prune = 0
+                if self.ttl_seconds:
+                    cutoff = time.time() - self.ttl_seconds
+                    self._conn.execute("DELETE FROM responses WHERE created_at < ?", (cutoff,))
+                if self.max_size_bytes:
+                    total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+                    excess = total - self.max_size_bytes
+                    if excess > 0:
+                        victims = []
+                        for key, size in self._conn.execute(
+                            "SELECT key, size FROM responses ORDER BY accessed_at ASC"
+                        ):
+                            victims.append((key,))
+                            excess -= size
+                            if excess <= 0:
+                                break
+                        self._conn.executemany("DELETE FROM responses WHERE key = ?", victims)
+                self._conn.commit()
+        except Exception as exc:
+            print(f"[ResponseCache] Failed to prune cache: {exc}")
+
+    def clear(self) -> None:
+        """Remove all cached responses."""
+        with self._lock:
+            self._conn.execute("DELETE FROM responses")
+            self._conn.commit()
+
+
+_caches: Dict[str, ResponseCache] = {}
+_caches_lock = threading.Lock()
+
+
+def get_response_cache(cache_config: Optional[Dict[str, Any]]) -> Optional[ResponseCache]:
+    """
+    Return the process-wide cache for a config section (see core.config.loader), or None when disabled.
+
+    One ResponseCache is shared per path so all models in a worker reuse the same connection.
+    """
+    if not cache_config or not cache_config.get("enabled"):
+        return None
+    path = cache_config.get("path") or os.path.join("cache", "llm_responses.sqlite3")
+    with _caches_lock:
+        cache = _caches.get(path)
+        if cache is None:
+            try:
+                cache = ResponseCache(
+                    path,
+                    ttl_seconds=cache_config.get("ttl_seconds", 7 * 24 * 3600),
+                    max_size_mb=cache_config.get("max_size_mb", 512),
+                )
+            except Exception as exc:
+                print(f"Warning: Could not open LLM response cache at {path}: {exc}")
+                return None
+            _caches[path] = cache
+    return cache
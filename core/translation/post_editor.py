@@ -11,10 +11,12 @@ analyzing validation reports and applying targeted corrections.
 import json
 import os
 import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 from typing import Dict, List, Optional, Any, Tuple
 from tqdm import tqdm
 from core.prompts.manager import PromptManager
+from core.utils.tracing import in_current_context
 from shared.utils.logging import TranslationLogger
 
 
@@ -254,11 +256,9 @@ class PostEditEngine:
 
                 # Keep existing progress logging
                 self.logger.log_translation_progress(segment_idx, len(segment_data.get('structured_cases', [])))
-                with open(self.logger.context_log_path, 'a', encoding='utf-8') as f:
-                    f.write(f"--- POST-EDIT SEGMENT {segment_idx} ---\n")
-                    f.write(f"Issues fixed: {len(segment_data.get('structured_cases', []))}\n")
-                    f.write(f"Original: {translated_text[:100]}...\n")
-                    f.write(f"Edited: {edited_text[:100]}...\n\n")
+                self.logger.log_post_edit_segment(
+                    segment_idx, len(segment_data.get('structured_cases', [])), translated_text, edited_text
+                )
 
             return edited_text
             
@@ -285,7 +285,8 @@ class PostEditEngine:
                          selected_cases: Dict[int, Any] | None = None,
                          modified_cases: Dict[int, Any] | None = None,
                          progress_callback=None,
-                         job_id: Optional[int] = None) -> List[str]:
+                         job_id: Optional[int] = None,
+                         concurrency: int = 1) -> List[str]:
         """
         Post-edit an entire translation document based on validation report.
         
@@ -295,6 +296,8 @@ class PostEditEngine:
             selected_cases: Optional mask per segment index -> boolean[] indicating which structured cases to fix
             progress_callback: Optional callback function for progress updates
             job_id: Optional job ID for logging purposes
+            concurrency: Number of segments post-edited at once. A segment that fails
+                keeps its current translation without affecting the others.
             
         Returns:
             List of post-edited translations
@@ -346,33 +349,43 @@ class PostEditEngine:
         edited_segments = translation_document.translated_segments.copy()
         
         # Post-edit each problematic segment
+        workers = max(1, min(int(concurrency or 1), len(segments_to_edit)))
         with tqdm(total=len(segments_to_edit), desc="Post-editing segments", unit="segment") as pbar:
-            for segment_data in segments_to_edit:
-                segment_idx = segment_data['segment_index']
-                
-                # Get source and current translation
-                source_text = translation_document.segments[segment_idx].text
-                current_translation = edited_segments[segment_idx]
-                
-                # Update progress bar
-                pbar.set_description(f"Post-editing segment {segment_idx}")
-                
-                # Perform post-edit
-                edited_translation = self.post_edit_segment(
-                    segment_data=segment_data,
-                    source_text=source_text,
-                    translated_text=current_translation,
-                    glossary=translation_document.glossary
-                )
-                
+            def on_segment_done(segment_idx: int, edited_translation: str) -> None:
                 # Update the segment
                 edited_segments[segment_idx] = edited_translation
 
                 if progress_callback:
                     progress = int(((pbar.n + 1) / len(segments_to_edit)) * 100)
                     progress_callback(progress)
-                
+
                 pbar.update(1)
+
+            if workers == 1:
+                for segment_data in segments_to_edit:
+                    segment_idx = segment_data['segment_index']
+                    # Update progress bar
+                    pbar.set_description(f"Post-editing segment {segment_idx}")
+                    on_segment_done(
+                        segment_idx,
+                        self._post_edit_isolated(segment_data, translation_document, edited_segments[segment_idx]),
+                    )
+            else:
+                # Each segment only depends on its own cases and the glossary; results are
+                # written back by index and progress is reported from this thread.
+                pbar.set_description(f"Post-editing segments ({workers} at a time)")
+                with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="post-edit") as executor:
+                    futures = {
+                        executor.submit(
+                            in_current_context(self._post_edit_isolated),
+                            segment_data,
+                            translation_document,
+                            edited_segments[segment_data['segment_index']],
+                        ): segment_data['segment_index']
+                        for segment_data in segments_to_edit
+                    }
+                    for future in as_completed(futures):
+                        on_segment_done(futures[future], future.result())
         
         # Create comprehensive log with all segments
         complete_log = self._create_complete_log(
@@ -404,6 +417,20 @@ class PostEditEngine:
         
         return edited_segments
     
+    def _post_edit_isolated(self, segment_data: Dict[str, Any], translation_document, current_translation: str) -> str:
+        """Post-edit one segment, keeping its current translation if anything fails."""
+        segment_idx = segment_data['segment_index']
+        try:
+            return self.post_edit_segment(
+                segment_data=segment_data,
+                source_text=translation_document.segments[segment_idx].text,
+                translated_text=current_translation,
+                glossary=translation_document.glossary
+            )
+        except Exception as e:
+            print(f"Warning: Post-edit failed for segment {segment_idx}: {e}")
+            return current_translation
+
     def _create_complete_log(self, 
                             translation_document,
                             edited_segments: List[str],
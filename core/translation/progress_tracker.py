@@ -5,6 +5,8 @@ This module handles progress tracking and database updates for translation jobs.
 Extracted from TranslationPipeline to separate concerns.
 """
 
+import hashlib
+import json
 import time
 from typing import Optional, Dict, Any, List
 from sqlalchemy.orm import Session
@@ -25,7 +27,8 @@ class ProgressTracker:
     """
     
     def __init__(self, db: Optional[Session] = None, job_id: Optional[int] = None, 
-                 filename: Optional[str] = None):
+                 filename: Optional[str] = None, segment_flush_size: int = 10,
+                 segment_flush_interval: float = 2.0):
         """
         Initialize the progress tracker.
         
@@ -33,12 +36,23 @@ class ProgressTracker:
             db: Optional database session
             job_id: Optional job ID for database updates
             filename: Optional filename for logging
+            segment_flush_size: Completed segments buffered before they are written
+            segment_flush_interval: Seconds after which buffered segments are written anyway
         """
         self.db = db
         self.job_id = job_id
         self.filename = filename
         self.start_time = time.time()
         self.logger = None
+
+        # Completed segments waiting to be upserted, keyed by segment_index
+        self.segment_flush_size = max(1, int(segment_flush_size))
+        self.segment_flush_interval = segment_flush_interval
+        self._pending_segments: Dict[int, Dict[str, Any]] = {}
+        # Fingerprints of what is already stored, so finalization only rewrites changed rows
+        self._stored_fingerprints: Dict[int, str] = {}
+        self._last_flush = time.monotonic()
+        self._total_segments = 0
         
         # Initialize logger if we have the necessary info
         if job_id and filename:
@@ -46,35 +60,112 @@ class ProgressTracker:
     
     def update_progress(self, current_index: int, total_segments: int):
         """
-        Update translation progress in the database.
+        Log translation progress.
+
+        The job's progress in the database is derived from the stored segment rows
+        when completed segments are flushed (see record_segment).
         
         Args:
             current_index: Current segment index (0-based)
             total_segments: Total number of segments
         """
-        progress = int((current_index / total_segments) * 100)
+        self._total_segments = total_segments
         
         # Log progress to file
         if self.logger:
             elapsed_time = time.time() - self.start_time
             self.logger.log_translation_progress(current_index, total_segments, elapsed_time)
-        
-        # Update database if available
+
+    def record_segment(self, segment_index: int, source_segment: SegmentInfo,
+                       translated_text: str, total_segments: int):
+        """
+        Queue a completed segment for persistence.
+
+        Segments are upserted in batches once `segment_flush_size` are pending or
+        `segment_flush_interval` seconds have passed since the last write.
+
+        Args:
+            segment_index: Position of the segment in the document (0-based)
+            source_segment: Source segment info
+            translated_text: Translated text of the segment
+            total_segments: Total number of segments in the document
+        """
         if not self.db or not self.job_id:
             return
-        
+
+        self._total_segments = total_segments
+        data = self._segment_data(segment_index, source_segment, translated_text)
+        if self._stored_fingerprints.get(segment_index) == self._fingerprint(data):
+            return
+        self._pending_segments[segment_index] = data
+
+        if (len(self._pending_segments) >= self.segment_flush_size
+                or time.monotonic() - self._last_flush >= self.segment_flush_interval):
+            self.flush_segments()
+
+    def flush_segments(self, segment_count: Optional[int] = None):
+        """
+        Upsert buffered segments and update the job's progress in a single commit.
+
+        Args:
+            segment_count: Final number of segments; stored rows at or after it
+                (from an earlier, longer run) are deleted in the same commit
+        """
+        self._last_flush = time.monotonic()
+        if not self.db or not self.job_id or (not self._pending_segments and segment_count is None):
+            return
+
         try:
-            from backend import crud
-            crud.update_job_progress(self.db, self.job_id, progress)
+            from backend.domains.shared.events.live import publish_job_event_after_commit
+            from backend.domains.translation.models import TranslationJob
+            from backend.domains.translation.repository import SqlAlchemyTranslationSegmentRepository
         except ImportError:
             # Backend not available (e.g., running in core-only mode)
-            pass
+            self._pending_segments.clear()
+            return
+
+        pending = self._pending_segments
+        self._pending_segments = {}
+        try:
+            repo = SqlAlchemyTranslationSegmentRepository(self.db)
+            repo.upsert_many(self.job_id, pending)
+            if segment_count is not None:
+                repo.delete_from(self.job_id, segment_count)
+            progress = None
+            if self._total_segments:
+                stored = repo.count(self.job_id)
+                progress = min(100, int((stored / self._total_segments) * 100))
+                self.db.query(TranslationJob).filter(TranslationJob.id == self.job_id).update(
+                    {"progress": progress}, synchronize_session=False
+                )
+            # Pushed to live subscribers once committed
+            publish_job_event_after_commit(
+                self.db, self.job_id, "segments",
+                segment_indices=sorted(pending), progress=progress,
+            )
+            self.db.commit()
+        except Exception as exc:
+            self.db.rollback()
+            # Keep the batch so the next flush retries it
+            pending.update(self._pending_segments)
+            self._pending_segments = pending
+            print(f"[ProgressTracker] Failed to persist segments for job {self.job_id}: {exc}")
+            return
+
+        for segment_index, data in pending.items():
+            self._stored_fingerprints[segment_index] = self._fingerprint(data)
+        if segment_count is not None:
+            for segment_index in [i for i in self._stored_fingerprints if i >= segment_count]:
+                del self._stored_fingerprints[segment_index]
     
     def finalize_translation(self, segments: List[SegmentInfo], 
                            translated_segments: List[str], 
                            glossary: Dict[str, str]):
         """
         Finalize translation by updating database with results.
+
+        Segments were already stored while translating; only segments that changed
+        since (reconciled terms, illustrations, world atmosphere) are written here.
         
         Args:
             segments: Original source segments
@@ -102,41 +193,49 @@ class ProgressTracker:
             
             # Update glossary
             crud.update_job_final_glossary(self.db, self.job_id, glossary)
-            
-            # Save translation segments for segment view with enhanced metadata
-            segments_data = []
-            for i, (source_segment, translated_segment) in enumerate(
-                zip(segments, translated_segments)
-            ):
-                segment_data = {
-                    "segment_index": i,
-                    "source_text": source_segment.text,
-                    "translated_text": translated_segment,
-                    "chapter_title": source_segment.chapter_title,
-                    "chapter_filename": source_segment.chapter_filename,
-                }
-
-                # Include world_atmosphere data if available
-                if hasattr(source_segment, 'world_atmosphere') and source_segment.world_atmosphere:
-                    segment_data["world_atmosphere"] = source_segment.world_atmosphere
-
-                    # Extract segment_summary from world_atmosphere for quick access
-                    if isinstance(source_segment.world_atmosphere, dict):
-                        segment_data["segment_summary"] = source_segment.world_atmosphere.get("segment_summary", "")
-
-                # Include illustration data if available
-                if hasattr(source_segment, 'illustration_path') and source_segment.illustration_path:
-                    segment_data["illustration_path"] = source_segment.illustration_path
-                    segment_data["illustration_prompt"] = source_segment.illustration_prompt
-                    segment_data["illustration_status"] = source_segment.illustration_status
-
-                segments_data.append(segment_data)
-
-            crud.update_job_translation_segments(self.db, self.job_id, segments_data)
-            
         except ImportError:
             # Backend not available (e.g., running in core-only mode)
-            pass
+            return
+
+        # Save translation segments for segment view with enhanced metadata
+        for i, (source_segment, translated_segment) in enumerate(
+            zip(segments, translated_segments)
+        ):
+            self.record_segment(i, source_segment, translated_segment, len(segments))
+        self.flush_segments(segment_count=len(segments))
+
+    @staticmethod
+    def _segment_data(segment_index: int, source_segment: SegmentInfo,
+                      translated_text: str) -> Dict[str, Any]:
+        """Build the stored representation of one segment."""
+        segment_data = {
+            "segment_index": segment_index,
+            "source_text": source_segment.text,
+            "translated_text": translated_text,
+            "chapter_title": source_segment.chapter_title,
+            "chapter_filename": source_segment.chapter_filename,
+        }
+
+        # Include world_atmosphere data if available
+        if hasattr(source_segment, 'world_atmosphere') and source_segment.world_atmosphere:
+            segment_data["world_atmosphere"] = source_segment.world_atmosphere
+
+            # Extract segment_summary from world_atmosphere for quick access
+            if isinstance(source_segment.world_atmosphere, dict):
+                segment_data["segment_summary"] = source_segment.world_atmosphere.get("segment_summary", "")
+
+        # Include illustration data if available
+        if hasattr(source_segment, 'illustration_path') and source_segment.illustration_path:
+            segment_data["illustration_path"] = source_segment.illustration_path
+            segment_data["illustration_prompt"] = source_segment.illustration_prompt
+            segment_data["illustration_status"] = source_segment.illustration_status
+
+        return segment_data
+
+    @staticmethod
+    def _fingerprint(segment_data: Dict[str, Any]) -> str:
+        encoded = json.dumps(segment_data, sort_keys=True, ensure_ascii=False, default=str)
+        return hashlib.sha1(encoded.encode("utf-8")).hexdigest()
     
     def record_usage_log(
         self,
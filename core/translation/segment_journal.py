@@ -0,0 +1,83 @@
+"""
+Segment Journal Module
+
+An append-only, fsync'd journal of translated segments. The pipeline appends one
+record per translated segment instead of rewriting the whole output, and resume
+rebuilds the translated prefix from the journal. The full TXT/EPUB artifact is
+only written at finalization (see TranslationDocument.materialize_output).
+
+Each line is a JSON record {"i": <segment position>, "text": <translation>}.
+A later record for the same position replaces an earlier one (e.g. segments
+re-translated during glossary reconciliation).
+"""
+
+import json
+import os
+import threading
+from typing import Dict, Iterable, List, Optional, Tuple
+
+JOURNAL_FILENAME = "segments.journal.jsonl"
+
+
+class SegmentJournal:
+    """Append-only journal of translated segments for one job."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+
+    def append(self, position: int, text: str) -> None:
+        """Durably append a single segment translation."""
+        self.append_many([(position, text)])
+
+    def append_many(self, records: Iterable[Tuple[int, str]]) -> None:
+        """Durably append several segment translations with a single fsync."""
+        lines = "".join(self._encode(position, text) for position, text in records)
+        if not lines:
+            return
+        with self._lock:
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            with open(self.path, "a", encoding="utf-8") as journal_file:
+                journal_file.write(lines)
+                journal_file.flush()
+                os.fsync(journal_file.fileno())
+
+    def rewrite(self, segments: List[str]) -> None:
+        """Atomically replace the journal with the given translated prefix."""
+        tmp_path = f"{self.path}.tmp"
+        with self._lock:
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            with open(tmp_path, "w", encoding="utf-8") as journal_file:
+                journal_file.write("".join(self._encode(i, text) for i, text in enumerate(segments)))
+                journal_file.flush()
+                os.fsync(journal_file.fileno())
+            os.replace(tmp_path, self.path)
+
+    def read(self) -> Optional[List[str]]:
+        """
+        Read the contiguous translated prefix recorded in the journal.
+
+        Returns:
+            Translations for positions 0..n-1, or None when no journal exists.
+            A torn final line (crash mid-write) is ignored.
+        """
+        if not os.path.exists(self.path):
+            return None
+
+        by_position: Dict[int, str] = {}
+        with self._lock, open(self.path, "r", encoding="utf-8") as journal_file:
+            for line in journal_file:
+                try:
+                    record = json.loads(line)
+                    by_position[int(record["i"])] = str(record["text"])
+                except (ValueError, KeyError, TypeError):
+                    continue
+
+        segments: List[str] = []
+        while len(segments) in by_position:
+            segments.append(by_position[len(segments)])
+        return segments
+
+    @staticmethod
+    def _encode(position: int, text: str) -> str:
+        return json.dumps({"i": position, "text": text}, ensure_ascii=False) + "\n"
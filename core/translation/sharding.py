@@ -0,0 +1,155 @@
+"""
+Translation Sharding Module
+
+This module splits a document's segments into independent shards that can be
+translated in parallel, and reconciles the per-shard glossaries afterwards.
+"""
+
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Set, Tuple
+
+from ..schemas import SegmentInfo
+from ..utils.glossary_matcher import GlossaryMatcher
+
+
+SHARD_BY_CHAPTER = "chapter"
+SHARD_BY_SEGMENTS = "segments"
+SHARD_STRATEGIES = (SHARD_BY_CHAPTER, SHARD_BY_SEGMENTS)
+
+
+@dataclass
+class TranslationShard:
+    """A contiguous run of segments translated with its own dynamic guides."""
+
+    index: int
+    start: int  # position of the first segment in the document (0-based)
+    end: int  # exclusive
+    glossary: Dict[str, str] = field(default_factory=dict)
+    character_styles: Dict[str, str] = field(default_factory=dict)
+    translations: List[str] = field(default_factory=list)
+    style_deviations: List[str] = field(default_factory=list)
+
+    @property
+    def positions(self) -> range:
+        return range(self.start, self.end)
+
+    def __len__(self) -> int:
+        return self.end - self.start
+
+
+def split_into_shards(segments: List[SegmentInfo], strategy: str = SHARD_BY_CHAPTER,
+                      shard_size: int = 20, start: int = 0) -> List[TranslationShard]:
+    """
+    Split segments[start:] into shards.
+
+    Args:
+        segments: All segments of the document
+        strategy: "chapter" to cut at chapter boundaries, "segments" to cut every shard_size segments
+        shard_size: Segments per shard; also the fallback when no chapter metadata exists
+        start: First segment position to include (segments before it are already translated)
+
+    Returns:
+        Shards in document order
+    """
+    if strategy not in SHARD_STRATEGIES:
+        raise ValueError(f"Unknown shard strategy '{strategy}'. Expected one of {SHARD_STRATEGIES}.")
+    shard_size = max(1, int(shard_size))
+    total = len(segments)
+    if start >= total:
+        return []
+
+    boundaries: List[int] = []
+    if strategy == SHARD_BY_CHAPTER:
+        boundaries = _chapter_boundaries(segments, start)
+
+    # Without chapter metadata (e.g. plain text sources) fall back to fixed-size shards
+    if not boundaries:
+        boundaries = list(range(start, total, shard_size))
+
+    shards = []
+    for i, shard_start in enumerate(boundaries):
+        shard_end = boundaries[i + 1] if i + 1 < len(boundaries) else total
+        shards.append(TranslationShard(index=i, start=shard_start, end=shard_end))
+    return shards
+
+
+def _chapter_boundaries(segments: List[SegmentInfo], start: int) -> List[int]:
+    """Return the positions where a new chapter begins, or [] when chapters are unknown."""
+    def chapter_key(segment: SegmentInfo) -> Tuple[Optional[str], Optional[str]]:
+        return segment.chapter_filename, segment.chapter_title
+
+    if all(chapter_key(s) == (None, None) for s in segments[start:]):
+        return []
+
+    boundaries = [start]
+    for pos in range(start + 1, len(segments)):
+        if chapter_key(segments[pos]) != chapter_key(segments[pos - 1]):
+            boundaries.append(pos)
+    return boundaries
+
+
+def reconcile_glossaries(base_glossary: Dict[str, str],
+                         shards: List[TranslationShard]) -> Tuple[Dict[str, str], Dict[int, Set[str]]]:
+    """
+    Merge per-shard glossaries into a single glossary.
+
+    Translations from the base glossary win, then the earliest shard that introduced
+    a term, which matches what a serial run would have kept.
+
+    Returns:
+        Tuple of (merged_glossary, conflicts) where conflicts maps a shard index to
+        the terms that shard translated differently from the merged glossary.
+    """
+    merged = dict(base_glossary)
+    for shard in shards:
+        for term, translation in shard.glossary.items():
+            merged.setdefault(term, translation)
+
+    conflicts: Dict[int, Set[str]] = {}
+    for shard in shards:
+        conflicting = {
+            term for term, translation in shard.glossary.items()
+            if merged.get(term) != translation
+        }
+        if conflicting:
+            conflicts[shard.index] = conflicting
+    return merged, conflicts
+
+
+def find_segments_using_terms(segments: List[SegmentInfo], shard: TranslationShard,
+                              terms: Set[str]) -> List[int]:
+    """Return the positions in the shard whose source text contains any of the terms."""
+    if not terms:
+        return []
+    matcher = GlossaryMatcher(terms)
+    return [pos for pos in shard.positions if matcher.find(segments[pos].text)]
+
+
+def merge_character_styles(base_styles: Dict[str, str],
+                           shards: List[TranslationShard]) -> Dict[str, str]:
+    """Merge shard character styles in document order (later shards update earlier ones)."""
+    merged = dict(base_styles)
+    for shard in shards:
+        merged.update(shard.character_styles)
+    return merged
+
+
+@dataclass
+class ShardSegmentResult:
+    """A translated segment handed from a shard worker back to the pipeline thread."""
+
+    position: int
+    translated_text: str
+    prompt: str
+    context_data: Dict[str, object]
+    contextual_glossary: Dict[str, str]
+    style_deviation: str
+    translation_time: float
+
+
+def model_for_shard(model, shard_index: int):
+    """Return a per-shard view of a model when it supports one (e.g. to start on a different API key)."""
+    for_shard = getattr(model, "for_shard", None)
+    if for_shard is None:
+        return model
+    return for_shard(shard_index)
@@ -12,7 +12,7 @@ from ..translation.models.gemini import GeminiModel
 from ..translation.models.openrouter import OpenRouterModel
 from shared.errors import ProhibitedException, TranslationError
 from shared.errors.error_logger import ProhibitedContentLogger
-from ..utils.file_parser import parse_document
+from ..utils.document_cache import get_document_cache, parse_document_cached
 from ..utils.text_segmentation import create_segments_from_plain_text
 from shared.utils.logging import TranslationLogger
 
@@ -53,14 +53,16 @@ class StyleAnalyzer:
         Returns:
             Sample text for analysis
         """
-        # Parse document using centralized file parser
-        text = parse_document(filepath)
+        # Parse document using centralized file parser (shared per-file cache)
+        text = parse_document_cached(filepath)
         
         if method == "first_chars":
             return text[:count]
         
         if method == "first_segment":
-            segments = create_segments_from_plain_text(text, count)
+            segments = get_document_cache().get_segments(
+                filepath, f"text-{count}", lambda: create_segments_from_plain_text(text, count)
+            )
             return segments[0].text if segments else text[:count]
         
         # Fallback to simple character-based extraction
@@ -5,10 +5,12 @@ This module orchestrates the entire translation process, managing the segment-by
 translation workflow with context awareness, style consistency, and error handling.
 """
 
-import re
+import queue
+import threading
 import time
+from concurrent.futures import Future, ThreadPoolExecutor
 from tqdm import tqdm
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Union
 from sqlalchemy.orm import Session
 
 from .models.gemini import GeminiModel
@@ -18,12 +20,23 @@ from .style_analyzer import StyleAnalyzer
 from .progress_tracker import ProgressTracker
 from .illustration import IllustrationGenerator, WorldAtmosphereProvider
 from .usage_tracker import TokenUsageCollector
+from .sharding import (
+    ShardSegmentResult,
+    TranslationShard,
+    find_segments_using_terms,
+    merge_character_styles,
+    model_for_shard,
+    reconcile_glossaries,
+    split_into_shards,
+)
 from ..prompts.builder import PromptBuilder
 from ..prompts.manager import PromptManager
 from ..prompts.sanitizer import PromptSanitizer
-from ..config.builder import DynamicConfigBuilder
+from ..config.builder import DynamicConfigBuilder, SegmentGuideAnalysis
 from ..schemas.illustration import IllustrationConfig, IllustrationBatch
 from ..schemas.narrative_style import WorldAtmosphereAnalysis
+from ..utils.glossary_matcher import GlossaryMatcher
+from ..utils.tracing import Tracer, format_summary, in_current_context, span, use_tracer
 from shared.errors import ProhibitedException, TranslationError
 from shared.errors import ProhibitedContentLogger
 from shared.utils.logging import TranslationLogger
@@ -72,7 +85,11 @@ class TranslationPipeline:
                  illustration_config: Optional[IllustrationConfig] = None,
                  illustration_api_key: Optional[str] = None,
                  usage_collector: Optional[TokenUsageCollector] = None,
-                 turbo_mode: bool = False):
+                 turbo_mode: bool = False,
+                 guide_lookahead: int = 0,
+                 shard_strategy: Optional[str] = None,
+                 shard_size: int = 20,
+                 max_shard_workers: int = 4):
         """
         Initialize the translation pipeline.
         
@@ -85,10 +102,26 @@ class TranslationPipeline:
             style_model_api: Optional different model for style analysis
             illustration_config: Optional configuration for illustration generation
             illustration_api_key: Optional API key for illustration generation
+            guide_lookahead: Number of upcoming segments whose dynamic guide analysis
+                runs concurrently with the current translation (0 = serial). An analysis
+                submitted ahead sees the glossary as of its submission: terms added by the
+                segments in between are not in its prompt, and its own proposals for those
+                terms are dropped in favor of the existing translations when it is applied
+            shard_strategy: Optional sharding mode ("chapter" or "segments"); when set,
+                shards are translated in parallel and their glossaries reconciled
+            shard_size: Segments per shard (also the fallback when chapters are unknown)
+            max_shard_workers: Maximum number of shards translated at the same time
         """
         self.gemini_api = gemini_api
         self.dyn_config_builder = dyn_config_builder
         self.turbo_mode = turbo_mode
+        # Turbo mode skips guide analysis entirely, so there is nothing to run ahead
+        self.guide_lookahead = 0 if turbo_mode else max(0, int(guide_lookahead or 0))
+        self.shard_strategy = shard_strategy
+        self.shard_size = max(1, int(shard_size))
+        self.max_shard_workers = max(1, int(max_shard_workers))
+        # Compiled glossary matcher, extended as new terms are added to the glossary
+        self.glossary_matcher = GlossaryMatcher()
         # Choose prompt template based on mode
         template = PromptManager.TURBO_TRANSLATION if turbo_mode else PromptManager.MAIN_TRANSLATION
         self.prompt_builder = PromptBuilder(template)
@@ -101,6 +134,8 @@ class TranslationPipeline:
         # Logger will be initialized with document filename later
         self.job_id = job_id
         self.logger = None
+        # Timing spans of the current translate_document run
+        self.tracer: Optional[Tracer] = None
 
         # Initialize illustration generator if configured
         self.illustration_config = illustration_config
@@ -127,18 +162,32 @@ class TranslationPipeline:
         Args:
             document: The TranslationDocument to translate
         """
-        start_time = time.time()
         error_type = None
         # Precompute full original text so failures still log correct length
         original_text = "\n".join(s.text for s in document.segments)
         translated_text_final = ""
+        completed = False
+        self.tracer = Tracer(job_id=self.job_id)
 
         try:
-            self._translate_document_internal(document)
+            with use_tracer(self.tracer):
+                self._translate_document_internal(document)
+            completed = True
         except TranslationError as e:
             error_type = e.__class__.__name__
             raise e
         finally:
+            if not completed and document.translated_segments:
+                # Partial output is only journaled while translating; write it out for failed jobs
+                try:
+                    document.materialize_output()
+                except Exception as exc:
+                    print(f"Warning: Failed to save partial output: {exc}")
+            # Persist segments still buffered for the database (partial results on failure)
+            self.progress_tracker.flush_segments()
+            if self.logger:
+                self.logger.close()
+            self._report_spans()
             # Use whatever translations exist (may be partial on failure)
             translated_text_final = "\n".join(document.translated_segments)
             model_name = getattr(self.gemini_api, 'model_name', 'unknown_model')
@@ -159,6 +208,8 @@ class TranslationPipeline:
         # Initialize logging for this document
         self.logger = TranslationLogger(self.job_id, document.user_base_filename)
         self.logger.initialize_session()
+        if self.tracer is not None:
+            self.tracer.path = self.logger.span_log_path
         
         # Initialize job-specific prohibited content logger
         self.prohibited_logger = ProhibitedContentLogger(job_id=self.job_id)
@@ -168,10 +219,73 @@ class TranslationPipeline:
             return
         
         # Define core narrative style
-        core_narrative_style = self._define_core_style(document)
+        with span("core_style"):
+            core_narrative_style = self._define_core_style(document)
         self.logger.log_core_narrative_style(core_narrative_style)
         
-        # Translate segments
+        if self.shard_strategy:
+            self._translate_segments_sharded(document, core_narrative_style)
+        else:
+            self._translate_segments_pipelined(document, core_narrative_style)
+        
+        # Persist segments to DB before final file save to avoid DB omissions
+        with span("finalize"):
+            self.progress_tracker.finalize_translation(
+                document.segments, document.translated_segments, document.glossary
+            )
+
+        # Save final output (file I/O after DB write)
+        with span("final_save"):
+            document.save_final_output()
+        
+        # Generate illustration batch report if illustrations were created
+        if self.illustration_generator:
+            illustration_metadata = self.illustration_generator.get_illustration_metadata()
+            self.logger.log_debug(f"Illustration generation complete: {illustration_metadata}")
+        
+        # Finalization already performed above to prevent omissions
+        
+        print(f"\n--- Translation Complete! ---")
+        print(f"Output: {document.output_filename}")
+
+    def _report_spans(self):
+        """Write the span summary of the run and print per-phase percentiles."""
+        if self.tracer is None:
+            return
+        summary = self.tracer.close()
+        if summary["spans"]:
+            print("\n--- Translation Timings ---")
+            print(format_summary(summary["spans"]))
+
+    def _translate_segments_pipelined(self, document: TranslationDocument, core_narrative_style: str):
+        """Translate segments in order, optionally analyzing guides ahead of translation."""
+        # Run guide analysis for upcoming segments on worker threads when enabled
+        guide_executor = None
+        if self.guide_lookahead > 0:
+            guide_executor = ThreadPoolExecutor(
+                max_workers=self.guide_lookahead + 1,
+                thread_name_prefix=f"guides-{self.job_id}",
+            )
+            print(f"Pipelined guide analysis enabled (look-ahead: {self.guide_lookahead} segments)")
+
+        try:
+            self._translate_segments(document, core_narrative_style, guide_executor)
+        finally:
+            if guide_executor is not None:
+                guide_executor.shutdown(wait=False, cancel_futures=True)
+
+    def _translate_segments(self, document: TranslationDocument, core_narrative_style: str,
+                            guide_executor: Optional[ThreadPoolExecutor] = None):
+        """
+        Translate the document's segments in order.
+
+        Args:
+            document: The TranslationDocument to translate
+            core_narrative_style: Core narrative style for the document
+            guide_executor: Optional executor running guide analysis ahead of translation
+        """
+        # Guide analyses submitted to the executor, keyed by segment position
+        pending_guides: Dict[int, Future] = {}
         total_segments = len(document.segments)
         for i, segment_info in enumerate(tqdm(document.segments, desc="Translating Segments")):
             segment_index = i + 1
@@ -181,123 +295,396 @@ class TranslationPipeline:
             # If resuming and this segment is already translated from a prior run, skip to preserve composition
             if i < len(document.translated_segments):
                 # Ensure previous translation context is available to downstream steps
-                # No I/O here; continue with next needed segment
+                # Resumed segments are (re)queued so progress derived from stored rows stays correct
+                self.progress_tracker.record_segment(
+                    i, segment_info, document.translated_segments[i], total_segments
+                )
                 continue
             
-            # Build dynamic guides (glossary and character styles)
-            # Get previous context for world atmosphere analysis
-            previous_context = None
-            if i > 0 and document.segments:
-                previous_context = document.segments[i-1].text
+            with span("segment", segment=segment_index):
+                # Build dynamic guides (glossary and character styles)
+                # Get previous context for world atmosphere analysis
+                previous_context = None
+                if i > 0 and document.segments:
+                    previous_context = document.segments[i-1].text
             
-            updated_glossary, updated_styles, style_deviation = self._build_dynamic_guides(
-                document, segment_info, segment_index, core_narrative_style, previous_context
-            )
+                if guide_executor is not None:
+                    self._schedule_guide_analyses(
+                        guide_executor, pending_guides, document, i, core_narrative_style
+                    )
 
-            # Prepare context for translation
-            contextual_glossary = self._get_contextual_glossary(updated_glossary, segment_info.text)
-            immediate_context_source = get_segment_ending(document.get_previous_segment(i), max_chars=1500)
-            immediate_context_ko = get_segment_ending(document.get_previous_translation(i), max_chars=500)
-            
-            # Build translation prompt
-            prompt = self._build_translation_prompt(
-                segment_info, contextual_glossary, updated_styles,
-                core_narrative_style, style_deviation,
-                immediate_context_source, immediate_context_ko
-            )
+                updated_glossary, updated_styles, style_deviation = self._build_dynamic_guides(
+                    document, segment_info, segment_index, core_narrative_style, previous_context,
+                    prefetched_analysis=pending_guides.pop(i, None)
+                )
+
+                with span("prompt_build"):
+                    # Prepare context for translation
+                    contextual_glossary = self._get_contextual_glossary(updated_glossary, segment_info.text)
+                    immediate_context_source = get_segment_ending(document.get_previous_segment(i), max_chars=1500)
+                    immediate_context_ko = get_segment_ending(document.get_previous_translation(i), max_chars=500)
+
+                    # Build translation prompt
+                    prompt = self._build_translation_prompt(
+                        segment_info, contextual_glossary, updated_styles,
+                        core_narrative_style, style_deviation,
+                        immediate_context_source, immediate_context_ko
+                    )
             
-            # Log context and prompt
-            context_data = {
-                'style_deviation': style_deviation,
-                'contextual_glossary': contextual_glossary,
-                'full_glossary': document.glossary,
-                'character_styles': document.character_styles,
-                'immediate_context_source': immediate_context_source,
-                'immediate_context_ko': immediate_context_ko
-            }
-            self.logger.log_segment_context(segment_index, context_data)
-            self.logger.log_translation_prompt(segment_index, prompt)
+                # Log context and prompt
+                context_data = {
+                    'style_deviation': style_deviation,
+                    'contextual_glossary': contextual_glossary,
+                    'full_glossary': document.glossary,
+                    'character_styles': document.character_styles,
+                    'immediate_context_source': immediate_context_source,
+                    'immediate_context_ko': immediate_context_ko
+                }
+                self.logger.log_segment_context(segment_index, context_data)
+                self.logger.log_translation_prompt(segment_index, prompt)
             
-            # Track segment translation time
-            segment_start_time = time.time()
+                # Translate segment with retries
+                with span("translate") as translate_span:
+                    translated_text = self._translate_segment_with_retries(
+                        prompt, segment_info, segment_index, document,
+                        contextual_glossary, style_deviation
+                    )
+                segment_translation_time = translate_span.duration
 
-            # Translate segment with retries
-            translated_text = self._translate_segment_with_retries(
-                prompt, segment_info, segment_index, document,
-                contextual_glossary, style_deviation
-            )
+                should_generate_illustration = bool(
+                    self.illustration_generator
+                    and self._should_generate_illustration(segment_info, i)
+                )
+                world_atmosphere_for_illustration = None
+                if should_generate_illustration:
+                    world_atmosphere_for_illustration = self._analyze_world_atmosphere_for_illustration(
+                        segment_info=segment_info,
+                        glossary=document.glossary,
+                        previous_context=previous_context,
+                        segment_index=segment_index,
+                        job_base_filename=document.user_base_filename,
+                    )
+
+                with span("output_save"):
+                    # Log segment input/output
+                    if self.logger:
+                        metadata = {
+                            "glossary_used": contextual_glossary,
+                            "style_deviation": style_deviation,
+                            "translation_time": segment_translation_time,
+                            "chapter_title": segment_info.chapter_title,
+                            "chapter_filename": segment_info.chapter_filename
+                        }
+                        world_atmosphere_metadata = None
+                        if world_atmosphere_for_illustration is not None:
+                            world_atmosphere_metadata = world_atmosphere_for_illustration.model_dump()
+                        elif self.world_atmosphere_provider:
+                            world_atmosphere_metadata = self.world_atmosphere_provider.get_world_atmosphere_dict(segment_info)
+                        if world_atmosphere_metadata:
+                            metadata["world_atmosphere"] = world_atmosphere_metadata
+                        self.logger.log_segment_io(
+                            segment_index=segment_index,
+                            source_text=segment_info.text,
+                            translated_text=translated_text,
+                            metadata=metadata
+                        )
+
+                    # Append translation and save progress
+                    document.append_translated_segment(translated_text, segment_info)
+
+                # Generate illustration if enabled
+                if should_generate_illustration:
+                    self._generate_segment_illustration(
+                        segment_info, i, document.glossary,
+                        core_narrative_style, style_deviation, world_atmosphere_for_illustration,
+                        character_styles=updated_styles
+                    )
+
+                with span("output_save"):
+                    # Stream the finished segment to the database (batched)
+                    self.progress_tracker.record_segment(i, segment_info, translated_text, total_segments)
+                    document.save_partial_output()
+        self.progress_tracker.flush_segments()
+    
+    def _translate_segments_sharded(self, document: TranslationDocument, core_narrative_style: str):
+        """
+        Translate the remaining segments as independent shards on worker threads.
 
-            # Calculate translation time
-            segment_translation_time = time.time() - segment_start_time
+        Each shard builds its own glossary and character styles with its own
+        DynamicConfigBuilder. Results are logged and appended to the document on this
+        thread in segment order, then the shard glossaries are reconciled and segments
+        that used a conflicting term translation are translated again.
+        """
+        total_segments = len(document.segments)
+        start = len(document.translated_segments)
+        shards = split_into_shards(document.segments, self.shard_strategy, self.shard_size, start=start)
+        if not shards:
+            return
+        if self.guide_lookahead:
+            print("Note: guide look-ahead is ignored in sharded mode.")
 
-            should_generate_illustration = bool(
-                self.illustration_generator
-                and self._should_generate_illustration(segment_info, i)
+        for position in range(start):
+            self.progress_tracker.record_segment(
+                position, document.segments[position], document.translated_segments[position], total_segments
             )
-            world_atmosphere_for_illustration = None
-            if should_generate_illustration:
-                world_atmosphere_for_illustration = self._analyze_world_atmosphere_for_illustration(
-                    segment_info=segment_info,
-                    glossary=document.glossary,
-                    previous_context=previous_context,
-                    segment_index=segment_index,
-                    job_base_filename=document.user_base_filename,
+
+        base_glossary = {**self.dyn_config_builder.initial_glossary_dict, **document.glossary}
+        base_styles = dict(document.character_styles)
+        # The first shard continues from the resumed prefix; later shards start without Korean context
+        first_shard_prev_ko = document.get_previous_translation(start)
+
+        workers = min(self.max_shard_workers, len(shards))
+        print(f"Sharded translation: {len(shards)} shards ({self.shard_strategy}), {workers} workers")
+
+        # Shards report each segment, or the exception that stopped them, through `completed`
+        completed: "queue.Queue[Union[ShardSegmentResult, BaseException]]" = queue.Queue()
+        stop = threading.Event()
+        results: Dict[int, ShardSegmentResult] = {}
+        executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix=f"shards-{self.job_id}")
+        try:
+            futures = [
+                executor.submit(
+                    in_current_context(self._translate_shard), shard, document, core_narrative_style,
+                    base_glossary, base_styles,
+                    first_shard_prev_ko if shard.index == 0 else "",
+                    completed, stop,
                 )
+                for shard in shards
+            ]
+            remaining = sum(len(shard) for shard in shards)
+            with tqdm(total=remaining, desc="Translating Shards") as progress_bar:
+                while remaining:
+                    result = completed.get()
+                    if isinstance(result, BaseException):
+                        raise result
+                    remaining -= 1
+                    progress_bar.update(1)
+                    results[result.position] = result
+                    with span("output_save", segment=result.position + 1):
+                        self._log_shard_segment_result(document, result)
 
-            # Log segment input/output
-            if self.logger:
-                metadata = {
-                    "glossary_used": contextual_glossary,
-                    "style_deviation": style_deviation,
-                    "translation_time": segment_translation_time,
-                    "chapter_title": segment_info.chapter_title,
-                    "chapter_filename": segment_info.chapter_filename
-                }
-                world_atmosphere_metadata = None
-                if world_atmosphere_for_illustration is not None:
-                    world_atmosphere_metadata = world_atmosphere_for_illustration.model_dump()
-                elif self.world_atmosphere_provider:
-                    world_atmosphere_metadata = self.world_atmosphere_provider.get_world_atmosphere_dict(segment_info)
-                if world_atmosphere_metadata:
-                    metadata["world_atmosphere"] = world_atmosphere_metadata
-                self.logger.log_segment_io(
+                        # Append the contiguous prefix so partial output and resume stay ordered
+                        appended = False
+                        while len(document.translated_segments) in results:
+                            position = len(document.translated_segments)
+                            document.append_translated_segment(
+                                results[position].translated_text, document.segments[position]
+                            )
+                            self.progress_tracker.record_segment(
+                                position, document.segments[position],
+                                results[position].translated_text, total_segments
+                            )
+                            appended = True
+                        self.progress_tracker.update_progress(len(results) + start, total_segments)
+                        if appended:
+                            document.save_partial_output()
+            for future in futures:
+                future.result()
+        finally:
+            # Running shards stop before their next segment; queued ones never start
+            stop.set()
+            executor.shutdown(wait=False, cancel_futures=True)
+        self.progress_tracker.flush_segments()
+
+        self._reconcile_shards(document, shards, base_glossary, base_styles, core_narrative_style)
+
+        if self.illustration_generator:
+            deviations = {position: result.style_deviation for position, result in results.items()}
+            self._generate_illustrations_after_shards(document, core_narrative_style, deviations)
+
+    def _translate_shard(self, shard: TranslationShard, document: TranslationDocument,
+                         core_narrative_style: str, base_glossary: Dict[str, str],
+                         base_styles: Dict[str, str], prev_translation: str,
+                         completed: "queue.Queue[Union[ShardSegmentResult, BaseException]]",
+                         stop: threading.Event):
+        """
+        Translate one shard on a worker thread, reporting each segment through `completed`.
+
+        The shard gives up before its next segment once `stop` is set. A failure sets
+        `stop` for the other shards and is put on `completed` so the pipeline thread
+        raises it straight away.
+        """
+        try:
+            self._translate_shard_segments(shard, document, core_narrative_style, base_glossary,
+                                           base_styles, prev_translation, completed, stop)
+        except BaseException as e:
+            stop.set()
+            completed.put(e)
+            raise
+
+    def _translate_shard_segments(self, shard: TranslationShard, document: TranslationDocument,
+                                  core_narrative_style: str, base_glossary: Dict[str, str],
+                                  base_styles: Dict[str, str], prev_translation: str,
+                                  completed: "queue.Queue[Union[ShardSegmentResult, BaseException]]",
+                                  stop: threading.Event):
+        builder = self.dyn_config_builder.spawn_for_shard(shard.index)
+        model_api = model_for_shard(self.gemini_api, shard.index)
+        shard.glossary = dict(base_glossary)
+        shard.character_styles = dict(base_styles)
+
+        for position in shard.positions:
+            if stop.is_set():
+                return
+            segment_info = document.segments[position]
+            segment_index = position + 1
+            with span("segment", segment=segment_index, shard=shard.index):
+                shard.glossary, shard.character_styles, style_deviation = builder.build_dynamic_guides(
+                    segment_text=segment_info.text,
+                    core_narrative_style=core_narrative_style,
+                    current_glossary=shard.glossary,
+                    current_character_styles=shard.character_styles,
+                    job_base_filename=document.user_base_filename,
                     segment_index=segment_index,
-                    source_text=segment_info.text,
+                )
+
+                with span("prompt_build"):
+                    contextual_glossary = self._get_contextual_glossary(shard.glossary, segment_info.text)
+                    immediate_context_source = get_segment_ending(document.get_previous_segment(position), max_chars=1500)
+                    previous_ko = shard.translations[-1] if shard.translations else prev_translation
+                    immediate_context_ko = get_segment_ending(previous_ko, max_chars=500)
+
+                    prompt = self._build_translation_prompt(
+                        segment_info, contextual_glossary, shard.character_styles,
+                        core_narrative_style, style_deviation,
+                        immediate_context_source, immediate_context_ko
+                    )
+
+                with span("translate") as translate_span:
+                    translated_text = self._translate_segment_with_retries(
+                        prompt, segment_info, segment_index, document,
+                        contextual_glossary, style_deviation, model_api=model_api
+                    )
+                shard.translations.append(translated_text)
+                shard.style_deviations.append(style_deviation)
+
+                completed.put(ShardSegmentResult(
+                    position=position,
                     translated_text=translated_text,
-                    metadata=metadata
+                    prompt=prompt,
+                    context_data={
+                        'style_deviation': style_deviation,
+                        'contextual_glossary': contextual_glossary,
+                        'full_glossary': dict(shard.glossary),
+                        'character_styles': dict(shard.character_styles),
+                        'immediate_context_source': immediate_context_source,
+                        'immediate_context_ko': immediate_context_ko
+                    },
+                    contextual_glossary=contextual_glossary,
+                    style_deviation=style_deviation,
+                    translation_time=translate_span.duration,
+                ))
+
+    def _log_shard_segment_result(self, document: TranslationDocument, result: ShardSegmentResult,
+                                  extra_metadata: Optional[Dict[str, Any]] = None):
+        """Write the per-segment logs for a shard result (called from the pipeline thread)."""
+        if not self.logger:
+            return
+        segment_info = document.segments[result.position]
+        segment_index = result.position + 1
+        self.logger.log_segment_context(segment_index, result.context_data)
+        self.logger.log_translation_prompt(segment_index, result.prompt)
+        metadata = {
+            "glossary_used": result.contextual_glossary,
+            "style_deviation": result.style_deviation,
+            "translation_time": result.translation_time,
+            "chapter_title": segment_info.chapter_title,
+            "chapter_filename": segment_info.chapter_filename
+        }
+        if extra_metadata:
+            metadata.update(extra_metadata)
+        if self.world_atmosphere_provider:
+            world_atmosphere_metadata = self.world_atmosphere_provider.get_world_atmosphere_dict(segment_info)
+            if world_atmosphere_metadata:
+                metadata["world_atmosphere"] = world_atmosphere_metadata
+        self.logger.log_segment_io(
+            segment_index=segment_index,
+            source_text=segment_info.text,
+            translated_text=result.translated_text,
+            metadata=metadata
+        )
+
+    def _reconcile_shards(self, document: TranslationDocument, shards: list[TranslationShard],
+                          base_glossary: Dict[str, str], base_styles: Dict[str, str],
+                          core_narrative_style: str):
+        """Merge shard glossaries and re-translate segments that used a conflicting term."""
+        merged_glossary, conflicts = reconcile_glossaries(base_glossary, shards)
+        document.glossary = merged_glossary
+        document.character_styles = merge_character_styles(base_styles, shards)
+        if not conflicts:
+            return
+
+        retranslated = 0
+        for shard in shards:
+            terms = conflicts.get(shard.index)
+            positions = find_segments_using_terms(document.segments, shard, terms or set())
+            if not positions:
+                continue
+            print(f"Shard {shard.index}: re-translating {len(positions)} segments for glossary terms {sorted(terms)}")
+            for position in positions:
+                segment_info = document.segments[position]
+                style_deviation = shard.style_deviations[position - shard.start]
+                contextual_glossary = self._get_contextual_glossary(merged_glossary, segment_info.text)
+                immediate_context_source = get_segment_ending(document.get_previous_segment(position), max_chars=1500)
+                immediate_context_ko = get_segment_ending(document.get_previous_translation(position), max_chars=500)
+                prompt = self._build_translation_prompt(
+                    segment_info, contextual_glossary, shard.character_styles,
+                    core_narrative_style, style_deviation,
+                    immediate_context_source, immediate_context_ko
                 )
 
-            # Append translation and save progress
-            document.append_translated_segment(translated_text, segment_info)
+                with span("translate", segment=position + 1, reconciled=True) as translate_span:
+                    translated_text = self._translate_segment_with_retries(
+                        prompt, segment_info, position + 1, document,
+                        contextual_glossary, style_deviation
+                    )
+                document.replace_translated_segment(position, translated_text)
+                retranslated += 1
 
-            # Generate illustration if enabled
-            if should_generate_illustration:
-                self._generate_segment_illustration(
-                    segment_info, i, document.glossary,
-                    core_narrative_style, style_deviation, world_atmosphere_for_illustration,
-                    character_styles=updated_styles
+                self._log_shard_segment_result(
+                    document,
+                    ShardSegmentResult(
+                        position=position,
+                        translated_text=translated_text,
+                        prompt=prompt,
+                        context_data={
+                            'style_deviation': style_deviation,
+                            'contextual_glossary': contextual_glossary,
+                            'full_glossary': merged_glossary,
+                            'character_styles': shard.character_styles,
+                            'immediate_context_source': immediate_context_source,
+                            'immediate_context_ko': immediate_context_ko
+                        },
+                        contextual_glossary=contextual_glossary,
+                        style_deviation=style_deviation,
+                        translation_time=translate_span.duration,
+                    ),
+                    extra_metadata={"glossary_reconciled": True},
                 )
-            
-            document.save_partial_output()
-        
-        # Persist segments to DB before final file save to avoid DB omissions
-        self.progress_tracker.finalize_translation(
-            document.segments, document.translated_segments, document.glossary
-        )
 
-        # Save final output (file I/O after DB write)
-        document.save_final_output()
-        
-        # Generate illustration batch report if illustrations were created
-        if self.illustration_generator:
-            illustration_metadata = self.illustration_generator.get_illustration_metadata()
-            self.logger.log_debug(f"Illustration generation complete: {illustration_metadata}")
-        
-        # Finalization already performed above to prevent omissions
-        
-        print(f"\n--- Translation Complete! ---")
-        print(f"Output: {document.output_filename}")
-    
+        if retranslated:
+            print(f"Glossary reconciliation re-translated {retranslated} segments.")
+
+    def _generate_illustrations_after_shards(self, document: TranslationDocument,
+                                             core_narrative_style: str,
+                                             style_deviations: Dict[int, str]):
+        """Generate illustrations in segment order once all shards are translated."""
+        for i, segment_info in enumerate(document.segments):
+            if i not in style_deviations or not self._should_generate_illustration(segment_info, i):
+                continue
+            previous_context = document.segments[i - 1].text if i > 0 else None
+            world_atmosphere = self._analyze_world_atmosphere_for_illustration(
+                segment_info=segment_info,
+                glossary=document.glossary,
+                previous_context=previous_context,
+                segment_index=i + 1,
+                job_base_filename=document.user_base_filename,
+            )
+            self._generate_segment_illustration(
+                segment_info, i, document.glossary,
+                core_narrative_style, style_deviations[i], world_atmosphere,
+                character_styles=document.character_styles
+            )
+
     def _define_core_style(self, document: TranslationDocument) -> str:
         """
         Define the core narrative style for the document.
@@ -318,24 +705,60 @@ class TranslationPipeline:
                 document.user_base_filename
             )
     
+    def _schedule_guide_analyses(self, executor: ThreadPoolExecutor, pending_guides: Dict[int, Future],
+                                 document: TranslationDocument, current_index: int,
+                                 core_narrative_style: str):
+        """
+        Submit guide analysis for the current segment and the look-ahead window.
+
+        Each analysis sees the glossary as it is at submission time; terms added by
+        earlier segments in the meantime are reconciled when the result is applied.
+        """
+        window_end = min(len(document.segments), current_index + self.guide_lookahead + 1)
+        glossary_snapshot = dict(document.glossary)
+        for j in range(current_index, window_end):
+            if j in pending_guides or j < len(document.translated_segments):
+                continue
+            pending_guides[j] = executor.submit(
+                in_current_context(self.dyn_config_builder.analyze_segment),
+                document.segments[j].text,
+                core_narrative_style,
+                glossary_snapshot,
+                document.user_base_filename,
+                j + 1,
+            )
+
     def _build_dynamic_guides(self, document: TranslationDocument, segment_info: Any,
                              segment_index: int, core_narrative_style: str,
-                             previous_context: Optional[str] = None) -> tuple:
+                             previous_context: Optional[str] = None,
+                             prefetched_analysis: Optional["Future[SegmentGuideAnalysis]"] = None) -> tuple:
         """
         Build dynamic glossary and character style guides for the segment.
+
+        When a prefetched analysis is given, only the merge into the document state
+        happens here; the model calls already ran on the look-ahead executor.
         
         Returns:
             Tuple of (updated_glossary, updated_styles, style_deviation)
         """
-        updated_glossary, updated_styles, style_deviation = self.dyn_config_builder.build_dynamic_guides(
-            segment_text=segment_info.text,
-            core_narrative_style=core_narrative_style,
-            current_glossary=document.glossary,
-            current_character_styles=document.character_styles,
-            job_base_filename=document.user_base_filename,
-            segment_index=segment_index,
-            previous_context=previous_context
-        )
+        if prefetched_analysis is not None:
+            with span("guide_wait"):
+                analysis = prefetched_analysis.result()
+            updated_glossary, updated_styles, style_deviation = self.dyn_config_builder.apply_segment_analysis(
+                analysis,
+                current_glossary=document.glossary,
+                current_character_styles=document.character_styles,
+            )
+        else:
+            updated_glossary, updated_styles, style_deviation = self.dyn_config_builder.build_dynamic_guides(
+                segment_text=segment_info.text,
+                core_narrative_style=core_narrative_style,
+                current_glossary=document.glossary,
+                current_character_styles=document.character_styles,
+                job_base_filename=document.user_base_filename,
+                segment_index=segment_index,
+                previous_context=previous_context
+            )
 
         # Update document with new guides
         document.glossary = updated_glossary
@@ -347,10 +770,7 @@ class TranslationPipeline:
         """
         Filter glossary to only include terms present in the current segment.
         """
-        return {
-            key: value for key, value in glossary.items() 
-            if re.search(r'\b' + re.escape(key) + r'\b', segment_text, re.IGNORECASE)
-        }
+        return self.glossary_matcher.filter(glossary, segment_text)
     
     def _build_translation_prompt(self, segment_info: Any, contextual_glossary: Dict[str, str],
                                  character_styles: Dict[str, str], core_narrative_style: str,
@@ -370,13 +790,18 @@ class TranslationPipeline:
     
     def _translate_segment_with_retries(self, original_prompt: str, segment_info: Any,
                                        segment_index: int, document: TranslationDocument,
-                                       contextual_glossary: dict, style_deviation: str) -> str:
+                                       contextual_glossary: dict, style_deviation: str,
+                                       model_api: Optional[GeminiModel | OpenRouterModel] = None) -> str:
         """
         Translate a segment with retry logic for prohibited content.
+
+        Args:
+            model_api: Optional model to use instead of the pipeline's main model
         
         Returns:
             Translated text for the segment
         """
+        model_api = model_api or self.gemini_api
         soft_retry_attempts = 3
         prompt = original_prompt
         
@@ -385,9 +810,10 @@ class TranslationPipeline:
                 if retry_attempt > 0:
                     prompt = PromptSanitizer.create_softer_prompt(original_prompt, retry_attempt)
                     print(f"\nRetrying with softer prompt (attempt {retry_attempt}/{soft_retry_attempts})...")
-                    time.sleep(2)
+                    with span("soft_retry_wait", attempt=retry_attempt):
+                        time.sleep(2)
                 
-                model_response = self.gemini_api.generate_text(prompt)
+                model_response = model_api.generate_text(prompt)
                 translated_text = _extract_translation_from_response(model_response)
                 
                 if retry_attempt > 0:
@@ -401,7 +827,8 @@ class TranslationPipeline:
                 else:
                     return self._handle_final_prohibited_exception(
                         e, segment_info, segment_index, document,
-                        contextual_glossary, style_deviation, soft_retry_attempts
+                        contextual_glossary, style_deviation, soft_retry_attempts,
+                        model_api=model_api
                     )
             
             except TranslationError as e:
@@ -419,8 +846,10 @@ class TranslationPipeline:
     def _handle_final_prohibited_exception(self, e: ProhibitedException, segment_info: Any,
                                           segment_index: int, document: TranslationDocument,
                                           contextual_glossary: dict, style_deviation: str,
-                                          soft_retry_attempts: int) -> str:
+                                          soft_retry_attempts: int,
+                                          model_api: Optional[GeminiModel | OpenRouterModel] = None) -> str:
         """Handle the final prohibited content exception after all retries."""
+        model_api = model_api or self.gemini_api
         e.source_text = segment_info.text
         e.context = {
             'segment_index': segment_index,
@@ -442,7 +871,7 @@ class TranslationPipeline:
         try:
             print("Attempting minimal prompt as last resort...")
             minimal_prompt = PromptSanitizer.create_minimal_prompt(segment_info.text, "Korean")
-            model_response = self.gemini_api.generate_text(minimal_prompt)
+            model_response = model_api.generate_text(minimal_prompt)
             translated_text = _extract_translation_from_response(model_response)
 
             # Log segment with error recovery info
@@ -534,45 +963,46 @@ class TranslationPipeline:
         """
         if not self.illustration_generator:
             return
-        
-        try:
-            # Build style hints from configuration and narrative style
-            style_hints = self.illustration_config.style_hints
-            if not style_hints and core_style:
-                style_hints = f"Literary illustration matching: {core_style[:100]}"
+
+        with span("illustration"):
+            try:
+                # Build style hints from configuration and narrative style
+                style_hints = self.illustration_config.style_hints
+                if not style_hints and core_style:
+                    style_hints = f"Literary illustration matching: {core_style[:100]}"
             
-            # Generate the illustration
-            illustration_path, prompt = self.illustration_generator.generate_illustration(
-                segment_text=segment_info.text,
-                segment_index=segment_index,
-                style_hints=style_hints,
-                glossary=glossary,
-                world_atmosphere=world_atmosphere,
-                character_styles=character_styles
-            )
+                # Generate the illustration
+                illustration_path, prompt = self.illustration_generator.generate_illustration(
+                    segment_text=segment_info.text,
+                    segment_index=segment_index,
+                    style_hints=style_hints,
+                    glossary=glossary,
+                    world_atmosphere=world_atmosphere,
+                    character_styles=character_styles
+                )
             
-            if illustration_path:
-                # Update segment info with illustration data
-                segment_info.illustration_path = illustration_path
-                segment_info.illustration_prompt = prompt
-                segment_info.illustration_status = "generated"
+                if illustration_path:
+                    # Update segment info with illustration data
+                    segment_info.illustration_path = illustration_path
+                    segment_info.illustration_prompt = prompt
+                    segment_info.illustration_status = "generated"
                 
-                print(f"✓ Generated illustration for segment {segment_index}")
+                    print(f"✓ Generated illustration for segment {segment_index}")
                 
-                # Log the generation
-                if self.logger:
-                    self.logger.log_debug(
-                        f"Illustration generated for segment {segment_index}: {illustration_path}"
-                    )
-            else:
-                segment_info.illustration_status = "failed"
-                print(f"✗ Failed to generate illustration for segment {segment_index}")
+                    # Log the generation
+                    if self.logger:
+                        self.logger.log_debug(
+                            f"Illustration generated for segment {segment_index}: {illustration_path}"
+                        )
+                else:
+                    segment_info.illustration_status = "failed"
+                    print(f"✗ Failed to generate illustration for segment {segment_index}")
                 
-        except Exception as e:
-            segment_info.illustration_status = "failed"
-            print(f"Error generating illustration for segment {segment_index}: {e}")
-            if self.logger:
-                self.logger.log_error(e, segment_index, "illustration_generation")
+            except Exception as e:
+                segment_info.illustration_status = "failed"
+                print(f"Error generating illustration for segment {segment_index}: {e}")
+                if self.logger:
+                    self.logger.log_error(e, segment_index, "illustration_generation")
 
 
     def _analyze_world_atmosphere_for_illustration(
@@ -589,13 +1019,14 @@ class TranslationPipeline:
             return None
 
         try:
-            return self.world_atmosphere_provider.ensure_world_atmosphere(
-                segment_info=segment_info,
-                glossary=glossary,
-                previous_context=previous_context,
-                segment_index=segment_index,
-                job_base_filename=job_base_filename,
-            )
+            with span("world_atmosphere", segment=segment_index):
+                return self.world_atmosphere_provider.ensure_world_atmosphere(
+                    segment_info=segment_info,
+                    glossary=glossary,
+                    previous_context=previous_context,
+                    segment_index=segment_index,
+                    job_base_filename=job_base_filename,
+                )
         except Exception as exc:
             print(f"Warning: Failed to analyze world atmosphere for illustration (segment {segment_index}): {exc}")
             if self.logger:
@@ -16,6 +16,7 @@ class UsageEvent:
     completion_tokens: int = 0
     total_tokens: int = 0
     timestamp: Optional[datetime] = None
+    cached: bool = False  # served from the response cache, no tokens billed
 
     def normalized(self) -> "UsageEvent":
         """Return a copy with guaranteed non-negative integer values."""
@@ -28,6 +29,7 @@ class UsageEvent:
             completion_tokens=max(completion, 0),
             total_tokens=max(total, 0),
             timestamp=self.timestamp,
+            cached=bool(self.cached),
         )
 
 
@@ -8,13 +8,15 @@ frontend and post-edit modules (no legacy arrays, no raw_response).
 
 from __future__ import annotations
 
-import re
 import json
 import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from typing import Dict, List, Tuple, Any, Optional
 
 from core.schemas.validation import ValidationCase, ValidationResult, make_validation_response_schema
 from core.prompts.manager import PromptManager
+from core.utils.glossary_matcher import GlossaryMatcher
+from core.utils.tracing import in_current_context
 # Logging handled by service; no direct logger usage here
 
 
@@ -25,6 +27,7 @@ class TranslationValidator:
         self.ai_model = ai_model
         self.verbose = verbose
         self.logger = logger  # Optional TranslationLogger instance
+        self.glossary_matcher = GlossaryMatcher()
 
     def validate_segment(
         self,
@@ -47,10 +50,7 @@ class TranslationValidator:
 
         # Filter glossary to only include terms that appear in the source text
         if glossary:
-            contextual_glossary = {
-                key: value for key, value in glossary.items()
-                if re.search(r'\b' + re.escape(key) + r'\b', source_text, re.IGNORECASE)
-            }
+            contextual_glossary = self.glossary_matcher.filter(glossary, source_text)
             if self.verbose and len(glossary) > 0:
                 print(f"  Filtered glossary: {len(glossary)} → {len(contextual_glossary)} terms")
         else:
@@ -143,8 +143,22 @@ class TranslationValidator:
         sample_rate: float = 1.0,
         quick_mode: bool = False,
         progress_callback=None,
+        concurrency: int = 1,
     ) -> Tuple[List[ValidationResult], Dict[str, Any]]:
-        results: List[ValidationResult] = []
+        """
+        Validate the sampled segments of a document.
+
+        Args:
+            document: TranslationDocument with segments, translated_segments and glossary
+            sample_rate: Fraction of segments to validate (evenly spaced)
+            quick_mode: Use the quick validation prompt
+            progress_callback: Called with 0-100 as segments complete (monotonic)
+            concurrency: Number of segments validated at once. Requests are still
+                paced by the model's key pool / RPM limiter.
+
+        Returns:
+            (results in segment order, summary)
+        """
         total_segments = len(document.segments)
         print(f"[VALIDATOR] Starting validation - source segments: {total_segments}, translated segments: {len(document.translated_segments)}")
         if total_segments != len(document.translated_segments):
@@ -175,27 +189,42 @@ class TranslationValidator:
             print(f"{'='*60}\n")
 
         # Process segments with centralized progress tracking
-        print(f"[VALIDATOR] Will validate {segments_to_validate} segments, indices: {list(indices)[:5]}...")
-        for i, idx in enumerate(indices):
-            source_text = document.segments[idx].text
-            translated_text = document.translated_segments[idx]
+        indices = list(indices)
+        workers = max(1, min(int(concurrency or 1), len(indices)))
+        print(f"[VALIDATOR] Will validate {segments_to_validate} segments (concurrency={workers}), indices: {indices[:5]}...")
 
+        def validate_at(i: int, idx: int) -> ValidationResult:
             if self.verbose:
                 print(f"Validating segment {idx} ({i+1}/{segments_to_validate})...")
-            
-            res = self.validate_segment(
-                source_text=source_text,
-                translated_text=translated_text,
+            return self.validate_segment(
+                source_text=document.segments[idx].text,
+                translated_text=document.translated_segments[idx],
                 glossary=document.glossary,
                 segment_index=idx,
                 quick_mode=quick_mode,
             )
-            results.append(res)
-            
+
+        def report_progress(completed: int) -> None:
             if progress_callback:
-                progress = int(((i + 1) / segments_to_validate) * 100)
+                progress = int((completed / segments_to_validate) * 100)
                 progress_callback(progress)
 
+        if workers == 1:
+            results: List[ValidationResult] = []
+            for i, idx in enumerate(indices):
+                results.append(validate_at(i, idx))
+                report_progress(i + 1)
+        else:
+            # Results are slotted by position so ordering does not depend on completion order;
+            # progress is reported from this thread as the completed count grows.
+            ordered: List[Optional[ValidationResult]] = [None] * len(indices)
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="validation") as executor:
+                futures = {executor.submit(in_current_context(validate_at), i, idx): i for i, idx in enumerate(indices)}
+                for completed, future in enumerate(as_completed(futures), start=1):
+                    ordered[futures[future]] = future.result()
+                    report_progress(completed)
+            results = [res for res in ordered if res is not None]
+
         print(f"[VALIDATOR] Validation complete - {len(results)} results collected")
         summary = self._calculate_summary(results, total_segments, segments_to_validate)
         
@@ -7,25 +7,47 @@ This package provides centralized utilities for:
 - Retry logic and error handling
 """
 
-from .file_parser import parse_document
+from .file_parser import parse_document, iter_document_blocks, iter_epub_chapters, EpubChapter
+from .document_cache import ParsedDocumentCache, get_document_cache, parse_document_cached
 from .document_io import DocumentOutputManager
 from .text_segmentation import (
     create_segments_for_text, 
     create_segments_for_epub, 
     create_segments_from_plain_text,
+    iter_segments_from_blocks,
     get_segment_statistics
 )
+from .token_budget import (
+    SegmentBudget,
+    PromptOverhead,
+    estimate_tokens,
+    segment_token_budget,
+    budget_for_document
+)
 from shared.utils.logging import TranslationLogger, get_logger
 
 __all__ = [
     # File operations
     "parse_document",
+    "iter_document_blocks",
+    "iter_epub_chapters",
+    "EpubChapter",
+    "ParsedDocumentCache",
+    "get_document_cache",
+    "parse_document_cached",
     "DocumentOutputManager", 
     # Text segmentation
     "create_segments_for_text",
     "create_segments_for_epub", 
     "create_segments_from_plain_text",
+    "iter_segments_from_blocks",
     "get_segment_statistics",
+    # Token budgets
+    "SegmentBudget",
+    "PromptOverhead",
+    "estimate_tokens",
+    "segment_token_budget",
+    "budget_for_document",
     # Logging
     "TranslationLogger",
     "get_logger",
@@ -0,0 +1,265 @@
+"""
+Parsed Document Cache
+
+Parsing an EPUB/PDF and segmenting it is expensive, and one job does it several
+times (document segmentation, style sampling, glossary/character/style analysis,
+exports). This module caches the parsed plain text and segment lists keyed by the
+SHA-256 of the source file:
+
+- in memory, shared by everything running in the same worker process (LRU)
+- on disk, so other workers and later tasks of the same job skip parsing too:
+  in `<job dir>/output/.parsed/` for job inputs under JOB_STORAGE_BASE (removed
+  with the job), or in PARSED_DOCUMENT_CACHE_DIR when set. Other files (temporary
+  analysis uploads, CLI inputs) are cached in memory only. The disk directory is
+  pruned by age and total size whenever an entry is written.
+
+Cached segment lists are copied on every read because consumers annotate
+SegmentInfo objects (world atmosphere, illustrations).
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, List, Optional, Tuple
+
+from ..schemas import SegmentInfo
+from .file_parser import parse_document
+
+CACHE_DIR_NAME = ".parsed"
+# Bumped whenever parsing or segmentation changes the produced text
+CACHE_FORMAT_VERSION = 3
+DEFAULT_MAX_DISK_BYTES = 256 * 1024 * 1024
+DEFAULT_MAX_AGE_SECONDS = 7 * 24 * 3600
+# (path, mtime, size) -> content hash entries kept in memory
+MAX_HASHED_FILES = 1024
+
+
+def file_content_hash(filepath: str, chunk_size: int = 1024 * 1024) -> str:
+    """SHA-256 of a file's bytes, read in chunks."""
+    digest = hashlib.sha256()
+    with open(filepath, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class ParsedDocumentCache:
+    """Content-hash keyed cache of parsed text and segment lists."""
+
+    def __init__(self, max_entries: int = 16, use_disk: bool = True, cache_dir: Optional[str] = None,
+                 max_disk_bytes: int = DEFAULT_MAX_DISK_BYTES,
+                 max_age_seconds: float = DEFAULT_MAX_AGE_SECONDS):
+        """
+        Args:
+            max_entries: Parsed texts / segment lists kept in memory
+            use_disk: Also persist entries on disk (job inputs or `cache_dir` only)
+            cache_dir: Fixed directory for disk entries of any source file
+            max_disk_bytes: Total size a disk cache directory is pruned down to
+            max_age_seconds: Disk entries older than this are deleted
+        """
+        self.max_entries = max(1, int(max_entries))
+        self.use_disk = use_disk
+        self.cache_dir = cache_dir
+        self.max_disk_bytes = max_disk_bytes
+        self.max_age_seconds = max_age_seconds
+        self._entries: "OrderedDict[Tuple, object]" = OrderedDict()
+        # (path, mtime, size) -> content hash, so unchanged files are hashed once (LRU)
+        self._hashes: "OrderedDict[Tuple[str, float, int], str]" = OrderedDict()
+        self._lock = threading.RLock()
+        self._key_locks: Dict[Tuple, threading.Lock] = {}
+
+    def content_hash(self, filepath: str) -> str:
+        stat = os.stat(filepath)
+        stat_key = (os.path.abspath(filepath), stat.st_mtime, stat.st_size)
+        with self._lock:
+            cached = self._hashes.get(stat_key)
+            if cached is not None:
+                self._hashes.move_to_end(stat_key)
+                return cached
+        cached = file_content_hash(filepath)
+        with self._lock:
+            self._hashes[stat_key] = cached
+            while len(self._hashes) > MAX_HASHED_FILES:
+                self._hashes.popitem(last=False)
+        return cached
+
+    def get_text(self, filepath: str) -> str:
+        """Plain text of a document, parsed at most once per content hash."""
+        content_hash = self.content_hash(filepath)
+        key = ("text", content_hash)
+        return self._get_or_build(
+            key,
+            lambda: self._load_or_parse_text(filepath, content_hash),
+        )
+
+    def get_segments(self, filepath: str, variant: str,
+                     builder: Callable[[], List[SegmentInfo]]) -> List[SegmentInfo]:
+        """
+        Segments of a document for one segmentation variant (e.g. "text:15000").
+
+        Args:
+            filepath: Source document
+            variant: Identifies the segmentation method and its parameters
+            builder: Produces the segments when they are not cached
+
+        Returns:
+            Fresh SegmentInfo copies
+        """
+        content_hash = self.content_hash(filepath)
+        key = ("segments", content_hash, variant)
+        segments = self._get_or_build(
+            key,
+            lambda: self._load_or_build_segments(filepath, content_hash, variant, builder),
+        )
+        return [segment.model_copy(deep=True) for segment in segments]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._hashes.clear()
+
+    def _get_or_build(self, key: Tuple, build: Callable[[], object]):
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                return self._entries[key]
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+
+        # Concurrent callers for the same document wait for one parse
+        with key_lock:
+            try:
+                with self._lock:
+                    if key in self._entries:
+                        self._entries.move_to_end(key)
+                        return self._entries[key]
+                value = build()
+                with self._lock:
+                    self._entries[key] = value
+                    self._entries.move_to_end(key)
+                    while len(self._entries) > self.max_entries:
+                        self._entries.popitem(last=False)
+                return value
+            finally:
+                with self._lock:
+                    self._key_locks.pop(key, None)
+
+    def _disk_dir(self, filepath: str) -> Optional[str]:
+        """Directory for a source file's disk entries, or None to cache it in memory only."""
+        if not self.use_disk:
+            return None
+        if self.cache_dir:
+            return self.cache_dir
+        job_dir = _job_dir_of(filepath)
+        if job_dir is None:
+            return None
+        return os.path.join(job_dir, "output", CACHE_DIR_NAME)
+
+    def _disk_path(self, filepath: str, content_hash: str, suffix: str) -> Optional[str]:
+        directory = self._disk_dir(filepath)
+        if directory is None:
+            return None
+        return os.path.join(directory, f"{content_hash}.v{CACHE_FORMAT_VERSION}.{suffix}")
+
+    def _load_or_parse_text(self, filepath: str, content_hash: str) -> str:
+        path = self._disk_path(filepath, content_hash, "txt")
+        if path and os.path.exists(path):
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    return f.read()
+            except OSError as e:
+                print(f"Warning: Could not read parsed document cache {path}: {e}")
+
+        text = parse_document(filepath)
+        if path:
+            self._write_atomic(path, text)
+        return text
+
+    def _load_or_build_segments(self, filepath: str, content_hash: str, variant: str,
+                                builder: Callable[[], List[SegmentInfo]]) -> List[SegmentInfo]:
+        safe_variant = "".join(c if c.isalnum() or c in "-_" else "_" for c in variant)
+        path = self._disk_path(filepath, content_hash, f"segments.{safe_variant}.json")
+        if path and os.path.exists(path):
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    return [SegmentInfo(**data) for data in json.load(f)]
+            except (OSError, ValueError, TypeError) as e:
+                print(f"Warning: Ignoring unreadable segment cache {path}: {e}")
+
+        segments = builder()
+        if path:
+            payload = [segment.model_dump(exclude_none=True) for segment in segments]
+            self._write_atomic(path, json.dumps(payload, ensure_ascii=False))
+        return segments
+
+    def _write_atomic(self, path: str, content: str) -> None:
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                f.write(content)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            print(f"Warning: Could not write parsed document cache {path}: {e}")
+            return
+        self._prune(os.path.dirname(path), keep=path)
+
+    def _prune(self, directory: str, keep: str) -> None:
+        """Delete expired entries, then the oldest ones until the directory fits max_disk_bytes."""
+        now = time.time()
+        entries = []
+        try:
+            with os.scandir(directory) as it:
+                for entry in it:
+                    if entry.is_file() and not entry.name.endswith(".tmp"):
+                        stat = entry.stat()
+                        entries.append((stat.st_mtime, stat.st_size, entry.path))
+        except OSError:
+            return
+
+        entries.sort()
+        total = sum(size for _, size, _ in entries)
+        for mtime, size, path in entries:
+            if path == keep:
+                continue
+            if now - mtime <= self.max_age_seconds and total <= self.max_disk_bytes:
+                break
+            try:
+                os.remove(path)
+                total -= size
+            except OSError:
+                pass
+
+
+def _job_dir_of(filepath: str) -> Optional[str]:
+    """`<JOB_STORAGE_BASE>/<job id>` when filepath is a job file, else None."""
+    job_base = os.path.abspath(os.environ.get("JOB_STORAGE_BASE", "logs/jobs"))
+    try:
+        relative = os.path.relpath(os.path.abspath(filepath), job_base)
+    except ValueError:
+        # Different drive on Windows
+        return None
+    parts = relative.split(os.sep)
+    if len(parts) < 2 or parts[0] in (os.pardir, os.curdir) or not parts[0].isdigit():
+        return None
+    return os.path.join(job_base, parts[0])
+
+
+_default_cache: Optional[ParsedDocumentCache] = None
+_default_cache_lock = threading.Lock()
+
+
+def get_document_cache() -> ParsedDocumentCache:
+    """Process-wide cache (PARSED_DOCUMENT_CACHE_DIR sets a disk directory for every source file)."""
+    global _default_cache
+    with _default_cache_lock:
+        if _default_cache is None:
+            _default_cache = ParsedDocumentCache(cache_dir=os.getenv("PARSED_DOCUMENT_CACHE_DIR") or None)
+        return _default_cache
+
+
+def parse_document_cached(filepath: str) -> str:
+    """parse_document() through the shared parsed-document cache."""
+    return get_document_cache().get_text(filepath)
@@ -6,12 +6,13 @@ across the translation engine. It handles document parsing, output generation,
 and file management operations.
 """
 
+import html
 import os
 import uuid
 import ebooklib
 from ebooklib import epub
 from bs4 import BeautifulSoup
-from typing import List, Optional, Union
+from typing import List, Optional, Tuple, Union
 from pathlib import Path
 
 from .file_parser import parse_document
@@ -157,15 +158,22 @@ class DocumentOutputManager:
     
     @staticmethod
     def save_epub_output(original_filepath: str, segments: List[str], 
-                        output_path: str, style_map: Optional[dict] = None):
+                        output_path: str, style_map: Optional[dict] = None,
+                        segment_infos: Optional[List[SegmentInfo]] = None):
         """
         Save translated segments as an EPUB file.
+
+        When source segments carry chapter metadata (see create_segments_for_epub),
+        each chapter is written as its own XHTML document; e-readers handle many
+        small documents far better than one large one, and partially translated
+        books export their finished chapters.
         
         Args:
             original_filepath: Path to original EPUB file
             segments: List of translated text segments
             output_path: Path to save the output file
             style_map: Optional style mapping for formatting
+            segment_infos: Source segments aligned with `segments`, for chapter boundaries
         """
         print(f"Saving EPUB output to {output_path}...")
 
@@ -212,32 +220,31 @@ class DocumentOutputManager:
 
             translated_book.set_language('ko')  # Korean translation
 
-            # Join all segments for the content
-            full_translated_text = "\n\n".join(segments)
-
-            # Create a single chapter with all translated content
-            chapter = epub.EpubHtml(
-                title='Translated Content',
-                file_name='translated_content.xhtml',
-                lang='ko'
-            )
-
-            # Convert plain text to HTML with proper paragraph formatting
-            html_content = _convert_text_to_html(full_translated_text)
-            chapter.content = html_content
+            # One XHTML document per source chapter (a single one without chapter metadata)
+            groups = _group_segments_by_chapter(segments, segment_infos)
+            chapters = []
+            for number, (chapter_title, chapter_segments) in enumerate(groups, start=1):
+                if len(groups) == 1 and chapter_title is None:
+                    chapter_title, file_name = 'Translated Content', 'translated_content.xhtml'
+                else:
+                    chapter_title = chapter_title or f'Chapter {number}'
+                    file_name = f'chapter_{number:04d}.xhtml'
+                chapter = epub.EpubHtml(title=chapter_title, file_name=file_name, lang='ko')
+                # Convert plain text to HTML with proper paragraph formatting
+                chapter.content = _convert_text_to_html("\n\n".join(chapter_segments), chapter_title)
+                translated_book.add_item(chapter)
+                chapters.append(chapter)
 
-            # Add chapter to book
-            translated_book.add_item(chapter)
-
-            # Copy navigation structure or create simple one
-            translated_book.toc = (
-                epub.Link("translated_content.xhtml", "Translated Content", "content"),
+            # Navigation lists every chapter
+            translated_book.toc = tuple(
+                epub.Link(chapter.file_name, chapter.title, os.path.splitext(chapter.file_name)[0])
+                for chapter in chapters
             )
             translated_book.add_item(epub.EpubNcx())
             translated_book.add_item(epub.EpubNav())
 
             # Define spine
-            translated_book.spine = ['nav', chapter]
+            translated_book.spine = ['nav', *chapters]
 
             # Write the EPUB file
             epub.write_epub(output_path, translated_book, {})
@@ -253,7 +260,8 @@ class DocumentOutputManager:
     @staticmethod
     def save_translation_output(segments: List[str], output_path: str, 
                               original_filepath: Optional[str] = None,
-                              style_map: Optional[dict] = None):
+                              style_map: Optional[dict] = None,
+                              segment_infos: Optional[List[SegmentInfo]] = None):
         """
         Save translation output in the appropriate format.
         
@@ -262,23 +270,55 @@ class DocumentOutputManager:
             output_path: Path to save the output file
             original_filepath: Path to original file (for EPUB processing)
             style_map: Optional style mapping for formatting
+            segment_infos: Source segments aligned with `segments` (EPUB chapters)
         """
         file_extension = os.path.splitext(output_path.lower())[1]
         
         if file_extension == '.epub':
             if not original_filepath:
                 raise ValueError("Original filepath required for EPUB output")
-            DocumentOutputManager.save_epub_output(original_filepath, segments, output_path, style_map)
+            DocumentOutputManager.save_epub_output(
+                original_filepath, segments, output_path, style_map, segment_infos
+            )
         else:
             DocumentOutputManager.save_text_output(segments, output_path)
 
 
-def _convert_text_to_html(text: str) -> str:
+def _group_segments_by_chapter(segments: List[str],
+                               segment_infos: Optional[List[SegmentInfo]]) -> List[Tuple[Optional[str], List[str]]]:
+    """
+    Group consecutive translated segments by their source chapter.
+
+    Args:
+        segments: Translated text segments (may be a prefix of the source segments)
+        segment_infos: Source segments with chapter metadata
+
+    Returns:
+        List of (chapter_title, segments) in reading order; a single untitled group
+        when chapter metadata is missing or does not cover the segments
+    """
+    if not segment_infos or len(segment_infos) < len(segments):
+        return [(None, list(segments))]
+    if all(info.chapter_filename is None for info in segment_infos[:len(segments)]):
+        return [(None, list(segments))]
+
+    groups: List[Tuple[Optional[str], List[str]]] = []
+    current_file = object()
+    for text, info in zip(segments, segment_infos):
+        if info.chapter_filename != current_file:
+            current_file = info.chapter_filename
+            groups.append((info.chapter_title, []))
+        groups[-1][1].append(text)
+    return groups
+
+
+def _convert_text_to_html(text: str, title: str = 'Translated Content') -> str:
     """
     Convert plain text to HTML with proper paragraph formatting.
     
     Args:
         text: Plain text to convert
+        title: Document title
         
     Returns:
         HTML formatted text
@@ -287,13 +327,13 @@ def _convert_text_to_html(text: str) -> str:
     paragraphs = text.split('\n\n')
     
     html_parts = ['<html xmlns="http://www.w3.org/1999/xhtml">',
-                  '<head><title>Translated Content</title></head>',
+                  f'<head><title>{html.escape(title)}</title></head>',
                   '<body>']
     
     for para in paragraphs:
         if para.strip():
             # Replace single newlines with <br/> tags within paragraphs
-            para_html = para.replace('\n', '<br/>')
+            para_html = html.escape(para, quote=False).replace('\n', '<br/>')
             html_parts.append(f'<p>{para_html}</p>')
     
     html_parts.extend(['</body>', '</html>'])
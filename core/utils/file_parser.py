@@ -8,61 +8,141 @@ from bs4 import BeautifulSoup
 import markdown
 import fitz  # PyMuPDF
 import gc
+from typing import Dict, Iterator, List, NamedTuple, Optional, Tuple
 
-def _parse_txt(filepath):
-    """Parses a .txt file."""
+# Block iterators: each yields the document's text in pieces (paragraphs, spine
+# items, pages) whose boundaries are paragraph boundaries, so callers can segment a
+# book without materializing it as one string.
+
+def _iter_txt(filepath) -> Iterator[str]:
+    """Yields the paragraphs of a .txt file, reading it line by line."""
     with open(filepath, 'r', encoding='utf-8') as f:
-        return f.read()
+        lines: List[str] = []
+        for line in f:
+            if line.strip():
+                lines.append(line)
+            elif lines:
+                yield "".join(lines)
+                lines = []
+        if lines:
+            yield "".join(lines)
 
-def _parse_docx(filepath):
-    """Parses a .docx file and returns its text content."""
+def _iter_docx(filepath) -> Iterator[str]:
+    """Yields the non-empty paragraphs of a .docx file."""
     try:
         doc = docx.Document(filepath)
-        # Join paragraphs with double newlines to preserve structure
-        return "\n\n".join([para.text for para in doc.paragraphs if para.text.strip()])
     except Exception as e:
         print(f"Error parsing DOCX file {filepath}: {e}")
         raise
+    for para in doc.paragraphs:
+        if para.text.strip():
+            yield para.text
 
-def _parse_epub(filepath):
-    """Parses an .epub file and returns its text content."""
+class EpubChapter(NamedTuple):
+    """Text of one EPUB spine document."""
+    file_name: str
+    title: Optional[str]
+    text: str
+
+def _epub_document_items(book) -> list:
+    """Document items in reading (spine) order; manifest order if the spine is empty."""
+    items = []
+    for idref, _linear in book.spine:
+        item = book.get_item_with_id(idref)
+        if item is not None and item.get_type() == ebooklib.ITEM_DOCUMENT:
+            items.append(item)
+    return items or list(book.get_items_of_type(ebooklib.ITEM_DOCUMENT))
+
+def _epub_item_chapter(item) -> Tuple[Optional[str], str]:
+    """(first heading, text) of a spine item."""
+    soup = BeautifulSoup(item.get_content(), 'html.parser')
+    heading = soup.find(['h1', 'h2', 'h3'])
+    heading_text = heading.get_text(' ', strip=True) if heading else None
+    # Extract text, preserving paragraph breaks with newlines
+    text = soup.get_text(separator='\n', strip=True)
+    soup.decompose()
+    return heading_text or None, text
+
+def _epub_toc_titles(toc) -> Dict[str, str]:
+    """Maps chapter file names to their table-of-contents titles."""
+    titles: Dict[str, str] = {}
+    for entry in toc:
+        if isinstance(entry, (tuple, list)):
+            # (Section, [children])
+            section, children = entry[0], entry[1] if len(entry) > 1 else []
+            if getattr(section, 'href', None) and section.title:
+                titles.setdefault(section.href.split('#', 1)[0], section.title)
+            for name, title in _epub_toc_titles(children).items():
+                titles.setdefault(name, title)
+        elif getattr(entry, 'href', None) and entry.title:
+            titles.setdefault(entry.href.split('#', 1)[0], entry.title)
+    return titles
+
+def iter_epub_chapters(filepath) -> Iterator[EpubChapter]:
+    """
+    Yields the chapters of an .epub file in spine order.
+
+    Each spine document with text is one chapter, titled from the table of contents,
+    then the document's title, then its first heading. Items without text (covers,
+    image-only pages) are skipped.
+    """
     try:
         book = epub.read_epub(filepath)
-        content = []
-        # Iterate through all document items in the book
-        for item in book.get_items_of_type(ebooklib.ITEM_DOCUMENT):
-            soup = BeautifulSoup(item.get_content(), 'html.parser')
-            # Extract text and append, preserving paragraph breaks with newlines
-            text = soup.get_text(separator='\n', strip=True)
-            if text:
-                content.append(text)
-        return "\n\n".join(content)
     except Exception as e:
         print(f"Error parsing EPUB file {filepath}: {e}")
         raise
+    toc_titles = _epub_toc_titles(book.toc)
+    for item in _epub_document_items(book):
+        heading, text = _epub_item_chapter(item)
+        if not text:
+            continue
+        file_name = item.get_name()
+        title = toc_titles.get(file_name) or getattr(item, 'title', None) or heading
+        yield EpubChapter(file_name=file_name, title=title, text=text)
 
-def _parse_md(filepath):
-    """Parses a .md file and returns its text content."""
+def _iter_epub(filepath) -> Iterator[str]:
+    """Yields the text of an .epub file one spine item at a time."""
+    for chapter in iter_epub_chapters(filepath):
+        yield chapter.text
+
+def _markdown_block_text(md_text: str) -> str:
+    # Convert markdown to HTML, then extract text
+    html = markdown.markdown(md_text)
+    soup = BeautifulSoup(html, 'html.parser')
+    return soup.get_text(separator='\n', strip=True)
+
+def _iter_md(filepath) -> Iterator[str]:
+    """Yields the text of a .md file block by block (blank-line separated, fences kept whole)."""
     try:
         with open(filepath, 'r', encoding='utf-8') as f:
-            md_text = f.read()
-        # Convert markdown to HTML, then extract text
-        html = markdown.markdown(md_text)
-        soup = BeautifulSoup(html, 'html.parser')
-        return soup.get_text(separator='\n', strip=True)
+            lines: List[str] = []
+            in_fence = False
+            for line in f:
+                if line.lstrip().startswith(("```", "~~~")):
+                    in_fence = not in_fence
+                if line.strip() or in_fence:
+                    lines.append(line)
+                    continue
+                if lines:
+                    text = _markdown_block_text("".join(lines))
+                    lines = []
+                    if text:
+                        yield text
+            if lines:
+                text = _markdown_block_text("".join(lines))
+                if text:
+                    yield text
     except Exception as e:
         print(f"Error parsing Markdown file {filepath}: {e}")
         raise
 
-def _parse_pdf(filepath):
-    """Parses a .pdf file and returns its text content."""
+def _iter_pdf(filepath) -> Iterator[str]:
+    """Yields the text of a .pdf file page by page."""
     doc = None
     try:
         doc = fitz.open(filepath)
-        content = []
         for page in doc:
-            content.append(page.get_text())
-        return "\n\n".join(content)
+            yield page.get_text()
     except Exception as e:
         print(f"Error parsing PDF file {filepath}: {e}")
         raise
@@ -72,6 +152,65 @@ def _parse_pdf(filepath):
             del doc
             gc.collect()
 
+def _parse_txt(filepath):
+    """Parses a .txt file."""
+    with open(filepath, 'r', encoding='utf-8') as f:
+        return f.read()
+
+def _parse_docx(filepath):
+    """Parses a .docx file and returns its text content."""
+    # Join paragraphs with double newlines to preserve structure
+    return "\n\n".join(_iter_docx(filepath))
+
+def _parse_epub(filepath):
+    """Parses an .epub file and returns its text content."""
+    return "\n\n".join(_iter_epub(filepath))
+
+def _parse_md(filepath):
+    """Parses a .md file and returns its text content."""
+    return "\n\n".join(_iter_md(filepath))
+
+def _parse_pdf(filepath):
+    """Parses a .pdf file and returns its text content."""
+    return "\n\n".join(_iter_pdf(filepath))
+
+_PARSERS = {
+    '.txt': (_parse_txt, _iter_txt),
+    '.docx': (_parse_docx, _iter_docx),
+    '.epub': (_parse_epub, _iter_epub),
+    '.md': (_parse_md, _iter_md),
+    '.pdf': (_parse_pdf, _iter_pdf),
+}
+
+def _parsers_for(filepath: str):
+    # Get the file extension and convert to lowercase for matching
+    _, extension = os.path.splitext(filepath.lower())
+    if extension not in _PARSERS:
+        # If the extension is not found in our map, raise an error
+        supported_formats = ", ".join(_PARSERS.keys())
+        raise ValueError(f"Unsupported file format: '{extension}'. Supported formats are: {supported_formats}")
+    return extension, _PARSERS[extension]
+
+def iter_document_blocks(filepath: str) -> Iterator[str]:
+    """
+    Streams a document's plain text as blocks that end on paragraph boundaries
+    (paragraphs for TXT/MD/DOCX, spine items for EPUB, pages for PDF).
+
+    Joined with blank lines, the blocks give the same paragraphs as parse_document().
+
+    Args:
+        filepath: The absolute path to the file.
+
+    Returns:
+        An iterator over text blocks.
+
+    Raises:
+        ValueError: If the file format is not supported.
+    """
+    extension, (_, block_iterator) = _parsers_for(filepath)
+    print(f"Detected '{extension}' file. Streaming with the appropriate parser.")
+    return block_iterator(filepath)
+
 def parse_document(filepath: str) -> str:
     """
     Detects the file type based on its extension and uses the appropriate
@@ -86,21 +225,6 @@ def parse_document(filepath: str) -> str:
     Raises:
         ValueError: If the file format is not supported.
     """
-    # Get the file extension and convert to lowercase for matching
-    _, extension = os.path.splitext(filepath.lower())
-    
-    parser_map = {
-        '.txt': _parse_txt,
-        '.docx': _parse_docx,
-        '.epub': _parse_epub,
-        '.md': _parse_md,
-        '.pdf': _parse_pdf,
-    }
-
-    if extension in parser_map:
-        print(f"Detected '{extension}' file. Using the appropriate parser.")
-        return parser_map[extension](filepath)
-    else:
-        # If the extension is not found in our map, raise an error
-        supported_formats = ", ".join(parser_map.keys())
-        raise ValueError(f"Unsupported file format: '{extension}'. Supported formats are: {supported_formats}")
+    extension, (parser, _) = _parsers_for(filepath)
+    print(f"Detected '{extension}' file. Using the appropriate parser.")
+    return parser(filepath)
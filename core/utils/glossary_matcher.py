@@ -0,0 +1,178 @@
+"""
+Glossary term matching.
+
+Finds which glossary terms occur in a text segment with one pass over the text
+(an Aho–Corasick automaton) instead of one regex search per term. Matches follow
+the same rules as re.search(r'\\b' + re.escape(term) + r'\\b', text, re.IGNORECASE):
+case-insensitive, word boundaries on both ends, and overlapping terms
+(e.g. "Andrew" inside "Andrew Ramsay") both count.
+"""
+
+import functools
+import threading
+from typing import Dict, Iterable, List, Set
+
+
+def _is_word_char(ch: str) -> bool:
+    """Same definition of a word character as the re module's \\w for str patterns."""
+    return ch.isalnum() or ch == "_"
+
+
+# Pairs re.IGNORECASE treats as equal that upper()/lower() do not connect
+_EXTRA_FOLDS = {"\u1fd3": "\u0390", "\u1fe3": "\u03b0", "\ufb05": "\ufb06"}
+
+
+@functools.lru_cache(maxsize=4096)
+def _fold_char(ch: str) -> str:
+    """
+    One character's case-insensitive key, with re.IGNORECASE's single-character rules.
+
+    Folding through the uppercase puts 'σ'/'ς'/'Σ', 'i'/'ı'/'I' and 's'/'ſ'/'S' in one
+    class, as re does; 'İ' lowercases to 'i' plus a combining dot, of which re keeps 'i'.
+    """
+    ch = _EXTRA_FOLDS.get(ch, ch)
+    upper = ch.upper()
+    return (upper if len(upper) == 1 else ch).lower()[0]
+
+
+def _fold(text: str) -> str:
+    """Case-fold text one character at a time, so match offsets map back to the original."""
+    if text.isascii():
+        return text.lower()
+    return "".join(map(_fold_char, text))
+
+
+class GlossaryMatcher:
+    """
+    Compiled matcher for a growing set of glossary terms.
+
+    Terms can be added at any time; the automaton's failure links are rebuilt
+    lazily on the next search. Safe to share between threads.
+    """
+
+    def __init__(self, terms: Iterable[str] = ()):
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._outputs: List[List[str]] = [[]]  # folded terms ending at each node
+        self._output_link: List[int] = [-1]  # nearest node on the failure chain with outputs
+        self._originals: Dict[str, List[str]] = {}  # folded term -> original spellings
+        self._known: Set[str] = set()
+        self._has_empty_term = False
+        self._built = True
+        self._lock = threading.Lock()
+        self.add_terms(terms)
+
+    def __len__(self) -> int:
+        return len(self._known)
+
+    def __contains__(self, term: str) -> bool:
+        return term in self._known
+
+    def add_terms(self, terms: Iterable[str]) -> int:
+        """
+        Add terms that are not in the matcher yet.
+
+        Returns:
+            Number of new terms added
+        """
+        added = 0
+        with self._lock:
+            for term in terms:
+                if term in self._known:
+                    continue
+                self._known.add(term)
+                added += 1
+                if not term:
+                    self._has_empty_term = True
+                    continue
+                folded = _fold(term)
+                spellings = self._originals.setdefault(folded, [])
+                spellings.append(term)
+                if len(spellings) > 1:
+                    continue
+                node = 0
+                for ch in folded:
+                    nxt = self._goto[node].get(ch)
+                    if nxt is None:
+                        nxt = len(self._goto)
+                        self._goto[node][ch] = nxt
+                        self._goto.append({})
+                        self._fail.append(0)
+                        self._outputs.append([])
+                        self._output_link.append(-1)
+                    node = nxt
+                self._outputs[node].append(folded)
+                self._built = False
+        return added
+
+    def find(self, text: str) -> Set[str]:
+        """Return the terms (original spellings) that occur in text."""
+        with self._lock:
+            if not self._built:
+                self._build()
+            found_folded: Set[str] = set()
+            folded_text = _fold(text)
+            length = len(text)
+            goto, fail, outputs, output_link = self._goto, self._fail, self._outputs, self._output_link
+
+            node = 0
+            for end, ch in enumerate(folded_text):
+                while node and ch not in goto[node]:
+                    node = fail[node]
+                node = goto[node].get(ch, 0)
+
+                candidate = node if outputs[node] else output_link[node]
+                while candidate > 0:
+                    for term in outputs[candidate]:
+                        if term in found_folded:
+                            continue
+                        start = end - len(term) + 1
+                        if self._at_boundary(text, start, length) and self._at_boundary(text, end + 1, length):
+                            found_folded.add(term)
+                    candidate = output_link[candidate]
+
+            found = {original for term in found_folded for original in self._originals[term]}
+            if self._has_empty_term and any(_is_word_char(ch) for ch in text):
+                # r'\b\b' matches wherever there is any word boundary
+                found.add("")
+            return found
+
+    def filter(self, glossary: Dict[str, str], text: str) -> Dict[str, str]:
+        """
+        Return the glossary entries whose term occurs in text, in glossary order.
+
+        New glossary terms are added to the matcher first.
+        """
+        if not glossary:
+            return {}
+        self.add_terms(term for term in glossary if term not in self._known)
+        found = self.find(text)
+        return {term: translation for term, translation in glossary.items() if term in found}
+
+    @staticmethod
+    def _at_boundary(text: str, pos: int, length: int) -> bool:
+        before = pos > 0 and _is_word_char(text[pos - 1])
+        after = pos < length and _is_word_char(text[pos])
+        return before != after
+
+    def _build(self) -> None:
+        """Compute failure and output links breadth-first."""
+        goto, fail, outputs, output_link = self._goto, self._fail, self._outputs, self._output_link
+        queue: List[int] = []
+        for child in goto[0].values():
+            fail[child] = 0
+            output_link[child] = -1
+            queue.append(child)
+        head = 0
+        while head < len(queue):
+            node = queue[head]
+            head += 1
+            for ch, child in goto[node].items():
+                state = fail[node]
+                while state and ch not in goto[state]:
+                    state = fail[state]
+                target = goto[state].get(ch, 0)
+                fail[child] = target if target != child else 0
+                output_link[child] = fail[child] if outputs[fail[child]] else output_link[fail[child]]
+                queue.append(child)
+        self._built = True
@@ -0,0 +1,212 @@
+"""
+Prometheus Metrics
+
+Counters and histograms for the translation engine, exported in the Prometheus text
+format. Metrics are off until enable() is called (the API and the Celery workers do
+so when ENABLE_METRICS is set); until then every record_* function is a no-op and
+prometheus_client is not imported.
+
+Recorded here:
+    cat_llm_calls_total{provider, model, outcome, error_class}   (llm_call spans)
+    cat_llm_call_seconds{provider, model}                        (llm_call spans)
+    cat_llm_tokens_total{model, kind}                            (UsageEvent)
+    cat_llm_cached_responses_total{model}                        (UsageEvent)
+    cat_segment_seconds                                          (segment spans)
+    cat_wait_seconds{reason}                   (rate_limit_wait, key_cooldown_wait,
+                                                retry_backoff, soft_retry_wait spans)
+    cat_api_key_events_total{model, event}     (key put in cooldown / disabled)
+    cat_api_keys{model, state}                 (key pool state, max over processes)
+    cat_db_checkout_wait_seconds               (time to get a pooled DB connection)
+
+Celery workers run as several processes, so with a multiprocess directory
+(PROMETHEUS_MULTIPROC_DIR) every process writes its samples there and render()
+merges them. The directory must be shared by the API and the workers on one host
+and emptied before they start; it is set before prometheus_client is first imported.
+Values that only the scraping process can read (queue depth, outbox backlog) are
+added with register_collector().
+"""
+
+import os
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+from .tracing import Span, add_span_listener
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Span names recorded as waits in cat_wait_seconds
+WAIT_SPANS = ("rate_limit_wait", "key_cooldown_wait", "retry_backoff", "soft_retry_wait")
+
+LATENCY_BUCKETS = (0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 20.0, 30.0, 60.0, 120.0, 300.0)
+WAIT_BUCKETS = (0.01, 0.05, 0.1, 0.5, 1.0, 2.0, 5.0, 10.0, 30.0, 60.0)
+CHECKOUT_BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 30.0)
+
+_lock = threading.Lock()
+_metrics: Optional[Dict[str, Any]] = None
+_registry = None
+_collectors: List[Any] = []
+
+
+def enable(multiprocess_dir: Optional[str] = None) -> bool:
+    """
+    Create the metrics and start recording (idempotent).
+
+    Args:
+        multiprocess_dir: Directory shared by all processes of this host; ignored when
+            PROMETHEUS_MULTIPROC_DIR is already set
+
+    Returns:
+        False if prometheus_client is not installed
+    """
+    global _metrics, _registry
+    with _lock:
+        if _metrics is not None:
+            return True
+        if multiprocess_dir and not os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+            os.makedirs(multiprocess_dir, exist_ok=True)
+            os.environ["PROMETHEUS_MULTIPROC_DIR"] = multiprocess_dir
+        try:
+            from prometheus_client import CollectorRegistry, Counter, Gauge, Histogram
+        except ImportError:
+            print("Warning: prometheus_client is not installed; metrics are disabled.")
+            return False
+
+        _registry = CollectorRegistry()
+        _metrics = {
+            "llm_calls": Counter(
+                "cat_llm_calls_total", "Model API calls by outcome",
+                ["provider", "model", "outcome", "error_class"], registry=_registry,
+            ),
+            "llm_seconds": Histogram(
+                "cat_llm_call_seconds", "Model API call latency",
+                ["provider", "model"], buckets=LATENCY_BUCKETS, registry=_registry,
+            ),
+            "tokens": Counter(
+                "cat_llm_tokens_total", "Tokens reported by model responses",
+                ["model", "kind"], registry=_registry,
+            ),
+            "cached": Counter(
+                "cat_llm_cached_responses_total", "Model calls answered from the response cache",
+                ["model"], registry=_registry,
+            ),
+            "segment_seconds": Histogram(
+                "cat_segment_seconds", "Time to translate one segment",
+                buckets=LATENCY_BUCKETS, registry=_registry,
+            ),
+            "wait_seconds": Histogram(
+                "cat_wait_seconds", "Time spent sleeping on rate limits, key cooldowns and retries",
+                ["reason"], buckets=WAIT_BUCKETS, registry=_registry,
+            ),
+            "key_events": Counter(
+                "cat_api_key_events_total", "API keys put in cooldown or disabled",
+                ["model", "event"], registry=_registry,
+            ),
+            "keys": Gauge(
+                "cat_api_keys", "API keys of a model's key pool by state",
+                ["model", "state"], multiprocess_mode="livemax", registry=_registry,
+            ),
+            "db_checkout": Histogram(
+                "cat_db_checkout_wait_seconds", "Time to check a connection out of the DB pool",
+                buckets=CHECKOUT_BUCKETS, registry=_registry,
+            ),
+        }
+    add_span_listener(_record_span)
+    return True
+
+
+def is_enabled() -> bool:
+    return _metrics is not None
+
+
+def multiprocess_mode() -> bool:
+    return bool(os.environ.get("PROMETHEUS_MULTIPROC_DIR"))
+
+
+def register_collector(collector: Any) -> None:
+    """Add a scrape-time collector (an object with collect()) to render()."""
+    if collector not in _collectors:
+        _collectors.append(collector)
+
+
+def render() -> Tuple[bytes, str]:
+    """Exposition payload and its content type; merges all processes in multiprocess mode."""
+    if _metrics is None:
+        return b"", CONTENT_TYPE
+    from prometheus_client import CollectorRegistry, generate_latest
+
+    if multiprocess_mode():
+        from prometheus_client import multiprocess
+
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = CollectorRegistry()
+        registry.register(_registry)
+    for collector in _collectors:
+        registry.register(collector)
+    return generate_latest(registry), CONTENT_TYPE
+
+
+def mark_process_dead(pid: int) -> None:
+    """Drop the live gauges of an exited worker process (multiprocess mode)."""
+    if _metrics is None or not multiprocess_mode():
+        return
+    from prometheus_client import multiprocess
+
+    multiprocess.mark_process_dead(pid)
+
+
+def _record_span(finished: Span) -> None:
+    metrics = _metrics
+    if metrics is None:
+        return
+    if finished.name == "llm_call":
+        provider = finished.attributes.get("provider", "unknown")
+        model = finished.attributes.get("model", "unknown")
+        if finished.exception is None:
+            outcome, error_class = "success", ""
+        else:
+            outcome, error_class = _classify(finished.exception), type(finished.exception).__name__
+        metrics["llm_calls"].labels(provider, model, outcome, error_class).inc()
+        metrics["llm_seconds"].labels(provider, model).observe(finished.duration)
+    elif finished.name == "segment":
+        metrics["segment_seconds"].observe(finished.duration)
+    elif finished.name in WAIT_SPANS:
+        metrics["wait_seconds"].labels(finished.name).observe(finished.duration)
+
+
+def _classify(exc: BaseException) -> str:
+    from ..translation.models.gemini import classify_error
+
+    return classify_error(exc)
+
+
+def record_usage(event) -> None:
+    """Count the tokens of a UsageEvent (cached responses are counted separately)."""
+    metrics = _metrics
+    if metrics is None or event is None:
+        return
+    if event.cached:
+        metrics["cached"].labels(event.model_name).inc()
+        return
+    normalized = event.normalized()
+    if normalized.prompt_tokens:
+        metrics["tokens"].labels(event.model_name, "prompt").inc(normalized.prompt_tokens)
+    if normalized.completion_tokens:
+        metrics["tokens"].labels(event.model_name, "completion").inc(normalized.completion_tokens)
+
+
+def record_key_event(model: str, event: str) -> None:
+    if _metrics is not None:
+        _metrics["key_events"].labels(model, event).inc()
+
+
+def set_key_pool_state(model: str, counts: Dict[str, int]) -> None:
+    if _metrics is not None:
+        for state, count in counts.items():
+            _metrics["keys"].labels(model, state).set(count)
+
+
+def observe_db_checkout(seconds: float) -> None:
+    if _metrics is not None:
+        _metrics["db_checkout"].observe(seconds)
@@ -2,11 +2,13 @@
 Retry decorator for handling ProhibitedException with progressively softer prompts.
 """
 
+import asyncio
 import functools
 import time
 from typing import Callable, Any, Optional
 from shared.errors import ProhibitedException
 from ..prompts.sanitizer import PromptSanitizer
+from .tracing import span
 
 
 def retry_with_softer_prompt(max_retries: int = 3, delay: float = 2.0):
@@ -58,7 +60,8 @@ def retry_with_softer_prompt(max_retries: int = 3, delay: float = 2.0):
                             # For methods where self is first argument
                             args = (args[0], softer_prompt) + args[2:]
                         
-                        time.sleep(delay)
+                        with span("soft_retry_wait", attempt=attempt):
+                            time.sleep(delay)
                         return func(*args, **kwargs)
                         
                 except ProhibitedException as e:
@@ -82,6 +85,56 @@ def retry_with_softer_prompt(max_retries: int = 3, delay: float = 2.0):
     return decorator
 
 
+def async_retry_with_softer_prompt(max_retries: int = 3, delay: float = 2.0):
+    """
+    Async counterpart of retry_with_softer_prompt for coroutine methods.
+
+    The wrapped coroutine must take the prompt as its first argument after self
+    (or as the 'prompt' keyword).
+
+    Args:
+        max_retries: Maximum number of retry attempts
+        delay: Delay in seconds between retries
+    """
+    def decorator(func: Callable) -> Callable:
+        @functools.wraps(func)
+        async def wrapper(self, *args, **kwargs):
+            prompt_in_kwargs = 'prompt' in kwargs
+            original_prompt = kwargs['prompt'] if prompt_in_kwargs else (args[0] if args else None)
+            if not isinstance(original_prompt, str) or not original_prompt:
+                return await func(self, *args, **kwargs)
+
+            for attempt in range(max_retries + 1):
+                try:
+                    if attempt == 0:
+                        return await func(self, *args, **kwargs)
+
+                    print(f"\nRetrying with softer prompt (attempt {attempt}/{max_retries})...")
+                    softer_prompt = PromptSanitizer.create_softer_prompt(original_prompt, attempt)
+                    if prompt_in_kwargs:
+                        kwargs['prompt'] = softer_prompt
+                    else:
+                        args = (softer_prompt,) + args[1:]
+
+                    with span("soft_retry_wait", attempt=attempt):
+                        await asyncio.sleep(delay)
+                    return await func(self, *args, **kwargs)
+
+                except ProhibitedException as e:
+                    if attempt < max_retries:
+                        print(f"\nProhibitedException caught: {e}")
+                        print("Will retry with a softer prompt...")
+                    else:
+                        print(f"\nAll {max_retries} retry attempts with softer prompts failed.")
+                        e.context = e.context or {}
+                        e.context['retry_attempts'] = max_retries
+                        e.context['final_prompt'] = kwargs['prompt'] if prompt_in_kwargs else args[0]
+                        raise
+
+        return wrapper
+    return decorator
+
+
 def retry_on_prohibited_segment(translation_func: Callable) -> Callable:
     """
     Specialized decorator for translation segments that handles ProhibitedException
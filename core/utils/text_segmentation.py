@@ -7,44 +7,68 @@ boundaries and maintains readability for AI translation models.
 """
 
 import re
-from typing import List
+from typing import Callable, Iterable, Iterator, List, Optional, Tuple
 from ..schemas import SegmentInfo
-from .file_parser import parse_document
+from .document_cache import get_document_cache
+from .file_parser import EpubChapter, iter_document_blocks, iter_epub_chapters
+from .token_budget import SegmentBudget
 
+# A blank (whitespace-only) line separates paragraphs
+_PARAGRAPH_BREAK = re.compile(r'\n\s*\n')
+# Sentence terminator (Latin or CJK), optionally followed by closing quotes/brackets
+_SENTENCE_END = re.compile(r'[.!?\u3002\uff01\uff1f\uff0e][\'"\u2019\u201d\u300d\u300f\u300b\uff09)]*$')
+# Chinese/Japanese characters and punctuation, which get no space when a line wraps
+_CJK_CHAR = re.compile(r'[\u3001-\u30ff\u3400-\u4dbf\u4e00-\u9fff\uf900-\ufaff\uff01-\uff60]')
 
-def create_segments_for_text(filepath: str, target_size: int = 15000) -> List[SegmentInfo]:
+
+def create_segments_for_text(filepath: str, target_size: int = 15000,
+                             budget: Optional[SegmentBudget] = None) -> List[SegmentInfo]:
     """
     Create segments from a text file.
+
+    The file is streamed block by block into the segmenter, so the full text is
+    never held in memory as a single string.
     
     Args:
         filepath: Path to the text file
         target_size: Target character count for each segment
+        budget: Token budget per segment; replaces target_size when given
         
     Returns:
         List of SegmentInfo objects
     """
     print("Creating segments for text file...")
-    full_text = parse_document(filepath)
-    return create_segments_from_plain_text(full_text, target_size)
+    target_size, measure, variant = _segment_limit(target_size, budget)
+    return get_document_cache().get_segments(
+        filepath,
+        f"text-{variant}",
+        lambda: _collect_segments(iter_document_blocks(filepath), target_size, measure),
+    )
 
 
-def create_segments_for_epub(filepath: str, target_size: int = 15000) -> List[SegmentInfo]:
+def create_segments_for_epub(filepath: str, target_size: int = 15000,
+                             budget: Optional[SegmentBudget] = None) -> List[SegmentInfo]:
     """
-    Create segments from an EPUB file by flattening to text.
+    Create segments from an EPUB file, chapter by chapter.
+
+    Spine documents are segmented independently, so no segment spans two
+    chapters, and each segment records its chapter's title and source file.
     
     Args:
         filepath: Path to the EPUB file
         target_size: Target character count for each segment
+        budget: Token budget per segment; replaces target_size when given
         
     Returns:
         List of SegmentInfo objects
     """
-    print("Creating segments for EPUB by flattening to text...")
-    # Use the existing text parser to get all text from the EPUB
-    full_text = parse_document(filepath)
-    
-    # Use the same segmentation logic as for plain text files
-    return create_segments_from_plain_text(full_text, target_size)
+    print("Creating segments for EPUB chapter by chapter...")
+    target_size, measure, variant = _segment_limit(target_size, budget)
+    return get_document_cache().get_segments(
+        filepath,
+        f"epub-chapters-{variant}",
+        lambda: _collect_segments_by_chapter(iter_epub_chapters(filepath), target_size, measure),
+    )
 
 
 def create_segments_from_plain_text(text: str, target_size: int = 15000) -> List[SegmentInfo]:
@@ -64,15 +88,47 @@ def create_segments_from_plain_text(text: str, target_size: int = 15000) -> List
     Returns:
         List of SegmentInfo objects
     """
-    # Split by double newlines (paragraph boundaries)
-    raw_paragraphs = re.split(r'\n\s*\n', text)
-    
-    # Process paragraphs to handle hard-wrapped text
-    normalized_paragraphs = _normalize_paragraphs(raw_paragraphs)
-    
-    # Create segments from normalized paragraphs
-    segments = _build_segments(normalized_paragraphs, target_size)
-    
+    return _collect_segments([text], target_size)
+
+
+def iter_segments_from_blocks(blocks: Iterable[str], target_size: int = 15000,
+                              measure: Optional[Callable[[str], int]] = None) -> Iterator[SegmentInfo]:
+    """
+    Incrementally segment a stream of text blocks.
+
+    Block boundaries are treated as paragraph boundaries (see
+    file_parser.iter_document_blocks). Segments are yielded as soon as they are
+    complete; only the paragraphs of the segment being built are kept.
+
+    Args:
+        blocks: Text blocks, e.g. pages or spine items
+        target_size: Target size for each segment, in characters or in the units of `measure`
+        measure: Size of a text (default: its length), e.g. SegmentBudget.measure
+
+    Yields:
+        SegmentInfo objects in document order
+    """
+    builder = _SegmentBuilder(target_size, measure)
+    for block in blocks:
+        for raw_paragraph in _PARAGRAPH_BREAK.split(block):
+            paragraph = _normalize_paragraph(raw_paragraph)
+            if paragraph:
+                yield from builder.add(paragraph)
+    yield from builder.finish()
+
+
+def _segment_limit(target_size: int,
+                   budget: Optional[SegmentBudget]) -> Tuple[int, Optional[Callable[[str], int]], str]:
+    """(target, measure, cache variant) for character or token-budget segmentation."""
+    if budget is None:
+        return target_size, None, str(target_size)
+    return budget.max_tokens, budget.measure, f"tokens-{budget.max_tokens}-{budget.language}"
+
+
+def _collect_segments(blocks: Iterable[str], target_size: int,
+                      measure: Optional[Callable[[str], int]] = None) -> List[SegmentInfo]:
+    segments = list(iter_segments_from_blocks(blocks, target_size, measure))
+
     print(f"Text divided into {len(segments)} segments.")
     
     # Debug: Show preview of first few segments
@@ -81,123 +137,141 @@ def create_segments_from_plain_text(text: str, target_size: int = 15000) -> List
     return segments
 
 
-def _normalize_paragraphs(raw_paragraphs: List[str]) -> List[str]:
+def _collect_segments_by_chapter(chapters: Iterable[EpubChapter], target_size: int,
+                                 measure: Optional[Callable[[str], int]] = None) -> List[SegmentInfo]:
+    segments = []
+    chapter_count = 0
+    for chapter in chapters:
+        chapter_count += 1
+        for segment in iter_segments_from_blocks([chapter.text], target_size, measure):
+            segment.chapter_title = chapter.title
+            segment.chapter_filename = chapter.file_name
+            segments.append(segment)
+
+    print(f"Text divided into {len(segments)} segments across {chapter_count} chapters.")
+    _preview_segments(segments)
+    return segments
+
+
+def _normalize_paragraph(para: str) -> str:
     """
-    Normalize paragraphs by handling hard-wrapped lines.
+    Normalize one paragraph by handling hard-wrapped lines.
     
-    This function processes each paragraph to combine hard-wrapped lines
-    that belong to the same sentence while preserving intentional line breaks.
+    Combines hard-wrapped lines that belong to the same sentence while
+    preserving intentional line breaks. Runs in linear time: only the last
+    line of the accumulated sentence is checked for a terminator, and the
+    sentence is joined once.
     
     Args:
-        raw_paragraphs: List of raw paragraph strings
+        para: Raw paragraph string
         
     Returns:
-        List of normalized paragraph strings
+        Normalized paragraph, or "" for a blank paragraph
     """
-    normalized_paragraphs = []
+    processed_lines = []
+    # Lines of the sentence being accumulated
+    current_lines: List[str] = []
     
-    for para in raw_paragraphs:
-        if not para.strip():
+    for line in para.split('\n'):
+        line = line.strip()
+        if not line:
             continue
         
-        # Process lines within paragraph
-        lines = para.strip().split('\n')
-        processed_lines = []
-        current_sentence = ""
-        
-        for line in lines:
-            line = line.strip()
-            if not line:
-                continue
-            
-            if current_sentence:
-                # Check if previous accumulated text ends with sentence terminator
-                if re.search(r'[.!?]["\']*$', current_sentence):
-                    # Previous sentence is complete
-                    processed_lines.append(current_sentence)
-                    current_sentence = line
-                else:
-                    # Continue accumulating (hard-wrapped line)
-                    current_sentence += " " + line
-            else:
-                current_sentence = line
-        
-        # Add final sentence
-        if current_sentence:
-            processed_lines.append(current_sentence)
-        
-        # Join sentences with newlines to preserve sentence boundaries
-        normalized_para = "\n".join(processed_lines)
-        normalized_paragraphs.append(normalized_para)
+        if current_lines and _SENTENCE_END.search(current_lines[-1]):
+            # Previous sentence is complete
+            processed_lines.append(_join_wrapped_lines(current_lines))
+            current_lines = []
+        # Otherwise continue accumulating (hard-wrapped line)
+        current_lines.append(line)
     
-    return normalized_paragraphs
+    # Add final sentence
+    if current_lines:
+        processed_lines.append(_join_wrapped_lines(current_lines))
+    
+    # Join sentences with newlines to preserve sentence boundaries
+    return "\n".join(processed_lines)
+
 
+def _join_wrapped_lines(lines: List[str]) -> str:
+    """Join the lines of one hard-wrapped sentence (no space between CJK characters)."""
+    if len(lines) == 1:
+        return lines[0]
+    parts = [lines[0]]
+    for previous, line in zip(lines, lines[1:]):
+        if not (_CJK_CHAR.match(previous[-1]) and _CJK_CHAR.match(line[0])):
+            parts.append(" ")
+        parts.append(line)
+    return "".join(parts)
 
-def _build_segments(paragraphs: List[str], target_size: int) -> List[SegmentInfo]:
+
+class _SegmentBuilder:
     """
-    Build segments from normalized paragraphs.
-    
-    Args:
-        paragraphs: List of normalized paragraphs
-        target_size: Target size for each segment
-        
-    Returns:
-        List of SegmentInfo objects
+    Packs normalized paragraphs into segments close to the target size.
+
+    Paragraphs are kept as a list with a running length (each counted with its
+    paragraph break), so building a segment is linear in its size. Sizes are
+    character counts unless a `measure` (e.g. a token estimate) is given.
     """
-    segments = []
-    current_segment_text = ""
-    
-    for para in paragraphs:
+
+    def __init__(self, target_size: int, measure: Optional[Callable[[str], int]] = None):
+        self.target_size = target_size
+        self._measure = measure or len
+        self._paragraph_break = self._measure("\n\n")
+        self._line_break = self._measure("\n")
+        self._parts: List[str] = []
+        self._length = 0
+
+    def add(self, para: str) -> List[SegmentInfo]:
+        """Add a paragraph; returns the segments completed by it."""
+        completed = []
+        size = self._measure(para)
         # If adding this paragraph would exceed target size
-        if len(current_segment_text) + len(para) > target_size and current_segment_text:
+        if self._length + size > self.target_size and self._parts:
             # Save current segment and start new one
-            segments.append(SegmentInfo(text=current_segment_text.strip()))
-            current_segment_text = ""
+            completed.append(self._flush())
         
         # If paragraph itself is larger than target size, split by sentences
-        if len(para) > target_size:
-            _split_large_paragraph(para, target_size, segments, current_segment_text)
-            current_segment_text = ""
+        if size > self.target_size:
+            completed.extend(self._split_large_paragraph(para))
         else:
             # Add the whole paragraph
-            current_segment_text += para + "\n\n"
-    
-    # Add any remaining text as final segment
-    if current_segment_text.strip():
-        segments.append(SegmentInfo(text=current_segment_text.strip()))
-    
-    return segments
+            self._parts.append(para)
+            self._length += size + self._paragraph_break
+        return completed
 
+    def finish(self) -> List[SegmentInfo]:
+        """Returns the final partial segment, if any."""
+        return [self._flush()] if self._parts else []
 
-def _split_large_paragraph(para: str, target_size: int, 
-                          segments: List[SegmentInfo], current_segment_text: str):
-    """
-    Split a large paragraph by sentences.
-    
-    Args:
-        para: The paragraph to split
-        target_size: Target size for each segment
-        segments: List to append segments to
-        current_segment_text: Current accumulated text
-    """
-    # The paragraph already has sentence boundaries preserved as newlines
-    sentences = para.split('\n')
-    local_segment_text = current_segment_text
-    
-    for sentence in sentences:
-        sentence = sentence.strip()
-        if not sentence:
-            continue
-        
-        if len(local_segment_text) + len(sentence) > target_size and local_segment_text:
-            segments.append(SegmentInfo(text=local_segment_text.strip()))
-            local_segment_text = ""
+    def _flush(self) -> SegmentInfo:
+        segment = SegmentInfo(text="\n\n".join(self._parts).strip())
+        self._parts = []
+        self._length = 0
+        return segment
+
+    def _split_large_paragraph(self, para: str) -> List[SegmentInfo]:
+        """Split a paragraph larger than the target size by sentences."""
+        # The paragraph already has sentence boundaries preserved as newlines
+        segments = []
+        sentences: List[str] = []
+        length = 0
+        for sentence in para.split('\n'):
+            sentence = sentence.strip()
+            if not sentence:
+                continue
+            
+            size = self._measure(sentence)
+            if length + size > self.target_size and sentences:
+                segments.append(SegmentInfo(text="\n".join(sentences)))
+                sentences = []
+                length = 0
+            
+            sentences.append(sentence)
+            length += size + self._line_break
         
-        local_segment_text += sentence + "\n"
-    
-    # Add remaining text with paragraph break
-    if local_segment_text.strip():
-        segments.append(SegmentInfo(text=local_segment_text.strip()))
+        if sentences:
+            segments.append(SegmentInfo(text="\n".join(sentences)))
+        return segments
 
 
 def _preview_segments(segments: List[SegmentInfo], count: int = 3):
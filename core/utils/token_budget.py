@@ -0,0 +1,258 @@
+"""
+Token Budget Segmentation
+
+Character targets map very differently to tokens: 15,000 characters of English are
+roughly 4k tokens, the same amount of Japanese or Chinese several times that. This
+module estimates tokens locally (no tokenizer download or API call) and derives a
+per-model segment budget so that a segment, together with the prompt that
+PromptBuilder.build_translation_prompt wraps around it, fits the model's context and
+its translation fits the output limit.
+
+The estimate counts characters per script, applies per-script rates and then a
+per-language calibration factor.
+"""
+
+import re
+from dataclasses import dataclass
+from itertools import islice
+from typing import Dict, Optional, Tuple
+
+from .file_parser import iter_document_blocks
+
+# Tokens per character for each script (SentencePiece/BPE-style vocabularies)
+_SCRIPT_RATES: Tuple[Tuple[str, "re.Pattern[str]", float], ...] = (
+    ("han", re.compile(r'[\u3400-\u4dbf\u4e00-\u9fff\uf900-\ufaff]'), 0.9),
+    ("kana", re.compile(r'[\u3040-\u30ff]'), 0.65),
+    ("hangul", re.compile(r'[\uac00-\ud7af\u1100-\u11ff\u3130-\u318f]'), 0.6),
+    ("cjk_punct", re.compile(r'[\u3000-\u303f\uff00-\uffef]'), 0.8),
+    ("latin", re.compile(r'[A-Za-z\u00c0-\u024f]'), 0.28),
+    ("cyrillic", re.compile(r'[\u0400-\u04ff]'), 0.35),
+    ("digit_punct", re.compile(r'[0-9!-/:-@\[-`{-~]'), 0.45),
+)
+# Characters matched by none of the patterns above (other scripts, symbols)
+_OTHER_RATE = 0.5
+_WHITESPACE = re.compile(r'\s')
+
+# Multipliers on the script estimate; tune them against the prompt token counts
+# providers report (translation usage logs) when estimates drift
+LANGUAGE_CALIBRATION: Dict[str, float] = {
+    "en": 1.0,
+    "ja": 1.0,
+    "zh": 1.0,
+    "ko": 1.05,
+    "ru": 1.0,
+    "other": 1.1,
+}
+
+# Korean output tokens per source token when translating from each language
+OUTPUT_TOKEN_RATIO: Dict[str, float] = {
+    "en": 1.5,
+    "ja": 1.1,
+    "zh": 1.5,
+    "ko": 1.0,
+    "ru": 1.3,
+    "other": 1.5,
+}
+
+# (context window, max output tokens) by model name prefix; the longest prefix wins
+MODEL_TOKEN_LIMITS: Dict[str, Tuple[int, int]] = {
+    "gemini-2.5": (1_048_576, 65_536),
+    "gemini-3": (1_048_576, 65_536),
+    "gemini-flash": (1_048_576, 65_536),
+    "gemini-2.0": (1_048_576, 8_192),
+    "gemini-1.5": (1_048_576, 8_192),
+    "gpt-4o": (128_000, 16_384),
+    "gpt-4.1": (1_047_576, 32_768),
+    "claude": (200_000, 8_192),
+}
+DEFAULT_MODEL_TOKEN_LIMITS = (128_000, 8_192)
+
+# Characters of previous source / Korean text the pipeline adds as context
+PREVIOUS_SOURCE_CONTEXT_CHARS = 1500
+PREVIOUS_TRANSLATION_CONTEXT_CHARS = 500
+
+MIN_SEGMENT_TOKENS = 500
+DEFAULT_MAX_SEGMENT_TOKENS = 8000
+
+
+def detect_language(text: str) -> str:
+    """
+    Guess the source language from its script.
+
+    Returns:
+        "ja", "zh", "ko", "ru", "en" (Latin scripts) or "other"
+    """
+    return _language_from_counts(_script_counts(text))
+
+
+def _language_from_counts(counts: Dict[str, int]) -> str:
+    if counts["kana"] > 0.05 * max(1, counts["han"] + counts["kana"]):
+        return "ja"
+    languages = {"han": "zh", "hangul": "ko", "latin": "en", "cyrillic": "ru"}
+    script = max(languages, key=lambda name: counts[name])
+    if counts[script] == 0 and counts["other"] == 0:
+        return "en"
+    return "other" if counts["other"] > counts[script] else languages[script]
+
+
+def estimate_tokens(text: str, language: Optional[str] = None) -> int:
+    """
+    Estimate the token count of a text without a tokenizer.
+
+    Args:
+        text: Text to measure
+        language: Language code for calibration (detected when omitted)
+
+    Returns:
+        Estimated token count
+    """
+    if not text:
+        return 0
+    counts = _script_counts(text)
+    estimate = sum(counts[name] * rate for name, _, rate in _SCRIPT_RATES)
+    estimate += counts["other"] * _OTHER_RATE
+    # Word boundaries usually start a new token
+    estimate += counts["whitespace"] * 0.05
+    calibration = LANGUAGE_CALIBRATION.get(
+        language or _language_from_counts(counts), LANGUAGE_CALIBRATION["other"]
+    )
+    return int(estimate * calibration + 0.999)
+
+
+def _script_counts(text: str) -> Dict[str, int]:
+    counts = {name: len(pattern.findall(text)) for name, pattern, _ in _SCRIPT_RATES}
+    counts["whitespace"] = len(_WHITESPACE.findall(text))
+    counts["other"] = max(0, len(text) - sum(counts.values()))
+    return counts
+
+
+def model_token_limits(model_name: Optional[str]) -> Tuple[int, int]:
+    """(context window, max output tokens) of a model, e.g. "gemini-2.5-flash" or "google/gemini-2.5-pro"."""
+    name = (model_name or "").lower().rsplit("/", 1)[-1]
+    matches = [prefix for prefix in MODEL_TOKEN_LIMITS if name.startswith(prefix)]
+    if not matches:
+        return DEFAULT_MODEL_TOKEN_LIMITS
+    return MODEL_TOKEN_LIMITS[max(matches, key=len)]
+
+
+@dataclass
+class PromptOverhead:
+    """
+    Prompt content around the source segment, reserved when sizing segments.
+
+    Segmentation happens before the glossary and dialogue styles are known, so
+    they are reserved as a number of entries rather than measured.
+    """
+    template: Optional[str] = None
+    core_narrative_style: str = ""
+    glossary_terms: int = 80
+    character_styles: int = 20
+    tokens_per_entry: int = 15
+    protagonist_name: str = "protagonist"
+    extra_tokens: int = 0
+
+    def tokens(self, language: str) -> int:
+        """Estimated prompt tokens excluding the source segment itself."""
+        from ..prompts.builder import PromptBuilder
+        from ..prompts.manager import PromptManager
+
+        prompt = PromptBuilder(self.template or PromptManager.MAIN_TRANSLATION).build_translation_prompt(
+            core_narrative_style=self.core_narrative_style,
+            style_deviation_info="N/A",
+            glossary={},
+            character_styles={},
+            source_segment="",
+            prev_segment_source="",
+            prev_segment_ko="",
+            protagonist_name=self.protagonist_name,
+        )
+        # Previous-segment context is appended by the pipeline at these lengths
+        context = (
+            _tokens_for_chars(PREVIOUS_SOURCE_CONTEXT_CHARS, language)
+            + _tokens_for_chars(PREVIOUS_TRANSLATION_CONTEXT_CHARS, "ko")
+        )
+        entries = (self.glossary_terms + self.character_styles) * self.tokens_per_entry
+        return estimate_tokens(prompt) + context + entries + self.extra_tokens
+
+
+def _tokens_for_chars(chars: int, language: str) -> int:
+    sample = {"ja": "あ", "zh": "中", "ko": "한"}.get(language, "word ")
+    return estimate_tokens(sample * (chars // len(sample)), language)
+
+
+@dataclass(frozen=True)
+class SegmentBudget:
+    """Token budget for one segment of a document in a given language."""
+    max_tokens: int
+    language: str = "en"
+
+    def measure(self, text: str) -> int:
+        return estimate_tokens(text, self.language)
+
+
+def segment_token_budget(model_name: Optional[str], *, language: str = "en",
+                         prompt_overhead_tokens: int = 0,
+                         max_output_tokens: Optional[int] = None,
+                         reserved_output_tokens: int = 0,
+                         safety_margin: float = 0.85,
+                         max_segment_tokens: int = DEFAULT_MAX_SEGMENT_TOKENS) -> int:
+    """
+    Largest source segment (in tokens) a model can translate in one call.
+
+    Args:
+        model_name: Translation model
+        language: Source language code
+        prompt_overhead_tokens: Prompt tokens besides the segment (see PromptOverhead)
+        max_output_tokens: Configured output limit (capped by the model's own limit)
+        reserved_output_tokens: Output tokens spent on anything but the translation
+            (e.g. thinking)
+        safety_margin: Fraction of the computed limit to use
+        max_segment_tokens: Upper bound regardless of model limits
+
+    Returns:
+        Segment budget in source tokens
+    """
+    context_window, model_max_output = model_token_limits(model_name)
+    output_limit = model_max_output
+    if max_output_tokens:
+        output_limit = min(output_limit, int(max_output_tokens))
+    output_limit = max(0, output_limit - reserved_output_tokens)
+
+    ratio = OUTPUT_TOKEN_RATIO.get(language, OUTPUT_TOKEN_RATIO["other"])
+    by_output = output_limit / ratio
+    by_context = context_window - prompt_overhead_tokens - output_limit
+    budget = int(min(by_output, by_context) * safety_margin)
+    return max(MIN_SEGMENT_TOKENS, min(budget, max_segment_tokens))
+
+
+def detect_document_language(filepath: str, sample_blocks: int = 50) -> str:
+    """Detect the language of a document from its first blocks."""
+    sample = "\n".join(islice(iter_document_blocks(filepath), sample_blocks))
+    return detect_language(sample[:200_000])
+
+
+def budget_for_document(filepath: str, model_name: Optional[str], *,
+                        overhead: Optional[PromptOverhead] = None,
+                        language: Optional[str] = None,
+                        **limits) -> SegmentBudget:
+    """
+    Segment budget for translating a document with a model.
+
+    Args:
+        filepath: Source document (its first blocks are used to detect the language)
+        model_name: Translation model
+        overhead: Prompt overhead to reserve (defaults to the main translation prompt)
+        language: Source language code, detected when omitted
+        **limits: Passed to segment_token_budget (max_output_tokens, ...)
+
+    Returns:
+        SegmentBudget for create_segments_for_text / create_segments_for_epub
+    """
+    language = language or detect_document_language(filepath)
+    overhead_tokens = (overhead or PromptOverhead()).tokens(language)
+    max_tokens = segment_token_budget(
+        model_name, language=language, prompt_overhead_tokens=overhead_tokens, **limits
+    )
+    print(f"Segment token budget for {model_name or 'default model'} ({language}): {max_tokens} tokens "
+          f"(prompt overhead ~{overhead_tokens} tokens)")
+    return SegmentBudget(max_tokens=max_tokens, language=language)
@@ -0,0 +1,331 @@
+"""
+Timing Spans
+
+Lightweight span instrumentation for the translation hot path. A Tracer is made
+current for a job with use_tracer(); code on the path opens spans with
+span(name, **attributes). Spans opened inside another span inherit its segment
+and shard attributes, so every model call, wait and save is attributed to the
+segment it served.
+
+Span names used by the engine:
+    segment, guide_analysis, guide_wait, prompt_build, translate, soft_retry_wait,
+    output_save, world_atmosphere, illustration        (TranslationPipeline)
+    glossary_terms, dialogue_analysis, style_deviation,
+    combined_analysis                                  (DynamicConfigBuilder)
+    llm_call, key_cooldown_wait, retry_backoff         (GeminiModel)
+    rate_limit_wait                                    (RateLimiter)
+    image_generation, image_api_call, image_save       (ImageGenerationService)
+
+Finished spans are appended to a JSONL file per job and aggregated per name into
+count/total/p50/p90/p99/max. Without a current tracer, span() still measures its
+block (Span.duration) but records nothing. Process-wide listeners registered with
+add_span_listener() see every finished span, with or without a tracer (metrics).
+
+Worker threads do not inherit context variables: submit work with
+in_current_context(fn) to keep its spans attached to the job's tracer.
+
+Usage:
+    python -m core.utils.tracing logs/jobs/<job_id>/traces/translation_spans.jsonl
+"""
+
+import argparse
+import contextvars
+import functools
+import itertools
+import json
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional
+
+# Attributes a span passes on to the spans opened inside it
+INHERITED_ATTRIBUTES = ("segment", "shard")
+PERCENTILES = (50, 90, 99)
+
+_current_tracer: contextvars.ContextVar[Optional["Tracer"]] = contextvars.ContextVar("tracer", default=None)
+_current_span: contextvars.ContextVar[Optional["Span"]] = contextvars.ContextVar("trace_span", default=None)
+_span_ids = itertools.count(1)
+_span_listeners: List[Callable[["Span"], None]] = []
+
+
+class Span:
+    """One timed block; duration is in seconds once the block has exited."""
+
+    __slots__ = ("name", "span_id", "parent_id", "attributes", "started_at", "duration", "error", "exception", "_start")
+
+    def __init__(self, name: str, attributes: Dict[str, Any], parent: Optional["Span"] = None):
+        self.name = name
+        self.span_id = next(_span_ids)
+        self.parent_id = parent.span_id if parent is not None else None
+        self.attributes = {
+            key: parent.attributes[key]
+            for key in INHERITED_ATTRIBUTES
+            if parent is not None and key in parent.attributes
+        }
+        self.attributes.update(attributes)
+        self.started_at = time.time()
+        self.duration = 0.0
+        self.error: Optional[str] = None
+        # The exception that ended the span, for listeners; not exported
+        self.exception: Optional[BaseException] = None
+        self._start = time.perf_counter()
+
+    def set(self, **attributes: Any) -> None:
+        """Add attributes discovered while the span is open (e.g. outcome)."""
+        self.attributes.update(attributes)
+
+    def to_dict(self) -> Dict[str, Any]:
+        record = {
+            "name": self.name,
+            "id": self.span_id,
+            "parent": self.parent_id,
+            "start": round(self.started_at, 6),
+            "ms": round(self.duration * 1000.0, 3),
+            "thread": threading.current_thread().name,
+        }
+        if self.error:
+            record["error"] = self.error
+        if self.attributes:
+            record["attrs"] = self.attributes
+        return record
+
+
+class Tracer:
+    """
+    Collects the spans of one job.
+
+    Records are buffered and appended to `path` (JSONL) every `flush_every` spans
+    and on close; durations are kept per span name and per segment for the summary.
+    """
+
+    def __init__(self, job_id: Optional[int] = None, path: Optional[str] = None, flush_every: int = 256):
+        self.job_id = job_id
+        self.path = path
+        self.flush_every = max(1, flush_every)
+        self._lock = threading.Lock()
+        self._buffer: List[Dict[str, Any]] = []
+        self._durations: Dict[str, List[float]] = {}
+        self._segment_phases: Dict[Any, Dict[str, float]] = {}
+
+    def finish(self, span: Span) -> None:
+        """Record a finished span."""
+        record = span.to_dict()
+        with self._lock:
+            self._durations.setdefault(span.name, []).append(span.duration)
+            segment = span.attributes.get("segment")
+            if segment is not None:
+                phases = self._segment_phases.setdefault(segment, {})
+                phases[span.name] = phases.get(span.name, 0.0) + span.duration
+            self._buffer.append(record)
+            if len(self._buffer) >= self.flush_every:
+                self._flush_locked()
+
+    def flush(self) -> None:
+        """Append buffered spans to the JSONL file (kept in memory until a path is set)."""
+        with self._lock:
+            self._flush_locked()
+
+    def _flush_locked(self) -> None:
+        if not self.path or not self._buffer:
+            return
+        records, self._buffer = self._buffer, []
+        try:
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write("".join(json.dumps(r, ensure_ascii=False, default=str) + "\n" for r in records))
+        except Exception as e:
+            print(f"Warning: Failed to write spans to {self.path}: {e}")
+
+    def summary(self, slowest_segments: int = 10) -> Dict[str, Any]:
+        """
+        Aggregate timings.
+
+        Returns:
+            {"spans": {name: stats in ms}, "slowest_segments": [{"segment", "ms",
+            "phases": {name: ms}}]}, ordered by total time
+        """
+        with self._lock:
+            durations = {name: list(values) for name, values in self._durations.items()}
+            segments = {segment: dict(phases) for segment, phases in self._segment_phases.items()}
+
+        slowest = sorted(segments.items(), key=lambda item: item[1].get("segment", 0.0), reverse=True)
+        return {
+            "job_id": self.job_id,
+            "spans": _stats_by_name(durations),
+            "slowest_segments": [
+                {
+                    "segment": segment,
+                    "ms": round(phases.get("segment", 0.0) * 1000.0, 1),
+                    "phases": {
+                        name: round(seconds * 1000.0, 1)
+                        for name, seconds in sorted(phases.items(), key=lambda item: -item[1])
+                        if name != "segment"
+                    },
+                }
+                for segment, phases in slowest[:slowest_segments]
+            ],
+        }
+
+    def close(self) -> Dict[str, Any]:
+        """Flush the spans and write the summary next to the JSONL file."""
+        self.flush()
+        summary = self.summary()
+        if self.path:
+            summary_path = f"{os.path.splitext(self.path)[0]}_summary.json"
+            try:
+                with open(summary_path, "w", encoding="utf-8") as f:
+                    json.dump(summary, f, ensure_ascii=False, indent=2, default=str)
+            except Exception as e:
+                print(f"Warning: Failed to write span summary to {summary_path}: {e}")
+        return summary
+
+
+@contextmanager
+def use_tracer(tracer: Optional[Tracer]) -> Iterator[Optional[Tracer]]:
+    """Make a tracer current for the enclosed block (and threads started with in_current_context)."""
+    token = _current_tracer.set(tracer)
+    try:
+        yield tracer
+    finally:
+        _current_tracer.reset(token)
+
+
+def current_tracer() -> Optional[Tracer]:
+    return _current_tracer.get()
+
+
+@contextmanager
+def span(name: str, **attributes: Any) -> Iterator[Span]:
+    """
+    Time the enclosed block as a span of the current tracer.
+
+    Exceptions are recorded on the span (as their class name) and re-raised.
+    """
+    current = Span(name, attributes, _current_span.get())
+    token = _current_span.set(current)
+    try:
+        yield current
+    except BaseException as e:
+        current.error = type(e).__name__
+        current.exception = e
+        raise
+    finally:
+        current.duration = time.perf_counter() - current._start
+        _current_span.reset(token)
+        tracer = _current_tracer.get()
+        if tracer is not None:
+            tracer.finish(current)
+        for listener in _span_listeners:
+            try:
+                listener(current)
+            except Exception as e:
+                print(f"Warning: Span listener failed for {name}: {e}")
+
+
+def add_span_listener(listener: Callable[[Span], None]) -> None:
+    """Call listener(span) for every span finished in this process."""
+    if listener not in _span_listeners:
+        _span_listeners.append(listener)
+
+
+def remove_span_listener(listener: Callable[[Span], None]) -> None:
+    if listener in _span_listeners:
+        _span_listeners.remove(listener)
+
+
+def in_current_context(fn: Callable) -> Callable:
+    """
+    Bind fn to a copy of the calling thread's context (tracer and open span).
+
+    Wrap once per submission: one copy cannot run on two threads at the same time.
+    """
+    context = contextvars.copy_context()
+
+    @functools.wraps(fn)
+    def run(*args, **kwargs):
+        return context.run(fn, *args, **kwargs)
+
+    return run
+
+
+def percentile(values: List[float], q: float) -> float:
+    """Linearly interpolated percentile (q in 0..100) of a non-empty list."""
+    ordered = sorted(values)
+    if len(ordered) == 1:
+        return ordered[0]
+    position = (len(ordered) - 1) * q / 100.0
+    lower = int(position)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower)
+
+
+def _stats_by_name(durations: Dict[str, List[float]]) -> Dict[str, Dict[str, float]]:
+    stats = {}
+    for name, values in durations.items():
+        if not values:
+            continue
+        entry = {"count": len(values), "total_ms": round(sum(values) * 1000.0, 1)}
+        for q in PERCENTILES:
+            entry[f"p{q}_ms"] = round(percentile(values, q) * 1000.0, 1)
+        entry["max_ms"] = round(max(values) * 1000.0, 1)
+        stats[name] = entry
+    return dict(sorted(stats.items(), key=lambda item: -item[1]["total_ms"]))
+
+
+def load_spans(path: str) -> Iterator[Dict[str, Any]]:
+    """Span records of a JSONL file; a torn final line is skipped."""
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                yield json.loads(line)
+            except ValueError:
+                continue
+
+
+def summarize_spans(records: Iterable[Dict[str, Any]], group_by: str = "name") -> Dict[str, Dict[str, float]]:
+    """
+    Percentiles of exported span records.
+
+    Args:
+        records: Span records (see load_spans)
+        group_by: "name", or an attribute such as "segment" or "model" to group the
+            spans by "<name>:<attribute value>"
+    """
+    durations: Dict[str, List[float]] = {}
+    for record in records:
+        key = record.get("name", "?")
+        if group_by != "name":
+            value = (record.get("attrs") or {}).get(group_by)
+            if value is None:
+                continue
+            key = f"{key}:{value}"
+        durations.setdefault(key, []).append(float(record.get("ms", 0.0)) / 1000.0)
+    return _stats_by_name(durations)
+
+
+def format_summary(stats: Dict[str, Dict[str, float]]) -> str:
+    """Render span statistics as a fixed-width table."""
+    header = f"{'span':<28}{'count':>8}{'total s':>10}" + "".join(f"{'p%d ms' % q:>10}" for q in PERCENTILES) + f"{'max ms':>10}"
+    lines = [header]
+    for name, entry in stats.items():
+        lines.append(
+            f"{name[:28]:<28}{entry['count']:>8}{entry['total_ms'] / 1000.0:>10.1f}"
+            + "".join(f"{entry[f'p{q}_ms']:>10.1f}" for q in PERCENTILES)
+            + f"{entry['max_ms']:>10.1f}"
+        )
+    return "\n".join(lines)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Summarize a job's span log")
+    parser.add_argument("path", help="Span JSONL file (traces/<task>_spans.jsonl)")
+    parser.add_argument("--by", default="name", help="Group by span name (default) or an attribute, e.g. model")
+    args = parser.parse_args(argv)
+    print(format_summary(summarize_spans(load_spans(args.path), group_by=args.by)))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -91,6 +91,15 @@ python -m backend.scripts.bootstrap_migrations || true
 echo "[entry] Running Alembic upgrade head"
 alembic -c backend/alembic.ini upgrade head || echo "[entry] Alembic upgrade failed (continuing)"
 
+# Prometheus samples of the API and worker processes are merged from one directory,
+# which must start empty
+if [ "${ENABLE_METRICS:-false}" = "true" ]; then
+  : "${PROMETHEUS_MULTIPROC_DIR:=/tmp/prometheus_multiproc}"
+  export PROMETHEUS_MULTIPROC_DIR
+  rm -rf "$PROMETHEUS_MULTIPROC_DIR"
+  mkdir -p "$PROMETHEUS_MULTIPROC_DIR"
+fi
+
 # Start Celery processes if enabled
 if [ "$START_CELERY_WORKER" = "true" ]; then
   if [ -n "$CELERY_AUTOSCALE" ]; then
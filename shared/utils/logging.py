@@ -6,13 +6,25 @@ across the translation engine. It handles debug prompts, context logging, and st
 logging for translation operations.
 """
 
+import functools
 import os
-import json
+import threading
 import time
 from pathlib import Path
 from typing import Optional, Dict, Any, List
 from datetime import datetime
 
+from .segment_log import SegmentLogReader, SegmentLogWriter, get_segment_log_writer
+
+
+def _synchronized(method):
+    """Run a TranslationLogger method under the logger's lock."""
+    @functools.wraps(method)
+    def locked(self, *args, **kwargs):
+        with self._lock:
+            return method(self, *args, **kwargs)
+    return locked
+
 
 class TranslationLogger:
     """
@@ -23,6 +35,9 @@ class TranslationLogger:
     - Context information logging  
     - Progress tracking
     - Error logging
+
+    A logger may be shared by threads processing segments concurrently: every log
+    call holds the logger's lock, so records of different segments do not interleave.
     """
     
     def __init__(self, job_id: Optional[int] = None, user_base_filename: Optional[str] = None, job_storage_base: Optional[str] = None, task_type: str = "translation"):
@@ -39,6 +54,9 @@ class TranslationLogger:
         self.user_base_filename = user_base_filename
         self.task_type = task_type
         self.start_time = time.time()
+        self._lock = threading.RLock()
+        # Buffered segment log, shared with other loggers of the same job and task
+        self._segment_log: Optional[SegmentLogWriter] = None
         
         # Try to use settings if available, otherwise use default
         if job_storage_base:
@@ -62,7 +80,7 @@ class TranslationLogger:
         # Only create job-specific directories if job_id is provided
         if self.job_id:
             job_dir = os.path.join(self.job_storage_base, str(self.job_id))
-            subdirs = ["prompts", "context", "validation", "postedit", "progress", "segments"]
+            subdirs = ["prompts", "context", "validation", "postedit", "progress", "segments", "traces"]
             for subdir in subdirs:
                 os.makedirs(os.path.join(job_dir, subdir), exist_ok=True)
 
@@ -84,6 +102,8 @@ class TranslationLogger:
             self.prompt_log_path = os.path.join(job_dir, "prompts", prompt_filename)
             self.context_log_path = os.path.join(job_dir, "context", context_filename)
             self.progress_log_path = os.path.join(job_dir, "progress", progress_filename)
+            # Timing spans (see core.utils.tracing)
+            self.span_log_path = os.path.join(job_dir, "traces", f"{self.task_type}_spans.jsonl")
 
             # Setup segment logging paths
             self.segments_dir = os.path.join(job_dir, "segments", self.task_type)
@@ -93,9 +113,11 @@ class TranslationLogger:
             self.prompt_log_path = None
             self.context_log_path = None
             self.progress_log_path = None
+            self.span_log_path = None
             self.segments_dir = None
             self.segments_summary_path = None
     
+    @_synchronized
     def initialize_session(self):
         """Initialize a new translation session with log headers."""
         if not self.job_id:
@@ -121,6 +143,7 @@ class TranslationLogger:
             f.write(f"# Job ID: {self.job_id}\n")
             f.write(f"# Started: {datetime.now().isoformat()}\n\n")
     
+    @_synchronized
     def log_core_narrative_style(self, core_narrative_style: str):
         """
         Log the core narrative style definition.
@@ -136,6 +159,7 @@ class TranslationLogger:
             f.write(f"{core_narrative_style}\n")
             f.write("="*50 + "\n\n")
     
+    @_synchronized
     def log_translation_prompt(self, segment_index: int, prompt: str):
         """
         Log a translation prompt for debugging.
@@ -152,6 +176,7 @@ class TranslationLogger:
             f.write(prompt)
             f.write("\n\n" + "="*50 + "\n\n")
     
+    @_synchronized
     def log_segment_context(self, segment_index: int, context_data: Dict[str, Any]):
         """
         Log context information for a segment translation.
@@ -210,6 +235,28 @@ class TranslationLogger:
             f.write(f"{immediate_context_ko or 'N/A'}\n\n")
             f.write("="*50 + "\n\n")
     
+    @_synchronized
+    def log_post_edit_segment(self, segment_index: int, issues_fixed: int,
+                              original_text: str, edited_text: str):
+        """
+        Log the outcome of post-editing a segment to the context log.
+
+        Args:
+            segment_index: Index of the segment
+            issues_fixed: Number of validation issues addressed
+            original_text: Translation before post-editing
+            edited_text: Translation after post-editing
+        """
+        if not self.context_log_path:
+            return  # Skip logging without job_id
+
+        with open(self.context_log_path, 'a', encoding='utf-8') as f:
+            f.write(f"--- POST-EDIT SEGMENT {segment_index} ---\n")
+            f.write(f"Issues fixed: {issues_fixed}\n")
+            f.write(f"Original: {original_text[:100]}...\n")
+            f.write(f"Edited: {edited_text[:100]}...\n\n")
+
+    @_synchronized
     def log_translation_progress(self, segment_index: int, total_segments: int, 
                                elapsed_time: Optional[float] = None):
         """
@@ -232,6 +279,7 @@ class TranslationLogger:
             f.write(f"({progress_percent:.1f}%) ")
             f.write(f"- Elapsed: {elapsed_time:.1f}s\n")
     
+    @_synchronized
     def log_error(self, error: Exception, segment_index: Optional[int] = None, 
                   context: Optional[str] = None):
         """
@@ -259,12 +307,16 @@ class TranslationLogger:
                 import traceback
                 f.write(f"\nTraceback:\n{traceback.format_exc()}")
     
+    @_synchronized
     def log_segment_io(self, segment_index: int, source_text: str,
                        translated_text: Optional[str] = None,
                        metadata: Optional[Dict[str, Any]] = None,
                        error: Optional[str] = None):
         """
-        Log segment input/output to individual and summary files.
+        Log segment input/output to the task's segment log.
+
+        Records are buffered and appended to segments.jsonl; summary.json is
+        materialized periodically and by log_completion/close (see segment_log).
 
         Args:
             segment_index: Index of the segment (1-based for display)
@@ -298,76 +350,27 @@ class TranslationLogger:
         if metadata:
             segment_data["metadata"] = metadata
 
-        # Save individual segment file
-        segment_filename = f"segment_{segment_index:04d}.json"
-        segment_path = os.path.join(self.segments_dir, segment_filename)
-
         try:
-            with open(segment_path, 'w', encoding='utf-8') as f:
-                json.dump(segment_data, f, ensure_ascii=False, indent=2)
+            self._get_segment_log().append(segment_index, segment_data)
         except Exception as e:
-            print(f"Warning: Failed to save segment {segment_index} log: {e}")
-
-        # Update summary file
-        self._update_segments_summary(segment_index, segment_data)
-
-    def _update_segments_summary(self, segment_index: int, segment_data: Dict[str, Any]):
-        """
-        Update the segments summary file with the new segment.
+            print(f"Warning: Failed to log segment {segment_index}: {e}")
 
-        Args:
-            segment_index: Index of the segment
-            segment_data: Segment data to add to summary
-        """
-        if not self.segments_summary_path:
-            return
-
-        # Load existing summary or create new
-        summary = {}
-        if os.path.exists(self.segments_summary_path):
-            try:
-                with open(self.segments_summary_path, 'r', encoding='utf-8') as f:
-                    summary = json.load(f)
-            except (json.JSONDecodeError, FileNotFoundError):
-                summary = {}
-
-        # Initialize structure if needed
-        if "job_info" not in summary:
-            summary["job_info"] = {
+    def _get_segment_log(self) -> SegmentLogWriter:
+        if self._segment_log is None:
+            self._segment_log = get_segment_log_writer(self.segments_dir, job_info={
                 "job_id": self.job_id,
                 "task_type": self.task_type,
-                "started_at": datetime.now().isoformat(),
                 "filename": self.user_base_filename
-            }
-
-        if "segments" not in summary:
-            summary["segments"] = {}
+            })
+        return self._segment_log
 
-        # Add/update segment
-        summary["segments"][str(segment_index)] = segment_data
-
-        # Update statistics
-        total_segments = len(summary["segments"])
-        completed_segments = sum(
-            1 for s in summary["segments"].values()
-            if "translation" in s or "validation" in s or "post_edit" in s
-        )
-        failed_segments = sum(1 for s in summary["segments"].values() if "error" in s)
-
-        summary["statistics"] = {
-            "total_segments": total_segments,
-            "completed_segments": completed_segments,
-            "failed_segments": failed_segments,
-            "last_updated": datetime.now().isoformat()
-        }
-
-        # Save updated summary
-        try:
-            with open(self.segments_summary_path, 'w', encoding='utf-8') as f:
-                json.dump(summary, f, ensure_ascii=False, indent=2)
-        except Exception as e:
-            print(f"Warning: Failed to update segments summary: {e}")
+    @_synchronized
+    def close(self):
+        """Flush buffered segment records and materialize summary.json."""
+        if self._segment_log is not None:
+            self._segment_log.close()
 
+    @_synchronized
     def log_completion(self, total_segments: int, total_time: Optional[float] = None):
         """
         Log completion of translation job.
@@ -394,21 +397,13 @@ class TranslationLogger:
                 with open(log_path, 'a', encoding='utf-8') as f:
                     f.write(completion_message)
 
-        # Update segments summary with completion info
-        if self.segments_summary_path and os.path.exists(self.segments_summary_path):
-            try:
-                with open(self.segments_summary_path, 'r', encoding='utf-8') as f:
-                    summary = json.load(f)
-
-                summary["job_info"]["completed_at"] = datetime.now().isoformat()
-                summary["job_info"]["total_time"] = total_time
-                summary["job_info"]["average_time_per_segment"] = total_time/total_segments if total_segments > 0 else 0
-
-                with open(self.segments_summary_path, 'w', encoding='utf-8') as f:
-                    json.dump(summary, f, ensure_ascii=False, indent=2)
-            except Exception as e:
-                print(f"Warning: Failed to update summary with completion info: {e}")
-
+        # Record completion info in the materialized segments summary
+        if self.segments_dir and (self._segment_log is not None or SegmentLogReader(self.segments_dir).exists()):
+            self._get_segment_log().close({
+                "completed_at": datetime.now().isoformat(),
+                "total_time": total_time,
+                "average_time_per_segment": total_time/total_segments if total_segments > 0 else 0
+            })
 
 def get_logger(job_id: Optional[int] = None, filename: Optional[str] = None, job_storage_base: Optional[str] = None, task_type: str = "translation") -> TranslationLogger:
     """
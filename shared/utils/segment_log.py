@@ -0,0 +1,324 @@
+"""
+Segment Log
+
+Buffered, append-only log of per-segment input/output for one task of a job
+(segments/<task_type>/ in the job directory).
+
+Files:
+    segments.jsonl  One JSON record per logged segment. A later record for the
+                    same segment_index replaces an earlier one (retries, resumes).
+    segments.idx    Fixed-width binary index, one (segment_index, offset, length)
+                    record per JSONL line, for random access by segment_index.
+    summary.json    {"job_info", "segments", "statistics"} view of the log,
+                    materialized periodically and when the log is closed.
+
+Older jobs only have summary.json and/or one segment_NNNN.json file per segment;
+SegmentLogReader reads those as well.
+"""
+
+import glob
+import json
+import os
+import struct
+import threading
+import time
+import weakref
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+SEGMENT_LOG_FILENAME = "segments.jsonl"
+SEGMENT_INDEX_FILENAME = "segments.idx"
+SUMMARY_FILENAME = "summary.json"
+
+# segment_index (int32), byte offset (uint64), byte length (uint32), little-endian
+_INDEX_RECORD = struct.Struct("<iQI")
+
+# One writer per segments directory, shared by every logger of the same job/task
+_writers: "weakref.WeakValueDictionary[str, SegmentLogWriter]" = weakref.WeakValueDictionary()
+_writers_lock = threading.Lock()
+
+
+class SegmentLogWriter:
+    """
+    Buffered writer for a segments directory.
+
+    Records are buffered in memory and appended to the JSONL log and the index
+    every `flush_every` records or `flush_interval` seconds; summary.json is
+    rewritten at most every `summary_interval` seconds and on close.
+    """
+
+    def __init__(self, segments_dir: str, job_info: Optional[Dict[str, Any]] = None,
+                 flush_every: int = 32, flush_interval: float = 2.0,
+                 summary_interval: float = 60.0):
+        self.segments_dir = segments_dir
+        self.log_path = os.path.join(segments_dir, SEGMENT_LOG_FILENAME)
+        self.index_path = os.path.join(segments_dir, SEGMENT_INDEX_FILENAME)
+        self.summary_path = os.path.join(segments_dir, SUMMARY_FILENAME)
+        self.job_info: Dict[str, Any] = dict(job_info or {})
+        self.job_info.setdefault("started_at", datetime.now().isoformat())
+        self.flush_every = max(1, flush_every)
+        self.flush_interval = flush_interval
+        self.summary_interval = summary_interval
+
+        self._lock = threading.RLock()
+        self._buffer: List[Tuple[int, bytes]] = []
+        self._last_flush = time.monotonic()
+        self._last_summary = time.monotonic()
+        self._summary_dirty = False
+        # Writes out what is still buffered when the writer is dropped without close()
+        # (e.g. a task that failed before log_completion) and at interpreter exit
+        self._finalizer = weakref.finalize(
+            self, _write_records, self.segments_dir, self.log_path, self.index_path, self._buffer
+        )
+
+    def append(self, segment_index: int, record: Dict[str, Any]) -> None:
+        """Buffer one segment record, flushing when the buffer is due."""
+        line = (json.dumps(record, ensure_ascii=False) + "\n").encode("utf-8")
+        with self._lock:
+            self._buffer.append((segment_index, line))
+            self._summary_dirty = True
+            now = time.monotonic()
+            if len(self._buffer) >= self.flush_every or now - self._last_flush >= self.flush_interval:
+                self.flush()
+            if now - self._last_summary >= self.summary_interval:
+                self.materialize_summary()
+
+    def flush(self) -> None:
+        """Append buffered records to the JSONL log and the index."""
+        with self._lock:
+            self._last_flush = time.monotonic()
+            _write_records(self.segments_dir, self.log_path, self.index_path, self._buffer)
+
+    def materialize_summary(self, job_info: Optional[Dict[str, Any]] = None) -> None:
+        """
+        Flush and rewrite summary.json from the log.
+
+        Args:
+            job_info: Extra job_info fields (e.g. completion time) to record
+        """
+        with self._lock:
+            self.flush()
+            if job_info:
+                self.job_info.update(job_info)
+            self._last_summary = time.monotonic()
+            self._summary_dirty = False
+            try:
+                reader = SegmentLogReader(self.segments_dir)
+                merged_info = dict(reader.job_info())
+                started_at = merged_info.get("started_at")
+                merged_info.update(self.job_info)
+                if started_at:
+                    # Keep the start of the first session when a job is resumed
+                    merged_info["started_at"] = started_at
+                summary = build_summary(dict(reader.iter_segments()), merged_info)
+                tmp_path = f"{self.summary_path}.tmp"
+                with open(tmp_path, "w", encoding="utf-8") as f:
+                    json.dump(summary, f, ensure_ascii=False, indent=2)
+                os.replace(tmp_path, self.summary_path)
+            except Exception as e:
+                print(f"Warning: Failed to update segments summary: {e}")
+
+    def close(self, job_info: Optional[Dict[str, Any]] = None) -> None:
+        """Flush buffered records and materialize the summary if anything changed."""
+        with self._lock:
+            if self._summary_dirty or self._buffer or job_info:
+                self.materialize_summary(job_info)
+
+
+def get_segment_log_writer(segments_dir: str, job_info: Optional[Dict[str, Any]] = None) -> SegmentLogWriter:
+    """
+    Shared writer for a segments directory.
+
+    Loggers created for the same job and task (e.g. the pipeline's and the progress
+    tracker's) write through one writer, so their records share one buffer and
+    one index.
+    """
+    key = os.path.abspath(segments_dir)
+    with _writers_lock:
+        writer = _writers.get(key)
+        if writer is None:
+            writer = SegmentLogWriter(segments_dir, job_info=job_info)
+            _writers[key] = writer
+        return writer
+
+
+def _write_records(segments_dir: str, log_path: str, index_path: str, buffer: List[Tuple[int, bytes]]) -> None:
+    """Append and clear the buffered (segment_index, line) records of a writer."""
+    if not buffer:
+        return
+    records = buffer[:]
+    del buffer[:]
+    try:
+        os.makedirs(segments_dir, exist_ok=True)
+        with open(log_path, "ab") as log_file:
+            offset = log_file.tell()
+            log_file.write(b"".join(line for _, line in records))
+        entries = []
+        for segment_index, line in records:
+            entries.append(_INDEX_RECORD.pack(segment_index, offset, len(line)))
+            offset += len(line)
+        with open(index_path, "ab") as index_file:
+            index_file.write(b"".join(entries))
+    except Exception as e:
+        print(f"Warning: Failed to write segment log {log_path}: {e}")
+
+
+class SegmentLogReader:
+    """Read access to a segments directory, including legacy per-segment JSON logs."""
+
+    def __init__(self, segments_dir: str):
+        self.segments_dir = str(segments_dir)
+        self.log_path = os.path.join(self.segments_dir, SEGMENT_LOG_FILENAME)
+        self.index_path = os.path.join(self.segments_dir, SEGMENT_INDEX_FILENAME)
+        self.summary_path = os.path.join(self.segments_dir, SUMMARY_FILENAME)
+
+    def exists(self) -> bool:
+        """Whether any segment log (current or legacy) exists."""
+        return (
+            os.path.exists(self.log_path)
+            or os.path.exists(self.summary_path)
+            or bool(self._legacy_segment_files())
+        )
+
+    def get(self, segment_index: int) -> Optional[Dict[str, Any]]:
+        """Latest record logged for a segment, or None."""
+        if os.path.exists(self.log_path):
+            location = self._index().get(segment_index)
+            if location is None:
+                return None
+            with open(self.log_path, "rb") as log_file:
+                return self._read_record(log_file, *location)
+        return self._legacy_segments().get(segment_index)
+
+    def iter_segments(self) -> Iterator[Tuple[int, Dict[str, Any]]]:
+        """(segment_index, record) pairs in segment order, latest record per segment."""
+        if not os.path.exists(self.log_path):
+            yield from sorted(self._legacy_segments().items())
+            return
+        index = self._index()
+        with open(self.log_path, "rb") as log_file:
+            for segment_index in sorted(index):
+                record = self._read_record(log_file, *index[segment_index])
+                if record is not None:
+                    yield segment_index, record
+
+    def job_info(self) -> Dict[str, Any]:
+        """job_info of the last materialized summary."""
+        summary = self._load_summary_file()
+        job_info = summary.get("job_info") if summary else None
+        return job_info if isinstance(job_info, dict) else {}
+
+    def summary(self) -> Dict[str, Any]:
+        """
+        The summary.json view of the log; built from the log itself, so it is
+        current even between materializations.
+        """
+        if os.path.exists(self.log_path):
+            return build_summary(dict(self.iter_segments()), self.job_info())
+        summary = self._load_summary_file()
+        if summary:
+            return summary
+        return build_summary(self._legacy_segments(), {})
+
+    def _index(self) -> Dict[int, Tuple[int, int]]:
+        """segment_index -> (offset, length) of its latest record."""
+        locations: Dict[int, Tuple[int, int]] = {}
+        log_size = os.path.getsize(self.log_path)
+        indexed_end = 0
+        if os.path.exists(self.index_path):
+            with open(self.index_path, "rb") as index_file:
+                data = index_file.read()
+            # A torn trailing entry (crash mid-write) is ignored
+            usable = len(data) - len(data) % _INDEX_RECORD.size
+            for segment_index, offset, length in _INDEX_RECORD.iter_unpack(data[:usable]):
+                if offset + length <= log_size:
+                    locations[segment_index] = (offset, length)
+                    indexed_end = max(indexed_end, offset + length)
+
+        # Records appended after the last index write are found by scanning the tail
+        if indexed_end < log_size:
+            with open(self.log_path, "rb") as log_file:
+                log_file.seek(indexed_end)
+                offset = indexed_end
+                for line in log_file:
+                    if line.endswith(b"\n"):
+                        try:
+                            segment_index = int(json.loads(line)["segment_index"])
+                            locations[segment_index] = (offset, len(line))
+                        except (ValueError, KeyError, TypeError):
+                            pass
+                    offset += len(line)
+        return locations
+
+    @staticmethod
+    def _read_record(log_file, offset: int, length: int) -> Optional[Dict[str, Any]]:
+        log_file.seek(offset)
+        try:
+            return json.loads(log_file.read(length))
+        except ValueError:
+            return None
+
+    def _load_summary_file(self) -> Optional[Dict[str, Any]]:
+        if not os.path.exists(self.summary_path):
+            return None
+        try:
+            with open(self.summary_path, "r", encoding="utf-8") as f:
+                summary = json.load(f)
+            return summary if isinstance(summary, dict) else None
+        except (ValueError, OSError) as e:
+            print(f"Warning: Failed to read {self.summary_path}: {e}")
+            return None
+
+    def _legacy_segment_files(self) -> List[str]:
+        return sorted(glob.glob(os.path.join(self.segments_dir, "segment_[0-9]*.json")))
+
+    def _legacy_segments(self) -> Dict[int, Dict[str, Any]]:
+        """Segments of logs written before segments.jsonl existed."""
+        segments: Dict[int, Dict[str, Any]] = {}
+        summary = self._load_summary_file()
+        for key, data in ((summary or {}).get("segments") or {}).items():
+            try:
+                segments[int(key)] = data
+            except (TypeError, ValueError):
+                continue
+        if segments:
+            return segments
+
+        for path in self._legacy_segment_files():
+            if path.endswith("_prompt.json"):
+                continue
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+                segments[int(data.get("segment_index"))] = data
+            except (ValueError, TypeError, OSError) as e:
+                print(f"Warning: Failed to read {path}: {e}")
+        return segments
+
+
+def build_summary(segments: Dict[int, Dict[str, Any]], job_info: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Summary structure of a segment log.
+
+    Args:
+        segments: Latest record per segment_index
+        job_info: Job metadata (job_id, task_type, started_at, ...)
+
+    Returns:
+        {"job_info": ..., "segments": {str(index): record}, "statistics": ...}
+    """
+    completed_segments = sum(
+        1 for s in segments.values()
+        if "translation" in s or "validation" in s or "post_edit" in s
+    )
+    failed_segments = sum(1 for s in segments.values() if "error" in s)
+    return {
+        "job_info": job_info,
+        "segments": {str(index): segments[index] for index in sorted(segments)},
+        "statistics": {
+            "total_segments": len(segments),
+            "completed_segments": completed_segments,
+            "failed_segments": failed_segments,
+            "last_updated": datetime.now().isoformat(),
+        },
+    }
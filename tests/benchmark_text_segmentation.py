@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark for text segmentation throughput.
+
+Builds large samples from the novels in source_novel/ (as-is, hard-wrapped with
+no blank lines, and a CJK sample) and reports normalization + segmentation
+throughput in MB/s, next to the previous quadratic implementation.
+
+Usage:
+    python tests/benchmark_text_segmentation.py
+    python tests/benchmark_text_segmentation.py --size-mb 20 --repeat 5 --no-baseline
+"""
+
+import argparse
+import glob
+import os
+import re
+import sys
+import textwrap
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.utils.text_segmentation import iter_segments_from_blocks
+
+SOURCE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "source_novel")
+
+
+def _corpus() -> str:
+    texts = []
+    for path in sorted(glob.glob(os.path.join(SOURCE_DIR, "*.txt"))):
+        with open(path, 'r', encoding='utf-8', errors='ignore') as f:
+            texts.append(f.read())
+    if not texts:
+        raise SystemExit(f"No sample novels found in {SOURCE_DIR}")
+    return "\n\n".join(texts)
+
+
+def _scale(text: str, size_mb: float) -> str:
+    target = int(size_mb * 1024 * 1024)
+    return (text * (target // max(1, len(text.encode('utf-8'))) + 1))[:target]
+
+
+def _hard_wrapped(text: str) -> str:
+    # Gutenberg-style: fixed-width lines and no blank lines, so the whole book is one paragraph
+    words = " ".join(text.split())
+    return "\n".join(textwrap.wrap(words, width=72, break_long_words=False))
+
+
+def _cjk_sample(size_mb: float) -> str:
+    sentence = "彼は静かに窓の外を見つめていた。「雨がまだ降っている」と彼女は言った。"
+    lines = textwrap.wrap(sentence * 40, width=38)
+    block = "\n".join(lines) + "\n\n"
+    return _scale(block, size_mb)
+
+
+def _legacy_segments(text: str, target_size: int) -> int:
+    """The previous implementation: re-scans the accumulated sentence and concatenates strings."""
+    paragraphs = []
+    for para in re.split(r'\n\s*\n', text):
+        if not para.strip():
+            continue
+        processed_lines = []
+        current_sentence = ""
+        for line in para.strip().split('\n'):
+            line = line.strip()
+            if not line:
+                continue
+            if current_sentence:
+                if re.search(r'[.!?]["\']*$', current_sentence):
+                    processed_lines.append(current_sentence)
+                    current_sentence = line
+                else:
+                    current_sentence += " " + line
+            else:
+                current_sentence = line
+        if current_sentence:
+            processed_lines.append(current_sentence)
+        paragraphs.append("\n".join(processed_lines))
+
+    count = 0
+    current = ""
+    for para in paragraphs:
+        if len(current) + len(para) > target_size and current:
+            count += 1
+            current = ""
+        if len(para) > target_size:
+            local = ""
+            for sentence in para.split('\n'):
+                if len(local) + len(sentence) > target_size and local:
+                    count += 1
+                    local = ""
+                local += sentence + "\n"
+            count += 1 if local.strip() else 0
+        else:
+            current += para + "\n\n"
+    return count + (1 if current.strip() else 0)
+
+
+def _measure(fn, text: str, repeat: int) -> float:
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(text)
+        best = min(best, time.perf_counter() - start)
+    return len(text.encode('utf-8')) / (1024 * 1024) / best
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--size-mb", type=float, default=8.0, help="Size of each sample in MB")
+    parser.add_argument("--target-size", type=int, default=15000, help="Segment target size in characters")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per sample (best is reported)")
+    parser.add_argument("--no-baseline", action="store_true", help="Skip the previous implementation")
+    args = parser.parse_args()
+
+    corpus = _corpus()
+    samples = {
+        "novels": _scale(corpus, args.size_mb),
+        "hard-wrapped": _scale(_hard_wrapped(corpus), args.size_mb),
+        "cjk": _cjk_sample(args.size_mb),
+    }
+
+    def current(text: str) -> int:
+        return sum(1 for _ in iter_segments_from_blocks([text], args.target_size))
+
+    def baseline(text: str) -> int:
+        return _legacy_segments(text, args.target_size)
+
+    print(f"{'sample':<14}{'MB':>8}{'segments':>10}{'MB/s':>10}{'baseline MB/s':>16}")
+    for name, text in samples.items():
+        size_mb = len(text.encode('utf-8')) / (1024 * 1024)
+        throughput = _measure(current, text, args.repeat)
+        baseline_column = "-" if args.no_baseline else f"{_measure(baseline, text, 1):.2f}"
+        print(f"{name:<14}{size_mb:>8.1f}{current(text):>10}{throughput:>10.2f}{baseline_column:>16}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,89 @@
+import hashlib
+import os
+import random
+import sys
+import threading
+import time
+from contextlib import contextmanager
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+class ScriptedModel:
+    """
+    Offline model for pipeline tests.
+
+    Translations are derived from the prompt, so identical prompts give identical
+    output on any thread. Structured calls answer `structured(prompt, schema)` ({} by
+    default). Prompts containing `fail_on` raise RuntimeError.
+    """
+
+    model_name = "scripted-model"
+
+    def __init__(self, structured=None, fail_on=None):
+        self.structured = structured
+        self.fail_on = fail_on
+        self.text_prompts = []
+        self.structured_prompts = []
+        self._lock = threading.Lock()
+
+    def generate_text(self, prompt, max_retries=3):
+        with self._lock:
+            self.text_prompts.append(prompt)
+        if self.fail_on and self.fail_on in prompt:
+            raise RuntimeError("model unavailable")
+        return "번역 " + hashlib.sha256(prompt.encode("utf-8")).hexdigest()[:8]
+
+    def generate_structured(self, prompt, response_schema, max_retries=3):
+        with self._lock:
+            self.structured_prompts.append(prompt)
+        return self.structured(prompt, response_schema) if self.structured else {}
+
+
+@pytest.fixture
+def novel_file(tmp_path, monkeypatch):
+    """Write paragraphs as a novel in a temporary working directory (job logs land there too)."""
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv("TQDM_DISABLE", "1")
+
+    def write(paragraphs, name="novel.txt"):
+        path = tmp_path / name
+        path.write_text("\n\n".join(paragraphs), encoding="utf-8")
+        return str(path)
+
+    return write
+
+
+@pytest.fixture
+def scripted_model():
+    """ScriptedModel factory."""
+    return ScriptedModel
+
+
+class ConcurrencyProbe:
+    """Records how many fake model calls run at the same time."""
+
+    def __init__(self):
+        self.active = 0
+        self.max_active = 0
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def call(self, min_seconds=0.001, max_seconds=0.01):
+        """Hold a slot for a random delay while the enclosed fake call runs."""
+        with self._lock:
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+        try:
+            time.sleep(random.uniform(min_seconds, max_seconds))
+            yield
+        finally:
+            with self._lock:
+                self.active -= 1
+
+
+@pytest.fixture
+def concurrency_probe():
+    return ConcurrencyProbe()
@@ -0,0 +1,81 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks import run_benchmarks
+from benchmarks.fake_model import FakeModel, FakeModelProfile
+from core.schemas.validation import make_validation_response_schema
+from shared.errors import ProhibitedException
+
+INSTANT = FakeModelProfile(time_scale=0)
+
+
+def test_fake_model_is_deterministic_per_seed():
+    events = []
+    model = FakeModel(INSTANT, seed=7, usage_callback=events.append)
+
+    first = model.generate_text("Translate: Holden went to Pencey.")
+    assert first == FakeModel(INSTANT, seed=7).generate_text("Translate: Holden went to Pencey.")
+    assert first != FakeModel(INSTANT, seed=8).generate_text("Translate: Holden went to Pencey.")
+    assert events and events[0].total_tokens == events[0].prompt_tokens + events[0].completion_tokens
+
+
+def test_fake_model_injects_errors():
+    always_prohibited = FakeModel(FakeModelProfile(time_scale=0, prohibited_rate=1.0))
+    with pytest.raises(ProhibitedException):
+        always_prohibited.generate_text("prompt")
+
+    always_unavailable = FakeModel(FakeModelProfile(time_scale=0, transient_error_rate=1.0))
+    with pytest.raises(Exception, match="All 2 API call attempts failed"):
+        always_unavailable.generate_text("prompt", max_retries=2)
+
+
+def test_structured_answers_follow_the_schema():
+    model = FakeModel(FakeModelProfile(time_scale=0, array_fill_rate=1.0))
+    schema = make_validation_response_schema()
+
+    response = model.generate_structured("Check Holden and Phoebe", schema)
+
+    assert set(response) == set(schema["properties"])
+    case_schema = schema["properties"]["cases"]["items"]
+    for case in response["cases"]:
+        for name, field in case_schema["properties"].items():
+            if "enum" in field:
+                assert case[name] in field["enum"]
+
+
+def test_small_run_reports_every_stage(monkeypatch, tmp_path):
+    monkeypatch.setitem(run_benchmarks.SIZES, "tiny", 6000)
+    monkeypatch.setenv("JOB_STORAGE_BASE", str(tmp_path))
+    monkeypatch.setenv("TQDM_DISABLE", "1")
+    monkeypatch.chdir(tmp_path)
+    options = {
+        "profile": {"time_scale": 0.0},
+        "seed": 0,
+        "segment_size": 2000,
+        "protagonist": "Holden",
+        "concurrency": 2,
+        "guide_lookahead": 0,
+        "shard_strategy": None,
+        "turbo": False,
+        "combined_analysis": False,
+        "stages": ["translation", "validation", "post_edit"],
+        "keep_workdir": False,
+        "verbose": False,
+    }
+
+    report = run_benchmarks.run_size("tiny", options)
+
+    assert list(report["stages"]) == ["translation", "validation", "post_edit"]
+    translation = report["stages"]["translation"]
+    assert translation["segments"] >= 2
+    assert translation["llm_calls"] > translation["segments"]
+    assert translation["tokens"] > 0
+    assert "segment" in translation["phases"]
+    assert report["stages"]["validation"]["segments"] == translation["segments"]
+
+    slower = {"sizes": {"tiny": {"stages": {"translation": dict(translation, seconds=translation["seconds"] / 10)}}}}
+    assert run_benchmarks.compare({"sizes": {"tiny": report}}, slower, 0.25)
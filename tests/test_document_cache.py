@@ -0,0 +1,116 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import core.utils.document_cache as document_cache
+from core.utils.document_cache import ParsedDocumentCache
+from core.utils.text_segmentation import create_segments_from_plain_text
+
+
+def _counting_parser(monkeypatch):
+    calls = []
+
+    def parse(filepath):
+        calls.append(filepath)
+        with open(filepath, 'r', encoding='utf-8') as f:
+            return f.read()
+
+    monkeypatch.setattr(document_cache, "parse_document", parse)
+    return calls
+
+
+def _write_source(tmp_path, text, directory="jobs/7/input"):
+    source = tmp_path / directory / "book.txt"
+    source.parent.mkdir(parents=True, exist_ok=True)
+    source.write_text(text, encoding="utf-8")
+    return str(source)
+
+
+def test_text_and_segments_are_parsed_once(tmp_path, monkeypatch):
+    calls = _counting_parser(monkeypatch)
+    source = _write_source(tmp_path, "First paragraph.\n\nSecond paragraph.\n\nThird one.")
+    cache = ParsedDocumentCache()
+
+    def build():
+        return create_segments_from_plain_text(cache.get_text(source), 20)
+
+    assert cache.get_text(source).startswith("First paragraph.")
+    first = cache.get_segments(source, "text-20", build)
+    second = cache.get_segments(source, "text-20", build)
+
+    assert calls == [source]
+    assert [s.text for s in first] == [s.text for s in second]
+    # Callers annotate segments; the cached list must not change
+    first[0].world_atmosphere = {"mood": "calm"}
+    assert cache.get_segments(source, "text-20", build)[0].world_atmosphere is None
+
+
+def test_disk_entries_are_shared_across_processes(tmp_path, monkeypatch):
+    monkeypatch.setenv("JOB_STORAGE_BASE", str(tmp_path / "jobs"))
+    calls = _counting_parser(monkeypatch)
+    source = _write_source(tmp_path, "Alpha.\n\nBeta.")
+
+    ParsedDocumentCache().get_text(source)
+    # A fresh cache (another worker) reads the entry stored in the job's output directory
+    assert ParsedDocumentCache().get_text(source) == "Alpha.\n\nBeta."
+    assert calls == [source]
+    assert os.listdir(tmp_path / "jobs" / "7" / "output" / document_cache.CACHE_DIR_NAME)
+
+
+def test_files_outside_job_storage_are_cached_in_memory_only(tmp_path, monkeypatch):
+    monkeypatch.setenv("JOB_STORAGE_BASE", str(tmp_path / "jobs"))
+    _counting_parser(monkeypatch)
+    upload = _write_source(tmp_path, "Temporary upload.", directory="translation_temp")
+    cli_input = _write_source(tmp_path, "A novel on the desktop.", directory="home/novels")
+
+    cache = ParsedDocumentCache()
+    cache.get_text(upload)
+    cache.get_text(cli_input)
+
+    assert sorted(p.name for p in tmp_path.rglob("*") if p.is_file()) == ["book.txt", "book.txt"]
+
+
+def test_disk_cache_directory_is_pruned_by_age_and_size(tmp_path, monkeypatch):
+    _counting_parser(monkeypatch)
+    cache_dir = tmp_path / "parsed"
+    cache = ParsedDocumentCache(cache_dir=str(cache_dir), max_disk_bytes=2500, max_age_seconds=3600)
+    cache_dir.mkdir()
+    stale = cache_dir / "stale.v3.txt"
+    stale.write_text("old", encoding="utf-8")
+    os.utime(stale, (0, 0))
+
+    for i in range(4):
+        cache.get_text(_write_source(tmp_path, str(i) * 1000, directory=f"books/{i}"))
+
+    # The expired entry goes first, then the oldest until two 1000-byte entries remain
+    assert len(os.listdir(cache_dir)) == 2
+    assert not stale.exists()
+
+
+def test_failed_build_releases_its_key_lock(tmp_path):
+    cache = ParsedDocumentCache(use_disk=False)
+    source = _write_source(tmp_path, "Text.")
+
+    def fail():
+        raise RuntimeError("segmentation failed")
+
+    with pytest.raises(RuntimeError):
+        cache.get_segments(source, "text-20", fail)
+
+    assert cache._key_locks == {}
+
+
+def test_changed_content_is_parsed_again(tmp_path, monkeypatch):
+    calls = _counting_parser(monkeypatch)
+    source = _write_source(tmp_path, "Old text.")
+    cache = ParsedDocumentCache(use_disk=False)
+
+    cache.get_text(source)
+    with open(source, 'w', encoding='utf-8') as f:
+        f.write("New text, longer than before.")
+
+    assert cache.get_text(source) == "New text, longer than before."
+    assert len(calls) == 2
@@ -0,0 +1,79 @@
+import os
+import sys
+
+from ebooklib import epub
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.schemas import SegmentInfo
+from core.utils.document_cache import ParsedDocumentCache
+from core.utils.document_io import DocumentOutputManager, _group_segments_by_chapter
+import core.utils.text_segmentation as text_segmentation
+
+
+def _write_book(path):
+    book = epub.EpubBook()
+    book.set_identifier("chapters-test")
+    book.set_title("Chapters")
+    book.set_language("en")
+    chapters = []
+    for number, body in enumerate(["First chapter text.", "Second chapter text.\n\nMore text."], start=1):
+        chapter = epub.EpubHtml(title=f"Chapter {number}", file_name=f"ch{number}.xhtml", lang="en")
+        paragraphs = "".join(f"<p>{para}</p>" for para in body.split("\n\n"))
+        chapter.content = f"<html><body><h1>Heading {number}</h1>{paragraphs}</body></html>"
+        book.add_item(chapter)
+        chapters.append(chapter)
+    book.toc = tuple(epub.Link(c.file_name, c.title, c.file_name) for c in chapters)
+    book.add_item(epub.EpubNcx())
+    book.add_item(epub.EpubNav())
+    book.spine = chapters
+    epub.write_epub(str(path), book, {})
+
+
+def test_epub_segments_carry_chapter_metadata(tmp_path, monkeypatch):
+    source = tmp_path / "book.epub"
+    _write_book(source)
+    monkeypatch.setattr(text_segmentation, "get_document_cache", lambda: ParsedDocumentCache(use_disk=False))
+
+    segments = text_segmentation.create_segments_for_epub(str(source), target_size=15000)
+
+    # Short chapters are not merged into one segment
+    assert [(s.chapter_filename, s.chapter_title) for s in segments] == [
+        ("ch1.xhtml", "Chapter 1"),
+        ("ch2.xhtml", "Chapter 2"),
+    ]
+    assert segments[1].text.startswith("Heading 2")
+
+
+def test_epub_output_has_one_document_per_chapter(tmp_path):
+    source = tmp_path / "book.epub"
+    _write_book(source)
+    infos = [
+        SegmentInfo(text="a", chapter_title="One", chapter_filename="ch1.xhtml"),
+        SegmentInfo(text="b", chapter_title="One", chapter_filename="ch1.xhtml"),
+        SegmentInfo(text="c", chapter_title="Two & more", chapter_filename="ch2.xhtml"),
+    ]
+    output = tmp_path / "out" / "book_translated.epub"
+
+    DocumentOutputManager.save_epub_output(str(source), ["A", "B", "C"], str(output), segment_infos=infos)
+
+    written = epub.read_epub(str(output))
+    documents = sorted(
+        item.get_name() for item in written.get_items()
+        if item.get_name().startswith("chapter_")
+    )
+    assert documents == ["chapter_0001.xhtml", "chapter_0002.xhtml"]
+    assert [link.title for link in written.toc] == ["One", "Two & more"]
+
+
+def test_partial_translations_group_by_chapter():
+    infos = [
+        SegmentInfo(text="a", chapter_filename="ch1.xhtml"),
+        SegmentInfo(text="b", chapter_filename="ch2.xhtml"),
+        SegmentInfo(text="c", chapter_filename="ch2.xhtml"),
+    ]
+
+    assert _group_segments_by_chapter(["A", "B"], infos) == [(None, ["A"]), (None, ["B"])]
+    # Without (matching) chapter metadata everything stays in one document
+    assert _group_segments_by_chapter(["A", "B"], None) == [(None, ["A", "B"])]
+    assert _group_segments_by_chapter(["A", "B"], infos[:1]) == [(None, ["A", "B"])]
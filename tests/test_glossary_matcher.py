@@ -0,0 +1,57 @@
+import random
+import re
+
+from core.utils.glossary_matcher import GlossaryMatcher
+
+
+def regex_filter(glossary, text):
+    return {
+        key: value for key, value in glossary.items()
+        if re.search(r'\b' + re.escape(key) + r'\b', text, re.IGNORECASE)
+    }
+
+
+def test_matches_whole_words_case_insensitively():
+    glossary = {"Holden": "홀든", "Andrew": "앤드류", "Andrew Ramsay": "앤드류 램지", "Pen": "펜"}
+    text = "andrew ramsay met HOLDEN near Pencey."
+
+    assert GlossaryMatcher().filter(glossary, text) == {
+        "Holden": "홀든",
+        "Andrew": "앤드류",
+        "Andrew Ramsay": "앤드류 램지",
+    }
+
+
+def test_terms_added_later_are_matched():
+    matcher = GlossaryMatcher(["Holden"])
+    assert matcher.find("Holden and Phoebe") == {"Holden"}
+
+    matcher.add_terms(["Phoebe"])
+
+    assert matcher.find("Holden and Phoebe") == {"Holden", "Phoebe"}
+
+
+def test_agrees_with_per_term_regex_on_random_input():
+    rng = random.Random(7)
+    alphabet = "abAB c-_.'é1홀든"
+    for _ in range(500):
+        glossary = {
+            "".join(rng.choice(alphabet) for _ in range(rng.randint(1, 4))): "x"
+            for _ in range(rng.randint(1, 8))
+        }
+        text = "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 40)))
+
+        assert GlossaryMatcher().filter(glossary, text) == regex_filter(glossary, text)
+
+
+def test_case_folding_follows_re_for_special_characters():
+    rng = random.Random(11)
+    alphabet = "iIıİsSſσςΣkK\u212aµμΜßẞ ΐ\u1fd3ﬅﬆ"
+    for _ in range(2000):
+        glossary = {
+            "".join(rng.choice(alphabet) for _ in range(rng.randint(1, 3))): "x"
+            for _ in range(rng.randint(1, 6))
+        }
+        text = "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 20)))
+
+        assert GlossaryMatcher().filter(glossary, text) == regex_filter(glossary, text)
@@ -0,0 +1,92 @@
+import os
+import sys
+import time
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.translation.illustration.cache_manager import IllustrationCacheManager
+from core.translation.illustration import image_service
+from core.translation.illustration.image_service import ImageGenerationService
+
+
+class SlowImageModels:
+    """Fake image API: no image parts, so the service falls back to saving the prompt."""
+
+    def __init__(self, probe):
+        self.probe = probe
+
+    def generate_content(self, model, contents):
+        with self.probe.call(0.05, 0.05):
+            return SimpleNamespace(candidates=[], usage_metadata=None)
+
+
+class EchoPromptBuilder:
+    def create_illustration_prompt(self, segment_text, **kwargs):
+        return f"illustrate: {segment_text}"
+
+
+class CountingLimiter:
+    def __init__(self):
+        self.keys = []
+
+    def wait(self, key):
+        self.keys.append(key)
+
+
+def make_service(tmp_path, probe, limiter=None):
+    return ImageGenerationService(
+        SimpleNamespace(models=SlowImageModels(probe)),
+        tmp_path,
+        IllustrationCacheManager(tmp_path, enable_caching=False),
+        rate_limiter=limiter,
+        rate_limit_key="key-1",
+    )
+
+
+def test_parallel_batch_keeps_segment_order(tmp_path, concurrency_probe):
+    service = make_service(tmp_path, concurrency_probe)
+    segments = [{"text": f"scene {i}", "index": i * 2} for i in range(8)]
+
+    started = time.time()
+    results = service.generate_batch_illustrations(
+        segments, EchoPromptBuilder(), parallel=True, max_workers=4
+    )
+    elapsed = time.time() - started
+
+    assert [r["segment_index"] for r in results] == [i * 2 for i in range(8)]
+    assert all(r["success"] for r in results)
+    assert results[3]["prompt"] == "illustrate: scene 3"
+    assert 1 < concurrency_probe.max_active <= 4
+    assert elapsed < 8 * 0.05
+
+
+def test_rate_limiter_paces_every_image_request(tmp_path, concurrency_probe):
+    limiter = CountingLimiter()
+    service = make_service(tmp_path, concurrency_probe, limiter)
+
+    service.generate_batch_illustrations(
+        [{"text": "scene", "index": 0}, {"text": "other", "index": 1}], EchoPromptBuilder()
+    )
+
+    assert limiter.keys == ["key-1", "key-1"]
+
+
+def test_batches_share_one_executor(tmp_path, concurrency_probe, monkeypatch):
+    created = []
+    real_executor = image_service.concurrent.futures.ThreadPoolExecutor
+
+    def recording_executor(*args, **kwargs):
+        created.append(kwargs.get("thread_name_prefix"))
+        return real_executor(*args, **kwargs)
+
+    monkeypatch.setattr(image_service, "_executors", {})
+    monkeypatch.setattr(image_service.concurrent.futures, "ThreadPoolExecutor", recording_executor)
+    service = make_service(tmp_path, concurrency_probe)
+    segments = [{"text": f"scene {i}", "index": i} for i in range(3)]
+
+    for _ in range(3):
+        service.generate_batch_illustrations(segments, EchoPromptBuilder(), parallel=True, max_workers=2)
+
+    assert concurrency_probe.max_active <= 2
+    assert created.count("illustration-batch") == 1
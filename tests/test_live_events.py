@@ -0,0 +1,93 @@
+import asyncio
+import json
+import os
+import sys
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session, sessionmaker
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+os.environ.setdefault("GEMINI_API_KEY", "test-gemini")
+os.environ.setdefault("CLERK_SECRET_KEY", "test-clerk")
+os.environ.setdefault("ADMIN_SECRET_KEY", "test-admin")
+
+import backend.domains.shared.events.live as live
+from backend.domains.shared.db_base import Base
+from backend.domains.translation.models import TranslationJob
+from backend.domains.translation.repository import SqlAlchemyTranslationJobRepository
+
+
+class RecordingPublisher:
+    def __init__(self):
+        self.events = []
+
+    def publish(self, channel, event_type, data, *, retain=True):
+        self.events.append((channel, event_type, data))
+        return True
+
+
+@pytest.fixture()
+def session(monkeypatch) -> Session:
+    monkeypatch.setattr(live, "_publisher", RecordingPublisher())
+    engine = create_engine("sqlite:///:memory:")
+    Base.metadata.create_all(engine)
+    db = sessionmaker(bind=engine)()
+    try:
+        yield db
+    finally:
+        db.close()
+        Base.metadata.drop_all(engine)
+        engine.dispose()
+
+
+def test_status_events_are_published_only_after_commit(session: Session) -> None:
+    job = TranslationJob(filename="book.txt")
+    session.add(job)
+    session.commit()
+    repo = SqlAlchemyTranslationJobRepository(session)
+
+    repo.set_status(job.id, "PROCESSING")
+    assert live._publisher.events == []
+    session.commit()
+
+    repo.set_status(job.id, "FAILED", error="boom")
+    session.rollback()
+
+    assert live._publisher.events == [
+        (live.job_channel(job.id), "status",
+         {"job_id": job.id, "phase": "translation", "status": "PROCESSING", "error": None, "progress": None}),
+    ]
+
+
+def test_broker_fans_out_to_channel_subscribers() -> None:
+    broker = live.LiveEventBroker("redis://unused", enabled=True)
+
+    async def no_reader():
+        return None
+
+    async def no_last_event(channel):
+        return None
+
+    broker._ensure_reader = no_reader
+    broker.last_event = no_last_event
+
+    async def collect():
+        channel = live.job_channel(7)
+        stream = broker.stream(channel, keepalive=0.05)
+        frames = [asyncio.ensure_future(stream.__anext__())]
+        await asyncio.sleep(0.01)
+        message = {"type": "progress", "data": {"job_id": 7, "phase": "validation", "progress": 40}}
+        broker.dispatch(live.job_channel(8), json.dumps({"type": "progress", "data": {}}))
+        broker.dispatch(channel, json.dumps(message))
+        first = await frames[0]
+        second = await stream.__anext__()
+        await stream.aclose()
+        return first, second
+
+    first, second = asyncio.run(collect())
+
+    assert first == 'event: progress\ndata: {"job_id": 7, "phase": "validation", "progress": 40}\n\n'
+    assert second == ": keep-alive\n\n"
+    assert broker._subscribers == {}
@@ -0,0 +1,84 @@
+import os
+import sys
+from types import SimpleNamespace
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+pytest.importorskip("prometheus_client")
+from prometheus_client.parser import text_string_to_metric_families
+
+from core.translation.models.gemini import GeminiModel, classify_error
+from core.translation.usage_tracker import UsageEvent
+from core.utils import metrics
+from core.utils.tracing import span
+
+
+class RateLimitedOnce:
+    def __init__(self):
+        self.calls = 0
+
+    def generate_content(self, **_kwargs):
+        self.calls += 1
+        if self.calls == 1:
+            raise RuntimeError("429 RESOURCE_EXHAUSTED: quota")
+        return SimpleNamespace(
+            text="번역",
+            usage_metadata=SimpleNamespace(prompt_token_count=12, candidates_token_count=5, total_token_count=17),
+        )
+
+
+def sample(name, **labels):
+    payload, _ = metrics.render()
+    for family in text_string_to_metric_families(payload.decode()):
+        for s in family.samples:
+            if s.name == name and all(s.labels.get(k) == v for k, v in labels.items()):
+                return s.value
+    return 0.0
+
+
+@pytest.fixture(autouse=True)
+def enabled_metrics(monkeypatch):
+    monkeypatch.delenv("PROMETHEUS_MULTIPROC_DIR", raising=False)
+    assert metrics.enable()
+
+
+def test_model_calls_are_counted_by_outcome(monkeypatch):
+    monkeypatch.setattr(GeminiModel, "_compute_backoff_seconds", lambda self, attempt, **_: 0.001)
+    model = GeminiModel(
+        api_key=None,
+        model_name="metrics-model",
+        safety_settings=[],
+        generation_config={},
+        enable_soft_retry=False,
+        client=SimpleNamespace(models=RateLimitedOnce()),
+    )
+
+    assert model.generate_text("prompt") == "번역"
+
+    labels = {"provider": "gemini", "model": "metrics-model"}
+    assert sample("cat_llm_calls_total", outcome="rate_limited", error_class="RuntimeError", **labels) == 1
+    assert sample("cat_llm_calls_total", outcome="success", **labels) == 1
+    assert sample("cat_llm_call_seconds_count", **labels) == 2
+    assert sample("cat_llm_tokens_total", model="metrics-model", kind="prompt") == 12
+    assert sample("cat_wait_seconds_count", reason="retry_backoff") >= 1
+
+
+def test_usage_and_key_pool_state():
+    metrics.record_usage(UsageEvent(model_name="cache-model", cached=True))
+    metrics.set_key_pool_state("pool-model", {"available": 1, "cooldown": 2, "disabled": 0})
+    with span("segment", segment=1):
+        pass
+
+    assert sample("cat_llm_cached_responses_total", model="cache-model") == 1
+    assert sample("cat_api_keys", model="pool-model", state="cooldown") == 2
+    assert sample("cat_segment_seconds_count") >= 1
+
+
+def test_classify_error_uses_http_status():
+    response = SimpleNamespace(status_code=503)
+    assert classify_error(type("HTTPStatusError", (Exception,), {})("boom")) == "error"
+    error = Exception("server")
+    error.response = response
+    assert classify_error(error) == "transient"
@@ -0,0 +1,156 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from core.config.builder import DynamicConfigBuilder, SegmentGuideAnalysis
+from core.schemas.character_style import CharacterInteraction, DialogueAnalysisResult
+from core.translation import translation_pipeline
+from core.translation.document import TranslationDocument
+from core.translation.translation_pipeline import TranslationPipeline
+
+
+class DummyModel:
+    def __init__(self):
+        self.calls = 0
+
+    def generate_structured(self, prompt, schema, max_retries=3):
+        self.calls += 1
+        return {}
+
+
+def test_apply_segment_analysis_keeps_existing_translations():
+    builder = DynamicConfigBuilder(DummyModel(), "Holden", initial_glossary={"Pencey": "펜시"})
+    analysis = SegmentGuideAnalysis(
+        new_terms={"Holden": "홀든 (new)", "Phoebe": "피비"},
+        dialogue=DialogueAnalysisResult(
+            protagonist_name="Holden",
+            has_dialogue=True,
+            interactions=[CharacterInteraction(character_name="Phoebe", speech_style="반말")],
+        ),
+        style_deviation="Letter in segment",
+    )
+
+    glossary, styles, deviation = builder.apply_segment_analysis(
+        analysis,
+        current_glossary={"Holden": "홀든"},
+        current_character_styles={"Holden->Stradlater": "반말"},
+    )
+
+    # Terms proposed against an older snapshot must not overwrite earlier translations
+    assert glossary == {"Pencey": "펜시", "Holden": "홀든", "Phoebe": "피비"}
+    assert styles == {"Holden->Stradlater": "반말", "Holden->Phoebe": "반말"}
+    assert deviation == "Letter in segment"
+
+
+def test_analyze_segment_in_turbo_mode_makes_no_calls():
+    model = DummyModel()
+    builder = DynamicConfigBuilder(model, "Holden", turbo_mode=True)
+
+    analysis = builder.analyze_segment("Some text", "core style", {}, "job", 1)
+    glossary, styles, deviation = builder.apply_segment_analysis(analysis, {"A": "에이"}, {})
+
+    assert model.calls == 0
+    assert glossary == {"A": "에이"}
+    assert styles == {}
+    assert deviation == "N/A"
+
+
+class CombinedModel:
+    def __init__(self, response=None, error=None):
+        self.prompts = []
+        self.response = response
+        self.error = error
+
+    def generate_structured(self, prompt, schema, max_retries=3):
+        self.prompts.append(prompt)
+        if self.error and len(self.prompts) == 1:
+            raise self.error
+        return self.response if len(self.prompts) == 1 else {}
+
+
+def test_combined_analysis_uses_a_single_call():
+    model = CombinedModel(response={
+        "new_terms": [
+            {"source": "Phoebe", "korean": "피비"},
+            {"source": "Holden", "korean": "홀던"},
+        ],
+        "has_dialogue": True,
+        "interactions": [{"character_name": "Phoebe", "speech_style": "반말"}],
+        "style_deviation": {"has_deviation": True, "starts_with": "Dear Allie", "instruction": "Use a letter tone."},
+    })
+    builder = DynamicConfigBuilder(model, "Holden", combined_analysis=True)
+
+    analysis = builder.analyze_segment("Holden talks to Phoebe.", "core style", {"Holden": "홀든"}, "job", 1)
+
+    assert len(model.prompts) == 1
+    assert analysis.new_terms == {"Phoebe": "피비"}
+    assert analysis.dialogue.to_style_dict() == {"Holden->Phoebe": "반말"}
+    assert analysis.style_deviation == "**Starts with:** Dear Allie\n**Instruction:** Use a letter tone."
+
+
+def test_combined_analysis_falls_back_to_separate_calls_on_error():
+    model = CombinedModel(error=RuntimeError("bad payload"))
+    builder = DynamicConfigBuilder(model, "Holden", combined_analysis=True)
+
+    analysis = builder.analyze_segment("Some text", "core style", {}, "job", 1)
+
+    assert len(model.prompts) > 1
+    assert analysis.new_terms == {}
+    assert analysis.style_deviation == "N/A"
+
+
+# Six segments of one paragraph each at target_segment_size=1000
+PARAGRAPHS = [f"Paragraph {i}. " + "Holden walked around Pencey for a while and thought about things. " * 12 for i in range(6)]
+
+
+def translate(path, model, *, job_id, guide_lookahead, resumed=None):
+    document = TranslationDocument(path, target_segment_size=1000, job_id=job_id)
+    if resumed:
+        document.translated_segments = list(resumed)
+    pipeline = TranslationPipeline(
+        model, DynamicConfigBuilder(model, "Holden"), db=None, job_id=job_id,
+        initial_core_style="plain", guide_lookahead=guide_lookahead,
+    )
+    pipeline.translate_document(document)
+    return document.translated_segments
+
+
+def test_lookahead_pipeline_matches_serial_translation(novel_file, scripted_model):
+    path = novel_file(PARAGRAPHS)
+
+    serial = translate(path, scripted_model(), job_id=1, guide_lookahead=0)
+    ahead = translate(path, scripted_model(), job_id=2, guide_lookahead=2)
+
+    assert len(serial) == len(PARAGRAPHS)
+    assert ahead == serial
+
+
+def test_lookahead_pipeline_does_not_analyze_resumed_segments(novel_file, scripted_model):
+    path = novel_file(PARAGRAPHS)
+    serial = translate(path, scripted_model(), job_id=1, guide_lookahead=0)
+
+    model = scripted_model()
+    resumed = translate(path, model, job_id=2, guide_lookahead=3, resumed=serial[:2])
+
+    assert resumed == serial
+    assert any("Paragraph 2." in p for p in model.structured_prompts)
+    assert not any("Paragraph 0." in p or "Paragraph 1." in p for p in model.structured_prompts)
+    assert len(model.text_prompts) == len(PARAGRAPHS) - 2
+
+
+def test_lookahead_executor_is_shut_down_when_translation_fails(novel_file, scripted_model, monkeypatch):
+    executors = []
+
+    class RecordingExecutor(ThreadPoolExecutor):
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            executors.append(self)
+
+    monkeypatch.setattr(translation_pipeline, "ThreadPoolExecutor", RecordingExecutor)
+    path = novel_file(PARAGRAPHS)
+
+    with pytest.raises(RuntimeError, match="model unavailable"):
+        translate(path, scripted_model(fail_on="Paragraph 3."), job_id=1, guide_lookahead=2)
+
+    assert len(executors) == 1
+    assert executors[0]._shutdown
@@ -0,0 +1,112 @@
+import json
+import os
+import re
+import sys
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.translation.post_editor import PostEditEngine
+from shared.utils.logging import TranslationLogger
+
+
+class FakeLogger:
+    def __init__(self, log_dir):
+        self.context_log_path = str(log_dir / "context.log")
+        self.progress_log_path = str(log_dir / "progress_job.log")
+        self.segments = []
+
+    def log_translation_prompt(self, segment_idx, prompt):
+        pass
+
+    def log_segment_io(self, segment_index, source_text, translated_text=None, metadata=None, error=None):
+        self.segments.append(segment_index)
+
+    def log_translation_progress(self, segment_idx, count):
+        pass
+
+    def log_post_edit_segment(self, segment_index, issues_fixed, original_text, edited_text):
+        pass
+
+    def log_error(self, error, segment_idx, context):
+        pass
+
+    def log_completion(self, total_segments, total_time=None):
+        pass
+
+
+class EditingModel:
+    """Returns 'edited <segment>' after a random delay; fails for the segment marked 'boom'."""
+
+    def __init__(self, probe):
+        self.probe = probe
+
+    def generate_text(self, prompt):
+        with self.probe.call():
+            if "boom" in prompt:
+                raise RuntimeError("model failure")
+            match = re.search(r"source (\d+)", prompt)
+            return f"edited {match.group(1)}"
+
+
+def make_fixture(tmp_path, count):
+    document = SimpleNamespace(
+        segments=[SimpleNamespace(text=f"source {i}" + (" boom" if i == 3 else "")) for i in range(count)],
+        translated_segments=[f"translated {i}" for i in range(count)],
+        glossary={},
+        user_base_filename="book",
+    )
+    case = {
+        "current_korean_sentence": "a",
+        "problematic_source_sentence": "b",
+        "reason": "c",
+        "dimension": "accuracy",
+        "severity": "2",
+        "recommend_korean_sentence": "d",
+    }
+    report = {
+        "detailed_results": [
+            {"segment_index": i, "status": "FAIL", "structured_cases": [case]} for i in range(0, count, 2)
+        ] + [{"segment_index": 3, "status": "FAIL", "structured_cases": [case]}]
+    }
+    report_path = tmp_path / "report.json"
+    report_path.write_text(json.dumps(report), encoding="utf-8")
+    selected = {r["segment_index"]: [True] for r in report["detailed_results"]}
+    return document, str(report_path), selected
+
+
+def test_concurrent_post_edit_assembles_results_by_index(tmp_path, concurrency_probe):
+    document, report_path, selected = make_fixture(tmp_path, 20)
+    model = EditingModel(concurrency_probe)
+    engine = PostEditEngine(model, logger=FakeLogger(tmp_path))
+    progress = []
+
+    edited = engine.post_edit_document(
+        document, report_path, selected, progress_callback=progress.append, concurrency=5
+    )
+
+    for i in range(20):
+        if i == 3:
+            # Failed segment keeps its translation, others are unaffected
+            assert edited[i] == "translated 3"
+        elif i % 2 == 0:
+            assert edited[i] == f"edited {i}"
+        else:
+            assert edited[i] == f"translated {i}"
+    assert progress == sorted(progress)
+    assert progress[-1] == 100
+    assert 1 < concurrency_probe.max_active <= 5
+
+
+def test_concurrent_post_edit_shares_one_translation_logger(tmp_path, concurrency_probe):
+    document, report_path, selected = make_fixture(tmp_path, 20)
+    logger = TranslationLogger(job_id=9, user_base_filename="book", task_type="postedit", job_storage_base=str(tmp_path))
+    logger.initialize_session()
+    engine = PostEditEngine(EditingModel(concurrency_probe), logger=logger)
+
+    engine.post_edit_document(document, report_path, selected, concurrency=5)
+
+    with open(logger.context_log_path, encoding="utf-8") as f:
+        context_log = f.read()
+    edited = sorted(int(i) for i in re.findall(r"--- POST-EDIT SEGMENT (\d+) ---", context_log))
+    assert edited == list(range(0, 20, 2))
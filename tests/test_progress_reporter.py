@@ -0,0 +1,106 @@
+import os
+import sys
+
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import Session, sessionmaker
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+os.environ.setdefault("GEMINI_API_KEY", "test-gemini")
+os.environ.setdefault("CLERK_SECRET_KEY", "test-clerk")
+os.environ.setdefault("ADMIN_SECRET_KEY", "test-admin")
+
+from backend.celery_tasks.progress import ProgressReporter
+from backend.domains.shared.db_base import Base
+from backend.domains.translation.models import TranslationJob
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class FakeTask:
+    def __init__(self):
+        self.states = []
+
+    def update_state(self, state, meta):
+        self.states.append((state, meta))
+
+
+@pytest.fixture()
+def engine():
+    engine = create_engine("sqlite:///:memory:")
+    Base.metadata.create_all(engine)
+    yield engine
+    Base.metadata.drop_all(engine)
+    engine.dispose()
+
+
+@pytest.fixture()
+def session(engine) -> Session:
+    db = sessionmaker(bind=engine)()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+def create_job(db: Session) -> TranslationJob:
+    job = TranslationJob(filename="book.txt")
+    db.add(job)
+    db.commit()
+    return job
+
+
+def test_updates_are_coalesced_by_delta_and_interval(engine, session: Session) -> None:
+    job_id = create_job(session).id
+    statements = []
+    event.listen(engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+    clock = FakeClock()
+    task = FakeTask()
+    reporter = ProgressReporter(
+        session, job_id, "validation_progress", task=task,
+        status_message=lambda p: f"Validating... {p}%",
+        extra_values={"validation_status": "IN_PROGRESS"},
+        min_interval=5.0, min_delta=10, clock=clock,
+    )
+
+    for progress in range(1, 40):
+        reporter.report(progress)
+    clock.now = 10.0
+    reporter.report(40)
+    reporter.report(41)
+    reporter.flush()
+
+    # First value, every 10%, the interval-elapsed value and the flushed tail
+    assert reporter.writes == 6
+    assert [meta["current"] for _, meta in task.states] == [1, 11, 21, 31, 40, 41]
+    assert task.states[-1][1]["status"] == "Validating... 41%"
+    assert not any(sql.lstrip().upper().startswith("SELECT") for sql in statements)
+
+    session.expire_all()
+    job = session.get(TranslationJob, job_id)
+    assert job.validation_progress == 41
+    assert job.validation_status == "IN_PROGRESS"
+
+
+def test_completion_and_partial_values_are_written(session: Session) -> None:
+    job = create_job(session)
+    reporter = ProgressReporter(
+        session, job.id, "illustrations_progress", min_interval=3600, min_delta=50, clock=FakeClock()
+    )
+
+    assert reporter.report(10, values={"illustrations_data": [{"segment_index": 0}]})
+    assert not reporter.report(20, values={"illustrations_data": [{"segment_index": 0}, {"segment_index": 1}]})
+    assert reporter.report(100)
+    assert not reporter.flush()
+
+    session.expire_all()
+    job = session.get(TranslationJob, job.id)
+    assert job.illustrations_progress == 100
+    assert len(job.illustrations_data) == 2
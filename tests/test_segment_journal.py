@@ -0,0 +1,40 @@
+from core.translation.segment_journal import SegmentJournal
+
+
+def test_journal_reads_back_contiguous_prefix(tmp_path):
+    journal = SegmentJournal(str(tmp_path / "output" / "segments.journal.jsonl"))
+
+    journal.append(0, "첫 번째")
+    journal.append_many([(1, "두 번째"), (3, "네 번째")])
+
+    # Position 2 is missing, so only the contiguous prefix is resumable
+    assert journal.read() == ["첫 번째", "두 번째"]
+
+
+def test_journal_later_record_replaces_earlier_one(tmp_path):
+    journal = SegmentJournal(str(tmp_path / "segments.journal.jsonl"))
+
+    journal.append_many([(0, "홀던"), (1, "피비")])
+    journal.append(0, "홀든")
+
+    assert journal.read() == ["홀든", "피비"]
+
+
+def test_journal_ignores_torn_last_line(tmp_path):
+    path = tmp_path / "segments.journal.jsonl"
+    journal = SegmentJournal(str(path))
+    journal.append(0, "완료")
+    with open(path, "a", encoding="utf-8") as f:
+        f.write('{"i": 1, "text": "잘린')
+
+    assert journal.read() == ["완료"]
+
+
+def test_journal_rewrite_replaces_previous_content(tmp_path):
+    journal = SegmentJournal(str(tmp_path / "segments.journal.jsonl"))
+    journal.append_many([(0, "a"), (1, "b"), (2, "c")])
+
+    journal.rewrite(["x"])
+
+    assert journal.read() == ["x"]
+    assert SegmentJournal(str(tmp_path / "missing.jsonl")).read() is None
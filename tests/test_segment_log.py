@@ -0,0 +1,124 @@
+import gc
+import json
+import os
+import sys
+from types import SimpleNamespace
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from shared.utils.logging import TranslationLogger
+from shared.utils.segment_log import (
+    SEGMENT_INDEX_FILENAME,
+    SEGMENT_LOG_FILENAME,
+    SegmentLogReader,
+    SegmentLogWriter,
+)
+
+
+def _record(index, text, translation=None):
+    record = {"segment_index": index, "source": {"text": text, "length": len(text)}}
+    if translation is not None:
+        record["translation"] = {"text": translation, "length": len(translation)}
+    return record
+
+
+def test_logger_buffers_segments_and_materializes_summary_at_completion(tmp_path):
+    logger = TranslationLogger(job_id=7, user_base_filename="book", job_storage_base=str(tmp_path))
+    for i in range(1, 4):
+        logger.log_segment_io(i, f"source {i}", f"번역 {i}", metadata={"chapter_title": "One"})
+    logger.log_segment_io(2, "source 2", error="timeout")
+
+    # Nothing is rewritten per segment
+    assert not os.path.exists(logger.segments_summary_path)
+    assert not any(name.startswith("segment_") for name in os.listdir(logger.segments_dir))
+
+    logger.log_completion(3, total_time=6.0)
+
+    with open(logger.segments_summary_path, encoding="utf-8") as f:
+        summary = json.load(f)
+    assert list(summary["segments"]) == ["1", "2", "3"]
+    assert summary["segments"]["2"]["error"] == "timeout"
+    assert summary["statistics"]["completed_segments"] == 2
+    assert summary["statistics"]["failed_segments"] == 1
+    assert summary["job_info"]["job_id"] == 7
+    assert summary["job_info"]["average_time_per_segment"] == 2.0
+
+
+def test_reader_random_access_uses_latest_record(tmp_path):
+    writer = SegmentLogWriter(str(tmp_path), flush_every=2)
+    writer.append(5, _record(5, "five", "다섯"))
+    writer.append(1, _record(1, "one"))
+    writer.append(1, _record(1, "one", "하나"))
+    writer.flush()
+
+    reader = SegmentLogReader(str(tmp_path))
+    assert reader.get(1)["translation"]["text"] == "하나"
+    assert reader.get(5)["source"]["text"] == "five"
+    assert reader.get(3) is None
+    assert [index for index, _ in reader.iter_segments()] == [1, 5]
+
+
+
+def test_dropped_writer_writes_out_buffered_records(tmp_path):
+    writer = SegmentLogWriter(str(tmp_path))
+    for i in range(3):
+        writer.append(i, _record(i, f"source {i}"))
+    assert not os.path.exists(tmp_path / SEGMENT_LOG_FILENAME)
+
+    del writer
+    gc.collect()
+
+    assert [index for index, _ in SegmentLogReader(str(tmp_path)).iter_segments()] == [0, 1, 2]
+
+
+def test_failed_validation_still_writes_its_segment_log(tmp_path):
+    from backend.domains.validation.service import ValidationDomainService
+
+    logger = TranslationLogger(job_id=7, user_base_filename="book", task_type="validation", job_storage_base=str(tmp_path))
+
+    class FailingValidator:
+        def validate_document(self, document, **_kwargs):
+            logger.log_segment_io(1, "source 1", "번역 1")
+            raise RuntimeError("model unavailable")
+
+    document = SimpleNamespace(segments=["source 1"], translated_segments=["번역 1"])
+    with pytest.raises(RuntimeError):
+        ValidationDomainService().run_validation(FailingValidator(), document, segment_logger=logger, concurrency=1)
+
+    assert [index for index, _ in SegmentLogReader(logger.segments_dir).iter_segments()] == [1]
+
+def test_reader_recovers_records_missing_from_the_index(tmp_path):
+    writer = SegmentLogWriter(str(tmp_path))
+    writer.append(1, _record(1, "one", "하나"))
+    writer.flush()
+    # Crash between the log and index writes: a torn index entry and an unindexed record
+    with open(tmp_path / SEGMENT_LOG_FILENAME, "ab") as f:
+        f.write((json.dumps(_record(2, "two", "둘"), ensure_ascii=False) + "\n").encode("utf-8"))
+        f.write(b'{"segment_index": 3, "sou')
+    with open(tmp_path / SEGMENT_INDEX_FILENAME, "ab") as f:
+        f.write(b"\x02\x00")
+
+    reader = SegmentLogReader(str(tmp_path))
+    assert [index for index, _ in reader.iter_segments()] == [1, 2]
+    assert reader.get(2)["translation"]["text"] == "둘"
+
+
+def test_reader_reads_legacy_logs(tmp_path):
+    summary_dir = tmp_path / "summary"
+    summary_dir.mkdir()
+    (summary_dir / "summary.json").write_text(json.dumps({
+        "job_info": {"job_id": 1},
+        "segments": {"2": _record(2, "two"), "10": _record(10, "ten")},
+    }), encoding="utf-8")
+    files_dir = tmp_path / "files"
+    files_dir.mkdir()
+    (files_dir / "segment_0001.json").write_text(json.dumps(_record(1, "one")), encoding="utf-8")
+    (files_dir / "segment_0001_prompt.json").write_text("{}", encoding="utf-8")
+
+    assert [index for index, _ in SegmentLogReader(str(summary_dir)).iter_segments()] == [2, 10]
+    assert SegmentLogReader(str(summary_dir)).summary()["job_info"] == {"job_id": 1}
+    assert SegmentLogReader(str(files_dir)).get(1)["source"]["text"] == "one"
+    assert SegmentLogReader(str(files_dir)).summary()["statistics"]["total_segments"] == 1
+    assert not SegmentLogReader(str(tmp_path / "missing")).exists()
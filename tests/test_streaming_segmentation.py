@@ -0,0 +1,53 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.utils.file_parser import iter_document_blocks
+from core.utils.text_segmentation import (
+    create_segments_from_plain_text,
+    iter_segments_from_blocks,
+)
+
+TEXT = (
+    "Chapter One\n\n"
+    "The rain had not stopped for three days, and the\n"
+    "river was rising faster than anyone expected.\n\n"
+    + "\n".join(f"Sentence number {i} of a very long paragraph." for i in range(40))
+    + "\n\n   \n\n"
+    "A short closing line.\n"
+)
+
+
+def _texts(segments):
+    return [segment.text for segment in segments]
+
+
+def test_streamed_txt_matches_whole_text_segmentation(tmp_path):
+    source = tmp_path / "book.txt"
+    source.write_text(TEXT, encoding="utf-8")
+
+    blocks = list(iter_document_blocks(str(source)))
+    streamed = list(iter_segments_from_blocks(iter_document_blocks(str(source)), 300))
+
+    assert len(blocks) > 1
+    assert _texts(streamed) == _texts(create_segments_from_plain_text(TEXT, 300))
+    # The oversized paragraph is split at sentence boundaries
+    assert all(len(text) <= 300 for text in _texts(streamed)[1:-1])
+    assert streamed[0].text.startswith("Chapter One\n\nThe rain had not stopped")
+
+
+def test_segments_are_yielded_before_input_is_exhausted():
+    consumed = []
+
+    def blocks():
+        for i in range(10):
+            consumed.append(i)
+            yield f"Paragraph {i} " + "x" * 40 + "."
+
+    segments = iter_segments_from_blocks(blocks(), 120)
+    first = next(segments)
+
+    assert first.text.startswith("Paragraph 0")
+    assert len(consumed) < 10
+    assert len(list(segments)) + 1 == 5
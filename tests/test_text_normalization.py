@@ -0,0 +1,44 @@
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.utils.text_segmentation import _normalize_paragraph, iter_segments_from_blocks
+
+
+def test_hard_wrapped_lines_are_joined_until_a_terminator():
+    para = "The rain had not\nstopped for days.\n\"Go home,\" she said.\nThen\nsilence."
+
+    assert _normalize_paragraph(para) == (
+        "The rain had not stopped for days.\n\"Go home,\" she said.\nThen silence."
+    )
+
+
+def test_cjk_terminators_and_wrapping():
+    para = "彼は窓の外を\n見ていた。\n「雨だ」\nと彼女は言った。\n次の文"
+
+    assert _normalize_paragraph(para) == "彼は窓の外を見ていた。\n「雨だ」と彼女は言った。\n次の文"
+    # A closing bracket after the terminator still ends the sentence
+    assert _normalize_paragraph("「行こう。」\n彼は笑った。") == "「行こう。」\n彼は笑った。"
+
+
+def test_unbroken_hard_wrapped_book_is_linear():
+    # No blank lines: the whole book is one paragraph of short wrapped lines
+    lines = ["and the river kept rising over the old stone", "bridge until morning came."]
+
+    def book(repeat):
+        return "\n".join(lines * repeat)
+
+    def elapsed(text):
+        start = time.perf_counter()
+        segments = list(iter_segments_from_blocks([text], 15000))
+        return time.perf_counter() - start, segments
+
+    small_time, _ = elapsed(book(1000))
+    large_time, segments = elapsed(book(20000))
+
+    assert len(segments) > 1
+    assert all(len(segment.text) <= 15000 for segment in segments)
+    # 20x the input must not cost anywhere near 400x the time
+    assert large_time < max(small_time, 1e-3) * 100
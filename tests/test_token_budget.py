@@ -0,0 +1,115 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import core.utils.text_segmentation as text_segmentation
+from core.utils.document_cache import ParsedDocumentCache
+from core.utils.text_segmentation import create_segments_for_text
+from core.utils.token_budget import (
+    PromptOverhead,
+    SegmentBudget,
+    detect_language,
+    estimate_tokens,
+    model_token_limits,
+    segment_token_budget,
+)
+
+ENGLISH = "The rain had not stopped for three days, and the river was rising. " * 20
+JAPANESE = "彼は静かに窓の外を見つめていた。「雨がまだ降っている」と彼女は言った。" * 20
+
+
+def test_language_detection_by_script():
+    assert detect_language(ENGLISH) == "en"
+    assert detect_language(JAPANESE) == "ja"
+    assert detect_language("他静静地看着窗外，雨还在下。") == "zh"
+    assert detect_language("그는 조용히 창밖을 바라보았다.") == "ko"
+    assert detect_language("") == "en"
+
+
+def test_cjk_text_costs_more_tokens_per_character():
+    english_rate = estimate_tokens(ENGLISH, "en") / len(ENGLISH)
+    japanese_rate = estimate_tokens(JAPANESE, "ja") / len(JAPANESE)
+
+    assert 0.15 < english_rate < 0.35
+    assert japanese_rate > 2 * english_rate
+
+
+def test_budget_respects_output_limit_and_prompt_overhead():
+    assert model_token_limits("google/gemini-2.5-flash") == model_token_limits("gemini-2.5-pro")
+
+    # gemini-2.0 models emit at most 8192 tokens; Korean output is larger than English input
+    small_output = segment_token_budget("gemini-2.0-flash", language="en", max_segment_tokens=100000)
+    assert small_output < 8192 / 1.4
+    capped = segment_token_budget(
+        "gemini-2.5-flash", language="en", max_output_tokens=25000, reserved_output_tokens=5000,
+        max_segment_tokens=100000,
+    )
+    assert capped < 20000
+    # A prompt that fills the context leaves only the minimum budget
+    assert segment_token_budget("gpt-4o", prompt_overhead_tokens=127000) == 500
+    assert PromptOverhead().tokens("ja") > PromptOverhead().tokens("en") > 1000
+
+
+def test_token_segments_follow_the_budget(tmp_path, monkeypatch):
+    monkeypatch.setattr(text_segmentation, "get_document_cache", lambda: ParsedDocumentCache(use_disk=False))
+    source = tmp_path / "book.txt"
+    source.write_text("\n\n".join([JAPANESE] * 10), encoding="utf-8")
+    budget = SegmentBudget(max_tokens=1500, language="ja")
+
+    by_tokens = create_segments_for_text(str(source), budget=budget)
+    by_chars = create_segments_for_text(str(source), target_size=15000)
+
+    assert len(by_chars) == 1
+    assert len(by_tokens) > 1
+    assert all(budget.measure(segment.text) <= 1500 for segment in by_tokens)
+
+
+def test_resumed_job_keeps_the_segmentation_it_started_with(monkeypatch):
+    from types import SimpleNamespace
+
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import sessionmaker
+    from sqlalchemy.pool import StaticPool
+
+    import backend.domains.translation.service as translation_service
+    from backend.domains.shared.db_base import Base
+    from backend.domains.translation.models import TranslationJob
+
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(engine)
+    session_factory = sessionmaker(bind=engine)
+    service = translation_service.TranslationDomainService(session_factory=session_factory)
+    settings = SimpleNamespace(segmentation_mode="characters", segment_output_reserve_tokens=None,
+                               segment_max_tokens=None)
+    monkeypatch.setattr(translation_service, "get_settings", lambda: settings)
+    monkeypatch.setattr(translation_service, "budget_for_document",
+                        lambda *args, **kwargs: SegmentBudget(max_tokens=1234))
+
+    with session_factory() as db:
+        started = TranslationJob(filename="a.txt", filepath="a.txt")
+        legacy = TranslationJob(filename="b.txt", filepath="b.txt")
+        db.add_all([started, legacy])
+        db.commit()
+        started_id, legacy_id = started.id, legacy.id
+
+    def resolve(job_id, resume):
+        with session_factory() as db:
+            job = db.get(TranslationJob, job_id)
+            return service._resolve_segment_token_budget(job_id, job, "gemini-2.0-flash", None, False, resume=resume)
+
+    assert resolve(started_id, resume=False) is None
+    # SEGMENTATION_MODE switches to tokens before the jobs are resumed
+    settings.segmentation_mode = "tokens"
+    assert resolve(started_id, resume=True) is None
+    assert resolve(legacy_id, resume=True) is None
+    with session_factory() as db:
+        assert db.get(TranslationJob, started_id).segmentation_mode == "characters"
+
+    new_id = legacy_id + 1
+    with session_factory() as db:
+        db.add(TranslationJob(id=new_id, filename="c.txt", filepath="c.txt"))
+        db.commit()
+    assert resolve(new_id, resume=False) == 1234
+    settings.segmentation_mode = "characters"
+    assert resolve(new_id, resume=True) == 1234
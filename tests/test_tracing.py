@@ -0,0 +1,106 @@
+import json
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.translation.models.gemini import GeminiModel
+from core.utils.tracing import (
+    Tracer,
+    in_current_context,
+    load_spans,
+    percentile,
+    span,
+    summarize_spans,
+    use_tracer,
+)
+
+
+class FlakyModels:
+    def __init__(self):
+        self.calls = 0
+
+    def generate_content(self, **_kwargs):
+        self.calls += 1
+        if self.calls == 1:
+            raise ConnectionError("connection reset")
+        return SimpleNamespace(text="번역", usage_metadata=None)
+
+
+def test_nested_spans_inherit_segment_and_export_jsonl(tmp_path):
+    path = tmp_path / "traces" / "translation_spans.jsonl"
+    tracer = Tracer(job_id=3, path=str(path))
+
+    with use_tracer(tracer):
+        with span("segment", segment=1):
+            with span("translate"):
+                with span("llm_call", model="m"):
+                    pass
+        try:
+            with span("segment", segment=2):
+                raise ValueError("boom")
+        except ValueError:
+            pass
+    summary = tracer.close()
+
+    records = list(load_spans(str(path)))
+    by_name = {(r["name"], r["attrs"].get("segment")): r for r in records}
+    assert by_name[("llm_call", 1)]["parent"] == by_name[("translate", 1)]["id"]
+    assert by_name[("segment", 2)]["error"] == "ValueError"
+    assert summary["spans"]["segment"]["count"] == 2
+    assert {entry["segment"] for entry in summary["slowest_segments"]} == {1, 2}
+    assert set(summary["slowest_segments"][0]["phases"]) <= {"translate", "llm_call"}
+    assert json.loads((tmp_path / "traces" / "translation_spans_summary.json").read_text())["job_id"] == 3
+    assert "llm_call:m" in summarize_spans(records, group_by="model")
+
+
+def test_spans_without_tracer_still_measure():
+    with span("translate") as measured:
+        pass
+
+    assert measured.duration >= 0.0
+
+
+def test_worker_threads_report_to_the_submitting_tracer():
+    tracer = Tracer()
+
+    with use_tracer(tracer), ThreadPoolExecutor(max_workers=2) as executor:
+        def analyze():
+            with span("guide_analysis"):
+                pass
+
+        with span("segment", segment=8):
+            for future in [executor.submit(in_current_context(analyze)) for _ in range(3)]:
+                future.result()
+
+    stats = tracer.summary()
+    assert stats["spans"]["guide_analysis"]["count"] == 3
+    assert any(entry["segment"] == 8 and "guide_analysis" in entry["phases"] for entry in stats["slowest_segments"])
+
+
+def test_model_retries_are_traced(monkeypatch):
+    monkeypatch.setattr(GeminiModel, "_compute_backoff_seconds", lambda self, attempt, **_: 0.001)
+    model = GeminiModel(
+        api_key=None,
+        model_name="test-model",
+        safety_settings=[],
+        generation_config={},
+        enable_soft_retry=False,
+        client=SimpleNamespace(models=FlakyModels()),
+    )
+    tracer = Tracer()
+
+    with use_tracer(tracer), span("segment", segment=1):
+        assert model.generate_text("prompt") == "번역"
+
+    spans = tracer.summary()["spans"]
+    assert spans["llm_call"]["count"] == 2
+    assert spans["retry_backoff"]["count"] == 1
+
+
+def test_percentile_interpolates():
+    assert percentile([1.0], 99) == 1.0
+    assert percentile([1.0, 2.0, 3.0, 4.0, 5.0], 50) == 3.0
+    assert percentile([0.0, 10.0], 90) == 9.0
@@ -0,0 +1,160 @@
+import os
+import sys
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session, sessionmaker
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+os.environ.setdefault("GEMINI_API_KEY", "test-gemini")
+os.environ.setdefault("CLERK_SECRET_KEY", "test-clerk")
+os.environ.setdefault("ADMIN_SECRET_KEY", "test-admin")
+
+from backend.domains.shared.db_base import Base
+from backend.domains.translation.models import TranslationJob, TranslationSegment
+from backend.domains.translation.repository import SqlAlchemyTranslationSegmentRepository
+from backend.domains.user.models import User  # noqa: F401 - registers the users table for create_all
+
+
+@pytest.fixture()
+def session() -> Session:
+    engine = create_engine("sqlite:///:memory:")
+    Base.metadata.create_all(engine)
+    db = sessionmaker(bind=engine)()
+    try:
+        yield db
+    finally:
+        db.close()
+        Base.metadata.drop_all(engine)
+        engine.dispose()
+
+
+def make_segments(count: int):
+    return [
+        {
+            "segment_index": i,
+            "source_text": f"source {i}",
+            "translated_text": f"번역 {i}",
+            "chapter_title": None,
+            "chapter_filename": None,
+        }
+        for i in range(count)
+    ]
+
+
+def create_job(db: Session) -> TranslationJob:
+    job = TranslationJob(filename="book.txt")
+    db.add(job)
+    db.commit()
+    db.refresh(job)
+    return job
+
+
+def test_segments_round_trip_through_rows(session: Session) -> None:
+    job = create_job(session)
+    segments = make_segments(3)
+    segments[1]["world_atmosphere"] = {"mood": "tense"}
+    segments[2]["custom_flag"] = True
+
+    job.translation_segments = segments
+    session.commit()
+    session.expire_all()
+
+    job = session.get(TranslationJob, job.id)
+    assert job.translation_segments == segments
+    assert job.legacy_translation_segments is None
+    assert session.query(TranslationSegment).count() == 3
+
+
+def test_rewrite_updates_rows_in_place(session: Session) -> None:
+    job = create_job(session)
+    job.translation_segments = make_segments(4)
+    session.commit()
+    first_ids = [row.id for row in job.segment_rows]
+
+    edited = make_segments(2)
+    edited[0]["translated_text"] = "수정됨"
+    job.translation_segments = edited
+    session.commit()
+
+    assert [row.id for row in job.segment_rows] == first_ids[:2]
+    assert job.translation_segments[0]["translated_text"] == "수정됨"
+    assert session.query(TranslationSegment).count() == 2
+
+
+def test_repeated_segment_index_keeps_the_last_entry(session: Session) -> None:
+    job = create_job(session)
+    segments = make_segments(3)
+    segments.append({**segments[1], "translated_text": "마지막"})
+
+    job.translation_segments = segments
+    session.commit()
+
+    assert session.query(TranslationSegment).count() == 3
+    assert [row["translated_text"] for row in job.translation_segments] == ["번역 0", "마지막", "번역 2"]
+
+
+def test_repository_paginates_and_upserts(session: Session) -> None:
+    job = create_job(session)
+    repo = SqlAlchemyTranslationSegmentRepository(session)
+    for data in make_segments(10):
+        repo.upsert(job.id, data["segment_index"], data)
+    repo.upsert(job.id, 4, {"source_text": "source 4", "translated_text": "again"})
+    session.commit()
+
+    page = repo.list_by_job(job.id, offset=3, limit=3)
+    assert repo.count(job.id) == 10
+    assert [row.segment_index for row in page] == [3, 4, 5]
+    assert page[1].translated_text == "again"
+
+
+def test_legacy_blob_is_still_readable(session: Session) -> None:
+    job = TranslationJob(filename="old.txt", legacy_translation_segments=make_segments(2))
+    session.add(job)
+    session.commit()
+
+    assert job.translation_segments == make_segments(2)
+    assert SqlAlchemyTranslationSegmentRepository(session).count(job.id) == 0
+
+
+def test_progress_tracker_streams_segments_in_batches(session: Session) -> None:
+    from core.schemas import SegmentInfo
+    from core.translation.progress_tracker import ProgressTracker
+
+    job = create_job(session)
+    tracker = ProgressTracker(db=session, job_id=job.id, segment_flush_size=3, segment_flush_interval=3600)
+    repo = SqlAlchemyTranslationSegmentRepository(session)
+    segments = [SegmentInfo(text=f"source {i}", chapter_title=None, chapter_filename=None) for i in range(5)]
+
+    for i in range(4):
+        tracker.record_segment(i, segments[i], f"번역 {i}", total_segments=5)
+    assert repo.count(job.id) == 3
+    session.refresh(job)
+    assert job.progress == 60
+
+    tracker.finalize_translation(segments, [f"번역 {i}" for i in range(5)], {"source": "원문"})
+    session.refresh(job)
+    assert repo.count(job.id) == 5
+    assert job.progress == 100
+    assert job.final_glossary == {"source": "원문"}
+    assert [row["translated_text"] for row in job.translation_segments] == [f"번역 {i}" for i in range(5)]
+
+
+def test_finalize_drops_rows_left_over_from_a_longer_run(session: Session) -> None:
+    from core.schemas import SegmentInfo
+    from core.translation.progress_tracker import ProgressTracker
+
+    job = create_job(session)
+    job.translation_segments = make_segments(5)
+    session.commit()
+    tracker = ProgressTracker(db=session, job_id=job.id)
+    segments = [SegmentInfo(text=f"source {i}", chapter_title=None, chapter_filename=None) for i in range(3)]
+
+    tracker.finalize_translation(segments, [f"재번역 {i}" for i in range(3)], {})
+    session.refresh(job)
+
+    repo = SqlAlchemyTranslationSegmentRepository(session)
+    assert repo.count(job.id) == 3
+    assert job.progress == 100
+    assert [row["translated_text"] for row in job.translation_segments] == [f"재번역 {i}" for i in range(3)]
@@ -0,0 +1,135 @@
+import json
+import time
+
+import pytest
+from pydantic import ValidationError
+
+from backend.config.settings import Settings
+from core.config.builder import DynamicConfigBuilder
+from core.schemas import SegmentInfo
+from core.translation.document import TranslationDocument
+from core.translation.segment_journal import SegmentJournal
+from core.translation.sharding import (
+    TranslationShard,
+    find_segments_using_terms,
+    reconcile_glossaries,
+    split_into_shards,
+)
+from core.translation.translation_pipeline import TranslationPipeline
+
+
+def make_segments(chapters: list[str | None]) -> list[SegmentInfo]:
+    return [
+        SegmentInfo(text=f"Segment {i} text", chapter_filename=chapter)
+        for i, chapter in enumerate(chapters)
+    ]
+
+
+def test_split_by_chapter_cuts_at_chapter_boundaries():
+    segments = make_segments(["ch1.xhtml", "ch1.xhtml", "ch2.xhtml", "ch3.xhtml", "ch3.xhtml"])
+
+    shards = split_into_shards(segments, "chapter", shard_size=10)
+
+    assert [(s.start, s.end) for s in shards] == [(0, 2), (2, 3), (3, 5)]
+
+
+def test_split_by_chapter_falls_back_to_fixed_size_without_metadata():
+    segments = make_segments([None] * 5)
+
+    shards = split_into_shards(segments, "chapter", shard_size=2, start=1)
+
+    assert [(s.start, s.end) for s in shards] == [(1, 3), (3, 5)]
+
+
+def test_reconcile_glossaries_prefers_earliest_translation():
+    first = TranslationShard(index=0, start=0, end=1, glossary={"Holden": "홀든", "Phoebe": "피비"})
+    second = TranslationShard(index=1, start=1, end=3, glossary={"Holden": "홀던", "Allie": "앨리"})
+
+    merged, conflicts = reconcile_glossaries({"Pencey": "펜시"}, [first, second])
+
+    assert merged == {"Pencey": "펜시", "Holden": "홀든", "Phoebe": "피비", "Allie": "앨리"}
+    assert conflicts == {1: {"Holden"}}
+
+
+def test_find_segments_using_terms_matches_whole_words_only():
+    segments = [
+        SegmentInfo(text="Nothing here"),
+        SegmentInfo(text="Holden said hello"),
+        SegmentInfo(text="Holdenness is not a name"),
+    ]
+    shard = TranslationShard(index=0, start=0, end=3)
+
+    assert find_segments_using_terms(segments, shard, {"Holden"}) == [1]
+
+
+# Phoebe appears in segments 0, 3 and 5; shards are (0, 1, 2) and (3, 4, 5)
+SHARD_PARAGRAPHS = [
+    f"Paragraph {i}. " + ("Phoebe " if i in (0, 3, 5) else "") + "Holden walked around for a while. " * 20
+    for i in range(6)
+]
+
+
+def answer_glossary_calls(prompt, schema):
+    properties = schema.get("properties", {}) if isinstance(schema, dict) else {}
+    if "terms" in properties:
+        return {"terms": ["Phoebe"] if "Phoebe" in prompt else []}
+    if "translations" in properties:
+        # The second shard first meets Phoebe in segment 3 and picks another spelling
+        korean = "피브" if "Paragraph 3." in prompt else "피비"
+        return {"translations": [{"source": "Phoebe", "korean": korean}]}
+    return {}
+
+
+def test_sharded_pipeline_retranslates_only_segments_with_conflicting_terms(novel_file, scripted_model):
+    path = novel_file(SHARD_PARAGRAPHS)
+    model = scripted_model(structured=answer_glossary_calls)
+    document = TranslationDocument(path, target_segment_size=1000, job_id=1)
+    pipeline = TranslationPipeline(
+        model, DynamicConfigBuilder(model, "Holden"), db=None, job_id=1,
+        initial_core_style="plain", shard_strategy="segments", shard_size=3, max_shard_workers=2,
+    )
+
+    pipeline.translate_document(document)
+
+    assert len(document.translated_segments) == len(SHARD_PARAGRAPHS)
+    assert document.glossary == {"Phoebe": "피비"}
+    # Six first-pass translations plus segments 3 and 5 again with the merged glossary
+    assert len(model.text_prompts) == 8
+    assert all("피비" in prompt and "피브" not in prompt for prompt in model.text_prompts[6:])
+    with open(document._get_journal().path, encoding="utf-8") as journal:
+        positions = [json.loads(line)["i"] for line in journal]
+    assert sorted(positions) == [0, 1, 2, 3, 3, 4, 5, 5]
+    assert positions[-2:] == [3, 5]
+    assert SegmentJournal(document._get_journal().path).read() == document.translated_segments
+
+
+def test_failing_shard_stops_the_other_shards(novel_file, scripted_model):
+    paragraphs = [f"Paragraph {i}. " + "Holden walked around for a while. " * 30 for i in range(24)]
+    path = novel_file(paragraphs)
+
+    class SlowModel(scripted_model):
+        def generate_text(self, prompt, max_retries=3):
+            time.sleep(0.02)
+            return super().generate_text(prompt, max_retries)
+
+    model = SlowModel(fail_on="Paragraph 7.")
+    document = TranslationDocument(path, target_segment_size=1000, job_id=1)
+    pipeline = TranslationPipeline(
+        model, DynamicConfigBuilder(model, "Holden"), db=None, job_id=1,
+        initial_core_style="plain", shard_strategy="segments", shard_size=6, max_shard_workers=4,
+    )
+
+    with pytest.raises(RuntimeError, match="model unavailable"):
+        pipeline.translate_document(document)
+
+    # The second segment of shard 1 fails; the other three shards stop within a segment or two
+    assert len(model.text_prompts) <= 10
+
+
+def test_settings_reject_unknown_shard_strategy(monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path)
+
+    assert Settings(translation_shard_strategy=" Chapter ").translation_shard_strategy == "chapter"
+    assert Settings(translation_shard_strategy="").translation_shard_strategy is None
+    with pytest.raises(ValidationError):
+        Settings(translation_shard_strategy="chapters")
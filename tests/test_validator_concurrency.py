@@ -0,0 +1,79 @@
+import os
+import sys
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.translation.validator import TranslationValidator
+from shared.utils.logging import TranslationLogger
+from shared.utils.segment_log import SegmentLogReader
+
+
+class SlowStructuredModel:
+    """Returns a failing case for odd segments after a random delay."""
+
+    def __init__(self, probe):
+        self.probe = probe
+
+    def generate_structured(self, prompt, response_schema):
+        with self.probe.call():
+            if "odd" not in prompt:
+                return {"cases": []}
+            return {
+                "cases": [
+                    {
+                        "current_korean_sentence": "문장",
+                        "problematic_source_sentence": "sentence",
+                        "reason": "mistranslation",
+                        "dimension": "accuracy",
+                        "severity": "2",
+                        "recommend_korean_sentence": "수정",
+                    }
+                ]
+            }
+
+
+def make_document(count: int):
+    return SimpleNamespace(
+        segments=[SimpleNamespace(text=f"source {i} {'odd' if i % 2 else 'even'}") for i in range(count)],
+        translated_segments=[f"translated {i}" for i in range(count)],
+        glossary={},
+    )
+
+
+def test_concurrent_validation_keeps_order_and_monotonic_progress(concurrency_probe):
+    model = SlowStructuredModel(concurrency_probe)
+    validator = TranslationValidator(model)
+    progress = []
+
+    results, summary = validator.validate_document(
+        make_document(24), progress_callback=progress.append, concurrency=6
+    )
+
+    assert [r.segment_index for r in results] == list(range(24))
+    assert [r.status for r in results] == ["FAIL" if i % 2 else "PASS" for i in range(24)]
+    assert progress == sorted(progress)
+    assert progress[-1] == 100
+    assert 1 < concurrency_probe.max_active <= 6
+    assert summary["validated_segments"] == 24
+
+
+def test_serial_validation_is_default(concurrency_probe):
+    model = SlowStructuredModel(concurrency_probe)
+    validator = TranslationValidator(model)
+
+    results, _ = validator.validate_document(make_document(5))
+
+    assert [r.segment_index for r in results] == list(range(5))
+    assert concurrency_probe.max_active == 1
+
+
+def test_translation_logger_is_safe_to_share_between_threads(tmp_path, concurrency_probe):
+    logger = TranslationLogger(job_id=9, user_base_filename="book", task_type="validation", job_storage_base=str(tmp_path))
+    logger.initialize_session()
+    validator = TranslationValidator(SlowStructuredModel(concurrency_probe), logger=logger)
+
+    validator.validate_document(make_document(24), concurrency=6)
+    logger.close()
+
+    assert [index for index, _ in SegmentLogReader(logger.segments_dir).iter_segments()] == list(range(24))
@@ -1,5 +1,7 @@
+import asyncio
 import os
 import sys
+import time
 
 import pytest
 
@@ -37,7 +39,21 @@ class DummyClient:
         self.models = DummyModels(fn)
 
 
-def make_model(*, plan_by_key: dict[str, list[object]], **kwargs) -> tuple[GeminiModel, dict[str, int]]:
+class DummyAsyncModels:
+    def __init__(self, fn):
+        self._fn = fn
+
+    async def generate_content(self, **kwargs):
+        return self._fn(**kwargs)
+
+
+class DummyAsyncClient(DummyClient):
+    def __init__(self, fn):
+        super().__init__(fn)
+        self.aio = type("Aio", (), {"models": DummyAsyncModels(fn)})()
+
+
+def make_model(*, plan_by_key: dict[str, list[object]], client_cls=DummyClient, **kwargs) -> tuple[GeminiModel, dict[str, int]]:
     calls: dict[str, int] = {}
 
     def client_factory(api_key: str):
@@ -53,7 +69,7 @@ def make_model(*, plan_by_key: dict[str, list[object]], **kwargs) -> tuple[Gemin
                 raise action
             return action
 
-        return DummyClient(behavior)
+        return client_cls(behavior)
 
     model = GeminiModel(
         api_key="key_primary",
@@ -123,3 +139,91 @@ def test_rotates_on_rate_limit_without_sleep(monkeypatch):
     assert calls["key_backup"] == 1
     # When a backup key is available, we rotate instead of sleeping on 429.
     assert slept == []
+
+
+def test_async_rotates_on_rate_limit_without_blocking(monkeypatch):
+    import core.translation.models.gemini as gemini_module
+
+    def fail_blocking_sleep(seconds: float):
+        raise AssertionError("async path must not call time.sleep")
+
+    monkeypatch.setattr(gemini_module.time, "sleep", fail_blocking_sleep)
+
+    model, calls = make_model(
+        plan_by_key={
+            "key_primary": [google_exceptions.ResourceExhausted("RESOURCE_EXHAUSTED")],
+            "key_backup": [DummyResponse(text="ok")],
+        },
+        client_cls=DummyAsyncClient,
+    )
+
+    result = asyncio.run(model.agenerate_text("prompt", max_retries=2))
+
+    assert result == "ok"
+    assert calls["key_primary"] == 1
+    assert calls["key_backup"] == 1
+
+
+def test_async_does_not_rotate_on_safety_block():
+    model, calls = make_model(
+        plan_by_key={
+            "key_primary": [DummyResponse(prompt_feedback=DummyPromptFeedback("SAFETY"))],
+            "key_backup": [DummyResponse(text="ok")],
+        },
+        client_cls=DummyAsyncClient,
+    )
+
+    with pytest.raises(ProhibitedException):
+        asyncio.run(model.agenerate_text("prompt", max_retries=2))
+
+    assert calls["key_primary"] == 1
+    assert calls.get("key_backup", 0) == 0
+
+
+def test_concurrent_failure_only_disables_the_failing_key():
+    primary_called = asyncio.Event()
+    release_primary = asyncio.Event()
+    calls: dict[str, int] = {}
+
+    class GatedModels:
+        def __init__(self, api_key: str):
+            self._api_key = api_key
+
+        async def generate_content(self, **_kwargs):
+            calls[self._api_key] = calls.get(self._api_key, 0) + 1
+            if self._api_key == "key_primary":
+                primary_called.set()
+                await release_primary.wait()
+                raise google_exceptions.PermissionDenied("PERMISSION_DENIED")
+            release_primary.set()
+            return DummyResponse(text=f"ok from {self._api_key}")
+
+    def client_factory(api_key: str):
+        client = DummyClient(lambda **_: None)
+        client.aio = type("Aio", (), {"models": GatedModels(api_key)})()
+        return client
+
+    model = GeminiModel(
+        api_key="key_primary",
+        model_name="test-model",
+        safety_settings=[],
+        generation_config={},
+        enable_soft_retry=False,
+        backup_api_keys=["key_backup"],
+        client_factory=client_factory,
+    )
+
+    async def main():
+        first = asyncio.create_task(model.agenerate_text("first", max_retries=2))
+        await primary_called.wait()
+        # Another request moves the shared pool on to the backup key meanwhile
+        model._api_key_pool.rotate(time.time())
+        second = await model.agenerate_text("second", max_retries=2)
+        return await first, second
+
+    # The primary key fails only after the second request selected the backup key
+    assert asyncio.run(main()) == ("ok from key_backup", "ok from key_backup")
+    assert calls == {"key_primary": 1, "key_backup": 2}
+    now = time.time()
+    assert model._api_key_pool.state_counts(now) == {"available": 1, "cooldown": 0, "disabled": 1}
+    assert model._api_key_pool.current(now) == "key_backup"
@@ -0,0 +1,92 @@
+import asyncio
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+import httpx
+import pytest
+
+import core.translation.models.openrouter as openrouter_module
+from core.translation.models.async_http import get_async_client, run_sync
+from core.translation.models.openrouter import OpenRouterModel
+from shared.errors import ProhibitedException
+
+
+def _completion(text: str) -> dict:
+    return {
+        "choices": [{"message": {"content": text}}],
+        "usage": {"prompt_tokens": 3, "completion_tokens": 2, "total_tokens": 5},
+    }
+
+
+def _use_transport(monkeypatch, handler):
+    clients = {}
+
+    def fake_client():
+        loop = asyncio.get_running_loop()
+        if loop not in clients:
+            clients[loop] = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        return clients[loop]
+
+    monkeypatch.setattr(openrouter_module, "get_async_client", fake_client)
+
+
+def test_generate_text_posts_chat_completion_and_emits_usage(monkeypatch):
+    requests_seen = []
+
+    def handler(request):
+        requests_seen.append(request)
+        return httpx.Response(200, json=_completion("hello"))
+
+    _use_transport(monkeypatch, handler)
+    events = []
+    model = OpenRouterModel(
+        api_key="sk-or-test",
+        model_name="openai/gpt-4o",
+        generation_config={"max_output_tokens": 100, "temperature": 0.2},
+        usage_callback=events.append,
+        enable_soft_retry=False,
+    )
+
+    assert model.generate_text("prompt") == "hello"
+    assert requests_seen[0].url.path.endswith("/chat/completions")
+    assert requests_seen[0].headers["Authorization"] == "Bearer sk-or-test"
+    assert events[0].total_tokens == 5
+
+
+def test_agenerate_text_retries_transient_errors(monkeypatch):
+    statuses = iter([503, 200])
+
+    def handler(request):
+        status = next(statuses)
+        return httpx.Response(status, json=_completion("ok") if status == 200 else {})
+
+    _use_transport(monkeypatch, handler)
+    monkeypatch.setattr(openrouter_module.asyncio, "sleep", _no_sleep)
+    model = OpenRouterModel(api_key="sk-or-test", model_name="openai/gpt-4o", enable_soft_retry=False)
+
+    assert asyncio.run(model.agenerate_text("prompt")) == "ok"
+
+
+def test_content_policy_error_raises_prohibited(monkeypatch):
+    def handler(request):
+        return httpx.Response(400, json={"error": {"message": "Blocked by content policy"}})
+
+    _use_transport(monkeypatch, handler)
+    model = OpenRouterModel(api_key="sk-or-test", model_name="openai/gpt-4o", enable_soft_retry=False)
+
+    with pytest.raises(ProhibitedException):
+        model.generate_text("prompt")
+
+
+def test_async_client_is_reused_within_a_loop():
+    async def pair():
+        return get_async_client(), get_async_client()
+
+    first, second = run_sync(pair())
+    assert first is second
+
+
+async def _no_sleep(_seconds):
+    return None
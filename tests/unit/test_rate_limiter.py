@@ -0,0 +1,193 @@
+import asyncio
+import os
+import sys
+import time
+from types import SimpleNamespace
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from core.translation.models.gemini import GeminiModel
+from core.translation.models.rate_limiter import RateLimiter, current_scope, rate_limit_scope
+
+
+def local_limiter(rpm=60, tpm=0, **kwargs) -> RateLimiter:
+    return RateLimiter(rpm, tpm, redis_url="", **kwargs)
+
+
+def fake_redis(monkeypatch):
+    fakeredis = pytest.importorskip("fakeredis")
+    pytest.importorskip("lupa")
+    import redis
+
+    server = fakeredis.FakeServer()
+    monkeypatch.setattr(
+        redis.Redis, "from_url",
+        staticmethod(lambda *args, **kwargs: fakeredis.FakeRedis(server=server, decode_responses=True)),
+    )
+    return fakeredis.FakeRedis(server=server, decode_responses=True)
+
+
+def granted(limiter: RateLimiter, count: int, tokens: int = 0) -> int:
+    return sum(1 for _ in range(count) if limiter.try_acquire("key", tokens) == 0.0)
+
+
+def test_lower_priority_queues_leave_headroom():
+    limiter = local_limiter(rpm=60)  # bursts of 6 requests
+
+    with rate_limit_scope("illustrations", job_id=1):
+        assert granted(limiter, 10) == 4
+        assert limiter.try_acquire("key") > 0
+    with rate_limit_scope("translation", job_id=2):
+        assert granted(limiter, 10) == 2
+
+
+def waits_after_one_translation_request(limiter: RateLimiter) -> dict:
+    with rate_limit_scope("translation", job_id=1):
+        assert limiter.try_acquire("key") == 0.0
+    waits = {}
+    for queue in ("translation", "illustrations"):
+        with rate_limit_scope(queue, job_id=2):
+            waits[queue] = limiter.try_acquire("key")
+    return waits
+
+
+def test_reserves_apply_when_the_bucket_holds_one_request():
+    waits = waits_after_one_translation_request(local_limiter(rpm=6))  # one request every 10 s
+
+    assert waits["translation"] == pytest.approx(10.0, abs=0.01)
+    assert waits["illustrations"] == pytest.approx(13.0, abs=0.01)
+
+
+def test_jobs_on_one_key_are_capped_at_their_share():
+    limiter = local_limiter(rpm=60)
+    with rate_limit_scope("translation", job_id=1):
+        limiter.try_acquire("key")
+    with rate_limit_scope("translation", job_id=2):
+        limiter.try_acquire("key")
+
+    # Four requests are left in the burst, but job 1 is capped at half of it
+    with rate_limit_scope("translation", job_id=1):
+        assert granted(limiter, 10) == 3
+    with rate_limit_scope("translation", job_id=2):
+        assert granted(limiter, 10) == 1
+
+
+def test_settle_returns_unused_tokens():
+    limiter = local_limiter(rpm=0, tpm=6000)  # bursts of 600 tokens
+
+    with rate_limit_scope("translation", job_id=1):
+        assert limiter.try_acquire("key", 400) == 0.0
+        assert limiter.try_acquire("key", 400) == pytest.approx(2.0, abs=0.01)
+        limiter.settle("key", reserved_tokens=400, used_tokens=100)
+        assert limiter.try_acquire("key", 400) == 0.0
+
+
+def test_async_wait_yields_to_the_event_loop():
+    limiter = local_limiter(rpm=600, burst=0.0)  # one request every 100 ms
+    ticks = []
+
+    async def ticker():
+        for _ in range(5):
+            ticks.append(time.perf_counter())
+            await asyncio.sleep(0.01)
+
+    async def main():
+        started = time.perf_counter()
+        await asyncio.gather(limiter.async_wait("key"), limiter.async_wait("key"), ticker())
+        return time.perf_counter() - started
+
+    with rate_limit_scope("validation", job_id=3):
+        elapsed = asyncio.run(main())
+
+    assert elapsed >= 0.09
+    assert len(ticks) == 5
+    assert current_scope() == ("default", "-")
+
+
+def test_workers_share_buckets_through_redis(monkeypatch):
+    fake_redis(monkeypatch)
+    workers = [RateLimiter(60, redis_url="redis://fake") for _ in range(2)]
+
+    with rate_limit_scope("translation", job_id=1):
+        assert sum(granted(worker, 4) for worker in workers) == 6
+
+
+def test_redis_reserves_apply_when_the_bucket_holds_one_request(monkeypatch):
+    fake_redis(monkeypatch)
+    waits = waits_after_one_translation_request(RateLimiter(6, redis_url="redis://fake"))
+
+    assert waits["translation"] == pytest.approx(10.0, abs=0.01)
+    assert waits["illustrations"] == pytest.approx(13.0, abs=0.01)
+
+
+def test_settle_skips_expired_redis_buckets(monkeypatch):
+    client = fake_redis(monkeypatch)
+    limiter = RateLimiter(0, 6000, redis_url="redis://fake")
+
+    with rate_limit_scope("translation", job_id=1):
+        assert limiter.try_acquire("key", 400) == 0.0
+        key, job_key, _ = limiter._keys("key", "translation:1")
+        client.delete(key, job_key)  # expired between the call and its settlement
+        limiter.settle("key", reserved_tokens=400, used_tokens=900)
+
+        assert not client.exists(key, job_key)
+        # A full bucket again, not one read back as empty
+        assert limiter.try_acquire("key", 400) == 0.0
+
+
+class RecordingLimiter:
+    tokens_per_minute = 1000
+
+    def __init__(self):
+        self.waits = []
+        self.settled = []
+
+    def wait(self, api_key, tokens=0):
+        self.waits.append((api_key, tokens))
+
+    def settle(self, api_key, reserved_tokens, used_tokens):
+        self.settled.append((api_key, reserved_tokens, used_tokens))
+
+
+def test_gemini_reserves_tokens_and_settles_reported_usage():
+    response = SimpleNamespace(
+        text="번역",
+        candidates=[],
+        usage_metadata=SimpleNamespace(prompt_token_count=30, candidates_token_count=10, total_token_count=40),
+    )
+    model = GeminiModel(
+        api_key="key_primary",
+        model_name="test-model",
+        safety_settings=[],
+        generation_config={},
+        enable_soft_retry=False,
+        client_factory=lambda key: SimpleNamespace(models=SimpleNamespace(generate_content=lambda **_: response)),
+        requests_per_minute=60,
+        tokens_per_minute=1000,
+    )
+    model._rate_limiter = limiter = RecordingLimiter()
+
+    assert model.generate_text("Holden went to Pencey Prep.") == "번역"
+
+    (key, reserved), = limiter.waits
+    assert key == "key_primary" and reserved > 0
+    assert limiter.settled == [("key_primary", reserved, 40)]
+
+
+def test_illustration_workers_inherit_the_task_scope():
+    from concurrent.futures import ThreadPoolExecutor
+
+    from backend.celery_tasks.illustrations import _submit_segment_illustration
+
+    class ScopeRecordingGenerator:
+        def generate_illustration(self, segment_text, segment_index, **kwargs):
+            return current_scope(), None
+
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        with rate_limit_scope("illustrations", job_id=5):
+            future = _submit_segment_illustration(executor, ScopeRecordingGenerator(), {"text": "scene", "index": 0})
+        scope, _ = future.result()
+
+    assert scope == ("illustrations", "5")
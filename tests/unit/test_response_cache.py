@@ -0,0 +1,90 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from pydantic import BaseModel
+
+from core.translation.models.gemini import GeminiModel
+from core.translation.models.response_cache import ResponseCache
+
+
+class DummyResponse:
+    def __init__(self, text: str):
+        self.text = text
+        self.prompt_feedback = None
+        self.candidates = []
+        self.usage_metadata = None
+
+
+class DummyModels:
+    def __init__(self):
+        self.calls = 0
+
+    def generate_content(self, **kwargs):
+        self.calls += 1
+        return DummyResponse(f"answer {self.calls}")
+
+
+class DummyClient:
+    def __init__(self):
+        self.models = DummyModels()
+
+
+class Terms(BaseModel):
+    terms: list[str]
+
+
+def test_cache_round_trips_text_and_pydantic_values(tmp_path):
+    cache = ResponseCache(str(tmp_path / "cache.sqlite3"))
+    text_key = cache.build_key("text", "model", {"temperature": 0.5}, "prompt")
+    model_key = cache.build_key("structured", "model", {"temperature": 0.5}, "prompt", Terms)
+
+    cache.put(text_key, "hello")
+    cache.put(model_key, Terms(terms=["Holden"]), response_schema=Terms)
+
+    assert text_key != model_key
+    assert cache.get(text_key) == "hello"
+    assert cache.get(model_key, Terms) == Terms(terms=["Holden"])
+
+
+def test_cache_key_depends_on_generation_config(tmp_path):
+    cache = ResponseCache(str(tmp_path / "cache.sqlite3"))
+
+    assert cache.build_key("text", "model", {"temperature": 0.5}, "prompt") != \
+        cache.build_key("text", "model", {"temperature": 0.9}, "prompt")
+
+
+def test_cache_expires_entries_after_ttl(tmp_path, monkeypatch):
+    cache = ResponseCache(str(tmp_path / "cache.sqlite3"), ttl_seconds=60)
+    key = cache.build_key("text", "model", {}, "prompt")
+    cache.put(key, "hello")
+
+    import core.translation.models.response_cache as response_cache_module
+    real_time = response_cache_module.time.time
+    monkeypatch.setattr(response_cache_module.time, "time", lambda: real_time() + 120)
+
+    assert cache.get(key) is None
+
+
+def test_gemini_cache_hit_skips_api_and_emits_cached_usage(tmp_path):
+    client = DummyClient()
+    events = []
+    model = GeminiModel(
+        api_key=None,
+        client=client,
+        model_name="test-model",
+        safety_settings=[],
+        generation_config={},
+        enable_soft_retry=False,
+        usage_callback=events.append,
+        response_cache=ResponseCache(str(tmp_path / "cache.sqlite3")),
+    )
+
+    assert model.generate_text("prompt") == "answer 1"
+    assert model.generate_text("prompt") == "answer 1"
+
+    assert client.models.calls == 1
+    assert len(events) == 1
+    assert events[0].cached is True
+    assert events[0].total_tokens == 0